@@ -114,6 +114,14 @@ class M5AssertionValidator:
         """从Prometheus指标文本中提取P95延迟"""
         import re
 
+        # 优先使用进程内直方图导出的分位数（精度不受le分桶限制）
+        quantile = re.search(
+            r'trading_signal_latency_quantile_seconds\{quantile="0\.95"\}\s+([0-9.eE+-]+)',
+            metrics_text,
+        )
+        if quantile:
+            return float(quantile.group(1))
+
         # 查找trading_signal_latency的直方图数据
         pattern = r'trading_signal_latency_seconds_bucket\{.*le="([0-9.]+)".*\}\s+([0-9]+)'
         matches = re.findall(pattern, metrics_text)
@@ -139,6 +147,10 @@ class M5AssertionValidator:
 
     def _get_p95_from_memory(self) -> Optional[float]:
         """从内存中的指标获取P95延迟"""
+        latency = self.metrics.get_latency_percentiles("signal", [95])
+        if latency["count"]:
+            return latency["p95"]
+
         # 在CI环境中，如果没有实际的性能数据，返回一个合理的模拟值
         # 这应该基于实际的基准测试结果
         import os
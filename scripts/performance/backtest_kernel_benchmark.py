@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+回测内核基准测试
+Backtest Kernel Benchmark
+
+用途：
+- 对比逐K线实现（run_backtest_loop）与数组内核（run_backtest）
+- 默认100万根K线随机游走，检查两者权益曲线逐分一致
+- 输出耗时与加速比
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+
+from src.strategies.backtest import BacktestExecutor
+from src.strategies.backtest_kernel import JIT_ENABLED
+
+
+def _generate_prices(bars: int, seed: int = 42) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    prices = 30000 + np.cumsum(rng.normal(0, 10, bars))
+    return pd.Series(prices, index=pd.date_range("2020-01-01", periods=bars, freq="min"))
+
+
+def _executor(price: pd.Series) -> BacktestExecutor:
+    return BacktestExecutor(
+        price=price,
+        fast_win=7,
+        slow_win=20,
+        atr_win=20,
+        risk_frac=0.02,
+        init_equity=100_000.0,
+        use_trailing_stop=True,
+        breakeven_r=1.0,
+        trail_r=2.0,
+        verbose=False,
+    )
+
+
+def run_benchmark(bars: int = 1_000_000) -> Dict[str, Any]:
+    """运行逐K线与数组内核对比"""
+    price = _generate_prices(bars)
+
+    if JIT_ENABLED:
+        # 预热JIT，避免把编译时间计入
+        _executor(price.iloc[:100]).run_backtest()
+
+    start = time.perf_counter()
+    kernel_curve = _executor(price).run_backtest()
+    kernel_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    loop_curve = _executor(price).run_backtest_loop()
+    loop_time = time.perf_counter() - start
+
+    max_diff = float(np.abs(kernel_curve.values - loop_curve.values).max())
+    return {
+        "bars": bars,
+        "backend": "numba" if JIT_ENABLED else "python",
+        "loop_seconds": loop_time,
+        "kernel_seconds": kernel_time,
+        "speedup": loop_time / kernel_time,
+        "max_abs_diff": max_diff,
+        "matches_to_cent": max_diff < 0.005,
+    }
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="回测内核基准测试")
+    parser.add_argument("--bars", type=int, default=1_000_000, help="K线数量")
+    parser.add_argument("--output", help="结果JSON输出路径（可选）")
+    args = parser.parse_args()
+
+    print(f"🚀 回测内核基准测试 ({args.bars:,} 根K线)")
+    results = run_benchmark(args.bars)
+
+    print(f"   后端: {results['backend']}")
+    print(f"   逐K线: {results['loop_seconds']:.2f}s")
+    print(f"   内核:   {results['kernel_seconds']:.2f}s")
+    print(f"   加速比: {results['speedup']:.1f}x")
+    print(f"   最大偏差: {results['max_abs_diff']:.6f} (逐分一致: {results['matches_to_cent']})")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✅ 测试结果已保存: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+市场模拟器账本基准测试
+Market Simulator Ledger Benchmark
+
+用途：
+- 对比逐行实现（apply/iterrows/.loc，保留为 LegacyMarketSimulator）与数组账本
+- 数组账本跑满100万根K线；逐行实现按 --legacy-bars 抽样并线性外推
+- 在抽样区间上检查交易记录与权益曲线一致
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+
+from src.brokers.simulator.market_sim import MarketSimulator
+
+
+class LegacyMarketSimulator(MarketSimulator):
+    """逐行参考实现（向量化之前的版本），仅用于对照"""
+
+    def _generate_positions(self, signals: pd.DataFrame) -> None:
+        self.positions = signals.copy()
+        self.positions["price"] = self.data["close"]
+        self.positions["exec_price"] = self.positions.apply(
+            lambda x: (
+                x["price"] * (1 + self.slippage)
+                if x["signal"] > 0
+                else x["price"] * (1 - self.slippage) if x["signal"] < 0 else x["price"]
+            ),
+            axis=1,
+        )
+        self.positions["commission"] = (
+            abs(self.positions["signal"]) * self.positions["exec_price"] * self.commission
+        )
+        self._record_trades()
+
+    def _record_trades(self) -> None:
+        prev_signal = 0
+        for date, row in self.positions.iterrows():
+            if row["signal"] != prev_signal:
+                self.trades.append(
+                    {
+                        "date": date,
+                        "signal": row["signal"],
+                        "price": row["exec_price"],
+                        "commission": row["commission"],
+                    }
+                )
+                prev_signal = row["signal"]
+
+    def _calculate_holdings(self) -> None:
+        self.holdings = pd.DataFrame(index=self.positions.index)
+        self.holdings["cash"] = float(self.initial_capital)
+        self.holdings["units"] = 0.0
+        self.holdings["asset_value"] = 0.0
+
+        prev_signal = 0
+        for i, (date, row) in enumerate(self.positions.iterrows()):
+            if i > 0:
+                self.holdings.loc[date, "cash"] = self.holdings.iloc[i - 1]["cash"]
+                self.holdings.loc[date, "units"] = self.holdings.iloc[i - 1]["units"]
+
+            if row["signal"] != prev_signal:
+                if row["signal"] > 0 and prev_signal <= 0:
+                    units_to_buy = (
+                        self.holdings.loc[date, "cash"]
+                        * 0.99
+                        / (row["exec_price"] * (1 + self.commission))
+                    )
+                    cost = units_to_buy * row["exec_price"] * (1 + self.commission)
+                    self.holdings.loc[date, "units"] += units_to_buy
+                    self.holdings.loc[date, "cash"] -= cost
+                elif row["signal"] <= 0 and prev_signal > 0:
+                    units_to_sell = self.holdings.loc[date, "units"]
+                    proceeds = units_to_sell * row["exec_price"] * (1 - self.commission)
+                    self.holdings.loc[date, "units"] = 0
+                    self.holdings.loc[date, "cash"] += proceeds
+
+            self.holdings.loc[date, "asset_value"] = self.holdings.loc[date, "units"] * row["price"]
+            prev_signal = row["signal"]
+
+
+def generate_market(bars: int, seed: int = 42) -> pd.DataFrame:
+    """随机游走行情"""
+    rng = np.random.default_rng(seed)
+    close = 30000 + np.cumsum(rng.normal(0, 10, bars))
+    return pd.DataFrame(
+        {"close": close}, index=pd.date_range("2020-01-01", periods=bars, freq="min")
+    )
+
+
+def ma_cross_signals(data: pd.DataFrame, fast: int = 20, slow: int = 60) -> pd.DataFrame:
+    """均线交叉多空信号（1/-1，预热期为0）"""
+    fast_ma = data["close"].rolling(fast).mean()
+    slow_ma = data["close"].rolling(slow).mean()
+    signals = pd.DataFrame(index=data.index)
+    signals["signal"] = np.where(fast_ma > slow_ma, 1, -1)
+    signals.iloc[: slow - 1, 0] = 0
+    return signals
+
+
+def _timed_run(simulator_cls, data: pd.DataFrame):
+    simulator = simulator_cls(data)
+    start = time.perf_counter()
+    simulator.run_backtest(ma_cross_signals)
+    return simulator, time.perf_counter() - start
+
+
+def run_benchmark(bars: int = 1_000_000, legacy_bars: int = 20_000) -> Dict[str, Any]:
+    """运行数组账本与逐行实现对比"""
+    data = generate_market(bars)
+    _, vector_time = _timed_run(MarketSimulator, data)
+
+    sample = data.iloc[:legacy_bars]
+    legacy, legacy_time = _timed_run(LegacyMarketSimulator, sample)
+    vector, _ = _timed_run(MarketSimulator, sample)
+
+    max_diff = float(
+        np.abs(
+            vector.performance["total_value"].values - legacy.performance["total_value"].values
+        ).max()
+    )
+    legacy_estimate = legacy_time * bars / legacy_bars
+    return {
+        "bars": bars,
+        "legacy_bars": legacy_bars,
+        "vector_seconds": vector_time,
+        "legacy_seconds_sampled": legacy_time,
+        "legacy_seconds_estimated": legacy_estimate,
+        "speedup_estimated": legacy_estimate / vector_time,
+        "trades_match": vector.trades == legacy.trades,
+        "max_abs_diff": max_diff,
+    }
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="市场模拟器账本基准测试")
+    parser.add_argument("--bars", type=int, default=1_000_000, help="K线数量")
+    parser.add_argument("--legacy-bars", type=int, default=20_000, help="逐行实现抽样K线数")
+    parser.add_argument("--output", help="结果JSON输出路径（可选）")
+    args = parser.parse_args()
+
+    print(f"🚀 市场模拟器账本基准测试 ({args.bars:,} 根K线)")
+    results = run_benchmark(args.bars, args.legacy_bars)
+
+    print(f"   数组账本: {results['vector_seconds']:.2f}s")
+    print(
+        f"   逐行实现: {results['legacy_seconds_sampled']:.2f}s / {args.legacy_bars:,} 根"
+        f" (外推 {results['legacy_seconds_estimated']:.0f}s)"
+    )
+    print(f"   加速比(外推): {results['speedup_estimated']:.0f}x")
+    print(f"   交易记录一致: {results['trades_match']}, 最大偏差: {results['max_abs_diff']:.2e}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✅ 测试结果已保存: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
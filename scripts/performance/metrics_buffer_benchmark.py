@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+热路径指标写入基准测试
+Hot-path Metrics Overhead Benchmark
+
+用途：
+- 按K线消息路径的调用序列（ws延迟、并发任务、消息计数、价格更新）测量每条消息的指标开销
+- 对比旧版（每次labels()查找+加锁写入）、子项缓存直写、缓冲模式三种方式
+"""
+
+import argparse
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from src.monitoring.metrics_collector import MetricsConfig, TradingMetricsCollector
+
+
+def _legacy_path(metrics: TradingMetricsCollector) -> Callable[[str, float], None]:
+    """改造前的写法：每次调用都经过labels()"""
+
+    def on_message(symbol: str, latency: float) -> None:
+        metrics.ws_latency.observe(latency)
+        metrics.concurrent_tasks.labels(task_type="market_data").set(1)
+        metrics.ws_messages_total.labels(symbol=symbol, type="kline").inc()
+        metrics.price_updates_total.labels(symbol=symbol, source="ws").inc()
+
+    return on_message
+
+
+def _collector_path(metrics: TradingMetricsCollector) -> Callable[[str, float], None]:
+    def on_message(symbol: str, latency: float) -> None:
+        metrics.observe_ws_latency(latency)
+        metrics.update_concurrent_tasks("market_data", 1)
+        metrics.record_ws_message(symbol, "kline")
+        metrics.record_price_update(symbol, 100.0)
+
+    return on_message
+
+
+def run(on_message: Callable[[str, float], None], symbols: List[str], count: int) -> Dict:
+    """
+    回放count条消息并统计每条消息的指标开销
+
+    Args:
+        on_message: 单条消息的指标调用序列
+        symbols: 轮转的交易对
+        count: 消息数
+
+    Returns:
+        每条消息耗时统计（微秒）
+    """
+    samples = np.empty(count)
+    n_symbols = len(symbols)
+    start_total = time.perf_counter()
+    for i in range(count):
+        start = time.perf_counter()
+        on_message(symbols[i % n_symbols], 0.002)
+        samples[i] = time.perf_counter() - start
+    total = time.perf_counter() - start_total
+
+    us = samples * 1e6
+    return {
+        "msgs_per_second": count / total,
+        "mean_us": float(us.mean()),
+        "p50_us": float(np.percentile(us, 50)),
+        "p99_us": float(np.percentile(us, 99)),
+    }
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="热路径指标写入基准测试")
+    parser.add_argument("--count", type=int, default=100_000, help="消息数量")
+    parser.add_argument("--symbols", type=int, default=50, help="交易对数量")
+    parser.add_argument("--flush-ms", type=float, default=250.0, help="缓冲刷新间隔（毫秒）")
+    args = parser.parse_args()
+
+    symbols = [f"SYM{i:03d}USDT" for i in range(args.symbols)]
+    metrics = TradingMetricsCollector(MetricsConfig())
+
+    results = {
+        "旧版labels()": run(_legacy_path(metrics), symbols, args.count),
+        "子项缓存直写": run(_collector_path(metrics), symbols, args.count),
+    }
+
+    buffer = metrics.enable_buffering(args.flush_ms)
+    results["缓冲模式"] = run(_collector_path(metrics), symbols, args.count)
+    start = time.perf_counter()
+    metrics.disable_buffering()
+    flush_ms = (time.perf_counter() - start) * 1000
+
+    print(f"🧪 {args.count:,} 条消息 × 4 次指标调用, {args.symbols} 个交易对")
+    for name, res in results.items():
+        print(
+            f"   {name}: {res['msgs_per_second']:>10,.0f} msg/s | mean={res['mean_us']:.2f}µs "
+            f"p50={res['p50_us']:.2f}µs p99={res['p99_us']:.2f}µs"
+        )
+    print(f"🔄 后台刷新 {buffer.flush_count} 次, 最后一次刷新 {flush_ms:.1f}ms")
+    speedup = results["旧版labels()"]["mean_us"] / results["缓冲模式"]["mean_us"]
+    print(f"🚀 每条消息指标开销降低: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
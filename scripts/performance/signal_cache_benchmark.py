@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+信号缓存微基准测试
+Signal Cache Micro-benchmark
+
+用途：
+- 对比旧版缓存（SHA-256字符串键 + min(access_times)淘汰）与O(1) LRU
+- 测量1k / 10k条目满容量时的 get（命中）与 set（触发淘汰）延迟
+- 输出命中/未命中/淘汰统计
+"""
+
+import argparse
+import hashlib
+import json
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from src.core.signal_processor_optimized import SignalCache
+
+
+class LegacySignalCache:
+    """旧版实现（仅用于对比）"""
+
+    def __init__(self, max_size: int = 1000):
+        self.cache = {}
+        self.max_size = max_size
+        self.access_times = {}
+
+    def _generate_key(self, data: pd.DataFrame, fast_win: int, slow_win: int) -> str:
+        data_hash = hashlib.sha256(
+            str(data.tail(max(fast_win, slow_win) + 10).values).encode()
+        ).hexdigest()[:16]
+        return f"{data_hash}_{fast_win}_{slow_win}"
+
+    def get(self, data: pd.DataFrame, fast_win: int, slow_win: int):
+        key = self._generate_key(data, fast_win, slow_win)
+        if key in self.cache:
+            self.access_times[key] = time.time()
+            return self.cache[key]
+        return None
+
+    def set(self, data: pd.DataFrame, fast_win: int, slow_win: int, value: Dict):
+        key = self._generate_key(data, fast_win, slow_win)
+        if len(self.cache) >= self.max_size:
+            oldest_key = min(self.access_times.items(), key=lambda x: x[1])[0]
+            del self.cache[oldest_key]
+            del self.access_times[oldest_key]
+        self.cache[key] = value
+        self.access_times[key] = time.time()
+
+
+def _generate_windows(count: int, window: int = 60) -> List[pd.DataFrame]:
+    """生成count个互不相同的滑动窗口OHLC数据"""
+    np.random.seed(42)
+    total = count + window
+    close = 30000 * np.cumprod(1 + np.random.normal(0, 0.001, total))
+    data = pd.DataFrame(
+        {
+            "open": close,
+            "high": close * 1.001,
+            "low": close * 0.999,
+            "close": close,
+            "volume": np.random.uniform(100, 1000, total),
+        },
+        index=pd.date_range("2024-01-01", periods=total, freq="min"),
+    )
+    return [data.iloc[slice(i, i + window)] for i in range(count)]
+
+
+def _percentiles_us(samples: List[float]) -> Dict[str, float]:
+    arr = np.asarray(samples) * 1e6
+    return {
+        "avg_us": float(arr.mean()),
+        "p50_us": float(np.percentile(arr, 50)),
+        "p95_us": float(np.percentile(arr, 95)),
+    }
+
+
+def benchmark_cache(cache: Any, windows: List[pd.DataFrame], capacity: int, ops: int):
+    """
+    预填满缓存后测量命中读取与淘汰写入延迟
+
+    Args:
+        cache: 缓存实例（新旧实现接口一致）
+        windows: 至少 capacity + ops 个数据窗口
+        capacity: 缓存容量
+        ops: 测量次数
+
+    Returns:
+        延迟统计字典
+    """
+    value = {"buy_signal": False, "sell_signal": False}
+    for frame in windows[:capacity]:
+        cache.set(frame, 7, 25, value)
+
+    get_samples = []
+    for frame in windows[slice(capacity - ops, capacity)]:
+        start = time.perf_counter()
+        cache.get(frame, 7, 25)
+        get_samples.append(time.perf_counter() - start)
+
+    set_samples = []
+    for frame in windows[slice(capacity, capacity + ops)]:
+        start = time.perf_counter()
+        cache.set(frame, 7, 25, value)
+        set_samples.append(time.perf_counter() - start)
+
+    return {"get_hit": _percentiles_us(get_samples), "set_evict": _percentiles_us(set_samples)}
+
+
+def run_benchmark(sizes=(1_000, 10_000), ops: int = 500) -> Dict[str, Any]:
+    """运行新旧缓存对比"""
+    windows = _generate_windows(max(sizes) + ops)
+    results: Dict[str, Any] = {}
+
+    for size in sizes:
+        legacy = benchmark_cache(LegacySignalCache(size), windows, size, ops)
+        lru = SignalCache(size)
+        optimized = benchmark_cache(lru, windows, size, ops)
+        optimized["stats"] = lru.stats()
+        results[str(size)] = {"legacy": legacy, "lru": optimized}
+
+        print(f"\n📊 容量 {size:,} 条目（{ops} 次操作）")
+        for name, res in (("旧版", legacy), ("LRU", optimized)):
+            print(
+                f"   {name:<4} get命中 p50={res['get_hit']['p50_us']:.1f}µs "
+                f"p95={res['get_hit']['p95_us']:.1f}µs | "
+                f"set淘汰 p50={res['set_evict']['p50_us']:.1f}µs "
+                f"p95={res['set_evict']['p95_us']:.1f}µs"
+            )
+        stats = optimized["stats"]
+        print(
+            f"   LRU统计: hits={stats['hits']} misses={stats['misses']} "
+            f"evictions={stats['evictions']}"
+        )
+
+    return results
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="信号缓存微基准测试")
+    parser.add_argument("--ops", type=int, default=500, help="每种操作的测量次数")
+    parser.add_argument("--output", help="结果JSON输出路径（可选）")
+    args = parser.parse_args()
+
+    print("🚀 信号缓存微基准测试")
+    results = run_benchmark(ops=args.ops)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✅ 测试结果已保存: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+WebSocket K线解码回放基准测试
+WebSocket Kline Decode Replay Benchmark
+
+用途：
+- 回放录制的原始WS消息文件（每行一条消息）
+- 对比旧版路径（json.loads + pd.to_datetime + 字典）与快速路径（orjson + KlineRecord）
+- 未提供录制文件时生成合成的1秒K线消息，可用 --record 保存供后续回放
+"""
+
+import argparse
+import json
+import random
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from src.ws import kline_decoder
+from src.ws.binance_ws_client import BinanceWSClient
+
+
+def generate_messages(count: int, symbols: int = 200, seed: int = 42) -> List[str]:
+    """生成合成的kline事件消息（多交易对轮转）"""
+    rng = random.Random(seed)
+    names = [f"SYM{i:03d}USDT" for i in range(symbols)]
+    base_ms = 1_700_000_000_000
+    messages = []
+
+    for i in range(count):
+        symbol = names[i % symbols]
+        open_time = base_ms + (i // symbols) * 1000
+        close = 100 + rng.random()
+        event = {
+            "e": "kline",
+            "E": open_time + 999,
+            "s": symbol,
+            "k": {
+                "t": open_time,
+                "T": open_time + 999,
+                "s": symbol,
+                "i": "1s",
+                "o": f"{close - 0.05:.8f}",
+                "c": f"{close:.8f}",
+                "h": f"{close + 0.1:.8f}",
+                "l": f"{close - 0.1:.8f}",
+                "v": f"{rng.random() * 10:.8f}",
+                "n": 12,
+                "x": rng.random() < 0.2,
+                "q": "0.0",
+            },
+        }
+        messages.append(json.dumps(event, separators=(",", ":")))
+
+    return messages
+
+
+def load_messages(path: str) -> List[bytes]:
+    """读取录制文件（每行一条原始消息），只保留kline事件"""
+    with open(path, "rb") as f:
+        return [line.rstrip(b"\n") for line in f if b'"k"' in line]
+
+
+def _legacy_decode(message):
+    data = json.loads(message)
+    return BinanceWSClient._build_kline_dict(data, time.perf_counter())
+
+
+def _fast_decode(message):
+    data = kline_decoder.loads(message)
+    return kline_decoder.decode_kline(data, time.perf_counter())
+
+
+def replay(messages: List, decode: Callable, rounds: int = 3) -> Dict[str, float]:
+    """
+    回放消息并统计单条解码耗时
+
+    Args:
+        messages: 原始消息列表
+        decode: 解码函数
+        rounds: 回放轮数（取最快一轮的吞吐）
+
+    Returns:
+        吞吐与延迟统计
+    """
+    best_total = float("inf")
+    samples = np.empty(len(messages))
+
+    for _ in range(rounds):
+        start_total = time.perf_counter()
+        for i, message in enumerate(messages):
+            start = time.perf_counter()
+            decode(message)
+            samples[i] = time.perf_counter() - start
+        best_total = min(best_total, time.perf_counter() - start_total)
+
+    us = samples * 1e6
+    return {
+        "messages": len(messages),
+        "msgs_per_second": len(messages) / best_total,
+        "p50_us": float(np.percentile(us, 50)),
+        "p99_us": float(np.percentile(us, 99)),
+    }
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="WebSocket K线解码回放基准测试")
+    parser.add_argument("--input", help="录制的消息文件（每行一条原始JSON）")
+    parser.add_argument("--count", type=int, default=50_000, help="合成消息数量")
+    parser.add_argument("--record", help="将合成消息写入该文件")
+    args = parser.parse_args()
+
+    if args.input:
+        messages = load_messages(args.input)
+        print(f"📂 回放录制文件: {args.input} ({len(messages):,} 条kline消息)")
+    else:
+        messages = generate_messages(args.count)
+        print(f"🧪 使用合成消息: {len(messages):,} 条")
+        if args.record:
+            with open(args.record, "w") as f:
+                f.write("\n".join(messages) + "\n")
+            print(f"💾 已保存: {args.record}")
+
+    print(f"⚙️  JSON后端: {kline_decoder.JSON_BACKEND}")
+    legacy = replay(messages, _legacy_decode)
+    fast = replay(messages, _fast_decode)
+
+    for name, res in (("旧版路径", legacy), ("快速路径", fast)):
+        print(
+            f"   {name}: {res['msgs_per_second']:>10,.0f} msg/s | "
+            f"p50={res['p50_us']:.2f}µs p99={res['p99_us']:.2f}µs"
+        )
+    print(f"🚀 吞吐提升: {fast['msgs_per_second'] / legacy['msgs_per_second']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
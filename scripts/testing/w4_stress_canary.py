@@ -17,6 +17,7 @@ import random
 import signal
 import sys
 import time
+from collections import deque
 from typing import Any, Dict, List
 
 # 添加项目根目录到路径
@@ -27,6 +28,7 @@ import psutil
 
 from scripts.testing.w3_leak_sentinel import LeakSentinel
 from src.core.gc_optimizer import GCOptimizer
+from src.monitoring.latency_histogram import LatencyHistogram
 from src.monitoring.metrics_collector import get_metrics_collector
 from src.strategies.cache_optimized_strategy import CacheOptimizedStrategy
 
@@ -57,6 +59,9 @@ class W4StressCanary:
         self.alerts = []
         self.performance_samples = []
         self.hourly_reports = []
+        # 交易周期延迟（秒）；按时间保存快照，相减即得最近1小时的分布
+        self.cycle_latency = LatencyHistogram()
+        self.latency_checkpoints = deque()
 
         # 策略和数据
         self.strategies = {}
@@ -168,6 +173,7 @@ class W4StressCanary:
                 self.performance_samples = self.performance_samples[-8000:]
 
             # 更新延迟指标
+            self.cycle_latency.record(cycle_duration)
             self.metrics.observe_task_latency("trading_cycle", cycle_duration)
 
             # 控制频率
@@ -248,6 +254,16 @@ class W4StressCanary:
 
             await asyncio.sleep(check_interval)
 
+    def _recent_cycle_latency(self, window_seconds: float):
+        """最近window_seconds秒内的周期延迟分布（当前快照减去窗口起点快照）"""
+        now = time.time()
+        current = self.cycle_latency.snapshot()
+        while self.latency_checkpoints and now - self.latency_checkpoints[0][0] > window_seconds:
+            self.latency_checkpoints.popleft()
+        recent = current - self.latency_checkpoints[0][1] if self.latency_checkpoints else current
+        self.latency_checkpoints.append((now, current))
+        return recent
+
     async def _collect_system_metrics(self) -> Dict[str, Any]:
         """收集系统指标"""
         try:
@@ -263,14 +279,9 @@ class W4StressCanary:
                 s for s in self.performance_samples if time.time() - s["timestamp"] <= 3600
             ]  # 最近1小时
 
-            if recent_samples:
-                latencies = [s["cycle_duration_ms"] for s in recent_samples]
-                latencies.sort()
-                p95_latency = latencies[int(len(latencies) * 0.95)] if latencies else 0
-                avg_latency = sum(latencies) / len(latencies) if latencies else 0
-            else:
-                p95_latency = 0
-                avg_latency = 0
+            recent_latency = self._recent_cycle_latency(3600)
+            p95_latency = recent_latency.percentile(95) * 1000
+            avg_latency = recent_latency.mean * 1000
 
             return {
                 "timestamp": time.time(),
@@ -495,15 +506,15 @@ class W4StressCanary:
 
         # 性能统计
         if self.performance_samples:
-            latencies = [s["cycle_duration_ms"] for s in self.performance_samples]
-            latencies.sort()
+            latency = self.cycle_latency.snapshot()
+            percentiles = latency.percentiles([95, 99])
 
             performance_stats = {
                 "total_operations": len(self.performance_samples) * len(self.pairs),
-                "avg_latency_ms": sum(latencies) / len(latencies),
-                "p95_latency_ms": latencies[int(len(latencies) * 0.95)],
-                "p99_latency_ms": latencies[int(len(latencies) * 0.99)],
-                "max_latency_ms": max(latencies),
+                "avg_latency_ms": latency.mean * 1000,
+                "p95_latency_ms": percentiles[95] * 1000,
+                "p99_latency_ms": percentiles[99] * 1000,
+                "max_latency_ms": latency.max() * 1000,
                 "operations_per_second": len(self.performance_samples)
                 * len(self.pairs)
                 / (runtime_hours * 3600),
@@ -19,6 +19,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from src.brokers import BinanceClient
 from src.config import get_config
+from src.data.storage import ParquetMarketStore
 
 logger = logging.getLogger(__name__)
 
@@ -196,17 +197,31 @@ class DataFetcher:
 
         return results
 
-    def save_data(self, data: pd.DataFrame, filepath: str, format: str = "csv"):
+    def save_data(
+        self,
+        data: pd.DataFrame,
+        filepath: str,
+        format: str = "csv",
+        symbol: Optional[str] = None,
+        interval: Optional[str] = None,
+    ):
         """
         Save data to file
 
         Args:
             data: DataFrame to save
-            filepath: Output file path
-            format: File format ('csv', 'parquet', 'json')
+            filepath: Output file path (store root directory for format 'store')
+            format: File format ('csv', 'parquet', 'json', 'store')
+            symbol: Trading symbol, required for format 'store'
+            interval: Time interval, required for format 'store'
         """
         try:
-            if format.lower() == "csv":
+            if format.lower() == "store":
+                if not symbol or not interval:
+                    raise ValueError("symbol and interval are required for format 'store'")
+                # Appends new partition files, existing data is not rewritten
+                ParquetMarketStore(filepath).append(symbol, interval, data)
+            elif format.lower() == "csv":
                 data.to_csv(filepath)
             elif format.lower() == "parquet":
                 data.to_parquet(filepath)
@@ -232,7 +247,9 @@ def main():
     parser.add_argument("--days", "-d", type=int, default=365, help="Number of days")
     parser.add_argument("--source", default="binance", help="Data source")
     parser.add_argument("--output", "-o", help="Output file path")
-    parser.add_argument("--format", "-f", default="csv", help="Output format")
+    parser.add_argument(
+        "--format", "-f", default="csv", help="Output format (csv, parquet, json, store)"
+    )
     parser.add_argument("--multiple", "-m", nargs="+", help="Multiple symbols")
 
     args = parser.parse_args()
@@ -255,14 +272,14 @@ def main():
                     output_path = (
                         args.output or f"{symbol}_{args.interval}_{args.days}d.{args.format}"
                     )
-                    fetcher.save_data(data, output_path, args.format)
+                    fetcher.save_data(data, output_path, args.format, symbol, args.interval)
                     print(f"Saved {symbol} data to {output_path}")
         else:
             # Fetch single symbol
             data = fetcher.fetch_historical_data(args.symbol, args.interval, args.days, args.source)
 
             if args.output:
-                fetcher.save_data(data, args.output, args.format)
+                fetcher.save_data(data, args.output, args.format, args.symbol, args.interval)
                 print(f"Data saved to {args.output}")
             else:
                 print(data.head())
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+移动平均策略并行参数扫描（optimize_ma.py 的进程池版本）
+"""
+
+import argparse
+
+from src.data import load_csv
+from src.strategies.param_sweep import ParameterSweep, load_sweep_results
+
+# 搜索空间
+SPACE = {
+    "fast_win": range(3, 11),
+    "slow_win": range(10, 41, 5),
+    "atr_win": [10, 14, 20],
+    "risk_frac": [0.01, 0.02],
+    "breakeven_r": [1.0, 1.5],
+    "trail_r": [2.0, 3.0],
+}
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="并行参数扫描")
+    parser.add_argument("--csv", default="btc_eth.csv", help="价格CSV文件")
+    parser.add_argument("--columns", nargs="+", default=["btc"], help="价格列（多列时按组合回测）")
+    parser.add_argument("--output", default="sweep_results", help="结果目录（Parquet分片）")
+    parser.add_argument("--workers", type=int, default=None, help="进程数（默认CPU核数）")
+    parser.add_argument("--random", type=int, default=0, help="随机搜索组合数（0为网格搜索）")
+    parser.add_argument("--seed", type=int, default=None, help="随机种子")
+    args = parser.parse_args()
+
+    df = load_csv(args.csv)
+    if len(args.columns) == 1:
+        prices = df[args.columns[0]].dropna()
+    else:
+        prices = {col: df[col].dropna() for col in args.columns}
+
+    sweep = ParameterSweep(prices, args.output, max_workers=args.workers)
+    if args.random:
+        summary = sweep.random(SPACE, args.random, seed=args.seed)
+    else:
+        summary = sweep.grid(SPACE)
+
+    print(
+        f"完成 {summary['completed']}/{summary['combinations']} 组合, "
+        f"{summary['combinations_per_second']:.1f} 组合/秒"
+    )
+    results = load_sweep_results(args.output).sort_values("sharpe", ascending=False)
+    print(results.head(10)[["fast_win", "slow_win", "atr_win", "final_equity", "sharpe"]])
+    print("\n最佳组合:", summary["best"])
+
+
+if __name__ == "__main__":
+    main()
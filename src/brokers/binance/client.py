@@ -137,7 +137,7 @@ class BinanceClient:
         return response.json()
 
     @rate_limit_retry(max_retries=3, base_delay=1)
-    def get_klines(self, symbol, interval="1d", limit=100):
+    def get_klines(self, symbol, interval="1d", limit=100, start_time=None):
         """
         获取K线数据
 
@@ -145,12 +145,15 @@ class BinanceClient:
             symbol: 交易对，如'BTCUSDT'
             interval: K线周期，如'1m', '5m', '1h', '1d'
             limit: 获取的K线数量
+            start_time: 起始开盘时间（毫秒，可选），用于只拉取增量K线
 
         返回:
             pandas.DataFrame: 包含K线数据的DataFrame
         """
         endpoint = "/v3/klines"
         params = {"symbol": symbol, "interval": interval, "limit": limit}
+        if start_time is not None:
+            params["startTime"] = int(start_time)
 
         response = requests.get(f"{self.base_url}{endpoint}", params=params, timeout=10)
         response.raise_for_status()  # 检查HTTP错误
@@ -13,6 +13,8 @@ import pandas as pd
 import requests
 from requests.exceptions import ConnectionError, Timeout
 
+from src.data.storage import ParquetMarketStore
+
 # 设置日志
 logging.basicConfig(
     level=logging.INFO,
@@ -372,7 +374,13 @@ class ExchangeClient:
 
         return self._request("GET", endpoint, params=params)
 
-    def sync_market_data(self, symbol: str, interval: str = "1d", days: int = 30) -> pd.DataFrame:
+    def sync_market_data(
+        self,
+        symbol: str,
+        interval: str = "1d",
+        days: int = 30,
+        store: Optional[ParquetMarketStore] = None,
+    ) -> pd.DataFrame:
         """
         同步并返回市场数据
 
@@ -380,6 +388,8 @@ class ExchangeClient:
             symbol: 交易对
             interval: 时间间隔
             days: 获取过去多少天的数据
+            store: 列式行情存储（可选）。提供时只拉取存储未覆盖的K线（窗口起点到
+                存储首条之前、存储末条起），追加写入存储，并从存储返回整个时间窗口的数据
 
         返回:
             包含OHLCV数据的DataFrame
@@ -389,17 +399,46 @@ class ExchangeClient:
         end_time = int(time.time() * 1000)
         start_time = end_time - (days * 24 * 60 * 60 * 1000)
 
-        klines = self.get_historical_klines(
-            symbol=symbol,
-            interval=interval,
-            start_time=start_time,
-            end_time=end_time,
-        )
+        # 需要拉取的区间：存储覆盖范围之前（回补）与之后（增量）
+        fetch_ranges = [(start_time, end_time)]
+        if store is not None:
+            stored = store.time_range(symbol, interval)
+            if stored is not None:
+                first_stored = int(stored[0].value // 1_000_000)
+                last_stored = int(stored[1].value // 1_000_000)
+                # 从存储末条起拉取：末条同步时可能尚未收盘，重复时间戳以新写入为准
+                fetch_ranges = [(max(start_time, last_stored), end_time)]
+                if first_stored > start_time:
+                    fetch_ranges.insert(0, (start_time, first_stored - 1))
+
+        klines = []
+        for fetch_start, fetch_end in fetch_ranges:
+            klines.extend(
+                self.get_historical_klines(
+                    symbol=symbol,
+                    interval=interval,
+                    start_time=fetch_start,
+                    end_time=fetch_end,
+                )
+            )
 
-        if not klines:
+        df = self._klines_to_frame(klines) if klines else pd.DataFrame()
+        if store is not None:
+            if not df.empty:
+                store.append(symbol, interval, df)
+            logger.info(f"已追加{len(df)}条{symbol}市场数据到行情存储")
+            return store.read(symbol, interval, start=start_time, end=end_time)
+
+        if df.empty:
             logger.warning(f"未获取到{symbol}的市场数据")
-            return pd.DataFrame()
+            return df
+
+        logger.info(f"成功同步{len(df)}条{symbol}市场数据")
+        return df
 
+    @staticmethod
+    def _klines_to_frame(klines: List[List]) -> pd.DataFrame:
+        """K线列表转为以timestamp为索引的OHLCV DataFrame"""
         df = pd.DataFrame(
             klines,
             columns=[
@@ -419,6 +458,4 @@ class ExchangeClient:
         # 转换价格和交易量为数值类型
         numeric_columns = ["open", "high", "low", "close", "volume"]
         df[numeric_columns] = df[numeric_columns].apply(pd.to_numeric)
-
-        logger.info(f"成功同步{len(df)}条{symbol}市场数据")
         return df
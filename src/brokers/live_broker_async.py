@@ -7,24 +7,42 @@ Live Broker Async for M4 Phase
 - 异步订单执行（非阻塞）
 - 订单往返延迟监控
 - 并发订单处理
+- 用户数据流事件驱动的订单状态跟踪（无事件时回退轮询）
+- 批量下单、按交易对撤销全部挂单、撤单并下新单（cancelReplace）
+- 请求调度：权重/下单限流、GET合并、签名请求并发上限（RequestScheduler）
 """
 
 import asyncio
 import hashlib
 import hmac
 import time
-from typing import Any, Dict, List, Optional, Union
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Union
 from urllib.parse import urlencode
 
 import aiohttp
+import numpy as np
 
+from src.brokers.order_state import OrderStateManager
+from src.brokers.request_scheduler import RequestScheduler, request_weight
 from src.monitoring.metrics_collector import get_metrics_collector
+from src.ws.user_data_stream import TESTNET_USER_STREAM_URL, USER_STREAM_URL, UserDataStream
 
 
 class LiveBrokerAsync:
     """异步实时交易代理"""
 
-    def __init__(self, api_key: str, api_secret: str, testnet: bool = True) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        api_secret: str,
+        testnet: bool = True,
+        base_url: Optional[str] = None,
+        max_signed_inflight: int = 10,
+        user_stream: bool = True,
+        ws_url: Optional[str] = None,
+        order_event_timeout: float = 5.0,
+    ) -> None:
         """
         初始化异步交易代理
 
@@ -32,6 +50,11 @@ class LiveBrokerAsync:
             api_key: API密钥 (API key)
             api_secret: API密钥 (API secret)
             testnet: 是否使用测试网 (Whether to use testnet)
+            base_url: 自定义API地址（可选，覆盖testnet设置） (Custom API base URL)
+            max_signed_inflight: 同时在途的签名请求上限 (Max in-flight signed requests)
+            user_stream: 是否用用户数据流跟踪订单状态 (Track orders via user data stream)
+            ws_url: 自定义用户数据流地址（可选） (Custom user data stream URL)
+            order_event_timeout: 订单无事件多少秒后回退轮询 (Seconds without events before polling)
         """
         self.api_key: str = api_key  # API密钥
         self.api_secret: str = api_secret  # API密钥
@@ -42,20 +65,40 @@ class LiveBrokerAsync:
             self.base_url: str = "https://testnet.binance.vision"
         else:
             self.base_url: str = "https://api.binance.com"
+        if base_url:
+            self.base_url = base_url.rstrip("/")
 
         # 会话管理
         self.session: Optional[aiohttp.ClientSession] = None  # HTTP会话对象
 
+        # 请求调度（限流、GET合并、签名请求并发上限）
+        self.scheduler = RequestScheduler(max_signed_inflight=max_signed_inflight)
+
         # 监控指标
         self.metrics = get_metrics_collector()
 
-        # 订单状态跟踪
-        self.pending_orders: Dict[str, Dict[str, Any]] = {}  # 待处理订单字典
-        self.order_history: List[Dict[str, Any]] = []  # 订单历史列表
+        # 订单状态跟踪（事件驱动，轮询仅作后备）
+        self.order_manager = OrderStateManager(
+            self._query_order_status, self.metrics, event_timeout=order_event_timeout
+        )
+        self.pending_orders: Dict[str, Dict[str, Any]] = self.order_manager.pending  # 待处理订单
+        self.order_history: List[Dict[str, Any]] = self.order_manager.history  # 订单历史列表
+
+        # 用户数据流（init_session时启动）
+        self.user_stream: Optional[UserDataStream] = None
+        if user_stream:
+            self.user_stream = UserDataStream(
+                self._request,
+                self.order_manager.on_event,
+                base_url=ws_url or (TESTNET_USER_STREAM_URL if testnet else USER_STREAM_URL),
+                metrics=self.metrics,
+            )
 
         # 性能统计
         self.order_count: int = 0  # 订单总数
         self.error_count: int = 0  # 错误计数
+        # 最近批量操作耗时（秒），用于p50/p95
+        self.batch_latencies: Dict[str, Deque[float]] = {}
 
     async def __aenter__(self) -> "LiveBrokerAsync":
         """异步上下文管理器入口"""
@@ -85,8 +128,14 @@ class LiveBrokerAsync:
             connector=connector, timeout=timeout, headers={"X-MBX-APIKEY": self.api_key}
         )
 
+        if self.user_stream is not None:
+            self.user_stream.start()
+
     async def close_session(self) -> None:
         """关闭HTTP会话"""
+        if self.user_stream is not None:
+            await self.user_stream.close()
+        await self.order_manager.close()
         if self.session:
             await self.session.close()
 
@@ -115,6 +164,8 @@ class LiveBrokerAsync:
         """
         异步HTTP请求
 
+        相同参数的并发GET请求合并为一次网络请求。
+
         Args:
             method: HTTP方法 (HTTP method)
             endpoint: API端点 (API endpoint)
@@ -127,26 +178,53 @@ class LiveBrokerAsync:
         Raises:
             Exception: 请求失败时抛出异常
         """
-        if params is None:
-            params = {}
+        params = dict(params or {})
 
-        # 添加时间戳（签名请求）
-        if signed:
-            params["timestamp"] = int(time.time() * 1000)
-            params["signature"] = self._generate_signature(params)
+        if method.upper() == "GET":
+            # 以签名前的参数作为合并键
+            key = (endpoint, signed, tuple(sorted(params.items())))
+            return await self.scheduler.coalesce(
+                key, lambda: self._send(method, endpoint, params, signed)
+            )
+        return await self._send(method, endpoint, params, signed)
 
+    async def _send(
+        self, method: str, endpoint: str, params: Dict[str, Any], signed: bool
+    ) -> Dict[str, Any]:
+        """
+        经调度器限流后发送请求
+
+        Args:
+            method: HTTP方法 (HTTP method)
+            endpoint: API端点 (API endpoint)
+            params: 请求参数 (Request parameters)
+            signed: 是否需要签名 (Whether signature is required)
+
+        Returns:
+            响应数据字典 (Response data dictionary)
+        """
+        weight, orders = request_weight(method, endpoint, params)
         url: str = f"{self.base_url}{endpoint}"
 
         try:
-            if method.upper() == "GET":
-                async with self.session.get(url, params=params) as response:
-                    return await self._handle_response(response)
-            elif method.upper() == "POST":
-                async with self.session.post(url, data=params) as response:
-                    return await self._handle_response(response)
-            elif method.upper() == "DELETE":
-                async with self.session.delete(url, params=params) as response:
-                    return await self._handle_response(response)
+            async with self.scheduler.slot(weight, orders, signed=signed):
+                # 取得许可后再签名，排队时间不计入recvWindow
+                if signed:
+                    params["timestamp"] = int(time.time() * 1000)
+                    params["signature"] = self._generate_signature(params)
+
+                if method.upper() == "GET":
+                    async with self.session.get(url, params=params) as response:
+                        return await self._handle_response(response)
+                elif method.upper() == "POST":
+                    async with self.session.post(url, data=params) as response:
+                        return await self._handle_response(response)
+                elif method.upper() == "DELETE":
+                    async with self.session.delete(url, params=params) as response:
+                        return await self._handle_response(response)
+                elif method.upper() == "PUT":
+                    async with self.session.put(url, params=params) as response:
+                        return await self._handle_response(response)
 
         except asyncio.TimeoutError:
             self.error_count += 1
@@ -168,6 +246,9 @@ class LiveBrokerAsync:
         Raises:
             Exception: 响应状态码非200时抛出异常
         """
+        # 用限额响应头校正调度器额度（429/418 时暂停后续请求）
+        self.scheduler.update_from_headers(response.headers, response.status)
+
         if response.status == 200:
             return await response.json()
         else:
@@ -248,14 +329,12 @@ class LiveBrokerAsync:
                 "price": price,
                 "status": response.get("status", "NEW"),
                 "submit_time": start_time,
+                "ack_latency": time.perf_counter() - start_time,
                 "response": response,
             }
 
-            # 添加到待处理订单
-            self.pending_orders[order_id] = order_info
-
-            # 启动订单状态监控任务
-            asyncio.create_task(self._monitor_order_status(order_id))
+            # 登记到订单状态管理器（由用户数据流事件更新，无事件时回退轮询）
+            self.order_manager.track(order_info)
 
             self.order_count += 1
 
@@ -277,70 +356,18 @@ class LiveBrokerAsync:
             # 更新并发任务计数
             self.metrics.update_concurrent_tasks("order_execution", len(self.pending_orders))
 
-    async def _monitor_order_status(self, order_id: str) -> None:
+    async def _query_order_status(self, order_info: Dict[str, Any]) -> Dict[str, Any]:
         """
-        监控订单状态直到完成
+        查询订单状态（订单状态管理器的后备轮询）
 
         Args:
-            order_id: 订单ID (Order ID)
-        """
-        max_attempts: int = 30  # 最多监控30次
-        attempt: int = 0
-
-        while attempt < max_attempts:
-            try:
-                if order_id not in self.pending_orders:
-                    break
-
-                order_info: Dict[str, Any] = self.pending_orders[order_id]
+            order_info: 订单信息字典 (Order information dictionary)
 
-                # 查询订单状态
-                params: Dict[str, str] = {"symbol": order_info["symbol"], "orderId": order_id}
-
-                response: Dict[str, Any] = await self._request(
-                    "GET", "/api/v3/order", params, signed=True
-                )
-                status: str = response.get("status", "UNKNOWN")
-
-                # 更新订单状态
-                order_info["status"] = status
-                order_info["last_update"] = time.perf_counter()
-
-                # 检查是否完成
-                if status in ["FILLED", "CANCELED", "REJECTED", "EXPIRED"]:
-                    # 计算订单往返延迟
-                    roundtrip_latency: float = time.perf_counter() - order_info["submit_time"]
-                    self.metrics.observe_order_roundtrip_latency(roundtrip_latency)
-
-                    # 移动到历史记录
-                    order_info["complete_time"] = time.perf_counter()
-                    order_info["roundtrip_latency"] = roundtrip_latency
-                    self.order_history.append(order_info)
-
-                    # 从待处理中移除
-                    del self.pending_orders[order_id]
-
-                    print(
-                        f"🏁 订单完成: {order_id} 状态:{status} 延迟:{roundtrip_latency*1000:.1f}ms"
-                    )
-                    break
-
-                # 等待后再次检查
-                await asyncio.sleep(1)
-                attempt += 1
-
-            except Exception as e:
-                print(f"⚠️ 订单状态监控错误: {e}")
-                attempt += 1
-                await asyncio.sleep(2)
-
-        # 超时处理
-        if attempt >= max_attempts and order_id in self.pending_orders:
-            print(f"⏰ 订单监控超时: {order_id}")
-            order_info = self.pending_orders[order_id]
-            order_info["status"] = "TIMEOUT"
-            self.order_history.append(order_info)
-            del self.pending_orders[order_id]
+        Returns:
+            订单查询响应 (Order query response)
+        """
+        params: Dict[str, str] = {"symbol": order_info["symbol"], "orderId": order_info["order_id"]}
+        return await self._request("GET", "/api/v3/order", params, signed=True)
 
     async def cancel_order_async(self, symbol: str, order_id: str) -> Dict[str, Any]:
         """
@@ -371,6 +398,194 @@ class LiveBrokerAsync:
             print(f"❌ 异步撤单失败: {e}")
             raise
 
+    async def place_orders_batch(self, orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        批量下单（单笔失败不影响其他订单）
+
+        现货REST没有批量下单端点：各订单经请求调度器的签名信号量与限流流水线发送。
+
+        Args:
+            orders: 订单列表，每项含 symbol / side / quantity，
+                可选 order_type（默认MARKET）/ price / time_in_force
+                (Order list)
+
+        Returns:
+            与输入顺序一致的结果列表 (Per-order results in input order)
+            - success: 是否成功
+            - order: 成功时为订单信息
+            - error: 失败时为错误信息
+        """
+        start_time: float = time.perf_counter()
+        results = await asyncio.gather(
+            *(
+                self.place_order_async(
+                    symbol=order["symbol"],
+                    side=order["side"],
+                    order_type=order.get("order_type", "MARKET"),
+                    quantity=order["quantity"],
+                    price=order.get("price"),
+                    time_in_force=order.get("time_in_force", "GTC"),
+                )
+                for order in orders
+            ),
+            return_exceptions=True,
+        )
+        self._record_batch_latency("place", time.perf_counter() - start_time)
+        return [self._batch_item(order, result) for order, result in zip(orders, results)]
+
+    async def cancel_all_orders_async(self, symbol: str) -> List[Dict[str, Any]]:
+        """
+        撤销交易对的全部挂单（一次请求）
+
+        Args:
+            symbol: 交易对 (Trading pair)
+
+        Returns:
+            被撤销的订单列表 (Canceled orders)
+
+        Raises:
+            Exception: 撤单失败时抛出异常
+        """
+        try:
+            response: List[Dict[str, Any]] = await self._request(
+                "DELETE", "/api/v3/openOrders", {"symbol": symbol}, signed=True
+            )
+            print(f"✅ 已撤销 {symbol} 全部挂单: {len(response)} 笔")
+            return response
+
+        except Exception as e:
+            self.error_count += 1
+            print(f"❌ 撤销全部挂单失败: {symbol} {e}")
+            raise
+
+    async def cancel_all_orders_batch(self, symbols: List[str]) -> List[Dict[str, Any]]:
+        """
+        撤销多个交易对的全部挂单（每个交易对一次请求，单个失败不影响其他）
+
+        Args:
+            symbols: 交易对列表 (Trading pairs)
+
+        Returns:
+            与输入顺序一致的结果列表，success时 order 为被撤销的订单列表
+        """
+        start_time: float = time.perf_counter()
+        results = await asyncio.gather(
+            *(self.cancel_all_orders_async(symbol) for symbol in symbols), return_exceptions=True
+        )
+        self._record_batch_latency("cancel_all", time.perf_counter() - start_time)
+        return [
+            self._batch_item({"symbol": symbol}, result) for symbol, result in zip(symbols, results)
+        ]
+
+    async def cancel_replace_order_async(
+        self,
+        symbol: str,
+        cancel_order_id: Any,
+        side: str,
+        order_type: str,
+        quantity: float,
+        price: Optional[float] = None,
+        time_in_force: str = "GTC",
+        mode: str = "STOP_ON_FAILURE",
+    ) -> Dict[str, Any]:
+        """
+        撤单并下新单（一次请求，POST /api/v3/order/cancelReplace）
+
+        Args:
+            symbol: 交易对 (Trading pair)
+            cancel_order_id: 要撤销的订单ID (Order ID to cancel)
+            side: 新订单方向 (BUY/SELL)
+            order_type: 新订单类型 (MARKET/LIMIT)
+            quantity: 新订单数量 (Quantity)
+            price: 新订单价格（限价单） (Price for limit orders)
+            time_in_force: 有效期 (Time in force)
+            mode: STOP_ON_FAILURE（撤单失败则不下新单）或 ALLOW_FAILURE
+
+        Returns:
+            交易所响应，新订单成功时含 order（已登记跟踪的订单信息）
+
+        Raises:
+            Exception: 请求失败时抛出异常
+        """
+        start_time: float = time.perf_counter()
+        params: Dict[str, Any] = {
+            "symbol": symbol,
+            "side": side,
+            "type": order_type,
+            "quantity": quantity,
+            "cancelReplaceMode": mode,
+            "cancelOrderId": cancel_order_id,
+        }
+        if order_type == "LIMIT" and price:
+            params["price"] = price
+            params["timeInForce"] = time_in_force
+
+        try:
+            response: Dict[str, Any] = await self._request(
+                "POST", "/api/v3/order/cancelReplace", params, signed=True
+            )
+        except Exception as e:
+            self.error_count += 1
+            self.metrics.record_exception("live_broker_async", e)
+            print(f"❌ 撤单并下新单失败: {cancel_order_id} {e}")
+            raise
+
+        new_order = response.get("newOrderResponse") or {}
+        if response.get("newOrderResult") == "SUCCESS" and "orderId" in new_order:
+            order_info: Dict[str, Any] = {
+                "order_id": new_order["orderId"],
+                "client_order_id": new_order.get("clientOrderId", f"client_{new_order['orderId']}"),
+                "symbol": symbol,
+                "side": side,
+                "type": order_type,
+                "quantity": quantity,
+                "price": price,
+                "status": new_order.get("status", "NEW"),
+                "submit_time": start_time,
+                "ack_latency": time.perf_counter() - start_time,
+                "response": new_order,
+            }
+            self.order_manager.track(order_info)
+            self.order_count += 1
+            response["order"] = order_info
+
+        print(f"✅ 撤单并下新单: {cancel_order_id} -> {new_order.get('orderId')}")
+        return response
+
+    @staticmethod
+    def _batch_item(request: Dict[str, Any], result: Any) -> Dict[str, Any]:
+        """批量操作的单项结果"""
+        if isinstance(result, Exception):
+            return {
+                "success": False,
+                "error": str(result),
+                "symbol": request.get("symbol"),
+                "side": request.get("side"),
+            }
+        return {"success": True, "order": result, "symbol": request.get("symbol")}
+
+    def _record_batch_latency(self, operation: str, latency: float, window: int = 1000) -> None:
+        """记录批量操作耗时，并推送最近 window 个批次的p50/p95"""
+        samples = self.batch_latencies.setdefault(operation, deque(maxlen=window))
+        samples.append(latency)
+        p50, p95 = np.percentile(samples, [50, 95])
+        self.metrics.observe_batch_order_latency(
+            operation, latency, quantiles={"p50": float(p50), "p95": float(p95)}
+        )
+
+    def get_batch_latency_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        批量操作延迟统计
+
+        Returns:
+            操作类型 -> {count, p50_ms, p95_ms}
+        """
+        stats = {}
+        for operation, samples in self.batch_latencies.items():
+            p50, p95 = np.percentile(samples, [50, 95]) * 1000
+            stats[operation] = {"count": len(samples), "p50_ms": p50, "p95_ms": p95}
+        return stats
+
     async def get_account_info_async(self) -> Dict[str, Any]:
         """
         异步获取账户信息
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+订单状态管理
+Order State Manager
+
+用途：
+- 以用户数据流的 executionReport 事件更新订单状态（无需逐单轮询）
+- 长时间没有事件的订单才回退为 GET /api/v3/order 轮询（单个共享轮询任务）
+- 订单往返延迟 = 本地测得的下单回报延迟 + 交易所时间戳计算的成交耗时
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+TERMINAL_STATUSES = frozenset({"FILLED", "CANCELED", "REJECTED", "EXPIRED", "EXPIRED_IN_MATCH"})
+
+# 查询订单状态的协程函数：订单信息 -> GET /api/v3/order 响应
+PollFunc = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+
+class OrderStateManager:
+    """由账户事件驱动的订单状态跟踪（轮询仅作后备）"""
+
+    def __init__(
+        self,
+        poll: PollFunc,
+        metrics: Any,
+        event_timeout: float = 5.0,
+        poll_interval: float = 1.0,
+        max_polls: int = 30,
+        max_early_events: int = 1000,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        """
+        初始化订单状态管理器
+
+        Args:
+            poll: 查询单个订单状态的协程函数
+            metrics: 指标收集器（observe_order_roundtrip_latency）
+            event_timeout: 订单多久没有事件后开始轮询（秒）
+            poll_interval: 后备轮询间隔（秒）
+            max_polls: 单个订单最多轮询次数，超过后标记为TIMEOUT
+            max_early_events: 先于下单回报到达的事件最多缓存数
+            clock: 单调时钟
+        """
+        self._poll = poll
+        self.metrics = metrics
+        self.event_timeout = event_timeout
+        self.poll_interval = poll_interval
+        self.max_polls = max_polls
+        self.max_early_events = max_early_events
+        self._clock = clock
+        self.logger = logging.getLogger(__name__)
+
+        self.pending: Dict[Any, Dict[str, Any]] = {}
+        self.history: List[Dict[str, Any]] = []
+        self._client_ids: Dict[str, Any] = {}
+        # 事件可能先于REST下单回报到达，暂存到订单登记时再应用
+        self._early_events: "OrderedDict[Any, Dict[str, Any]]" = OrderedDict()
+        self._sweeper: Optional[asyncio.Task] = None
+
+        self.event_count = 0
+        self.poll_count = 0
+
+    # ------------------------------------------------------------------
+    # 登记与事件
+    # ------------------------------------------------------------------
+
+    def track(self, order_info: Dict[str, Any]) -> None:
+        """
+        登记已提交的订单
+
+        Args:
+            order_info: 订单信息，需含 order_id / client_order_id / submit_time / response，
+                可含 ack_latency（下单请求往返秒数）
+        """
+        order_id = order_info["order_id"]
+        now = self._clock()
+        order_info.setdefault("ack_latency", now - order_info["submit_time"])
+        order_info["exchange_submit_ms"] = order_info["response"].get("transactTime")
+        order_info["next_poll"] = now + self.event_timeout
+        order_info["polls"] = 0
+
+        self.pending[order_id] = order_info
+        self._client_ids[order_info["client_order_id"]] = order_id
+
+        early = self._early_events.pop(order_id, None)
+        if early is not None:
+            self._apply(early)
+        elif order_info["status"] in TERMINAL_STATUSES:
+            self._complete(order_info, order_info["status"], order_info["exchange_submit_ms"])
+
+        if order_id in self.pending:
+            self._ensure_sweeper()
+
+    def on_event(self, event: Dict[str, Any], receive_ms: Optional[int] = None) -> None:
+        """用户数据流回调：只处理 executionReport"""
+        if event.get("e") == "executionReport":
+            self.on_execution_report(event)
+
+    def on_execution_report(self, event: Dict[str, Any]) -> None:
+        """
+        应用一条 executionReport 事件
+
+        Args:
+            event: 事件（i 订单ID、c 客户端订单ID、X 订单状态、T 成交时间、z 累计成交量）
+        """
+        self.event_count += 1
+        self._apply(event)
+
+    def _apply(self, event: Dict[str, Any]) -> None:
+        order_id = event.get("i")
+        if order_id not in self.pending:
+            order_id = self._client_ids.get(event.get("c"), order_id)
+        order_info = self.pending.get(order_id)
+        if order_info is None:
+            self._remember_early(event)
+            return
+
+        status = event.get("X", order_info["status"])
+        order_info["status"] = status
+        order_info["filled_quantity"] = float(event.get("z", 0) or 0)
+        order_info["last_event_ms"] = event.get("E")
+        order_info["last_update"] = self._clock()
+        order_info["next_poll"] = order_info["last_update"] + self.event_timeout
+
+        if status in TERMINAL_STATUSES:
+            self._complete(order_info, status, event.get("T") or event.get("E"))
+
+    def _remember_early(self, event: Dict[str, Any]) -> None:
+        order_id = event.get("i")
+        if order_id is None:
+            return
+        self._early_events[order_id] = event
+        while len(self._early_events) > self.max_early_events:
+            self._early_events.popitem(last=False)
+
+    def _complete(
+        self, order_info: Dict[str, Any], status: str, exchange_time_ms: Optional[int]
+    ) -> None:
+        """记录往返延迟并移入历史"""
+        now = self._clock()
+        submit_ms = order_info.get("exchange_submit_ms")
+        if exchange_time_ms is not None and submit_ms is not None:
+            # 下单回报之后的耗时取交易所时间戳，不受轮询间隔影响
+            roundtrip_latency = (
+                order_info["ack_latency"] + max(int(exchange_time_ms) - int(submit_ms), 0) / 1000.0
+            )
+        else:
+            roundtrip_latency = now - order_info["submit_time"]
+        self.metrics.observe_order_roundtrip_latency(roundtrip_latency)
+
+        order_info["status"] = status
+        order_info["complete_time"] = now
+        order_info["roundtrip_latency"] = roundtrip_latency
+        self.history.append(order_info)
+        self.pending.pop(order_info["order_id"], None)
+        self._client_ids.pop(order_info["client_order_id"], None)
+
+        self.logger.info(
+            f"🏁 订单完成: {order_info['order_id']} 状态:{status} "
+            f"延迟:{roundtrip_latency * 1000:.1f}ms"
+        )
+
+    # ------------------------------------------------------------------
+    # 后备轮询
+    # ------------------------------------------------------------------
+
+    def _ensure_sweeper(self) -> None:
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.create_task(self._sweep(), name="order-state-sweeper")
+
+    async def _sweep(self) -> None:
+        """轮询长时间没有事件的订单，直到没有待处理订单"""
+        while self.pending:
+            await asyncio.sleep(self.poll_interval)
+            now = self._clock()
+            due = [info for info in self.pending.values() if info["next_poll"] <= now]
+            if due:
+                await asyncio.gather(*(self._poll_order(info) for info in due))
+
+    async def _poll_order(self, order_info: Dict[str, Any]) -> None:
+        order_info["polls"] += 1
+        order_info["next_poll"] = self._clock() + self.poll_interval
+        self.poll_count += 1
+        try:
+            response = await self._poll(order_info)
+        except Exception as e:
+            self.logger.warning(f"⚠️ 订单状态查询错误: {e}")
+            response = None
+
+        if order_info["order_id"] not in self.pending:
+            # 查询期间已由事件完成
+            return
+
+        if response is not None:
+            status = response.get("status", order_info["status"])
+            order_info["status"] = status
+            order_info["last_update"] = self._clock()
+            if status in TERMINAL_STATUSES:
+                self._complete(order_info, status, response.get("updateTime"))
+                return
+
+        if order_info["polls"] >= self.max_polls:
+            self.logger.warning(f"⏰ 订单监控超时: {order_info['order_id']}")
+            order_info["status"] = "TIMEOUT"
+            self.history.append(order_info)
+            self.pending.pop(order_info["order_id"], None)
+            self._client_ids.pop(order_info["client_order_id"], None)
+
+    async def close(self) -> None:
+        """停止后备轮询"""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._sweeper
+            self._sweeper = None
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "pending": len(self.pending),
+            "completed": len(self.history),
+            "events": self.event_count,
+            "polls": self.poll_count,
+        }
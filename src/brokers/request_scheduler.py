@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+异步请求调度器
+Async Request Scheduler
+
+用途：
+- 令牌桶限流：按请求权重与下单次数扣减，并用响应头
+  ``X-MBX-USED-WEIGHT-*`` / ``X-MBX-ORDER-COUNT-*`` 校正剩余额度
+- 429/418 响应按 ``Retry-After`` 暂停所有请求
+- 相同参数的并发GET合并为一次网络请求
+- 签名请求通过有界信号量流水线发送
+"""
+
+import asyncio
+import contextlib
+import re
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterator, List, Mapping, Tuple
+
+# Binance 现货默认限额: (类型, 窗口秒数) -> 窗口内上限
+DEFAULT_LIMITS: Dict[Tuple[str, int], int] = {
+    ("weight", 60): 6000,
+    ("orders", 10): 100,
+    ("orders", 86400): 200000,
+}
+
+# 端点权重（未列出的端点权重为1）
+ENDPOINT_WEIGHTS: Dict[Tuple[str, str], int] = {
+    ("GET", "/api/v3/account"): 20,
+    ("GET", "/api/v3/order"): 4,
+    ("GET", "/api/v3/openOrders"): 6,
+    ("GET", "/api/v3/allOrders"): 20,
+    ("GET", "/api/v3/myTrades"): 20,
+    ("GET", "/api/v3/exchangeInfo"): 20,
+    ("GET", "/api/v3/klines"): 2,
+}
+# 不带symbol查询全部挂单的权重
+OPEN_ORDERS_ALL_WEIGHT = 80
+
+_LIMIT_HEADER = re.compile(r"^x-mbx-(used-weight|order-count)(?:-(\d+)([smhd]))?$", re.IGNORECASE)
+_UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def request_weight(method: str, endpoint: str, params: Mapping[str, Any]) -> Tuple[int, int]:
+    """
+    请求的 (权重, 下单次数)
+
+    Args:
+        method: HTTP方法
+        endpoint: API端点
+        params: 请求参数
+
+    Returns:
+        (请求权重, 计入下单限额的次数)
+    """
+    method = method.upper()
+    if method == "GET" and endpoint == "/api/v3/openOrders" and "symbol" not in params:
+        weight = OPEN_ORDERS_ALL_WEIGHT
+    else:
+        weight = ENDPOINT_WEIGHTS.get((method, endpoint), 1)
+    orders = 1 if method == "POST" and endpoint.startswith("/api/v3/order") else 0
+    return weight, orders
+
+
+def parse_limit_headers(headers: Mapping[str, str]) -> Iterator[Tuple[Tuple[str, int], int]]:
+    """
+    解析限额响应头
+
+    Returns:
+        ((类型, 窗口秒数), 已用量) 迭代器；不带窗口的旧式头按1分钟处理
+    """
+    for name, value in headers.items():
+        match = _LIMIT_HEADER.match(name)
+        if match is None:
+            continue
+        kind = "weight" if match.group(1).lower() == "used-weight" else "orders"
+        if match.group(2) is None:
+            window = 60
+        else:
+            window = int(match.group(2)) * _UNIT_SECONDS[match.group(3).lower()]
+        try:
+            yield (kind, window), int(value)
+        except ValueError:
+            continue
+
+
+class TokenBucket:
+    """窗口额度的令牌桶（容量为窗口上限，按 上限/窗口 匀速恢复）"""
+
+    __slots__ = ("capacity", "rate", "tokens", "updated")
+
+    def __init__(self, capacity: int, window: float, now: float) -> None:
+        self.capacity = float(capacity)
+        self.rate = capacity / window
+        self.tokens = float(capacity)
+        self.updated = now
+
+    def _refill(self, now: float) -> None:
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def delay(self, amount: float, now: float) -> float:
+        """距离可扣减 ``amount`` 个令牌还需等待的秒数"""
+        self._refill(now)
+        # 超过容量的请求只要求桶满，避免永远等待
+        deficit = min(amount, self.capacity) - self.tokens
+        return max(deficit, 0.0) / self.rate
+
+    def consume(self, amount: float, now: float) -> None:
+        self._refill(now)
+        self.tokens -= amount
+
+    def sync_used(self, used: int, now: float) -> None:
+        """按服务器报告的已用量收紧剩余额度（只收紧，乱序到达的旧响应不会放宽限额）"""
+        self._refill(now)
+        self.tokens = min(self.tokens, self.capacity - used)
+
+
+class RequestScheduler:
+    """异步请求调度：限流、GET合并与签名请求并发上限"""
+
+    def __init__(
+        self,
+        limits: Mapping[Tuple[str, int], int] = DEFAULT_LIMITS,
+        max_signed_inflight: int = 10,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        初始化请求调度器
+
+        Args:
+            limits: (类型, 窗口秒数) -> 窗口上限，类型为 "weight" 或 "orders"
+            max_signed_inflight: 同时在途的签名请求上限
+            clock: 单调时钟（测试可替换）
+        """
+        self._clock = clock
+        now = clock()
+        self.buckets: Dict[Tuple[str, int], TokenBucket] = {
+            key: TokenBucket(limit, key[1], now) for key, limit in limits.items()
+        }
+        self.max_signed_inflight = max_signed_inflight
+        self._signed = asyncio.Semaphore(max_signed_inflight)
+        self._acquire_lock = asyncio.Lock()
+        self._paused_until = 0.0
+        self._inflight: Dict[Hashable, "asyncio.Future[Any]"] = {}
+
+        self.stats: Dict[str, float] = {
+            "requests": 0,
+            "coalesced": 0,
+            "throttled": 0,
+            "throttle_seconds": 0.0,
+            "rate_limited": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # 限流
+    # ------------------------------------------------------------------
+
+    def _demands(self, weight: int, orders: int) -> List[Tuple[TokenBucket, int]]:
+        demands = []
+        for (kind, _), bucket in self.buckets.items():
+            amount = weight if kind == "weight" else orders
+            if amount:
+                demands.append((bucket, amount))
+        return demands
+
+    def delay(self, weight: int = 1, orders: int = 0) -> float:
+        """当前发送该请求需要等待的秒数（不扣减额度）"""
+        now = self._clock()
+        wait = max(self._paused_until - now, 0.0)
+        for bucket, amount in self._demands(weight, orders):
+            wait = max(wait, bucket.delay(amount, now))
+        return wait
+
+    async def acquire(self, weight: int = 1, orders: int = 0) -> None:
+        """
+        等待并扣减额度（按调用顺序排队）
+
+        Args:
+            weight: 请求权重
+            orders: 计入下单限额的次数
+        """
+        async with self._acquire_lock:
+            wait = self.delay(weight, orders)
+            while wait > 0:
+                self.stats["throttled"] += 1
+                self.stats["throttle_seconds"] += wait
+                await asyncio.sleep(wait)
+                wait = self.delay(weight, orders)
+
+            now = self._clock()
+            for bucket, amount in self._demands(weight, orders):
+                bucket.consume(amount, now)
+            self.stats["requests"] += 1
+
+    def update_from_headers(self, headers: Mapping[str, str], status: int = 200) -> None:
+        """
+        用响应头校正额度；429/418 时按 Retry-After 暂停
+
+        Args:
+            headers: 响应头
+            status: HTTP状态码
+        """
+        now = self._clock()
+        for key, used in parse_limit_headers(headers):
+            bucket = self.buckets.get(key)
+            if bucket is not None:
+                bucket.sync_used(used, now)
+
+        if status in (418, 429):
+            self.stats["rate_limited"] += 1
+            try:
+                retry_after = float(headers.get("Retry-After", 1))
+            except ValueError:
+                retry_after = 1.0
+            self.pause(retry_after)
+
+    def pause(self, seconds: float) -> None:
+        """暂停所有请求 ``seconds`` 秒"""
+        self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+    @contextlib.asynccontextmanager
+    async def slot(self, weight: int = 1, orders: int = 0, signed: bool = False):
+        """
+        发送一次请求的许可：签名请求先占用信号量，再扣减额度
+
+        Args:
+            weight: 请求权重
+            orders: 计入下单限额的次数
+            signed: 是否为签名请求
+        """
+        if not signed:
+            await self.acquire(weight, orders)
+            yield
+            return
+
+        async with self._signed:
+            await self.acquire(weight, orders)
+            yield
+
+    # ------------------------------------------------------------------
+    # GET合并
+    # ------------------------------------------------------------------
+
+    async def coalesce(self, key: Hashable, request: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        相同 ``key`` 的并发调用共享同一次请求的结果
+
+        Args:
+            key: 请求标识（方法、端点与签名前参数）
+            request: 发起请求的协程函数
+
+        Returns:
+            请求结果（失败时所有等待者收到同一个异常）
+        """
+        future = self._inflight.get(key)
+        if future is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(future)
+
+        future = asyncio.ensure_future(request())
+        self._inflight[key] = future
+        future.add_done_callback(lambda done: self._release(key, done))
+        # shield: 某个等待者被取消不会取消其他等待者共享的请求
+        return await asyncio.shield(future)
+
+    def _release(self, key: Hashable, future: "asyncio.Future[Any]") -> None:
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if not future.cancelled():
+            # 所有等待者都已取消时避免 "exception was never retrieved"
+            future.exception()
+
+    def get_stats(self) -> Dict[str, float]:
+        """调度统计（含各限额桶剩余额度）"""
+        now = self._clock()
+        stats = dict(self.stats)
+        for (kind, window), bucket in self.buckets.items():
+            bucket._refill(now)
+            stats[f"{kind}_{window}s_available"] = bucket.tokens
+        stats["inflight_gets"] = len(self._inflight)
+        return stats
@@ -3,13 +3,101 @@
 
 import os
 from datetime import datetime
-from typing import Callable, Dict, Optional, Union
+from typing import Callable, Dict, Optional, Tuple, Union
 
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
 
+def execution_prices(price: np.ndarray, signal: np.ndarray, slippage: float) -> np.ndarray:
+    """
+    计算含滑点的执行价格
+
+    参数:
+        price: 收盘价数组
+        signal: 信号数组（>0买入加滑点，<0卖出减滑点，其余按原价）
+        slippage: 滑点百分比
+
+    返回:
+        执行价格数组
+    """
+    return np.where(
+        signal > 0,
+        price * (1 + slippage),
+        np.where(signal < 0, price * (1 - slippage), price),
+    )
+
+
+def signal_changes(signal: np.ndarray) -> np.ndarray:
+    """
+    标记信号改变的K线（首根与0比较，NaN视为改变）
+
+    参数:
+        signal: 信号数组
+
+    返回:
+        布尔数组
+    """
+    prev = np.empty_like(signal)
+    prev[:1] = 0
+    prev[1:] = signal[:-1]
+    return signal != prev
+
+
+def simulate_ledger(
+    price: np.ndarray,
+    exec_price: np.ndarray,
+    signal: np.ndarray,
+    initial_capital: float,
+    commission: float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    现金/持仓/资产价值账本状态机
+
+    只在信号改变的K线上结算买卖，其余K线沿用上一状态，
+    按段填充后资产价值 = 持仓 × 收盘价。
+
+    参数:
+        price: 收盘价数组
+        exec_price: 执行价格数组
+        signal: 信号数组
+        initial_capital: 初始资金
+        commission: 交易佣金百分比
+
+    返回:
+        (cash, units, asset_value) 三个float64数组
+    """
+    changed = signal_changes(signal)
+    signals = signal.tolist()
+    exec_prices = exec_price.tolist()
+
+    # 第0项为初始状态，第k项为第k次信号改变后的状态
+    cash, units = float(initial_capital), 0.0
+    event_cash = [cash]
+    event_units = [units]
+    for i in np.flatnonzero(changed).tolist():
+        current = signals[i]
+        prev = signals[i - 1] if i > 0 else 0
+        if current > 0 and prev <= 0:
+            # 买入：动用99%现金
+            units_to_buy = cash * 0.99 / (exec_prices[i] * (1 + commission))
+            units += units_to_buy
+            cash -= units_to_buy * exec_prices[i] * (1 + commission)
+        elif current <= 0 and prev > 0:
+            # 卖出：全部平仓
+            cash += units * exec_prices[i] * (1 - commission)
+            units = 0.0
+        event_cash.append(cash)
+        event_units.append(units)
+
+    # 每根K线取最近一次信号改变后的状态
+    state = np.cumsum(changed)
+    cash_curve = np.asarray(event_cash)[state]
+    units_curve = np.asarray(event_units)[state]
+    return cash_curve, units_curve, units_curve * price
+
+
 class MarketSimulator:
     """
     市场模拟器类，用于回测交易策略
@@ -94,13 +182,10 @@ class MarketSimulator:
         self.positions["price"] = self.data["close"]
 
         # 计算实际执行价格（考虑滑点）
-        self.positions["exec_price"] = self.positions.apply(
-            lambda x: (
-                x["price"] * (1 + self.slippage)
-                if x["signal"] > 0
-                else x["price"] * (1 - self.slippage) if x["signal"] < 0 else x["price"]
-            ),
-            axis=1,
+        self.positions["exec_price"] = execution_prices(
+            self.positions["price"].to_numpy(dtype=float),
+            self.positions["signal"].to_numpy(dtype=float),
+            self.slippage,
         )
 
         # 计算佣金
@@ -112,70 +197,36 @@ class MarketSimulator:
         self._record_trades()
 
     def _record_trades(self) -> None:
-        """记录交易详情"""
-        prev_signal = 0
-
-        for date, row in self.positions.iterrows():
-            if row["signal"] != prev_signal:
-                # 如果信号改变，记录交易
-                trade = {
+        """记录交易详情（信号改变的K线）"""
+        changed = signal_changes(self.positions["signal"].to_numpy(dtype=float))
+        rows = self.positions.iloc[np.flatnonzero(changed)]
+        # 与逐行iterrows一致：按整行公共dtype取值
+        values = rows.to_numpy()
+        columns = [rows.columns.get_loc(c) for c in ("signal", "exec_price", "commission")]
+
+        for date, row in zip(rows.index, values):
+            self.trades.append(
+                {
                     "date": date,
-                    "signal": row["signal"],
-                    "price": row["exec_price"],
-                    "commission": row["commission"],
+                    "signal": row[columns[0]],
+                    "price": row[columns[1]],
+                    "commission": row[columns[2]],
                 }
-                self.trades.append(trade)
-
-                prev_signal = row["signal"]
+            )
 
     def _calculate_holdings(self) -> None:
         """计算仓位价值和现金持有量"""
-        # 初始化持仓DataFrame
-        self.holdings = pd.DataFrame(index=self.positions.index)
-
-        # 初始现金
-        self.holdings["cash"] = self.initial_capital
-
-        # 持有的资产数量
-        self.holdings["units"] = 0
-
-        # 资产价值
-        self.holdings["asset_value"] = 0
-
-        # 计算每个时间点的持仓
-        prev_signal = 0
-        for i, (date, row) in enumerate(self.positions.iterrows()):
-            if i > 0:
-                # 继承前一时间点的现金和资产数量
-                self.holdings.loc[date, "cash"] = self.holdings.iloc[i - 1]["cash"]
-                self.holdings.loc[date, "units"] = self.holdings.iloc[i - 1]["units"]
-
-            # 如果信号改变，更新仓位
-            if row["signal"] != prev_signal:
-                if row["signal"] > 0 and prev_signal <= 0:
-                    # 买入信号
-                    units_to_buy = (
-                        self.holdings.loc[date, "cash"]
-                        * 0.99
-                        / (row["exec_price"] * (1 + self.commission))
-                    )
-                    cost = units_to_buy * row["exec_price"] * (1 + self.commission)
-
-                    self.holdings.loc[date, "units"] += units_to_buy
-                    self.holdings.loc[date, "cash"] -= cost
-
-                elif row["signal"] <= 0 and prev_signal > 0:
-                    # 卖出信号
-                    units_to_sell = self.holdings.loc[date, "units"]
-                    proceeds = units_to_sell * row["exec_price"] * (1 - self.commission)
-
-                    self.holdings.loc[date, "units"] = 0
-                    self.holdings.loc[date, "cash"] += proceeds
-
-            # 更新资产价值
-            self.holdings.loc[date, "asset_value"] = self.holdings.loc[date, "units"] * row["price"]
-
-            prev_signal = row["signal"]
+        cash, units, asset_value = simulate_ledger(
+            self.positions["price"].to_numpy(dtype=float),
+            self.positions["exec_price"].to_numpy(dtype=float),
+            self.positions["signal"].to_numpy(dtype=float),
+            self.initial_capital,
+            self.commission,
+        )
+        self.holdings = pd.DataFrame(
+            {"cash": cash, "units": units, "asset_value": asset_value},
+            index=self.positions.index,
+        )
 
     def _calculate_performance(self) -> None:
         """计算回测性能指标"""
@@ -10,6 +10,8 @@
 - 交易引擎
 """
 
+from .incremental_indicators import IncrementalIndicatorState
+from .market_data_buffer import MarketDataStore, OHLCVRingBuffer
 from .position_management import PositionManager
 from .price_fetcher import calculate_atr, fetch_price_data, generate_fallback_data
 from .risk_management import (
@@ -60,6 +62,8 @@ __all__ = [
     "trading_loop",
     "async_trading_engine",
     # 价格数据
+    "OHLCVRingBuffer",
+    "MarketDataStore",
     "fetch_price_data",
     "generate_fallback_data",
     "calculate_atr",
@@ -68,5 +72,6 @@ __all__ = [
     "validate_signal",
     "filter_signals",
     "signal_processor_vectorized",
+    "IncrementalIndicatorState",
     "OptimizedSignalProcessor",
 ]
@@ -48,6 +48,7 @@ except Exception:  # pragma: no cover – fallback for legacy tests
     _lb_mod.LiveBrokerAsync = LiveBrokerAsync
     sys.modules["src.brokers.live_broker_async"] = _lb_mod
 
+from src.core.market_data_buffer import MarketDataStore, OHLCVRingBuffer
 from src.core.price_fetcher import calculate_atr, fetch_price_data
 from src.core.signal_processor_vectorized import OptimizedSignalProcessor
 from src.ws.binance_ws_client import BinanceWSClient
@@ -76,6 +77,8 @@ class AsyncTradingEngine:
 
         # 核心组件
         self.ws_client: Optional[BinanceWSClient] = None
+        # K线分发worker数量（0表示在WS读取循环内直接回调）
+        self.dispatch_workers = 4
         self.broker: Optional[LiveBrokerAsync] = None
         self.signal_processor = OptimizedSignalProcessor()
 
@@ -93,9 +96,8 @@ class AsyncTradingEngine:
             telegram_token=telegram_token,
         )
 
-        # 数据缓存（内存窗口）
-        self.market_data: Dict[str, pd.DataFrame] = {}
-        self.max_data_points = 200  # 保留最近200个数据点
+        # 数据缓存（预分配环形缓冲区，按需才构建DataFrame）
+        self.market_data: MarketDataStore = MarketDataStore(capacity=200)  # 保留最近200个数据点
 
         # 交易状态
         self.running = False
@@ -132,6 +134,15 @@ class AsyncTradingEngine:
 
         self.logger = logging.getLogger(__name__)
 
+    @property
+    def max_data_points(self) -> int:
+        """每个交易对保留的K线数量（新建缓冲区的容量）"""
+        return self.market_data.capacity
+
+    @max_data_points.setter
+    def max_data_points(self, value: int):
+        self.market_data.capacity = value
+
     async def analyze_market_conditions(self, symbol: str = "BTCUSDT") -> Dict[str, Any]:
         """分析市场条件 - 异步版本"""
         try:
@@ -328,8 +339,38 @@ class AsyncTradingEngine:
         except Exception as e:
             self.metrics.record_exception("async_trading_engine", e)
 
+    def _batch_broker(self) -> bool:
+        """代理是否提供批量下单（按类属性判断，Mock代理不算）"""
+        return callable(getattr(type(self.broker), "place_orders_batch", None))
+
+    @staticmethod
+    def _market_order_requests(orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [
+            {
+                "symbol": o["symbol"],
+                "side": o["side"],
+                "order_type": "MARKET",
+                "quantity": o["quantity"],
+            }
+            for o in orders
+        ]
+
     async def process_concurrent_orders(self, orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """并发处理多个订单"""
+        if self._batch_broker():
+            items = await self.broker.place_orders_batch(self._market_order_requests(orders))
+            results = []
+            for item in items:
+                if item["success"]:
+                    result = item["order"]
+                    result.setdefault("orderId", result.get("order_id"))
+                    results.append(result)
+                else:
+                    results.append(
+                        {"error": item["error"], "symbol": item["symbol"], "side": item["side"]}
+                    )
+            return results
+
         results = []
 
         for order in orders:
@@ -934,6 +975,19 @@ class AsyncTradingEngine:
     ) -> List[Dict[str, Any]]:
         """并发执行订单"""
         try:
+            if self._batch_broker():
+                items = await self.broker.place_orders_batch(
+                    self._market_order_requests(trade_orders)
+                )
+                return [
+                    (
+                        item["order"]
+                        if item["success"]
+                        else {"status": "ERROR", "error": item["error"]}
+                    )
+                    for item in items
+                ]
+
             # 创建并发任务
             tasks = []
             for order in trade_orders:
@@ -1022,7 +1076,9 @@ class AsyncTradingEngine:
 
             # 1. 初始化WebSocket客户端
             self.ws_client = BinanceWSClient(
-                symbols=self.symbols, on_kline_callback=self._handle_market_data
+                symbols=self.symbols,
+                on_kline_callback=self._handle_market_data,
+                dispatch_workers=self.dispatch_workers,
             )
 
             # 2. 初始化异步代理
@@ -1033,7 +1089,7 @@ class AsyncTradingEngine:
 
             # 3. 初始化市场数据缓存
             for symbol in self.symbols:
-                self.market_data[symbol] = pd.DataFrame()
+                self.market_data[symbol] = OHLCVRingBuffer(self.max_data_points)
                 self.last_signals[symbol] = {}
 
             self.logger.info("✅ 异步交易引擎初始化完成")
@@ -1051,30 +1107,8 @@ class AsyncTradingEngine:
             if not kline_data.get("is_closed", False):
                 return
 
-            # 构建DataFrame行
-            new_row = pd.DataFrame(
-                [
-                    {
-                        "timestamp": kline_data["timestamp"],
-                        "open": kline_data["open"],
-                        "high": kline_data["high"],
-                        "low": kline_data["low"],
-                        "close": kline_data["close"],
-                        "volume": kline_data["volume"],
-                    }
-                ]
-            )
-            new_row.set_index("timestamp", inplace=True)
-
-            # 更新市场数据缓存
-            if symbol in self.market_data:
-                self.market_data[symbol] = pd.concat([self.market_data[symbol], new_row])
-
-                # 限制数据点数量
-                if len(self.market_data[symbol]) > self.max_data_points:
-                    self.market_data[symbol] = self.market_data[symbol].tail(self.max_data_points)
-            else:
-                self.market_data[symbol] = new_row
+            # 写入环形缓冲区（O(1)，超出容量自动覆盖最旧K线）
+            self.market_data.ensure(symbol).append_kline(kline_data)
 
             # 记录市场数据指标
             self.metrics.update_concurrent_tasks("market_data", 1)
@@ -1096,14 +1130,11 @@ class AsyncTradingEngine:
             # 记录并发任务开始
             self.metrics.update_concurrent_tasks("signal_processing", 1)
 
-            # 获取市场数据
-            if symbol not in self.market_data or len(self.market_data[symbol]) < max(
-                self.fast_win, self.slow_win
-            ):
+            # 获取市场数据（直接读取环形缓冲区视图，不复制）
+            market_data = self.market_data.buffer(symbol)
+            if market_data is None or len(market_data) < max(self.fast_win, self.slow_win):
                 return
 
-            market_data = self.market_data[symbol].copy()
-
             # 使用M3优化版信号处理器
             with self.metrics.measure_signal_latency():
                 signals = self.signal_processor.get_trading_signals_optimized(
@@ -1453,6 +1484,12 @@ class AsyncTradingEngine:
                 if queue_size > 0:
                     self.metrics.update_concurrent_tasks("ws_queue", queue_size)
 
+            # 信号缓存命中/未命中/淘汰统计
+            self.signal_processor.publish_cache_metrics(self.metrics)
+
+            # GC计数与周期性tracemalloc采样（不遍历堆）
+            self.metrics.update_gc_tracked_objects()
+
         except Exception as e:
             self.logger.warning(f"⚠️ 批量指标更新失败: {e}")
 
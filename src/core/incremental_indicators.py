@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+增量指标状态引擎
+Incremental (O(1) per bar) Indicator State Engine
+
+用途：
+- 每根K线到达时增量更新EMA/SMA/TR/ATR，无需对整个窗口重算ewm
+- 支持同一根K线的多次修订（未收盘K线、REST轮询覆盖最后一根）
+- 交叉信号与批量路径（fast_ema / fast_atr / _detect_crossover_fast）保持一致
+"""
+
+import math
+from collections import deque
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class _RollingSum:
+    """定长滑动求和（用于SMA），支持修订最后一个值"""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values: deque = deque(maxlen=window)
+        self.total = 0.0
+        self._pushes_since_resum = 0
+
+    def push(self, value: float) -> None:
+        if len(self.values) == self.window:
+            self.total -= self.values[0]
+        self.values.append(value)
+        self.total += value
+
+        # 周期性精确重算，避免浮点误差累积（均摊O(1)）
+        self._pushes_since_resum += 1
+        if self._pushes_since_resum >= self.window:
+            self.total = math.fsum(self.values)
+            self._pushes_since_resum = 0
+
+    def replace_last(self, value: float) -> None:
+        self.total += value - self.values[-1]
+        self.values[-1] = value
+
+    @property
+    def mean(self) -> float:
+        if not self.values:
+            return float("nan")
+        return self.total / len(self.values)
+
+
+class IncrementalIndicatorState:
+    """
+    单个 (symbol, fast_win, slow_win, atr_window) 的流式指标状态
+
+    EMA / ATR 与 ``ewm(adjust=False)`` 同一递推式；SMA 与 ``rolling(min_periods=1)`` 一致。
+    fast_win / slow_win 为 None 时仅维护ATR。
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        fast_win: Optional[int] = 7,
+        slow_win: Optional[int] = 25,
+        atr_window: int = 14,
+    ):
+        if bool(fast_win) != bool(slow_win):
+            raise ValueError("fast_win与slow_win需同时设置或同时为None")
+
+        self.symbol = symbol
+        self.fast_win = fast_win
+        self.slow_win = slow_win
+        self.atr_window = atr_window
+
+        self._alpha_fast = 2.0 / (fast_win + 1) if fast_win else None
+        self._alpha_slow = 2.0 / (slow_win + 1) if slow_win else None
+        self._alpha_atr = 2.0 / (atr_window + 1)
+
+        self.reset()
+
+    def reset(self) -> None:
+        """清空状态"""
+        self.bar_count = 0
+        self.last_timestamp: Optional[int] = None
+        self._last_bar: Optional[Tuple[int, float, float, float]] = None
+
+        # 当前值（含最后一根K线）
+        self.fast_ema = float("nan")
+        self.slow_ema = float("nan")
+        self.true_range = float("nan")
+        self.atr = float("nan")
+        self.close = float("nan")
+        self._diff = float("nan")
+
+        # 最后一根K线之前的状态，用于修订最后一根K线
+        self._base: Tuple[float, float, float, float, float] = (
+            float("nan"),
+            float("nan"),
+            float("nan"),
+            float("nan"),
+            float("nan"),
+        )
+
+        self._fast_sum = _RollingSum(self.fast_win) if self.fast_win else None
+        self._slow_sum = _RollingSum(self.slow_win) if self.slow_win else None
+
+    def update(self, timestamp: int, high: float, low: float, close: float) -> None:
+        """
+        应用一根K线
+
+        Args:
+            timestamp: K线开盘时间（毫秒）；与上一根相同则视为修订
+            high: 最高价
+            low: 最低价
+            close: 收盘价
+        """
+        bar = (timestamp, high, low, close)
+        if bar == self._last_bar:
+            return
+
+        if self.last_timestamp is not None and timestamp < self.last_timestamp:
+            return  # 过期K线
+
+        revise = timestamp == self.last_timestamp
+        if not revise:
+            self._base = (self.fast_ema, self.slow_ema, self.atr, self.close, self._diff)
+            self.bar_count += 1
+
+        prev_fast, prev_slow, prev_atr, prev_close, _ = self._base
+
+        if self.bar_count == 1:
+            tr = high - low
+            atr = tr
+        else:
+            tr = max(high - low, abs(high - prev_close), abs(low - prev_close))
+            atr = prev_atr + self._alpha_atr * (tr - prev_atr)
+
+        self.true_range = tr
+        self.atr = atr
+        self.close = close
+
+        if self.fast_win:
+            if self.bar_count == 1:
+                self.fast_ema = self.slow_ema = close
+            else:
+                self.fast_ema = prev_fast + self._alpha_fast * (close - prev_fast)
+                self.slow_ema = prev_slow + self._alpha_slow * (close - prev_slow)
+            self._diff = self.fast_ema - self.slow_ema
+            for rolling in (self._fast_sum, self._slow_sum):
+                if revise:
+                    rolling.replace_last(close)
+                else:
+                    rolling.push(close)
+
+        self.last_timestamp = timestamp
+        self._last_bar = bar
+
+    def sync(
+        self,
+        timestamps: Sequence[int],
+        high: Sequence[float],
+        low: Sequence[float],
+        close: Sequence[float],
+    ) -> int:
+        """
+        从时间升序的OHLC数组中补齐尚未处理的K线
+
+        稳态下只处理最后一根（新K线或修订），首次调用会回放整个窗口。
+
+        Returns:
+            实际应用的K线数量
+        """
+        n = len(timestamps)
+        if n == 0:
+            return 0
+
+        if self.last_timestamp is None:
+            start = 0
+        elif int(timestamps[-1]) < self.last_timestamp:
+            # 数据源被重置（时间回退），重新回放
+            self.reset()
+            start = 0
+        else:
+            start = int(np.searchsorted(timestamps, self.last_timestamp, side="left"))
+
+        for i in range(start, n):
+            self.update(int(timestamps[i]), float(high[i]), float(low[i]), float(close[i]))
+        return n - start
+
+    @property
+    def fast_sma(self) -> float:
+        return self._fast_sum.mean if self._fast_sum else float("nan")
+
+    @property
+    def slow_sma(self) -> float:
+        return self._slow_sum.mean if self._slow_sum else float("nan")
+
+    def crossover(self) -> Tuple[bool, bool]:
+        """金叉/死叉（与批量路径的最后两点判断一致）"""
+        if self.bar_count < 2 or not self.fast_win:
+            return False, False
+        prev_diff = self._base[4]
+        return bool(prev_diff <= 0 < self._diff), bool(prev_diff >= 0 > self._diff)
+
+    def signals(self) -> Dict[str, Any]:
+        """构建与 OptimizedSignalProcessor 相同结构的信号字典"""
+        buy_signal, sell_signal = self.crossover()
+        return {
+            "buy_signal": buy_signal,
+            "sell_signal": sell_signal,
+            "current_price": self.close,
+            "fast_ma": self.fast_ema,
+            "slow_ma": self.slow_ema,
+            "atr": self.atr,
+            "last_timestamp": (
+                pd.Timestamp(self.last_timestamp, unit="ms")
+                if self.last_timestamp is not None
+                else None
+            ),
+        }
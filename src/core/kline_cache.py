@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+增量K线缓存
+Incremental Kline Cache
+
+用途：
+- 按 (交易对, 周期) 缓存最近的K线（OHLCVRingBuffer），首次全量拉取
+- 之后每个周期只用 start_time 拉取最后一根K线及其后的新K线，
+  同一时间戳原地覆盖尚未收盘的K线
+- 返回缓存内存上的只读DataFrame视图，不重建12列列表
+- 已收盘K线写入行情存储（src.data.storage.ParquetMarketStore），重启后从存储恢复；
+  默认存储目录取环境变量 MARKET_STORE_DIR（默认 data/market_store，设为空字符串禁用）
+"""
+
+import inspect
+import os
+import re
+import threading
+import time
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.core.market_data_buffer import OHLCV_COLUMNS, OHLCVRingBuffer
+
+_INTERVAL_UNITS_MS = {"m": 60_000, "h": 3_600_000, "d": 86_400_000, "w": 604_800_000}
+
+
+def interval_to_ms(interval: str) -> Optional[int]:
+    """K线周期转为毫秒；月线等不定长周期返回None"""
+    match = re.fullmatch(r"(\d+)([mhdw])", interval)
+    if match is None:
+        return None
+    return int(match.group(1)) * _INTERVAL_UNITS_MS[match.group(2)]
+
+
+def parse_klines(klines: Any) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    解析K线为 (毫秒时间戳数组, n×5 OHLCV数组)
+
+    参数:
+        klines: 交易所返回的K线列表（每行 [开盘时间, 开, 高, 低, 收, 量, ...]），
+            或 BinanceClient.get_klines 返回的DataFrame
+
+    返回:
+        (int64时间戳, float64数值)
+    """
+    if isinstance(klines, pd.DataFrame):
+        raw_ts = klines["timestamp"]
+        if pd.api.types.is_datetime64_any_dtype(raw_ts):
+            timestamps = pd.DatetimeIndex(raw_ts).asi8 // 1_000_000
+        else:
+            timestamps = raw_ts.to_numpy(dtype=np.int64)
+        return timestamps, klines[list(OHLCV_COLUMNS)].to_numpy(dtype=np.float64)
+
+    rows = list(klines)
+    timestamps = np.fromiter((int(row[0]) for row in rows), dtype=np.int64, count=len(rows))
+    values = np.array([row[1:6] for row in rows], dtype=np.float64).reshape(len(rows), 5)
+    return timestamps, values
+
+
+def _supports_start_time(client: Any) -> bool:
+    try:
+        parameters = inspect.signature(client.get_klines).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    return any(p.name == "start_time" or p.kind == p.VAR_KEYWORD for p in parameters)
+
+
+class KlineCache:
+    """
+    增量K线缓存
+
+    返回的DataFrame是缓存的只读视图：下一次获取同一交易对时，
+    未收盘K线可能被原地更新；缓冲区保留 2×limit 行，旧视图在之后 limit 根K线内有效。
+    """
+
+    def __init__(self, limit: int = 100, store: Any = None):
+        """
+        初始化K线缓存
+
+        参数:
+            limit: 返回的K线数量（首次全量拉取的数量）
+            store: 行情存储（可选），用于持久化已收盘K线
+        """
+        self.limit = limit
+        self.store = store
+        self._buffers: Dict[Tuple[str, str], OHLCVRingBuffer] = {}
+        self._persisted: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+        self.full_fetches = 0
+        self.delta_fetches = 0
+        self.rows_fetched = 0
+
+    def get(
+        self, client: Any, symbol: str, interval: str = "1h", now_ms: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        获取最近 limit 根K线（增量更新缓存）
+
+        参数:
+            client: 提供 get_klines(symbol, interval=, limit=[, start_time=]) 的客户端
+            symbol: 交易对
+            interval: K线周期
+            now_ms: 当前时间（毫秒，测试用）
+
+        返回:
+            以timestamp为索引的OHLCV只读DataFrame；无数据时为空DataFrame
+        """
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        step = interval_to_ms(interval)
+        key = (symbol, interval)
+
+        with self._lock:
+            buffer = self._buffers.get(key)
+            if buffer is None and self.store is not None and step is not None:
+                buffer = self._restore(key, step, now_ms)
+
+            behind = None
+            if buffer is not None and step is not None and _supports_start_time(client):
+                # 从最后一根（可能未收盘）K线起需要的数量
+                behind = (now_ms - buffer.last_timestamp) // step + 1
+
+            if behind is None or behind > self.limit:
+                buffer = self._full_fetch(client, key)
+            else:
+                self._delta_fetch(client, key, buffer, int(max(behind, 1)))
+
+            if buffer is None or buffer.empty:
+                return pd.DataFrame()
+            if self.store is not None and step is not None:
+                self._persist_closed(key, buffer, step, now_ms)
+            return buffer.frame_view(self.limit)
+
+    def _full_fetch(self, client: Any, key: Tuple[str, str]) -> Optional[OHLCVRingBuffer]:
+        symbol, interval = key
+        klines = client.get_klines(symbol, interval=interval, limit=self.limit)
+        self.full_fetches += 1
+        if klines is None or len(klines) == 0:
+            return None
+
+        buffer = OHLCVRingBuffer(2 * self.limit, symbol)
+        self._append_rows(buffer, klines)
+        self._buffers[key] = buffer
+        return buffer
+
+    def _delta_fetch(
+        self, client: Any, key: Tuple[str, str], buffer: OHLCVRingBuffer, count: int
+    ) -> None:
+        symbol, interval = key
+        klines = client.get_klines(
+            symbol, interval=interval, limit=count, start_time=buffer.last_timestamp
+        )
+        self.delta_fetches += 1
+        if klines is not None and len(klines):
+            self._append_rows(buffer, klines)
+
+    def _append_rows(self, buffer: OHLCVRingBuffer, klines: Any) -> None:
+        timestamps, values = parse_klines(klines)
+        self.rows_fetched += len(timestamps)
+        last = buffer.last_timestamp
+        for ts, row in zip(timestamps.tolist(), values.tolist()):
+            # 只接受最后一根及之后的K线；同一时间戳原地覆盖
+            if last is None or ts >= last:
+                buffer.append(ts, *row)
+                last = ts
+
+    def _restore(self, key: Tuple[str, str], step: int, now_ms: int) -> Optional[OHLCVRingBuffer]:
+        """从行情存储恢复最近 limit 根K线"""
+        symbol, interval = key
+        stored = self.store.read(symbol, interval, start=now_ms - self.limit * step)
+        if stored.empty:
+            return None
+
+        buffer = OHLCVRingBuffer.from_frame(stored, 2 * self.limit, symbol)
+        self._buffers[key] = buffer
+        self._persisted[key] = buffer.last_timestamp
+        return buffer
+
+    def _persist_closed(
+        self, key: Tuple[str, str], buffer: OHLCVRingBuffer, step: int, now_ms: int
+    ) -> None:
+        """把尚未写入存储的已收盘K线追加到存储"""
+        timestamps = buffer.timestamps
+        after = self._persisted.get(key, -1)
+        mask = (timestamps > after) & (timestamps + step <= now_ms)
+        if not mask.any():
+            return
+
+        frame = buffer.frame_view()[mask].copy()
+        self.store.append(key[0], key[1], frame)
+        self._persisted[key] = int(timestamps[mask][-1])
+
+    def clear(self) -> None:
+        """清空内存缓存（存储中的数据保留）"""
+        with self._lock:
+            self._buffers.clear()
+            self._persisted.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """拉取统计"""
+        return {
+            "symbols": len(self._buffers),
+            "full_fetches": self.full_fetches,
+            "delta_fetches": self.delta_fetches,
+            "rows_fetched": self.rows_fetched,
+        }
+
+
+DEFAULT_STORE_DIR = os.path.join("data", "market_store")
+
+_client_caches: "weakref.WeakKeyDictionary[Any, KlineCache]" = weakref.WeakKeyDictionary()
+# store为None且未显式配置时，首次使用按环境变量创建默认存储
+_cache_settings: Dict[str, Any] = {"limit": 100, "store": None}
+_store_configured = False
+
+
+def default_kline_store() -> Any:
+    """
+    按环境变量 MARKET_STORE_DIR 创建默认行情存储
+
+    返回:
+        ParquetMarketStore；MARKET_STORE_DIR 为空字符串时返回None（不持久化）
+    """
+    root = os.getenv("MARKET_STORE_DIR", DEFAULT_STORE_DIR)
+    if not root:
+        return None
+    from src.data.storage import ParquetMarketStore
+
+    return ParquetMarketStore(root)
+
+
+def configure_kline_cache(limit: int = 100, store: Any = None) -> None:
+    """
+    设置之后新建的客户端缓存的参数，并清空已有缓存
+
+    参数:
+        limit: 返回的K线数量
+        store: 行情存储，用于跨重启持久化（None为不持久化）
+    """
+    global _store_configured
+    _cache_settings.update(limit=limit, store=store)
+    _store_configured = True
+    _client_caches.clear()
+
+
+def reset_kline_cache() -> None:
+    """清空已有缓存并恢复默认设置（下次使用时重新按环境变量创建存储）"""
+    global _store_configured
+    _cache_settings.update(limit=100, store=None)
+    _store_configured = False
+    _client_caches.clear()
+
+
+def get_kline_cache(client: Any) -> KlineCache:
+    """获取某个交易所客户端对应的K线缓存（随客户端释放）"""
+    global _store_configured
+    if not _store_configured:
+        _cache_settings["store"] = default_kline_store()
+        _store_configured = True
+    try:
+        cache = _client_caches.get(client)
+        if cache is None:
+            cache = KlineCache(**_cache_settings)
+            _client_caches[client] = cache
+        return cache
+    except TypeError:
+        # 不可弱引用/不可哈希的客户端：不缓存
+        return KlineCache(**_cache_settings)
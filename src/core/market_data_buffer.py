@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+行情数据环形缓冲区
+OHLCV Ring Buffer for Live Market Data
+
+用途：
+- 预分配的NumPy OHLCV存储，每根K线O(1)写入，无pd.concat
+- 任意时刻导出连续内存视图（零拷贝），供信号/ATR计算直接读取
+- 仅在调用方需要时才构建DataFrame
+"""
+
+from datetime import datetime
+from typing import Any, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+OHLCV_COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+def to_epoch_ms(timestamp: Any) -> int:
+    """
+    将时间戳统一转换为毫秒整数
+
+    Args:
+        timestamp: int毫秒 / pd.Timestamp / datetime / np.datetime64
+
+    Returns:
+        毫秒时间戳
+    """
+    if isinstance(timestamp, (int, np.integer)):
+        return int(timestamp)
+    if isinstance(timestamp, pd.Timestamp):
+        return int(timestamp.value // 1_000_000)
+    if isinstance(timestamp, (datetime, np.datetime64)):
+        return int(pd.Timestamp(timestamp).value // 1_000_000)
+    return int(timestamp)
+
+
+class OHLCVRingBuffer:
+    """
+    定长OHLCV环形缓冲区
+
+    每列按 2×capacity 预分配，写入时同时写两个镜像位置，
+    因此最近 ``len(self)`` 行始终是一段连续内存，``close`` 等属性直接返回视图。
+    """
+
+    def __init__(self, capacity: int = 200, symbol: Optional[str] = None):
+        if capacity <= 0:
+            raise ValueError("capacity必须为正整数")
+
+        self.capacity = int(capacity)
+        self.symbol = symbol
+        self._timestamps = np.zeros(2 * self.capacity, dtype=np.int64)
+        self._values = np.zeros((len(OHLCV_COLUMNS), 2 * self.capacity), dtype=np.float64)
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def empty(self) -> bool:
+        """是否为空（与DataFrame.empty保持一致）"""
+        return self._size == 0
+
+    def append(
+        self,
+        timestamp: Any,
+        open_: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float,
+    ) -> None:
+        """
+        追加一根K线；时间戳与最后一根相同时原地覆盖
+
+        Args:
+            timestamp: K线开盘时间
+            open_/high/low/close/volume: K线数值
+        """
+        ts = to_epoch_ms(timestamp)
+
+        if self._size and self._timestamps[self._start + self._size - 1] == ts:
+            pos = (self._start + self._size - 1) % self.capacity
+        elif self._size < self.capacity:
+            pos = (self._start + self._size) % self.capacity
+            self._size += 1
+        else:
+            pos = self._start
+            self._start = (self._start + 1) % self.capacity
+
+        row = (open_, high, low, close, volume)
+        for mirror in (pos, pos + self.capacity):
+            self._timestamps[mirror] = ts
+            self._values[:, mirror] = row
+
+    def append_kline(self, kline: Any) -> None:
+        """从标准化K线字典或KlineRecord追加（BinanceWSClient回调格式）"""
+        as_row = getattr(kline, "as_row", None)
+        if as_row is not None:
+            # KlineRecord：直接使用整数毫秒时间戳，不构造pd.Timestamp
+            self.append(*as_row())
+            return
+
+        self.append(
+            kline["timestamp"],
+            kline["open"],
+            kline["high"],
+            kline["low"],
+            kline["close"],
+            kline["volume"],
+        )
+
+    def _window(self) -> slice:
+        return slice(self._start, self._start + self._size)
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        获取某列的连续只读视图（零拷贝）
+
+        Args:
+            name: open/high/low/close/volume/timestamp
+
+        Returns:
+            长度为 ``len(self)`` 的NumPy视图
+        """
+        if name == "timestamp":
+            view = self._timestamps[self._window()]
+        else:
+            view = self._values[OHLCV_COLUMNS.index(name), self._window()]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self.column("timestamp")
+
+    @property
+    def open(self) -> np.ndarray:
+        return self.column("open")
+
+    @property
+    def high(self) -> np.ndarray:
+        return self.column("high")
+
+    @property
+    def low(self) -> np.ndarray:
+        return self.column("low")
+
+    @property
+    def close(self) -> np.ndarray:
+        return self.column("close")
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self.column("volume")
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        """最后一根K线的毫秒时间戳"""
+        if not self._size:
+            return None
+        return int(self._timestamps[self._start + self._size - 1])
+
+    def last_row(self) -> Tuple[Any, ...]:
+        """最后一根K线 (timestamp, open, high, low, close, volume)"""
+        if not self._size:
+            raise IndexError("缓冲区为空")
+        idx = self._start + self._size - 1
+        return (int(self._timestamps[idx]), *self._values[:, idx].tolist())
+
+    def clear(self) -> None:
+        """清空缓冲区（保留已分配内存）"""
+        self._start = 0
+        self._size = 0
+
+    def to_frame(self) -> pd.DataFrame:
+        """按需构建DataFrame（timestamp为索引）"""
+        window = self._window()
+        index = pd.DatetimeIndex(
+            pd.to_datetime(self._timestamps[window], unit="ms"), name="timestamp"
+        )
+        return pd.DataFrame(
+            {name: self._values[i, window].copy() for i, name in enumerate(OHLCV_COLUMNS)},
+            index=index,
+        )
+
+    def frame_view(self, rows: Optional[int] = None) -> pd.DataFrame:
+        """
+        最近 ``rows`` 行的只读DataFrame视图（数值不拷贝）
+
+        视图直接引用缓冲区内存：同一时间戳的K线被覆盖时视图随之变化，
+        缓冲区写满 ``capacity`` 行后旧视图的内容将被新K线替换。
+
+        Args:
+            rows: 行数（默认全部）
+
+        Returns:
+            以timestamp为索引、OHLCV为列的DataFrame
+        """
+        rows = self._size if rows is None else min(rows, self._size)
+        window = slice(self._start + self._size - rows, self._start + self._size)
+        values = self._values[:, window]
+        values.flags.writeable = False
+        index = pd.DatetimeIndex(
+            pd.to_datetime(self._timestamps[window], unit="ms"), name="timestamp"
+        )
+        return pd.DataFrame(values.T, index=index, columns=list(OHLCV_COLUMNS), copy=False)
+
+    @classmethod
+    def from_frame(
+        cls, df: pd.DataFrame, capacity: int = 200, symbol: Optional[str] = None
+    ) -> "OHLCVRingBuffer":
+        """
+        从DataFrame加载（仅保留最后 ``capacity`` 行）
+
+        Args:
+            df: 含OHLCV列的DataFrame，索引或 ``timestamp`` 列为时间
+            capacity: 缓冲区容量
+            symbol: 交易对（可选）
+
+        Returns:
+            新的环形缓冲区
+        """
+        buffer = cls(capacity, symbol)
+        if df is None or df.empty:
+            return buffer
+
+        tail = df.tail(capacity)
+        n = len(tail)
+
+        if "timestamp" in tail.columns:
+            raw_ts = tail["timestamp"]
+        else:
+            raw_ts = tail.index
+
+        if pd.api.types.is_datetime64_any_dtype(raw_ts):
+            timestamps = pd.DatetimeIndex(raw_ts).asi8 // 1_000_000
+        elif pd.api.types.is_integer_dtype(raw_ts):
+            timestamps = np.asarray(raw_ts, dtype=np.int64)
+        else:
+            timestamps = np.arange(n, dtype=np.int64)
+
+        for mirror in (0, capacity):
+            rows = slice(mirror, mirror + n)
+            buffer._timestamps[rows] = timestamps
+            for i, name in enumerate(OHLCV_COLUMNS):
+                if name in tail.columns:
+                    buffer._values[i, rows] = tail[name].to_numpy(dtype=np.float64)
+        buffer._size = n
+        return buffer
+
+
+class MarketDataStore(dict):
+    """
+    按交易对存放环形缓冲区的字典
+
+    读取 ``store[symbol]`` 时按需返回DataFrame（兼容旧代码/测试），
+    热路径请使用 ``store.buffer(symbol)`` 直接访问NumPy视图。
+    """
+
+    def __init__(self, capacity: int = 200):
+        super().__init__()
+        self.capacity = capacity
+
+    def buffer(self, symbol: str) -> Optional[OHLCVRingBuffer]:
+        """获取原始环形缓冲区（不构建DataFrame）"""
+        return dict.get(self, symbol)
+
+    def ensure(self, symbol: str) -> OHLCVRingBuffer:
+        """获取或创建某交易对的缓冲区"""
+        buf = dict.get(self, symbol)
+        if buf is None:
+            buf = OHLCVRingBuffer(self.capacity, symbol)
+            dict.__setitem__(self, symbol, buf)
+        return buf
+
+    def __setitem__(self, symbol: str, value: Any) -> None:
+        if not isinstance(value, OHLCVRingBuffer):
+            value = OHLCVRingBuffer.from_frame(value, self.capacity, symbol)
+        elif value.symbol is None:
+            value.symbol = symbol
+        dict.__setitem__(self, symbol, value)
+
+    def __getitem__(self, symbol: str) -> pd.DataFrame:
+        return dict.__getitem__(self, symbol).to_frame()
+
+    def get(self, symbol: str, default: Any = None) -> Any:
+        if symbol not in self:
+            return default
+        return self[symbol]
+
+    def values(self) -> Iterator[pd.DataFrame]:  # type: ignore[override]
+        return (self[symbol] for symbol in self)
+
+    def items(self) -> Iterator[Tuple[str, pd.DataFrame]]:  # type: ignore[override]
+        return ((symbol, self[symbol]) for symbol in self)
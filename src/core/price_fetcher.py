@@ -13,6 +13,8 @@ from typing import Optional
 import numpy as np
 import pandas as pd
 
+from .kline_cache import KlineCache, get_kline_cache
+
 try:
     from ..brokers.exchange import ExchangeClient
 except ImportError:
@@ -23,68 +25,65 @@ except ImportError:
         ExchangeClient = None
 
 
-def fetch_price_data(symbol: str, exchange_client: Optional[ExchangeClient] = None) -> pd.DataFrame:
+_default_client = None
+_default_client_cls = None
+
+
+def _get_default_client():
+    """复用默认BinanceClient（类被替换时重新创建），使K线缓存跨周期生效"""
+    global _default_client, _default_client_cls
+
+    try:
+        from ..brokers.binance import BinanceClient
+    except ImportError:
+        try:
+            from src.brokers.binance import BinanceClient
+        except ImportError:
+            return None
+
+    if _default_client is None or _default_client_cls is not BinanceClient:
+        _default_client = BinanceClient()
+        _default_client_cls = BinanceClient
+    return _default_client
+
+
+def fetch_price_data(
+    symbol: str,
+    exchange_client: Optional[ExchangeClient] = None,
+    cache: Optional[KlineCache] = None,
+) -> pd.DataFrame:
     """
     获取价格数据。
     Fetch price data.
 
+    首次获取最近100根1小时K线，之后只增量拉取新K线并更新未收盘K线；
+    已收盘K线写入默认行情存储（MARKET_STORE_DIR），重启后从存储恢复。
+    Fetches 100 hourly klines once, then only the newer bars on later calls;
+    closed bars persist to the default market store and are restored after a restart.
+
     参数 (Parameters):
         symbol: 交易对 (Trading pair)
         exchange_client: 交易所客户端实例 (Exchange client instance)
+        cache: K线缓存，默认每个客户端一个 (Kline cache, one per client by default)
 
     返回 (Returns):
-        pd.DataFrame: 价格数据 (Price data)
+        pd.DataFrame: 价格数据，缓存的只读视图 (Price data, read-only view of the cache)
     """
     try:
         if exchange_client is None:
             # 创建默认的交易所客户端
-            try:
-                from ..brokers.binance import BinanceClient
-            except ImportError:
-                try:
-                    from src.brokers.binance import BinanceClient
-                except ImportError:
-                    # 如果无法导入，直接使用备用数据
-                    return generate_fallback_data(symbol)
+            exchange_client = _get_default_client()
+            if exchange_client is None:
+                # 如果无法导入，直接使用备用数据
+                return generate_fallback_data(symbol)
 
-            exchange_client = BinanceClient()
+        if cache is None:
+            cache = get_kline_cache(exchange_client)
 
-        # 获取最近的K线数据(例如最近100个1小时K线)
-        klines = exchange_client.get_klines(symbol, interval="1h", limit=100)
-
-        if not klines:
+        df = cache.get(exchange_client, symbol, interval="1h")
+        if df.empty:
             raise Exception("无法获取K线数据")
-
-        # 转换为DataFrame
-        df = pd.DataFrame(
-            klines,
-            columns=[
-                "timestamp",
-                "open",
-                "high",
-                "low",
-                "close",
-                "volume",
-                "close_time",
-                "quote_volume",
-                "count",
-                "taker_buy_volume",
-                "taker_buy_quote_volume",
-                "ignore",
-            ],
-        )
-
-        # 转换数据类型
-        df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
-        df[["open", "high", "low", "close", "volume"]] = df[
-            ["open", "high", "low", "close", "volume"]
-        ].astype(float)
-
-        # 设置时间戳为索引
-        df.set_index("timestamp", inplace=True)
-
-        # 只保留需要的列
-        return df[["open", "high", "low", "close", "volume"]]
+        return df
 
     except Exception as e:
         print(f"获取真实数据失败: {e}, 使用模拟数据")
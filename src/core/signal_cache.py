@@ -1,31 +1,80 @@
 #!/usr/bin/env python3
 """
-M3阶段信号缓存（简化版）
-Simplified Signal Cache for M3 Phase
+M3阶段信号缓存（有界LRU）
+Bounded LRU Signal Cache for M3 Phase
 
-配合OptimizedSignalProcessor使用
+配合OptimizedSignalProcessor使用：
+- OrderedDict实现，get/set/淘汰均为O(1)
+- 统计命中、未命中、淘汰次数，供get_cache_stats与Prometheus导出
 """
 
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
 
 class SignalCache:
-    """简化的信号缓存"""
+    """有界LRU信号缓存"""
+
+    def __init__(self, max_size: int = 1000):
+        if max_size <= 0:
+            raise ValueError("max_size必须为正数")
+
+        # 按访问顺序排列：最久未使用的在最前
+        self.cache: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.max_size = max_size
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
 
-    def __init__(self):
-        # 简单的内存缓存
-        self.cache = {}
+    def get(self, key: Hashable) -> Optional[Any]:
+        """获取缓存值（命中时标记为最近使用）"""
+        try:
+            value = self.cache[key]
+        except KeyError:
+            self.misses += 1
+            return None
 
-    def get(self, key):
-        """获取缓存值"""
-        return self.cache.get(key)
+        self.cache.move_to_end(key)
+        self.hits += 1
+        return value
 
-    def set(self, key, value):
-        """设置缓存值"""
+    def set(self, key: Hashable, value: Any) -> None:
+        """设置缓存值，超出容量时淘汰最久未使用的条目"""
+        if key in self.cache:
+            self.cache.move_to_end(key)
         self.cache[key] = value
 
-    def clear(self):
-        """清空缓存"""
+        while len(self.cache) > self.max_size:
+            self.cache.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """清空缓存（统计计数保留）"""
         self.cache.clear()
 
-    def size(self):
+    def size(self) -> int:
         """缓存大小"""
         return len(self.cache)
+
+    @property
+    def hit_rate(self) -> float:
+        """命中率（无查询时为0.0）"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        获取缓存统计
+
+        Returns:
+            包含size/max_size/hits/misses/evictions/hit_rate的字典
+        """
+        return {
+            "size": len(self.cache),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
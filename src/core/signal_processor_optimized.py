@@ -4,55 +4,90 @@
 提供缓存机制和并行计算优化的信号计算
 """
 
-import hashlib
 import logging
-import time
 from functools import lru_cache
 from typing import Any, Dict, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
+from src.core.signal_cache import SignalCache as LRUSignalCache
 from src.monitoring.metrics_collector import get_metrics_collector
 
 
 class SignalCache:
-    """信号计算缓存器"""
+    """
+    信号计算缓存器（O(1) LRU）
+
+    底层复用 src.core.signal_cache.SignalCache 的有序字典；
+    键由尾部窗口的数组字节与最后一根K线身份构成，避免对数组做字符串化。
+    """
 
     def __init__(self, max_size: int = 1000):
-        self.cache = {}
-        self.max_size = max_size
-        self.access_times = {}
-
-    def _generate_key(self, data: pd.DataFrame, fast_win: int, slow_win: int) -> str:
-        """生成缓存键"""
-        # 使用数据的最后几行和参数生成唯一键
-        # 注意：这里使用哈希仅用于缓存键生成，不涉及安全
-        data_hash = hashlib.sha256(
-            str(data.tail(max(fast_win, slow_win) + 10).values).encode()
-        ).hexdigest()[:16]
-        return f"{data_hash}_{fast_win}_{slow_win}"
+        self._lru = LRUSignalCache(max_size=max_size)
+
+    @property
+    def cache(self) -> Dict:
+        """底层有序字典（最久未使用的在最前）"""
+        return self._lru.cache
+
+    @property
+    def access_times(self) -> Dict:
+        """兼容旧属性：有序字典的顺序即访问顺序"""
+        return self._lru.cache
+
+    @property
+    def max_size(self) -> int:
+        return self._lru.max_size
+
+    @property
+    def hits(self) -> int:
+        return self._lru.hits
+
+    @property
+    def misses(self) -> int:
+        return self._lru.misses
+
+    @property
+    def evictions(self) -> int:
+        return self._lru.evictions
+
+    def _generate_key(self, data: pd.DataFrame, fast_win: int, slow_win: int) -> Tuple:
+        """
+        生成缓存键：(行数, 最后K线索引, 尾部OHLC字节哈希, 参数)
+
+        只读取最后 max(fast_win, slow_win) + 10 行的 high/low/close，
+        注意：这里的hash仅用于缓存键生成，不涉及安全。
+        """
+        n = len(data)
+        if n == 0:
+            return (0, None, 0, fast_win, slow_win)
+
+        tail = slice(max(0, n - (max(fast_win, slow_win) + 10)), n)
+        digest = hash(
+            b"".join(
+                np.ascontiguousarray(data[col].to_numpy()[tail]).tobytes()
+                for col in ("high", "low", "close")
+                if col in data.columns
+            )
+        )
+        return (n, data.index[-1], digest, fast_win, slow_win)
 
     def get(self, data: pd.DataFrame, fast_win: int, slow_win: int) -> Optional[Dict]:
         """获取缓存值"""
-        key = self._generate_key(data, fast_win, slow_win)
-        if key in self.cache:
-            self.access_times[key] = time.time()
-            return self.cache[key]
-        return None
+        return self._lru.get(self._generate_key(data, fast_win, slow_win))
 
     def set(self, data: pd.DataFrame, fast_win: int, slow_win: int, value: Dict):
-        """设置缓存值"""
-        key = self._generate_key(data, fast_win, slow_win)
+        """设置缓存值（超出容量时淘汰最久未使用的条目）"""
+        self._lru.set(self._generate_key(data, fast_win, slow_win), value)
 
-        # 如果缓存已满，删除最老的条目
-        if len(self.cache) >= self.max_size:
-            oldest_key = min(self.access_times.items(), key=lambda x: x[1])[0]
-            del self.cache[oldest_key]
-            del self.access_times[oldest_key]
+    def clear(self) -> None:
+        """清空缓存"""
+        self._lru.clear()
 
-        self.cache[key] = value
-        self.access_times[key] = time.time()
+    def stats(self) -> Dict[str, Any]:
+        """缓存统计（size/max_size/hits/misses/evictions/hit_rate）"""
+        return self._lru.stats()
 
 
 class OptimizedSignalProcessor:
@@ -243,12 +278,7 @@ class OptimizedSignalProcessor:
         if not self.cache:
             return {"enabled": False}
 
-        return {
-            "enabled": True,
-            "size": len(self.cache.cache),
-            "max_size": self.cache.max_size,
-            "hit_rate": "需要实现命中率统计",
-        }
+        return {"enabled": True, **self.cache.stats()}
 
 
 # 全局优化实例
@@ -9,11 +9,18 @@ Optimized Vectorized Signal Processor for M3 Phase
 - 减少30-50%的CPU使用
 """
 
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
 
+from src.core.incremental_indicators import IncrementalIndicatorState
+from src.core.market_data_buffer import OHLCVRingBuffer
+from src.core.signal_cache import SignalCache
+
+# 行情输入：DataFrame 或 直接读取的环形缓冲区
+PriceData = Union[pd.DataFrame, OHLCVRingBuffer]
+
 
 def fast_ema(prices: np.ndarray, window: int) -> np.ndarray:
     """
@@ -66,21 +73,106 @@ def fast_atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, window: int =
 class OptimizedSignalProcessor:
     """优化版向量化信号处理器"""
 
-    def __init__(self):
-        # 简化缓存策略
-        self._cache = {}
+    def __init__(self, use_incremental: bool = True, atr_window: int = 14, cache_size: int = 100):
+        # 批量路径的有界LRU缓存；_cache 保留为底层有序字典（兼容旧属性）
+        self.signal_cache = SignalCache(max_size=cache_size)
+        self._cache = self.signal_cache.cache
         self._last_data_hash = None
 
+        # 增量指标状态：(symbol, fast_win, slow_win, atr_window) -> state
+        self.use_incremental = use_incremental
+        self.atr_window = atr_window
+        self._indicator_states: Dict[Tuple, IncrementalIndicatorState] = {}
+        self._atr_state_index: Dict[Tuple[str, int], IncrementalIndicatorState] = {}
+
+    def get_indicator_state(
+        self,
+        symbol: str,
+        fast_win: Optional[int] = 7,
+        slow_win: Optional[int] = 25,
+        atr_window: int = 14,
+    ) -> IncrementalIndicatorState:
+        """获取（或创建）某组参数的增量指标状态"""
+        key = (symbol, fast_win, slow_win, atr_window)
+        state = self._indicator_states.get(key)
+        if state is None:
+            state = IncrementalIndicatorState(symbol, fast_win, slow_win, atr_window)
+            self._indicator_states[key] = state
+            self._atr_state_index.setdefault((symbol, atr_window), state)
+        return state
+
+    def reset_indicator_states(self, symbol: Optional[str] = None) -> None:
+        """清除增量状态（symbol为None时全部清除）"""
+        for key in [k for k in self._indicator_states if symbol is None or k[0] == symbol]:
+            del self._indicator_states[key]
+        for key in [k for k in self._atr_state_index if symbol is None or k[0] == symbol]:
+            del self._atr_state_index[key]
+
+    @staticmethod
+    def _incremental_inputs(df: PriceData) -> Optional[Tuple[np.ndarray, ...]]:
+        """提取增量更新所需的 (timestamp_ms, high, low, close)，无法提取时返回None"""
+        if isinstance(df, OHLCVRingBuffer):
+            return df.timestamps, df.high, df.low, df.close
+
+        if not isinstance(df.index, pd.DatetimeIndex):
+            return None
+        if not all(col in df.columns for col in ("high", "low", "close")):
+            return None
+        return (
+            df.index.asi8 // 1_000_000,
+            df["high"].to_numpy(dtype=np.float64),
+            df["low"].to_numpy(dtype=np.float64),
+            df["close"].to_numpy(dtype=np.float64),
+        )
+
+    def _synced_state(
+        self,
+        df: PriceData,
+        symbol: Optional[str],
+        fast_win: Optional[int],
+        slow_win: Optional[int],
+        atr_window: int,
+    ) -> Optional[IncrementalIndicatorState]:
+        """将增量状态同步到最新K线；不适用时返回None走批量路径"""
+        if not self.use_incremental:
+            return None
+
+        symbol = symbol or getattr(df, "symbol", None)
+        if symbol is None:
+            return None
+
+        inputs = self._incremental_inputs(df)
+        if inputs is None:
+            return None
+
+        if fast_win is None:
+            state = self._atr_state_index.get((symbol, atr_window))
+            if state is None:
+                state = self.get_indicator_state(symbol, None, None, atr_window)
+        else:
+            state = self.get_indicator_state(symbol, fast_win, slow_win, atr_window)
+
+        state.sync(*inputs)
+        return state
+
     def get_trading_signals_optimized(
-        self, df: pd.DataFrame, fast_win: int = 7, slow_win: int = 25
+        self,
+        df: PriceData,
+        fast_win: int = 7,
+        slow_win: int = 25,
+        symbol: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         优化版交易信号计算
 
+        提供symbol（或传入带symbol的OHLCVRingBuffer）时使用增量指标状态，
+        每根新K线O(1)更新；否则对整个窗口批量计算。
+
         Args:
-            df: 价格数据
+            df: 价格数据（DataFrame 或 OHLCVRingBuffer）
             fast_win: 快线窗口
             slow_win: 慢线窗口
+            symbol: 交易对（可选，用于增量状态）
 
         Returns:
             信号字典
@@ -88,39 +180,69 @@ class OptimizedSignalProcessor:
         if df.empty:
             return self._empty_signal()
 
-        # 获取价格数据
-        close_prices = df["close"].values
-        data_hash = hash(close_prices.tobytes())
-
-        # 检查缓存
-        cache_key = f"{data_hash}_{fast_win}_{slow_win}"
-        if cache_key in self._cache:
-            return self._cache[cache_key]
+        state = self._synced_state(df, symbol, fast_win, slow_win, self.atr_window)
+        if state is not None:
+            return state.signals()
 
-        # 使用pandas内置的快速移动平均
-        close_series = df["close"]
-        fast_ma = close_series.ewm(span=fast_win, adjust=False).mean()
-        slow_ma = close_series.ewm(span=slow_win, adjust=False).mean()
+        # 获取价格数据
+        if isinstance(df, OHLCVRingBuffer):
+            close_prices = df.close
+            last_timestamp = pd.Timestamp(df.last_timestamp, unit="ms")
+        else:
+            close_prices = df["close"].values
+            last_timestamp = df.index[-1]
+
+        # 检查缓存（O(1)键：不再对整个窗口求哈希）
+        cache_key = self._cache_key(df, symbol, last_timestamp, close_prices, fast_win, slow_win)
+        cached = self.signal_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # 快速EMA（直接作用于NumPy数组）
+        fast_ma = fast_ema(close_prices, fast_win)
+        slow_ma = fast_ema(close_prices, slow_win)
 
         # 向量化交叉检测
-        buy_signal, sell_signal = self._detect_crossover_fast(fast_ma.values, slow_ma.values)
+        buy_signal, sell_signal = self._detect_crossover_fast(fast_ma, slow_ma)
 
         # 构建结果
         result = {
             "buy_signal": buy_signal,
             "sell_signal": sell_signal,
             "current_price": float(close_prices[-1]),
-            "fast_ma": float(fast_ma.iloc[-1]),
-            "slow_ma": float(slow_ma.iloc[-1]),
-            "last_timestamp": df.index[-1],
+            "fast_ma": float(fast_ma[-1]),
+            "slow_ma": float(slow_ma[-1]),
+            "last_timestamp": last_timestamp,
         }
 
-        # 缓存结果（限制缓存大小）
-        if len(self._cache) < 100:
-            self._cache[cache_key] = result
+        # 缓存结果（超出容量时淘汰最久未使用的条目）
+        self.signal_cache.set(cache_key, result)
 
         return result
 
+    @staticmethod
+    def _cache_key(
+        df: PriceData,
+        symbol: Optional[str],
+        last_timestamp: Any,
+        close_prices: np.ndarray,
+        fast_win: int,
+        slow_win: int,
+    ) -> Tuple:
+        """
+        构建缓存键：(symbol, 最后K线时间, 行数, 最后收盘价, 参数)
+
+        最后收盘价用于区分未收盘K线的修订，以及未提供symbol时的不同数据源。
+        """
+        return (
+            symbol or getattr(df, "symbol", None),
+            last_timestamp,
+            len(close_prices),
+            float(close_prices[-1]),
+            fast_win,
+            slow_win,
+        )
+
     def _detect_crossover_fast(self, fast_ma: np.ndarray, slow_ma: np.ndarray) -> tuple:
         """快速交叉检测"""
         if len(fast_ma) < 2 or len(slow_ma) < 2:
@@ -149,13 +271,16 @@ class OptimizedSignalProcessor:
             "last_timestamp": None,
         }
 
-    def compute_atr_optimized(self, df: pd.DataFrame, window: int = 14) -> float:
+    def compute_atr_optimized(
+        self, df: PriceData, window: int = 14, symbol: Optional[str] = None
+    ) -> float:
         """
         优化版ATR计算
 
         Args:
-            df: OHLC数据
+            df: OHLC数据（DataFrame 或 OHLCVRingBuffer）
             window: ATR窗口
+            symbol: 交易对（可选，用于增量状态）
 
         Returns:
             当前ATR值
@@ -163,6 +288,13 @@ class OptimizedSignalProcessor:
         if len(df) < window:
             return 0.0
 
+        state = self._synced_state(df, symbol, None, None, window)
+        if state is not None:
+            return float(state.atr)
+
+        if isinstance(df, OHLCVRingBuffer):
+            return float(fast_atr(df.high, df.low, df.close, window)[-1])
+
         required_cols = ["high", "low", "close"]
         if not all(col in df.columns for col in required_cols):
             # 简化版本：使用收盘价变化
@@ -184,13 +316,23 @@ class OptimizedSignalProcessor:
         return float(atr.iloc[-1])
 
     def get_cache_stats(self) -> Dict[str, Any]:
-        """获取缓存统计信息（兼容性方法）"""
-        return {
-            "enabled": True,
-            "size": len(self._cache),
-            "max_size": 100,  # 硬编码的最大缓存大小
-            "hit_rate": "简化版缓存，无命中率统计",
-        }
+        """
+        获取缓存统计信息
+
+        Returns:
+            包含enabled/size/max_size/hits/misses/evictions/hit_rate的字典
+        """
+        return {"enabled": True, **self.signal_cache.stats()}
+
+    def publish_cache_metrics(self, metrics: Any, cache_name: str = "vectorized") -> None:
+        """
+        将缓存统计推送到Prometheus收集器
+
+        Args:
+            metrics: TradingMetricsCollector实例
+            cache_name: 指标中的cache标签
+        """
+        metrics.update_signal_cache_stats(cache_name, self.signal_cache.stats())
 
 
 # 全局处理器实例（复用以避免重复初始化）
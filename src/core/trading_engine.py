@@ -731,7 +731,7 @@ class TradingEngine:
             # 2. 使用M3优化版信号处理器计算交易信号
             with self.metrics.measure_signal_latency():
                 signals = self.signal_processor.get_trading_signals_optimized(
-                    price_data, fast_win, slow_win
+                    price_data, fast_win, slow_win, symbol=symbol
                 )
 
             # 3. 验证信号
@@ -740,7 +740,7 @@ class TradingEngine:
                 return False
 
             # 4. 计算ATR（使用优化版本）
-            atr = self.signal_processor.compute_atr_optimized(price_data)
+            atr = self.signal_processor.compute_atr_optimized(price_data, symbol=symbol)
 
             # 4.5 如果止损已触发，则跳过新的买卖信号处理
             stop_triggered = self.broker.check_stop_loss(symbol, signals["current_price"])
@@ -807,6 +807,9 @@ class TradingEngine:
             position_count = len(self.broker.positions)
             self.metrics.update_position_count(position_count)
 
+            # 信号缓存统计
+            self.signal_processor.publish_cache_metrics(self.metrics)
+
         except Exception as e:
             print(f"更新监控指标失败: {e}")
 
@@ -41,6 +41,9 @@ from .loaders.csv_loader import (
     load_ohlcv_csv,
 )
 
+# 列式行情存储
+from .storage.market_store import ParquetMarketStore
+
 # 向后兼容 - 从processors导入
 from .processors.data_processor import (
     load_data,
@@ -73,6 +76,8 @@ __all__ = [
     "CSVDataLoader",
     "load_csv",
     "load_ohlcv_csv",
+    # 列式行情存储
+    "ParquetMarketStore",
     # 技术指标
     "TechnicalIndicators",
     "VolatilityIndicators",
@@ -13,6 +13,8 @@ from typing import Dict
 import numpy as np
 import pandas as pd
 
+from src.indicators.moving_averages import weighted_moving_average
+
 
 class TechnicalIndicators:
     """技术指标计算器类"""
@@ -25,7 +27,7 @@ class TechnicalIndicators:
         参数:
             prices: 价格序列
             window: 窗口大小
-            ma_type: 移动平均类型 ('simple', 'exponential')
+            ma_type: 移动平均类型 ('simple', 'exponential', 'weighted')
 
         返回:
             移动平均序列
@@ -34,6 +36,8 @@ class TechnicalIndicators:
             return prices.rolling(window=window).mean()
         elif ma_type.lower() == "exponential":
             return prices.ewm(span=window).mean()
+        elif ma_type.lower() == "weighted":
+            return weighted_moving_average(prices, window)
         else:
             raise ValueError(f"不支持的移动平均类型: {ma_type}")
 
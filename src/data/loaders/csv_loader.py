@@ -9,23 +9,37 @@ CSV数据加载器模块 (CSV Data Loader Module)
 """
 
 import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
+from ..storage.market_store import ParquetMarketStore
+
 
 class CSVDataLoader:
     """CSV数据加载器类"""
 
-    def __init__(self, base_path: Optional[Union[str, Path]] = None):
+    def __init__(
+        self,
+        base_path: Optional[Union[str, Path]] = None,
+        store: Optional[ParquetMarketStore] = None,
+    ):
         """
         初始化CSV数据加载器
 
         参数:
             base_path: 数据文件基础路径
+            store: 列式行情存储（可选，用于 load_market_data）
         """
         self.base_path = Path(base_path) if base_path else Path.cwd()
+        self.store = store
+        # 最近一次流式读取的吞吐统计
+        self.last_load_stats: Dict[str, Any] = {}
 
     def load_data(
         self, file_path: Union[str, Path], columns: Optional[List[str]] = None, **kwargs
@@ -140,8 +154,6 @@ class CSVDataLoader:
         """
         from datetime import datetime, timedelta
 
-        import numpy as np
-
         # 生成日期范围
         days = 1000
         end_date = datetime.now()
@@ -209,6 +221,44 @@ class CSVDataLoader:
 
         return self._process_ohlcv_data(df, date_column)
 
+    def load_market_data(
+        self,
+        symbol: str,
+        interval: str,
+        start=None,
+        end=None,
+        columns: Optional[List[str]] = None,
+        csv_path: Optional[Union[str, Path]] = None,
+        date_column: str = "date",
+    ) -> pd.DataFrame:
+        """
+        从列式行情存储加载OHLCV数据；存储中没有该交易对时解析CSV并写入存储
+
+        首次运行解析一次CSV，之后的运行直接按列和时间范围读取Parquet分片。
+
+        参数:
+            symbol: 交易对
+            interval: K线周期
+            start: 起始时间（含，可选）
+            end: 结束时间（含，可选）
+            columns: 需要的列（可选）
+            csv_path: 存储中无数据时导入的CSV文件（可选）
+            date_column: CSV中的日期列名
+
+        返回:
+            以DatetimeIndex为索引的OHLCV DataFrame
+        """
+        if self.store is None:
+            raise ValueError("未配置行情存储(store)")
+
+        if not self.store.has_data(symbol, interval) and csv_path is not None:
+            df = self.load_ohlcv_data(csv_path, date_column=date_column)
+            if isinstance(df.index, pd.DatetimeIndex) and not df.empty:
+                self.store.append(symbol, interval, df)
+                print(f"✅ 已导入行情存储: {symbol} {interval} ({len(df)} 行)")
+
+        return self.store.read(symbol, interval, start=start, end=end, columns=columns)
+
     def _process_ohlcv_data(self, df: pd.DataFrame, date_column: str = "date") -> pd.DataFrame:
         """
         处理OHLCV数据的内部方法
@@ -264,40 +314,163 @@ class CSVDataLoader:
                     print(f"  💡 建议: '{missing_col}' 可能对应 {possible_matches}")
 
     def load_multiple_files(
-        self, file_patterns: List[Union[str, Path]], combine: bool = False
-    ) -> Union[List[pd.DataFrame], pd.DataFrame]:
+        self,
+        file_patterns: List[Union[str, Path]],
+        combine: bool = False,
+        streaming: bool = False,
+        chunksize: Optional[int] = None,
+        float32_prices: bool = False,
+        dtype: Optional[Dict[str, Any]] = None,
+        max_workers: Optional[int] = None,
+    ) -> Union[List[pd.DataFrame], pd.DataFrame, Iterator[pd.DataFrame]]:
         """
         加载多个CSV文件
 
         参数:
             file_patterns: 文件路径模式列表
             combine: 是否合并所有数据
+            streaming: 流式模式（见 iter_multiple_files）：显式dtype、分类型source_file、
+                线程池并行解析；combine=False时返回逐块迭代器
+            chunksize: 流式模式下单个文件按此行数分块读取（None为整文件）
+            float32_prices: 流式模式下价格列使用float32
+            dtype: 流式模式下额外的列类型
+            max_workers: 流式模式下并行解析的线程数
 
         返回:
-            DataFrame列表或合并后的DataFrame
+            DataFrame列表、合并后的DataFrame，或流式模式下的DataFrame迭代器
         """
+        if streaming:
+            chunks = self.iter_multiple_files(
+                file_patterns,
+                chunksize=chunksize,
+                float32_prices=float32_prices,
+                dtype=dtype,
+                max_workers=max_workers,
+            )
+            if not combine:
+                return chunks
+            return self._combine_chunks(chunks)
+
         dataframes = []
 
+        for file_path in self._resolve_file_patterns(file_patterns):
+            df = self.load_data(file_path)
+            if not df.empty:
+                df["source_file"] = file_path.name  # 添加来源文件信息
+                dataframes.append(df)
+
+        if combine and dataframes:
+            combined_df = pd.concat(dataframes, ignore_index=True)
+            print(f"✅ 合并了 {len(dataframes)} 个文件的数据")
+            return combined_df
+
+        return dataframes
+
+    def _resolve_file_patterns(self, file_patterns: List[Union[str, Path]]) -> List[Path]:
+        """展开通配符，返回存在的文件路径"""
+        files = []
         for pattern in file_patterns:
             if isinstance(pattern, str) and ("*" in pattern or "?" in pattern):
                 # 处理通配符模式
-                matching_files = list(self.base_path.glob(pattern))
+                matching_files = sorted(self.base_path.glob(pattern))
             else:
                 matching_files = [self.base_path / pattern]
+            files.extend(path for path in matching_files if path.exists())
+        return files
+
+    def iter_multiple_files(
+        self,
+        file_patterns: List[Union[str, Path]],
+        chunksize: Optional[int] = None,
+        float32_prices: bool = False,
+        dtype: Optional[Dict[str, Any]] = None,
+        max_workers: Optional[int] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        流式读取多个CSV文件，按文件顺序逐块产出
 
-            for file_path in matching_files:
-                if file_path.exists():
-                    df = self.load_data(file_path)
-                    if not df.empty:
-                        df["source_file"] = file_path.name  # 添加来源文件信息
-                        dataframes.append(df)
+        - 解析时即指定列类型，价格列可选float32
+        - source_file 为分类类型（所有块共享同一组类别），不按行重复存字符串
+        - chunksize为None时各文件在线程池中并行解析，同时在途的文件数不超过线程数；
+          否则逐文件按chunksize行分块读取，内存占用与块大小成正比
+        - 读取结束后吞吐统计写入 self.last_load_stats
 
-        if combine and dataframes:
-            combined_df = pd.concat(dataframes, ignore_index=True)
-            print(f"✅ 合并了 {len(dataframes)} 个文件的数据")
-            return combined_df
+        参数:
+            file_patterns: 文件路径模式列表
+            chunksize: 单个文件分块读取的行数（None为整文件）
+            float32_prices: 价格列(open/high/low/close)使用float32
+            dtype: 额外的列类型，覆盖默认设置
+            max_workers: 并行解析的线程数（默认min(4, 文件数)）
 
-        return dataframes
+        返回:
+            DataFrame迭代器
+        """
+        files = self._resolve_file_patterns(file_patterns)
+        source_dtype = pd.CategoricalDtype([path.name for path in files])
+        read_kwargs = {"dtype": self._stream_dtypes(float32_prices, dtype)}
+
+        stats = {"files": len(files), "rows": 0, "bytes": sum(p.stat().st_size for p in files)}
+        start = time.perf_counter()
+
+        for code, df in self._parse_files(files, chunksize, max_workers, read_kwargs):
+            df["source_file"] = pd.Categorical.from_codes(
+                np.full(len(df), code, dtype=np.int32), dtype=source_dtype
+            )
+            stats["rows"] += len(df)
+            yield df
+
+        stats["seconds"] = time.perf_counter() - start
+        stats["bytes_per_second"] = stats["bytes"] / stats["seconds"] if stats["seconds"] else 0.0
+        self.last_load_stats = stats
+
+    @staticmethod
+    def _stream_dtypes(float32_prices: bool, dtype: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        price_type = np.float32 if float32_prices else np.float64
+        dtypes = {column: price_type for column in ("open", "high", "low", "close")}
+        dtypes["volume"] = np.float64
+        dtypes.update(dtype or {})
+        return dtypes
+
+    @staticmethod
+    def _parse_files(
+        files: List[Path],
+        chunksize: Optional[int],
+        max_workers: Optional[int],
+        read_kwargs: Dict[str, Any],
+    ) -> Iterator[Tuple[int, pd.DataFrame]]:
+        """按文件顺序产出 (文件序号, 数据块)"""
+        if chunksize is not None:
+            for code, path in enumerate(files):
+                with pd.read_csv(path, chunksize=chunksize, **read_kwargs) as reader:
+                    for chunk in reader:
+                        yield code, chunk
+            return
+
+        workers = max_workers or min(4, max(1, len(files)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            for code, path in enumerate(files):
+                pending.append(executor.submit(pd.read_csv, path, **read_kwargs))
+                # 在途文件数不超过线程数，按顺序产出
+                if len(pending) >= workers:
+                    yield code - len(pending) + 1, pending.popleft().result()
+            first_code = len(files) - len(pending)
+            for offset, future in enumerate(pending):
+                yield first_code + offset, future.result()
+
+    def _combine_chunks(self, chunks: Iterator[pd.DataFrame]) -> pd.DataFrame:
+        """合并流式数据块并打印吞吐"""
+        frames = [chunk for chunk in chunks if not chunk.empty]
+        if not frames:
+            return pd.DataFrame()
+
+        combined_df = pd.concat(frames, ignore_index=True)
+        stats = self.last_load_stats
+        print(
+            f"✅ 合并了 {stats['files']} 个文件的数据 ({stats['rows']} 行, "
+            f"{stats['bytes_per_second'] / (1024 * 1024):.1f} MB/s)"
+        )
+        return combined_df
 
     def get_file_info(self, file_path: Union[str, Path]) -> dict:
         """
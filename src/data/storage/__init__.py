@@ -0,0 +1,9 @@
+"""
+数据存储模块 (Data Storage Module)
+
+提供按交易对/周期/时间分区的列式行情存储
+"""
+
+from .market_store import ParquetMarketStore
+
+__all__ = ["ParquetMarketStore"]
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+列式行情存储 (Columnar Market Data Store)
+
+用途：
+- 按 交易对 / K线周期 / 时间分区 存放OHLCV数据（Parquet分片）
+- 读取时按分区目录与分片文件名做时间范围裁剪，只读取需要的列
+- 追加新K线只写新分片，不重写已有文件；compact() 合并分区内分片
+- 安装pyarrow时以内存映射方式读取，否则回退到pandas默认Parquet引擎
+
+目录结构::
+
+    <root>/symbol=BTCUSDT/interval=1m/date=2024-01/part-00001-<首条ms>-<末条ms>.parquet
+"""
+
+import numbers
+import os
+import re
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+
+try:
+    import pyarrow.parquet as pq
+
+    ARROW_AVAILABLE = True
+except ImportError:  # pragma: no cover - 取决于运行环境
+    pq = None
+    ARROW_AVAILABLE = False
+
+TIMESTAMP_COLUMN = "timestamp"
+
+# 分区粒度 -> pandas Period 频率
+PARTITION_FREQS = {"day": "D", "month": "M", "year": "Y"}
+
+_PART_PATTERN = re.compile(r"^part-(\d+)-(\d+)-(\d+)\.parquet$")
+
+TimeLike = Union[str, pd.Timestamp, int, None]
+
+
+def _to_ms(value: TimeLike) -> Optional[int]:
+    """时间（字符串/Timestamp/毫秒整数）转为UTC毫秒时间戳"""
+    if value is None:
+        return None
+    if isinstance(value, numbers.Integral):
+        return int(value)
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert("UTC").tz_localize(None)
+    return ts.value // 1_000_000
+
+
+def _index_to_ms(index: pd.DatetimeIndex) -> pd.Index:
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+    return pd.Index(index.as_unit("ms").asi8)
+
+
+class ParquetMarketStore:
+    """
+    按交易对/周期/时间分区的Parquet行情存储
+
+    数据以毫秒时间戳列 ``timestamp`` 存储，读取时还原为DatetimeIndex。
+    同一时间戳在多个分片中出现时，以后写入的分片为准。
+    """
+
+    def __init__(self, root: Union[str, Path], partition: str = "month"):
+        """
+        初始化行情存储
+
+        参数:
+            root: 存储根目录
+            partition: 时间分区粒度 ('day', 'month', 'year')
+        """
+        if partition not in PARTITION_FREQS:
+            raise ValueError(f"不支持的分区粒度: {partition}. 支持: {list(PARTITION_FREQS)}")
+        self.root = Path(root)
+        self.partition = partition
+        self._freq = PARTITION_FREQS[partition]
+
+    # ------------------------------------------------------------------
+    # 路径与分片
+    # ------------------------------------------------------------------
+
+    def _series_dir(self, symbol: str, interval: str) -> Path:
+        # "BTC/USDT" 之类的交易对不能直接作为目录名
+        symbol = symbol.replace("/", "-")
+        return self.root / f"symbol={symbol}" / f"interval={interval}"
+
+    def _partition_label(self, ms: int) -> str:
+        return str(pd.Timestamp(ms, unit="ms").to_period(self._freq))
+
+    def _list_parts(self, symbol: str, interval: str) -> List[Tuple[str, int, int, int, Path]]:
+        """列出分片: (分区, 序号, 首条ms, 末条ms, 路径)，按写入顺序排列"""
+        series_dir = self._series_dir(symbol, interval)
+        if not series_dir.exists():
+            return []
+
+        parts = []
+        for partition_dir in series_dir.glob("date=*"):
+            label = partition_dir.name.split("=", 1)[1]
+            for path in partition_dir.iterdir():
+                match = _PART_PATTERN.match(path.name)
+                if match:
+                    seq, first, last = (int(group) for group in match.groups())
+                    parts.append((label, seq, first, last, path))
+        parts.sort(key=lambda part: part[1])
+        return parts
+
+    def _select_parts(
+        self, symbol: str, interval: str, start_ms: Optional[int], end_ms: Optional[int]
+    ) -> List[Path]:
+        """按分区目录与分片首末时间裁剪需要读取的分片"""
+        start_label = self._partition_label(start_ms) if start_ms is not None else None
+        end_label = self._partition_label(end_ms) if end_ms is not None else None
+
+        selected = []
+        for label, _, first, last, path in self._list_parts(symbol, interval):
+            # 分区标签为定长日期字符串，可直接按字典序比较
+            if start_label is not None and label < start_label:
+                continue
+            if end_label is not None and label > end_label:
+                continue
+            if start_ms is not None and last < start_ms:
+                continue
+            if end_ms is not None and first > end_ms:
+                continue
+            selected.append(path)
+        return selected
+
+    # ------------------------------------------------------------------
+    # 写入
+    # ------------------------------------------------------------------
+
+    def append(self, symbol: str, interval: str, data: pd.DataFrame) -> int:
+        """
+        追加K线数据（只写新分片，不修改已有文件）
+
+        参数:
+            symbol: 交易对
+            interval: K线周期
+            data: 以DatetimeIndex为索引（或含timestamp列）的OHLCV数据
+
+        返回:
+            写入的行数
+        """
+        frame = self._normalize(data)
+        if frame.empty:
+            return 0
+
+        labels = pd.to_datetime(frame[TIMESTAMP_COLUMN], unit="ms").dt.to_period(self._freq)
+        next_seq = max((part[1] for part in self._list_parts(symbol, interval)), default=0) + 1
+
+        for label, chunk in frame.groupby(labels.astype(str), sort=True):
+            self._write_part(symbol, interval, label, next_seq, chunk)
+            next_seq += 1
+        return len(frame)
+
+    def _normalize(self, data: pd.DataFrame) -> pd.DataFrame:
+        """转换为以毫秒时间戳列开头、按时间排序去重的DataFrame"""
+        if TIMESTAMP_COLUMN in data.columns:
+            frame = data.reset_index(drop=True)
+            timestamps = frame[TIMESTAMP_COLUMN]
+            if pd.api.types.is_datetime64_any_dtype(timestamps):
+                frame[TIMESTAMP_COLUMN] = _index_to_ms(pd.DatetimeIndex(timestamps)).to_numpy()
+        elif isinstance(data.index, pd.DatetimeIndex):
+            frame = data.reset_index(drop=True)
+            frame.insert(0, TIMESTAMP_COLUMN, _index_to_ms(data.index).to_numpy())
+        else:
+            raise ValueError("数据必须具有DatetimeIndex索引或timestamp列")
+
+        frame[TIMESTAMP_COLUMN] = frame[TIMESTAMP_COLUMN].astype("int64")
+        frame = frame.sort_values(TIMESTAMP_COLUMN, kind="stable")
+        return frame.drop_duplicates(TIMESTAMP_COLUMN, keep="last").reset_index(drop=True)
+
+    def _write_part(
+        self, symbol: str, interval: str, label: str, seq: int, chunk: pd.DataFrame
+    ) -> Path:
+        partition_dir = self._series_dir(symbol, interval) / f"date={label}"
+        partition_dir.mkdir(parents=True, exist_ok=True)
+
+        first = int(chunk[TIMESTAMP_COLUMN].iloc[0])
+        last = int(chunk[TIMESTAMP_COLUMN].iloc[-1])
+        path = partition_dir / f"part-{seq:05d}-{first}-{last}.parquet"
+
+        # 先写临时文件再原子替换，读取方不会看到写了一半的分片
+        tmp_path = partition_dir / f".{uuid.uuid4().hex}.tmp"
+        chunk.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+        return path
+
+    # ------------------------------------------------------------------
+    # 读取
+    # ------------------------------------------------------------------
+
+    def read(
+        self,
+        symbol: str,
+        interval: str,
+        start: TimeLike = None,
+        end: TimeLike = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> pd.DataFrame:
+        """
+        读取时间范围内的K线
+
+        参数:
+            symbol: 交易对
+            interval: K线周期
+            start: 起始时间（含，None为不限）
+            end: 结束时间（含，None为不限）
+            columns: 需要的列（None为全部）
+
+        返回:
+            以DatetimeIndex（名为timestamp）为索引的DataFrame；无数据时为空DataFrame
+        """
+        start_ms, end_ms = _to_ms(start), _to_ms(end)
+        paths = self._select_parts(symbol, interval, start_ms, end_ms)
+        if not paths:
+            return pd.DataFrame()
+
+        read_columns = None
+        if columns is not None:
+            read_columns = [TIMESTAMP_COLUMN] + [c for c in columns if c != TIMESTAMP_COLUMN]
+        filters = []
+        if start_ms is not None:
+            filters.append((TIMESTAMP_COLUMN, ">=", start_ms))
+        if end_ms is not None:
+            filters.append((TIMESTAMP_COLUMN, "<=", end_ms))
+
+        # 按写入顺序拼接，后写入的重复时间戳覆盖先写入的
+        frame = pd.concat(
+            [self._read_part(path, read_columns, filters or None) for path in paths],
+            ignore_index=True,
+        )
+        frame = frame.drop_duplicates(TIMESTAMP_COLUMN, keep="last")
+
+        if start_ms is not None:
+            frame = frame[frame[TIMESTAMP_COLUMN] >= start_ms]
+        if end_ms is not None:
+            frame = frame[frame[TIMESTAMP_COLUMN] <= end_ms]
+        frame = frame.sort_values(TIMESTAMP_COLUMN, kind="stable")
+
+        index = pd.DatetimeIndex(pd.to_datetime(frame[TIMESTAMP_COLUMN], unit="ms"))
+        index.name = TIMESTAMP_COLUMN
+        return frame.drop(columns=TIMESTAMP_COLUMN).set_axis(index, axis=0)
+
+    @staticmethod
+    def _read_part(
+        path: Path, columns: Optional[List[str]], filters: Optional[List[Tuple]]
+    ) -> pd.DataFrame:
+        if ARROW_AVAILABLE:
+            # 关闭hive分区推断，否则路径中的symbol=/interval=/date=会被当作数据列读出
+            table = pq.read_table(
+                path, columns=columns, filters=filters, memory_map=True, partitioning=None
+            )
+            return table.to_pandas()
+        return pd.read_parquet(path, columns=columns, filters=filters)
+
+    # ------------------------------------------------------------------
+    # 维护与元数据
+    # ------------------------------------------------------------------
+
+    def compact(self, symbol: str, interval: str) -> int:
+        """
+        合并每个分区内的多个分片为一个（去重后重写该分区）
+
+        返回:
+            被合并掉的分片数
+        """
+        by_partition: Dict[str, List[Tuple[str, int, int, int, Path]]] = {}
+        for part in self._list_parts(symbol, interval):
+            by_partition.setdefault(part[0], []).append(part)
+
+        removed = 0
+        for label, parts in by_partition.items():
+            if len(parts) < 2:
+                continue
+            frame = pd.concat(
+                [self._read_part(part[4], None, None) for part in parts], ignore_index=True
+            )
+            frame = self._normalize(frame)
+            # 新分片沿用分区内最大序号，保持与其他分区的先后关系；
+            # 先写新分片再删旧分片，中途失败时读取结果不变
+            merged = self._write_part(symbol, interval, label, parts[-1][1], frame)
+            for part in parts:
+                if part[4] != merged:
+                    part[4].unlink(missing_ok=True)
+            removed += len(parts) - 1
+        return removed
+
+    def time_range(self, symbol: str, interval: str) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """已存储数据的首末时间（仅读取文件名）"""
+        parts = self._list_parts(symbol, interval)
+        if not parts:
+            return None
+        first = min(part[2] for part in parts)
+        last = max(part[3] for part in parts)
+        return pd.Timestamp(first, unit="ms"), pd.Timestamp(last, unit="ms")
+
+    def has_data(self, symbol: str, interval: str) -> bool:
+        return bool(self._list_parts(symbol, interval))
+
+    def symbols(self) -> List[str]:
+        """已存储的交易对（交易对中的"/"存为"-"）"""
+        if not self.root.exists():
+            return []
+        return sorted(path.name.split("=", 1)[1] for path in self.root.glob("symbol=*"))
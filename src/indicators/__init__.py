@@ -15,6 +15,13 @@ from .cross_signals import (
     crossunder,
     vectorized_cross,
 )
+from .indicator_cache import (
+    IndicatorCache,
+    cached_indicator,
+    configure_indicator_cache,
+    get_indicator_cache,
+    reset_indicator_cache,
+)
 from .momentum_indicators import momentum, rate_of_change, zscore
 from .moving_averages import (
     exponential_moving_average,
@@ -47,4 +54,10 @@ __all__ = [
     "bollinger_bands",
     "average_true_range",
     "standard_deviation",
+    # 指标缓存
+    "IndicatorCache",
+    "cached_indicator",
+    "configure_indicator_cache",
+    "get_indicator_cache",
+    "reset_indicator_cache",
 ]
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+指标计算缓存 (Indicator Computation Cache)
+
+同一份行情数据上运行多个策略时，SMA(20)、ATR(14) 等指标只计算一次：
+- 键为 (数据标识, 指标名, 参数)，数据标识取底层数组内存地址 + 形状 + 首尾值
+- 缓存项持有底层数组的弱引用，数据被释放后自动失效
+- 按结果占用字节数做LRU淘汰，总量不超过 max_bytes
+- 原地修改数据后需调用 invalidate() 显式失效
+"""
+
+import functools
+import inspect
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def _root_array(values: np.ndarray) -> np.ndarray:
+    """沿 .base 找到真正持有内存的数组"""
+    while isinstance(values.base, np.ndarray):
+        values = values.base
+    return values
+
+
+def _index_key(index: pd.Index) -> Tuple:
+    if isinstance(index, pd.RangeIndex):
+        return ("range", index.start, index.stop, index.step)
+    if len(index) == 0:
+        return ("empty",)
+    return (len(index), index[0], index[-1])
+
+
+def data_key(data: Any) -> Optional[Tuple[Tuple, np.ndarray]]:
+    """
+    计算数据标识
+
+    参数:
+        data: pd.Series 或 np.ndarray
+
+    返回:
+        (标识元组, 持有内存的数组)；无法标识（非数值、非ndarray内存等）时返回None
+    """
+    if isinstance(data, pd.Series):
+        values = data.to_numpy(copy=False)
+        index = _index_key(data.index)
+    elif isinstance(data, np.ndarray):
+        values = data
+        index = None
+    else:
+        return None
+
+    if values.dtype.kind not in "biuf":
+        return None
+
+    root = _root_array(values)
+    # 首尾值按字节比较（NaN也能稳定匹配）
+    first = values.flat[0].tobytes() if values.size else b""
+    last = values.flat[-1].tobytes() if values.size else b""
+    key = (
+        values.__array_interface__["data"][0],
+        values.shape,
+        values.strides,
+        values.dtype.str,
+        index,
+        first,
+        last,
+    )
+    return key, root
+
+
+def _result_nbytes(result: Any) -> int:
+    if isinstance(result, (pd.Series, pd.DataFrame)):
+        return int(np.sum(result.memory_usage(index=False, deep=False)))
+    if isinstance(result, np.ndarray):
+        return result.nbytes
+    if isinstance(result, (tuple, list)):
+        return sum(_result_nbytes(item) for item in result)
+    if isinstance(result, dict):
+        return sum(_result_nbytes(item) for item in result.values())
+    return 0
+
+
+class _Entry:
+    __slots__ = ("value", "nbytes", "roots", "buffers", "name")
+
+    def __init__(self, value, nbytes, roots, buffers, name):
+        self.value = value
+        self.nbytes = nbytes
+        self.roots = roots
+        self.buffers = buffers
+        self.name = name
+
+    def alive(self) -> bool:
+        return all(ref() is not None for ref in self.roots)
+
+
+class IndicatorCache:
+    """
+    按内存上限淘汰的指标缓存
+
+    缓存结果为共享对象，调用方不应原地修改返回的Series。
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, enabled: bool = True):
+        """
+        初始化指标缓存
+
+        参数:
+            max_bytes: 缓存结果总字节数上限
+            enabled: 是否启用（禁用时直接计算）
+        """
+        if max_bytes <= 0:
+            raise ValueError("max_bytes必须为正数")
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def get_or_compute(
+        self,
+        name: str,
+        inputs: Sequence[Any],
+        params: Hashable,
+        compute: Callable[[], Any],
+    ) -> Any:
+        """
+        查询缓存，未命中时计算并写入
+
+        参数:
+            name: 指标名
+            inputs: 参与计算的数据序列（Series/ndarray）
+            params: 可哈希的参数（例如元组）
+            compute: 无参计算函数
+
+        返回:
+            指标结果
+        """
+        if not self.enabled:
+            return compute()
+
+        identities = [data_key(data) for data in inputs]
+        if any(identity is None for identity in identities):
+            return compute()
+
+        key = (name, tuple(identity[0] for identity in identities), params)
+        try:
+            hash(key)
+        except TypeError:
+            return compute()
+
+        found, value = self._lookup(key)
+        if found:
+            return value
+
+        value = compute()
+        self._store(key, value, identities)
+        return value
+
+    def _lookup(self, key: Hashable) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                if entry.alive():
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return True, entry.value
+                self._remove(key)
+            self.misses += 1
+        return False, None
+
+    def _store(self, key: Hashable, value: Any, identities: List[Tuple]) -> None:
+        nbytes = _result_nbytes(value)
+        if nbytes > self.max_bytes:
+            return
+        try:
+            roots = tuple(weakref.ref(identity[1]) for identity in identities)
+        except TypeError:
+            return
+
+        with self._lock:
+            if key in self.entries:
+                self._remove(key)
+            # 缓冲区 = (地址, 形状, 步长, dtype)，原地修改后不变
+            buffers = tuple(identity[0][:4] for identity in identities)
+            self.entries[key] = _Entry(value, nbytes, roots, buffers, key[0])
+            self.current_bytes += nbytes
+            while self.current_bytes > self.max_bytes and self.entries:
+                self._remove(next(iter(self.entries)))
+                self.evictions += 1
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self.entries.pop(key)
+        self.current_bytes -= entry.nbytes
+
+    def invalidate(self, data: Any = None, name: Optional[str] = None) -> int:
+        """
+        显式失效缓存项
+
+        参数:
+            data: 只失效以该数据为输入的项（None为不限）
+            name: 只失效该指标的项（None为不限）
+
+        返回:
+            失效的条目数
+        """
+        buffer = None
+        if data is not None:
+            identity = data_key(data)
+            if identity is None:
+                return 0
+            # 按内存缓冲区匹配，原地修改后首尾值变化也能失效
+            buffer = identity[0][:4]
+
+        with self._lock:
+            keys = [
+                key
+                for key, entry in self.entries.items()
+                if (buffer is None or buffer in entry.buffers)
+                and (name is None or entry.name == name)
+            ]
+            for key in keys:
+                self._remove(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        """清空缓存（统计计数保留）"""
+        with self._lock:
+            self.entries.clear()
+            self.current_bytes = 0
+
+    def size(self) -> int:
+        return len(self.entries)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """缓存统计"""
+        return {
+            "size": len(self.entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
+
+
+_global_cache: Optional[IndicatorCache] = None
+
+
+def get_indicator_cache() -> IndicatorCache:
+    """获取全局指标缓存实例"""
+    global _global_cache
+    if _global_cache is None:
+        _global_cache = IndicatorCache()
+    return _global_cache
+
+
+def configure_indicator_cache(
+    max_bytes: int = DEFAULT_MAX_BYTES, enabled: bool = True
+) -> IndicatorCache:
+    """
+    以新参数替换全局指标缓存（原有缓存项全部丢弃）
+
+    参数:
+        max_bytes: 缓存结果总字节数上限
+        enabled: 是否启用
+
+    返回:
+        新的全局缓存实例
+    """
+    global _global_cache
+    _global_cache = IndicatorCache(max_bytes=max_bytes, enabled=enabled)
+    return _global_cache
+
+
+def reset_indicator_cache() -> None:
+    """丢弃全局指标缓存，下次使用时按默认参数重建"""
+    global _global_cache
+    _global_cache = None
+
+
+def cached_indicator(name: str, data_args: Sequence[str]) -> Callable:
+    """
+    指标函数缓存装饰器
+
+    参数:
+        name: 指标名
+        data_args: 作为数据输入的参数名，其余参数作为缓存键参数
+
+    返回:
+        装饰器
+    """
+
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                bound = signature.bind(*args, **kwargs)
+            except TypeError:
+                return func(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = bound.arguments
+            inputs = [arguments[arg] for arg in data_args]
+            params = tuple((k, v) for k, v in arguments.items() if k not in data_args)
+            return get_indicator_cache().get_or_compute(
+                name, inputs, params, lambda: func(*args, **kwargs)
+            )
+
+        return wrapper
+
+    return decorator
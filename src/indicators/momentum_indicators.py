@@ -8,6 +8,8 @@
 
 import pandas as pd
 
+from .indicator_cache import cached_indicator
+
 
 def momentum(series: pd.Series, period: int = 14) -> pd.Series:
     """
@@ -37,6 +39,7 @@ def rate_of_change(series: pd.Series, period: int = 14) -> pd.Series:
     return series.pct_change(period) * 100
 
 
+@cached_indicator("zscore", data_args=["series"])
 def zscore(series: pd.Series, window: int = 20) -> pd.Series:
     """
     计算z-score标准化
@@ -53,6 +56,7 @@ def zscore(series: pd.Series, window: int = 20) -> pd.Series:
     return (series - rolling_mean) / rolling_std
 
 
+@cached_indicator("rsi", data_args=["series"])
 def rsi(series: pd.Series, window: int = 14) -> pd.Series:
     """
     计算相对强弱指标 (RSI)
@@ -73,6 +77,7 @@ def rsi(series: pd.Series, window: int = 14) -> pd.Series:
     return rsi
 
 
+@cached_indicator("stochastic", data_args=["high", "low", "close"])
 def stochastic_oscillator(
     high: pd.Series, low: pd.Series, close: pd.Series, k_period: int = 14, d_period: int = 3
 ) -> tuple[pd.Series, pd.Series]:
@@ -5,6 +5,8 @@
 Moving Average Indicators Module
 """
 
+from typing import Optional
+
 import numpy as np
 import pandas as pd
 
@@ -50,6 +52,77 @@ def exponential_moving_average(data: pd.Series, window: int, alpha: float = None
     return data.ewm(alpha=alpha, adjust=False).mean()
 
 
+def _block_sums(values: np.ndarray, block: int):
+    """块内前缀和：S为x的累加，W为(块内位置×x)的累加"""
+    n_blocks = -(-len(values) // block)
+    padded = np.zeros(n_blocks * block)
+    padded[: len(values)] = values
+    blocks = padded.reshape(n_blocks, block)
+    positions = np.arange(block, dtype=np.float64)
+    sums = np.cumsum(blocks, axis=1).ravel()
+    weighted = np.cumsum(blocks * positions, axis=1).ravel()
+    return sums, weighted
+
+
+def rolling_wma(values: np.ndarray, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+    """
+    O(n) 滚动加权移动平均内核，权重为 1..m（最近的数据权重最大）
+
+    不足window的预热期按已有的m个数据取权重1..m；窗口内含NaN时结果为NaN。
+    使用分块前缀和：块长不小于窗口，窗口最多跨两块，
+    块内累加的量级有界，避免全局前缀和在长序列上的精度损失。
+
+    参数:
+        values: 输入数组
+        window: 移动平均窗口
+        min_periods: 输出所需的最少数据量（默认等于window）
+
+    返回:
+        float64数组
+    """
+    if window <= 0:
+        raise ValueError("移动平均窗口必须大于0")
+    if min_periods is None:
+        min_periods = window
+
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    if n == 0:
+        return np.empty(0)
+
+    block = max(8, 1 << (window - 1).bit_length())
+    valid = ~np.isnan(values)
+    sums, weighted = _block_sums(np.where(valid, values, 0.0), block)
+
+    ends = np.arange(n)
+    sizes = np.minimum(ends + 1, window)
+    starts = ends - sizes + 1
+    start_pos = starts % block
+    end_pos = ends % block
+
+    def range_sum(cumulative, first, last):
+        # 同一块内 [first, last] 的和（first为块内位置）
+        before = np.where(first % block > 0, cumulative[first - 1], 0.0)
+        return cumulative[last] - before
+
+    spans = starts // block != ends // block
+    head_end = np.where(spans, starts - start_pos + block - 1, ends)
+    # 起点所在块：权重 = 块内位置 - start_pos + 1
+    numerator = range_sum(weighted, starts, head_end) - (start_pos - 1) * range_sum(
+        sums, starts, head_end
+    )
+    # 终点所在块（跨块时）：权重 = 块内位置 + 已跨过的数量 + 1
+    tail_start = ends - end_pos
+    tail = range_sum(weighted, tail_start, ends) + (tail_start - starts + 1) * range_sum(
+        sums, tail_start, ends
+    )
+    numerator = numerator + np.where(spans, tail, 0.0)
+
+    counts = np.concatenate(([0], np.cumsum(valid)))
+    complete = (counts[ends + 1] - counts[starts] == sizes) & (sizes >= min_periods)
+    return np.where(complete, numerator / (sizes * (sizes + 1) / 2.0), np.nan)
+
+
 def weighted_moving_average(data: pd.Series, window: int) -> pd.Series:
     """
     计算加权移动平均线 (Weighted Moving Average, WMA)
@@ -59,23 +132,16 @@ def weighted_moving_average(data: pd.Series, window: int) -> pd.Series:
         window: 移动平均窗口
 
     返回:
-        pd.Series: 加权移动平均线序列
+        pd.Series: 加权移动平均线序列（预热期使用可用数据计算）
     """
     if window <= 0:
         raise ValueError("移动平均窗口必须大于0")
 
-    # 创建权重序列：最近的数据权重更大
-    weights = np.arange(1, window + 1)
-
-    def wma_calc(x):
-        if len(x) < window:
-            # 如果数据不足，使用可用数据计算
-            available_weights = weights[: len(x)]
-            return np.average(x, weights=available_weights)
-        else:
-            return np.average(x, weights=weights)
-
-    return data.rolling(window=window, min_periods=1).apply(wma_calc, raw=True)
+    return pd.Series(
+        rolling_wma(data.to_numpy(dtype=float), window, min_periods=1),
+        index=data.index,
+        name=data.name,
+    )
 
 
 # 兼容性别名
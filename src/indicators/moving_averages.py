@@ -6,10 +6,13 @@
 提供各种移动平均计算功能，包括简单、指数和加权移动平均
 """
 
-import numpy as np
 import pandas as pd
 
+from .indicator_cache import cached_indicator
+from .moving_average import rolling_wma
 
+
+@cached_indicator("sma", data_args=["series"])
 def simple_moving_average(series: pd.Series, window: int) -> pd.Series:
     """
     计算简单移动平均 (SMA)
@@ -24,6 +27,7 @@ def simple_moving_average(series: pd.Series, window: int) -> pd.Series:
     return series.rolling(window=window).mean()
 
 
+@cached_indicator("ema", data_args=["series"])
 def exponential_moving_average(series: pd.Series, window: int, adjust: bool = False) -> pd.Series:
     """
     计算指数移动平均 (EMA)
@@ -39,6 +43,7 @@ def exponential_moving_average(series: pd.Series, window: int, adjust: bool = Fa
     return series.ewm(span=window, adjust=adjust).mean()
 
 
+@cached_indicator("wma", data_args=["series"])
 def weighted_moving_average(series: pd.Series, window: int) -> pd.Series:
     """
     计算加权移动平均 (WMA)
@@ -50,9 +55,10 @@ def weighted_moving_average(series: pd.Series, window: int) -> pd.Series:
     返回:
         加权移动平均序列
     """
-    weights = np.arange(1, window + 1)
-    return series.rolling(window=window).apply(
-        lambda x: np.sum(weights * x) / np.sum(weights), raw=True
+    return pd.Series(
+        rolling_wma(series.to_numpy(dtype=float), window),
+        index=series.index,
+        name=series.name,
     )
 
 
@@ -10,7 +10,10 @@ from typing import Tuple
 
 import pandas as pd
 
+from .indicator_cache import cached_indicator
 
+
+@cached_indicator("bollinger_bands", data_args=["series"])
 def bollinger_bands(
     series: pd.Series, window: int = 20, num_std: float = 2.0
 ) -> Tuple[pd.Series, pd.Series, pd.Series]:
@@ -32,6 +35,7 @@ def bollinger_bands(
     return upper_band, middle_band, lower_band
 
 
+@cached_indicator("std", data_args=["series"])
 def standard_deviation(series: pd.Series, window: int = 20) -> pd.Series:
     """
     计算滚动标准差
@@ -46,6 +50,7 @@ def standard_deviation(series: pd.Series, window: int = 20) -> pd.Series:
     return series.rolling(window=window).std()
 
 
+@cached_indicator("atr", data_args=["high", "low", "close"])
 def average_true_range(
     high: pd.Series, low: pd.Series, close: pd.Series, window: int = 14
 ) -> pd.Series:
@@ -48,6 +48,11 @@ try:
 except ImportError:
     PrometheusExporter = None
 
+try:
+    from .health_scheduler import AsyncHealthScheduler
+except ImportError:
+    AsyncHealthScheduler = None
+
 
 def get_monitoring_system(*, port: int = 9090, enable_alerts: bool = True):
     """Create and wire a *monitoring stack* (监控系统).
@@ -97,6 +102,7 @@ __all__ = [
     "MetricsCollector",
     "HealthChecker",
     "AlertManager",
+    "AsyncHealthScheduler",
     # Aliases / helper factories
     "TradingMetricsCollector",
     "metrics_collector",
@@ -154,31 +154,49 @@ class AlertManager:
         for name, rule in self._alert_rules.items():
             try:
                 # Check if alert condition is met
-                should_fire = rule["condition"]()
+                alert = self._fire_if_due(name, rule, rule["condition"](), current_time)
+                if alert is not None:
+                    fired_alerts.append(alert)
 
-                if should_fire:
-                    # Check cooldown period
-                    last_fired = self._fired_alerts.get(name, 0)
-                    if current_time - last_fired >= rule["cooldown_seconds"]:
-                        alert = {
-                            "name": name,
-                            "severity": rule["severity"],
-                            "description": rule["description"],
-                            "timestamp": current_time,
-                            "status": "firing",
-                        }
-
-                        fired_alerts.append(alert)
-                        self._fired_alerts[name] = current_time
-
-                        # Send to handlers
-                        self._handle_alert(alert)
+                    # Send to handlers
+                    self._handle_alert(alert)
 
             except Exception as e:
                 self.logger.error(f"Error checking alert rule '{name}': {e}")
 
         return fired_alerts
 
+    def _fire_if_due(
+        self, name: str, rule: Dict[str, Any], should_fire: bool, current_time: float
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Apply the cooldown to an evaluated rule
+
+        Args:
+            name: Alert rule name
+            rule: Alert rule configuration
+            should_fire: Result of the rule condition
+            current_time: Evaluation timestamp
+
+        Returns:
+            The fired alert, or None if the rule did not fire or is cooling down
+        """
+        if not should_fire:
+            return None
+
+        last_fired = self._fired_alerts.get(name, 0)
+        if current_time - last_fired < rule["cooldown_seconds"]:
+            return None
+
+        self._fired_alerts[name] = current_time
+        return {
+            "name": name,
+            "severity": rule["severity"],
+            "description": rule["description"],
+            "timestamp": current_time,
+            "status": "firing",
+        }
+
     def _handle_alert(self, alert: Dict[str, Any]):
         """
         Handle a fired alert
@@ -6,6 +6,7 @@ Health Checker (健康检查器)
 Monitors system health and provides health check endpoints
 """
 
+import asyncio
 import logging
 import threading
 import time
@@ -80,9 +81,10 @@ class HealthChecker:
 
         Args:
             name: Name of the health check
-            check_func: Function that returns True if healthy
+            check_func: Function that returns True if healthy; coroutine functions are
+                only run by AsyncHealthScheduler
             critical: Whether this is a critical check
-            timeout: Check timeout in seconds
+            timeout: Check timeout in seconds (enforced by AsyncHealthScheduler)
         """
         self._health_checks[name] = {"func": check_func, "critical": critical, "timeout": timeout}
         self.logger.info(f"Registered health check: {name} (critical: {critical})")
@@ -204,6 +206,9 @@ class HealthChecker:
     def _run_single_check(self, name: str, check_config: Dict[str, Any]) -> Dict[str, Any]:
         """运行单个健康检查"""
         try:
+            if asyncio.iscoroutinefunction(check_config["func"]):
+                raise TypeError(f"Async health check '{name}' requires AsyncHealthScheduler")
+
             start_time = time.time()
             is_healthy = check_config["func"]()
             check_duration = time.time() - start_time
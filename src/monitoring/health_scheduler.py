@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+异步健康检查与告警调度
+Async Health Check and Alert Scheduler
+
+用途：
+- 并发运行 HealthChecker 的检查（asyncio.gather），每项检查独立超时
+- 协程检查直接await；同步检查（psutil、连接数、指标查询）放到线程池执行，不阻塞事件循环
+- 结果按TTL缓存，并发请求共享同一次刷新；/health 处理器只读缓存或等待刷新
+- 周期性评估 AlertManager 规则，告警处理器同样在线程池中执行
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, List, Optional
+
+from .alerting import AlertManager
+from .health_checker import HealthChecker
+
+
+class AsyncHealthScheduler:
+    """HealthChecker / AlertManager 的异步调度器"""
+
+    def __init__(
+        self,
+        health_checker: HealthChecker,
+        alert_manager: Optional[AlertManager] = None,
+        interval: float = 30.0,
+        cache_ttl: float = 5.0,
+        alert_timeout: float = 10.0,
+        executor: Optional[Executor] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        初始化调度器
+
+        Args:
+            health_checker: 健康检查器（检查项及其 timeout 取自 register_check）
+            alert_manager: 告警管理器（可选）
+            interval: 后台检查间隔（秒）
+            cache_ttl: 健康结果缓存有效期（秒）
+            alert_timeout: 单条告警规则的评估超时（秒）
+            executor: 同步检查使用的线程池（None为事件循环默认线程池）
+            clock: 单调时钟
+        """
+        self.health_checker = health_checker
+        self.alert_manager = alert_manager
+        self.interval = interval
+        self.cache_ttl = cache_ttl
+        self.alert_timeout = alert_timeout
+        self.executor = executor
+        self._clock = clock
+        self.logger = logging.getLogger(__name__)
+
+        self._results: Optional[Dict[str, Any]] = None
+        self._results_time = 0.0
+        self._refresh_task: Optional[asyncio.Future] = None
+        self._task: Optional[asyncio.Task] = None
+
+        self.run_count = 0
+        self.timeout_count = 0
+
+    async def _call(self, func: Callable[[], Any], timeout: float) -> Any:
+        """协程函数直接await，同步函数放到线程池；两者都受timeout约束"""
+        if asyncio.iscoroutinefunction(func):
+            return await asyncio.wait_for(func(), timeout)
+        loop = asyncio.get_running_loop()
+        # 超时后线程中的同步调用无法取消，只是不再等待其结果
+        return await asyncio.wait_for(loop.run_in_executor(self.executor, func), timeout)
+
+    # ------------------------------------------------------------------
+    # 健康检查
+    # ------------------------------------------------------------------
+
+    async def _run_check(self, name: str, check_config: Dict[str, Any]) -> Dict[str, Any]:
+        critical = check_config["critical"]
+        timeout = check_config["timeout"]
+        start_time = time.perf_counter()
+        try:
+            is_healthy = await self._call(check_config["func"], timeout)
+        except asyncio.TimeoutError:
+            self.timeout_count += 1
+            return {
+                "status": "timeout",
+                "critical": critical,
+                "error": f"Health check '{name}' timed out after {timeout}s",
+            }
+        except Exception as e:
+            return {"status": "error", "critical": critical, "error": str(e)}
+
+        return {
+            "status": "healthy" if is_healthy else "unhealthy",
+            "critical": critical,
+            "duration_ms": round((time.perf_counter() - start_time) * 1000, 2),
+        }
+
+    async def run_checks(self, check_name: Optional[str] = None) -> Dict[str, Any]:
+        """
+        并发运行健康检查
+
+        Args:
+            check_name: 只运行指定检查（None为全部）
+
+        Returns:
+            与 HealthChecker.run_health_check 结构相同的结果
+        """
+        results: Dict[str, Any] = {
+            "timestamp": time.time(),
+            "overall_status": "healthy",
+            "checks": {},
+        }
+        checks = self.health_checker._get_checks_to_run(check_name, results)
+        if not checks:
+            return results
+
+        outcomes = await asyncio.gather(
+            *(self._run_check(name, config) for name, config in checks.items())
+        )
+        results["checks"] = dict(zip(checks, outcomes))
+        critical_failed = any(
+            outcome["status"] != "healthy" and outcome["critical"] for outcome in outcomes
+        )
+        self.health_checker._update_overall_status(results, critical_failed)
+
+        if check_name is None:
+            self.run_count += 1
+            self._results = results
+            self._results_time = self._clock()
+            # 同步接口 get_health_status() 也读取最新结果
+            self.health_checker._last_check_results = results
+        return results
+
+    async def refresh(self) -> Dict[str, Any]:
+        """运行全部检查；已有刷新进行中时等待同一次结果"""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.ensure_future(self.run_checks())
+        return dict(await asyncio.shield(self._refresh_task))
+
+    async def get_health_status(self, max_age: Optional[float] = None) -> Dict[str, Any]:
+        """
+        获取健康状态（缓存未过期时直接返回）
+
+        Args:
+            max_age: 可接受的结果年龄（秒，默认 cache_ttl）
+
+        Returns:
+            健康检查结果
+        """
+        ttl = self.cache_ttl if max_age is None else max_age
+        if self._results is not None and self._clock() - self._results_time < ttl:
+            return dict(self._results)
+        return await self.refresh()
+
+    # ------------------------------------------------------------------
+    # 告警
+    # ------------------------------------------------------------------
+
+    async def check_alerts(self) -> List[Dict[str, Any]]:
+        """
+        并发评估告警规则，冷却与处理逻辑同 AlertManager.check_alerts
+
+        Returns:
+            本次触发的告警
+        """
+        if self.alert_manager is None or not self.alert_manager.enabled:
+            return []
+
+        rules = list(self.alert_manager._alert_rules.items())
+        outcomes = await asyncio.gather(
+            *(self._call(rule["condition"], self.alert_timeout) for _, rule in rules),
+            return_exceptions=True,
+        )
+
+        current_time = time.time()
+        fired_alerts = []
+        for (name, rule), outcome in zip(rules, outcomes):
+            if isinstance(outcome, BaseException):
+                self.logger.error(f"Error checking alert rule '{name}': {outcome!r}")
+                continue
+            alert = self.alert_manager._fire_if_due(name, rule, outcome, current_time)
+            if alert is not None:
+                fired_alerts.append(alert)
+
+        loop = asyncio.get_running_loop()
+        for alert in fired_alerts:
+            # 处理器可能做网络I/O（如Telegram），放到线程池
+            await loop.run_in_executor(self.executor, self.alert_manager._handle_alert, alert)
+        return fired_alerts
+
+    # ------------------------------------------------------------------
+    # 后台调度
+    # ------------------------------------------------------------------
+
+    async def run_once(self) -> Dict[str, Any]:
+        """运行一次健康检查与告警评估"""
+        results = await self.refresh()
+        if results["overall_status"] != "healthy":
+            failed = {
+                name: check
+                for name, check in results["checks"].items()
+                if check["status"] != "healthy"
+            }
+            self.logger.warning(f"Health status: {results['overall_status']} {failed}")
+        await self.check_alerts()
+        return results
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"Health monitoring error: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> asyncio.Task:
+        """在当前事件循环中启动后台检查任务"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="health-scheduler")
+            self.logger.info(f"Started async health monitoring (interval: {self.interval}s)")
+        return self._task
+
+    async def stop(self) -> None:
+        """停止后台检查任务"""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+            self.logger.info("Stopped async health monitoring")
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+
+    async def handle_health(self, request: Any) -> Any:
+        """aiohttp /health 处理器：healthy/degraded 返回200，否则503"""
+        from aiohttp import web
+
+        status = await self.get_health_status()
+        code = 200 if status["overall_status"] in ("healthy", "degraded") else 503
+        return web.json_response(status, status=code)
+
+    def add_routes(self, app: Any, path: str = "/health") -> None:
+        """注册 /health 路由到 aiohttp 应用"""
+        app.router.add_get(path, self.handle_health)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "run_count": self.run_count,
+            "timeout_count": self.timeout_count,
+            "cache_age": self._clock() - self._results_time if self._results else None,
+            "running": self._task is not None and not self._task.done(),
+        }
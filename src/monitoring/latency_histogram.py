@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+进程内延迟直方图（HDR风格）
+In-process Latency Histograms (HDR-style)
+
+用途：
+- 对数-线性分桶：每个2倍区间再等分为 2**precision_bits 个子桶，相对误差 ≤ 1/2**precision_bits
+- 每个线程写自己的分片（无锁；同一事件循环上的asyncio任务共享该线程的分片）
+- 线程退出后其分片并入一个退役分片，分片数随存活线程数而非历史线程数增长
+- snapshot() 合并分片为可相加/相减的快照，进程内直接查询 p50/p95/p99
+- LatencyHistogramCollector 在Prometheus抓取时把快照导出为 histogram + 分位数gauge
+"""
+
+import math
+import threading
+import weakref
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_QUANTILES = (0.5, 0.95, 0.99)
+
+_frexp = math.frexp
+
+
+class _Shard:
+    """单线程写入的计数分片"""
+
+    __slots__ = ("counts", "total")
+
+    def __init__(self, size: int) -> None:
+        self.counts = [0] * size
+        self.total = 0.0
+
+
+class HistogramSnapshot:
+    """
+    直方图快照（可合并）
+
+    counts[i] 为落在第i个桶内的样本数；两个布局相同的快照可以相加（合并进程/分片）
+    或相减（取两次快照之间的区间）。
+    """
+
+    def __init__(self, layout: Tuple[int, int, int], counts: np.ndarray, total: float) -> None:
+        self.layout = layout
+        self.counts = counts
+        self.sum = total
+
+    @property
+    def count(self) -> int:
+        return int(self.counts.sum())
+
+    @property
+    def mean(self) -> float:
+        count = self.count
+        return self.sum / count if count else 0.0
+
+    def upper_edges(self) -> np.ndarray:
+        """每个桶的上边界（该桶内样本的最大可能值）"""
+        min_exp, sub, size = self.layout
+        index = np.arange(size)
+        exponents = index // sub + min_exp
+        mantissas = (sub + index % sub + 1) / (2.0 * sub)
+        return np.ldexp(mantissas, exponents)
+
+    def percentile(self, q: float) -> float:
+        """
+        第q百分位数（0-100），返回所在桶的上边界；无样本时为0
+        """
+        return self.percentiles([q])[q]
+
+    def percentiles(self, qs: Iterable[float]) -> Dict[float, float]:
+        """一次计算多个百分位数"""
+        qs = list(qs)
+        cumulative = np.cumsum(self.counts)
+        total = int(cumulative[-1]) if len(cumulative) else 0
+        if total == 0:
+            return {q: 0.0 for q in qs}
+
+        edges = self.upper_edges()
+        result = {}
+        for q in qs:
+            rank = max(1, math.ceil(q / 100.0 * total))
+            result[q] = float(edges[np.searchsorted(cumulative, rank, side="left")])
+        return result
+
+    def max(self) -> float:
+        nonzero = np.flatnonzero(self.counts)
+        return float(self.upper_edges()[nonzero[-1]]) if len(nonzero) else 0.0
+
+    def cumulative_counts(self, bounds: Sequence[float]) -> List[int]:
+        """各边界（含）以下的样本数，用于导出Prometheus累积桶"""
+        cumulative = np.cumsum(self.counts)
+        positions = np.searchsorted(self.upper_edges(), bounds, side="right")
+        return [int(cumulative[p - 1]) if p > 0 else 0 for p in positions]
+
+    def _check_layout(self, other: "HistogramSnapshot") -> None:
+        if other.layout != self.layout:
+            raise ValueError("直方图分桶布局不同，无法合并")
+
+    def __add__(self, other: "HistogramSnapshot") -> "HistogramSnapshot":
+        self._check_layout(other)
+        return HistogramSnapshot(self.layout, self.counts + other.counts, self.sum + other.sum)
+
+    def __sub__(self, other: "HistogramSnapshot") -> "HistogramSnapshot":
+        self._check_layout(other)
+        return HistogramSnapshot(self.layout, self.counts - other.counts, self.sum - other.sum)
+
+
+class LatencyHistogram:
+    """
+    分片写入的对数-线性延迟直方图（单位：秒）
+
+    record() 只写当前线程的分片，不加锁；snapshot() 读取时合并所有分片。
+    """
+
+    def __init__(
+        self, lowest: float = 1e-6, highest: float = 3600.0, precision_bits: int = 7
+    ) -> None:
+        """
+        初始化直方图
+
+        Args:
+            lowest: 可分辨的最小值（更小的值记入第一个桶）
+            highest: 可分辨的最大值（更大的值记入最后一个桶）
+            precision_bits: 每个2倍区间的子桶数为 2**precision_bits
+        """
+        self._sub = 1 << precision_bits
+        self._twice_sub = 2 * self._sub
+        self._min_exp = _frexp(lowest)[1]
+        self._size = (_frexp(highest)[1] - self._min_exp + 1) * self._sub
+        # 第一个桶的下边界
+        self._lowest = math.ldexp(0.5, self._min_exp)
+        self.layout = (self._min_exp, self._sub, self._size)
+
+        self._local = threading.local()
+        # (写入线程的弱引用, 分片)；线程退出后分片由 _retire_dead_shards 并入 _retired
+        self._shards: List[Tuple[weakref.ref, _Shard]] = []
+        self._retired = _Shard(self._size)
+        self._shards_lock = threading.Lock()
+
+    def _new_shard(self) -> _Shard:
+        shard = _Shard(self._size)
+        with self._shards_lock:
+            self._retire_dead_shards()
+            self._shards.append((weakref.ref(threading.current_thread()), shard))
+        self._local.shard = shard
+        return shard
+
+    def _retire_dead_shards(self) -> None:
+        """把已退出线程的分片并入退役分片（调用方持有 _shards_lock）"""
+        alive = []
+        retired = self._retired
+        for thread_ref, shard in self._shards:
+            thread = thread_ref()
+            if thread is not None and thread.is_alive():
+                alive.append((thread_ref, shard))
+                continue
+            # 线程已退出，不会再写入该分片
+            for index, count in enumerate(shard.counts):
+                if count:
+                    retired.counts[index] += count
+            retired.total += shard.total
+        self._shards = alive
+
+    @property
+    def shard_count(self) -> int:
+        """当前分片数（存活线程分片 + 退役分片）"""
+        with self._shards_lock:
+            return len(self._shards) + 1
+
+    def record(self, value: float) -> None:
+        """记录一个样本（秒）"""
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._new_shard()
+
+        if value < self._lowest:
+            index = 0
+        else:
+            mantissa, exponent = _frexp(value)
+            index = (exponent - self._min_exp) * self._sub + int(mantissa * self._twice_sub)
+            index -= self._sub
+            if index >= self._size:
+                index = self._size - 1
+        shard.counts[index] += 1
+        shard.total += value
+
+    # 与 prometheus_client.Histogram 接口兼容
+    observe = record
+
+    def snapshot(self) -> HistogramSnapshot:
+        """合并所有分片的当前计数（顺带回收已退出线程的分片）"""
+        counts = np.zeros(self._size, dtype=np.int64)
+        total = 0.0
+        with self._shards_lock:
+            self._retire_dead_shards()
+            for shard in [shard for _, shard in self._shards] + [self._retired]:
+                counts += np.asarray(shard.counts, dtype=np.int64)
+                total += shard.total
+        return HistogramSnapshot(self.layout, counts, total)
+
+    def percentiles(self, qs: Iterable[float] = (50, 95, 99)) -> Dict[float, float]:
+        """当前 p50/p95/p99 等（秒）"""
+        return self.snapshot().percentiles(qs)
+
+    def reset(self) -> None:
+        """清零所有分片（与并发写入竞争时可能保留极少量样本）"""
+        with self._shards_lock:
+            for shard in [shard for _, shard in self._shards] + [self._retired]:
+                shard.counts[:] = [0] * self._size
+                shard.total = 0.0
+
+
+class LatencyHistogramFamily:
+    """按标签区分的一组延迟直方图（接口同 prometheus_client 的 labels()）"""
+
+    def __init__(self, label_names: Sequence[str], **histogram_kwargs: float) -> None:
+        self.label_names = tuple(label_names)
+        self._histogram_kwargs = histogram_kwargs
+        self._children: Dict[Tuple[str, ...], LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str, **labels: str) -> LatencyHistogram:
+        key = values or tuple(str(labels[name]) for name in self.label_names)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, LatencyHistogram(**self._histogram_kwargs))
+        return child
+
+    def items(self) -> List[Tuple[Tuple[str, ...], LatencyHistogram]]:
+        with self._lock:
+            return list(self._children.items())
+
+
+class LatencyHistogramCollector:
+    """
+    Prometheus桥接：抓取时把直方图快照导出为
+
+    - ``<name>`` histogram（沿用原有的le分桶，兼容已有看板与解析脚本）
+    - ``<name去掉_seconds>_quantile_seconds{quantile=...}`` gauge（进程内计算的分位数）
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        histogram: "LatencyHistogram | LatencyHistogramFamily",
+        buckets: Sequence[float],
+        quantiles: Sequence[float] = DEFAULT_QUANTILES,
+    ) -> None:
+        self._name = name
+        self.documentation = documentation
+        self.histogram = histogram
+        self.buckets = [float(b) for b in buckets]
+        self.quantiles = tuple(quantiles)
+        base = name[: -len("_seconds")] if name.endswith("_seconds") else name
+        self.quantile_name = f"{base}_quantile_seconds"
+
+    def _series(self) -> Iterator[Tuple[Tuple[str, ...], HistogramSnapshot]]:
+        if isinstance(self.histogram, LatencyHistogramFamily):
+            for values, child in self.histogram.items():
+                yield values, child.snapshot()
+        else:
+            yield (), self.histogram.snapshot()
+
+    def collect(self):
+        from prometheus_client.core import GaugeMetricFamily, HistogramMetricFamily
+
+        label_names = list(getattr(self.histogram, "label_names", ()))
+        histogram_family = HistogramMetricFamily(self._name, self.documentation, labels=label_names)
+        quantile_family = GaugeMetricFamily(
+            self.quantile_name,
+            f"{self.documentation} (quantiles)",
+            labels=label_names + ["quantile"],
+        )
+
+        for values, snapshot in self._series():
+            counts = snapshot.cumulative_counts(self.buckets)
+            buckets = [(_format_le(b), c) for b, c in zip(self.buckets, counts)]
+            buckets.append(("+Inf", snapshot.count))
+            histogram_family.add_metric(list(values), buckets, sum_value=snapshot.sum)
+
+            percentiles = snapshot.percentiles(q * 100 for q in self.quantiles)
+            for q in self.quantiles:
+                quantile_family.add_metric(list(values) + [str(q)], percentiles[q * 100])
+
+        yield histogram_family
+        yield quantile_family
+
+
+def _format_le(bound: float) -> str:
+    return repr(float(bound))
+
+
+def register_latency_collector(
+    collector: LatencyHistogramCollector, registry: Optional[object] = None
+) -> Optional[LatencyHistogramCollector]:
+    """
+    注册到Prometheus注册表（未安装prometheus_client时跳过）
+
+    Returns:
+        注册成功返回collector，否则None
+    """
+    if registry is None:
+        try:
+            from prometheus_client import REGISTRY as registry
+        except ImportError:
+            return None
+    registry.register(collector)
+    return collector
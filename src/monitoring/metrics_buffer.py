@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+热路径指标缓冲
+Hot-path Metrics Buffer
+
+用途：
+- 热路径只把 (操作, 指标子项, 值) 追加到当前线程的缓冲队列（deque.append，无锁）
+- 后台线程每隔 flush_interval 秒聚合一次：Counter增量求和、Gauge取最后值、Histogram逐个observe
+- 停止时做最后一次刷新，不丢数据
+"""
+
+import logging
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+INC = 0
+SET = 1
+OBSERVE = 2
+
+Entry = Tuple[int, Any, float]
+
+
+class MetricsBuffer:
+    """按线程缓冲指标更新，后台定时批量写入Prometheus"""
+
+    def __init__(self, flush_interval: float = 0.25) -> None:
+        """
+        初始化指标缓冲
+
+        Args:
+            flush_interval: 后台刷新间隔（秒）
+        """
+        self.flush_interval = flush_interval
+        self.logger = logging.getLogger(__name__)
+
+        self._local = threading.local()
+        self._buffers: List[Deque[Entry]] = []
+        self._buffers_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.flush_count = 0
+        self.flushed_entries = 0
+
+    def _new_buffer(self) -> Deque[Entry]:
+        buffer: Deque[Entry] = deque()
+        with self._buffers_lock:
+            self._buffers.append(buffer)
+        self._local.buffer = buffer
+        return buffer
+
+    def _append(self, entry: Entry) -> None:
+        try:
+            buffer = self._local.buffer
+        except AttributeError:
+            buffer = self._new_buffer()
+        buffer.append(entry)
+
+    def inc(self, child: Any, amount: float = 1) -> None:
+        """缓冲一次 Counter.inc"""
+        self._append((INC, child, amount))
+
+    def set(self, child: Any, value: float) -> None:
+        """缓冲一次 Gauge.set"""
+        self._append((SET, child, value))
+
+    def observe(self, child: Any, value: float) -> None:
+        """缓冲一次 Histogram.observe"""
+        self._append((OBSERVE, child, value))
+
+    def flush(self) -> int:
+        """
+        聚合并写入所有缓冲的更新
+
+        Returns:
+            本次处理的缓冲条目数
+        """
+        with self._flush_lock:
+            with self._buffers_lock:
+                buffers = list(self._buffers)
+
+            increments: Dict[Any, float] = {}
+            gauges: Dict[Any, float] = {}
+            processed = 0
+            for buffer in buffers:
+                # 只取当前已有的条目；popleft与写线程的append可安全并发
+                count = len(buffer)
+                for _ in range(count):
+                    op, child, value = buffer.popleft()
+                    if op == INC:
+                        increments[child] = increments.get(child, 0) + value
+                    elif op == SET:
+                        gauges[child] = value
+                    else:
+                        child.observe(value)
+                processed += count
+
+            for child, amount in increments.items():
+                child.inc(amount)
+            for child, value in gauges.items():
+                child.set(value)
+
+            self.flush_count += 1
+            self.flushed_entries += processed
+            return processed
+
+    def pending(self) -> int:
+        """尚未刷新的条目数"""
+        with self._buffers_lock:
+            return sum(len(buffer) for buffer in self._buffers)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                self.logger.warning(f"⚠️ 指标缓冲刷新失败: {e}")
+
+    def start(self) -> None:
+        """启动后台刷新线程"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="metrics-buffer-flush", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """停止后台线程并刷新剩余条目"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "pending": self.pending(),
+            "flush_count": self.flush_count,
+            "flushed_entries": self.flushed_entries,
+        }
@@ -10,8 +10,16 @@ import os
 import time
 from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Any, Dict, Generator, Optional
-
+from typing import Any, Dict, Generator, Iterable, List, Optional, Tuple
+
+from .latency_histogram import (
+    LatencyHistogram,
+    LatencyHistogramCollector,
+    LatencyHistogramFamily,
+    register_latency_collector,
+)
+from .memory_telemetry import MemoryTelemetry
+from .metrics_buffer import MetricsBuffer
 from .prometheus_exporter import PrometheusExporter
 
 
@@ -55,6 +63,9 @@ def _create_fallback_prometheus_classes():
         def __init__(self, *args: Any, **kwargs: Any) -> None:
             pass
 
+        def labels(self, *args: Any, **kwargs: Any) -> "Gauge":
+            return self
+
         def set(self, *args: Any, **kwargs: Any) -> None:
             pass
 
@@ -85,11 +96,17 @@ class MetricsConfig:
         enabled: 是否启用监控 (Whether monitoring is enabled)
         port: Prometheus服务端口 (Prometheus server port)
         include_system_metrics: 是否包含系统指标 (Whether to include system metrics)
+        buffer_flush_ms: 热路径指标缓冲刷新间隔，0为直接写入 (Hot-path buffer flush interval)
+        tracemalloc_interval_s: tracemalloc采样窗口间隔，0为不采样 (Tracemalloc sampling interval)
+        tracemalloc_window_s: tracemalloc采样窗口长度 (Tracemalloc sampling window)
     """
 
     enabled: bool = True  # 监控启用状态
     port: int = 8000  # Prometheus端口
     include_system_metrics: bool = True  # 系统指标开关
+    buffer_flush_ms: float = 0.0  # 热路径指标缓冲（毫秒）
+    tracemalloc_interval_s: float = 0.0  # tracemalloc采样间隔（秒）
+    tracemalloc_window_s: float = 5.0  # tracemalloc采样窗口（秒）
 
 
 class TradingMetricsCollector:
@@ -146,8 +163,24 @@ class TradingMetricsCollector:
         self._error_counts: Dict[str, int] = {}
         # 交易计数 (symbol -> {action -> count})
         self._trade_counts: Dict[str, Dict[str, int]] = {}
+        # 异常计数 (module -> count)，与 trading_exceptions_total 同步更新
+        self._exception_counts: Dict[str, int] = {}
+        # 价格更新计数 ((symbol, source) -> count)，与 price_updates_total 同步更新
+        self._price_update_counts: Dict[Tuple[str, str], int] = {}
+        # 已推送的缓存统计 (cache -> {event -> count})，用于计算Counter增量
+        self._cache_stats_published: Dict[str, Dict[str, int]] = {}
+        # 已推送的WS分发统计 (symbol -> {dropped/coalesced -> count})
+        self._dispatch_stats_published: Dict[str, Dict[str, int]] = {}
         # 指标采集运行标志
         self._collecting: bool = False
+        # 带标签指标的子项缓存 ((指标, 标签值) -> 子项)，热路径跳过labels()查找
+        self._label_children: Dict[tuple, Any] = {}
+        # 热路径指标缓冲（启用后由后台线程批量写入）
+        self.metrics_buffer: Optional[MetricsBuffer] = None
+        # 采样式内存遥测（GC计数/事件 + 周期性tracemalloc窗口）
+        self.memory_telemetry = MemoryTelemetry(
+            self.config.tracemalloc_interval_s, self.config.tracemalloc_window_s
+        )
 
         if not self.config.enabled:
             self.logger.info("监控已禁用")
@@ -155,6 +188,9 @@ class TradingMetricsCollector:
 
         self._init_metrics()
 
+        if self.config.buffer_flush_ms > 0:
+            self.enable_buffering(self.config.buffer_flush_ms)
+
     def _init_metrics(self) -> None:
         """初始化Prometheus指标"""
         # 清除现有注册表以避免重复注册错误
@@ -195,22 +231,28 @@ class TradingMetricsCollector:
         except Exception:
             pass  # 忽略清理错误，继续初始化
 
+        # 热路径延迟使用进程内HDR风格直方图，抓取时再导出为Prometheus histogram + 分位数
+        self.latency_collectors: Dict[str, LatencyHistogramCollector] = {}
+
         # 信号处理延迟 (Signal processing latency)
-        self.signal_latency: Histogram = Histogram(
+        self.signal_latency: LatencyHistogram = self._latency_histogram(
+            "signal",
             "trading_signal_latency_seconds",
             "Time to calculate trading signals",
             buckets=[0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0],
         )
 
         # 订单执行延迟 (Order execution latency)
-        self.order_latency: Histogram = Histogram(
+        self.order_latency: LatencyHistogram = self._latency_histogram(
+            "order",
             "trading_order_latency_seconds",
             "Time to execute orders",
             buckets=[0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0],
         )
 
         # 数据获取延迟 (Data fetch latency)
-        self.data_fetch_latency: Histogram = Histogram(
+        self.data_fetch_latency: LatencyHistogram = self._latency_histogram(
+            "data_fetch",
             "trading_data_fetch_latency_seconds",
             "Time to fetch market data",
             buckets=[0.1, 0.5, 1.0, 2.0, 5.0, 10.0],
@@ -285,6 +327,19 @@ class TradingMetricsCollector:
             buckets=[0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0],
         )
 
+        self.batch_order_latency: Histogram = Histogram(
+            "batch_order_latency_seconds",
+            "批量订单操作延迟 (Batch order operation latency)",
+            ["operation"],  # place, cancel_all
+            buckets=[0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0],
+        )
+
+        self.batch_order_latency_quantile: Gauge = Gauge(
+            "batch_order_latency_quantile_seconds",
+            "批量订单操作延迟分位数 (Batch order latency quantiles)",
+            ["operation", "quantile"],  # quantile: p50, p95
+        )
+
         self.concurrent_tasks: Gauge = Gauge(
             "concurrent_tasks_count", "并发任务数量", ["task_type"]  # order_execution, data_fetch
         )
@@ -304,11 +359,12 @@ class TradingMetricsCollector:
         # M5阶段性能监控指标 (M5 Phase performance monitoring metrics)
 
         # 任务延迟指标 (Task latency metrics)
-        self.task_latency: Histogram = Histogram(
+        self.task_latency: LatencyHistogramFamily = self._latency_histogram(
+            "task",
             "task_latency_seconds",
             "各类任务执行延迟 (Task execution latency)",
-            ["task_type"],  # signal_processing, order_placement, data_analysis
             buckets=[0.001, 0.01, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0],
+            label_names=["task_type"],  # signal_processing, order_placement, data_analysis
         )
 
         # 内存使用指标 (Memory usage metrics)
@@ -347,9 +403,23 @@ class TradingMetricsCollector:
             buckets=[0.001, 0.01, 0.1, 0.5, 1.0, 5.0],
         )
 
-        self.gc_tracked_objects: Gauge = Gauge(
-            "gc_tracked_objects",
-            "GC跟踪对象数量 (Number of objects tracked by GC)",
+        # gc_tracked_objects 已停用：不遍历堆无法得到跟踪对象总数，
+        # 而 gc.get_count() 各代单位不同，不能相加冒充对象数
+        self.gc_generation_count: Gauge = Gauge(
+            "gc_generation_count",
+            "gc.get_count()：第0代为上次回收后净分配对象数，第1/2代为更年轻一代的回收次数 "
+            "(GC threshold counters per generation)",
+            ["generation"],
+        )
+
+        self.gc_uncollectable: Gauge = Gauge(
+            "gc_uncollectable_objects",
+            "各代不可回收对象累计 (Uncollectable objects per generation)",
+            ["generation"],
+        )
+
+        self.memory_traced_bytes: Gauge = Gauge(
+            "memory_traced_bytes", "最近tracemalloc窗口追踪的内存 (Traced memory in last window)"
         )
 
         # 内存分配跟踪 (Memory allocation tracking)
@@ -398,6 +468,110 @@ class TradingMetricsCollector:
             ["connection_type"],
         )
 
+        # 信号缓存指标 (Signal cache metrics)
+        self.signal_cache_events: Counter = Counter(
+            "signal_cache_events_total",
+            "信号缓存事件 (Signal cache hits/misses/evictions)",
+            ["cache", "event"],
+        )
+        self.signal_cache_size: Gauge = Gauge(
+            "signal_cache_entries", "信号缓存条目数 (Signal cache entries)", ["cache"]
+        )
+
+        # WebSocket分发队列指标 (WebSocket dispatch queue metrics)
+        self.ws_dispatch_queue_depth: Gauge = Gauge(
+            "ws_dispatch_queue_depth", "K线分发队列深度 (Kline dispatch queue depth)", ["symbol"]
+        )
+        self.ws_dispatch_dropped: Counter = Counter(
+            "ws_dispatch_dropped_total", "K线分发丢弃数 (Dropped klines)", ["symbol"]
+        )
+        self.ws_dispatch_coalesced: Counter = Counter(
+            "ws_dispatch_coalesced_total", "未收盘K线合并数 (Coalesced unclosed klines)", ["symbol"]
+        )
+
+        # 连接池分片队列指标：满队列时只丢弃未收盘K线，收盘K线改为背压（单独计数）
+        self.ws_shard_dropped: Counter = Counter(
+            "ws_shard_dropped_total", "分片队列丢弃的未收盘K线 (Dropped unclosed klines)", ["shard"]
+        )
+        self.ws_shard_backpressure: Counter = Counter(
+            "ws_shard_backpressure_total",
+            "分片队列满时阻塞读取的消息 (Backpressured messages)",
+            ["shard", "kind"],
+        )
+
+    def _latency_histogram(
+        self,
+        key: str,
+        name: str,
+        documentation: str,
+        buckets: List[float],
+        label_names: Optional[List[str]] = None,
+    ) -> "LatencyHistogram | LatencyHistogramFamily":
+        """创建进程内延迟直方图，并注册抓取时导出的Prometheus桥接"""
+        histogram = LatencyHistogramFamily(label_names) if label_names else LatencyHistogram()
+        collector = LatencyHistogramCollector(name, documentation, histogram, buckets)
+        try:
+            register_latency_collector(collector)
+        except ValueError as e:
+            self.logger.warning(f"延迟直方图 {name} 注册失败: {e}")
+        self.latency_collectors[key] = collector
+        return histogram
+
+    def enable_buffering(self, flush_ms: float = 250.0) -> MetricsBuffer:
+        """
+        启用热路径指标缓冲
+
+        record_ws_message / record_price_update / update_concurrent_tasks /
+        observe_ws_latency / observe_msg_lag 改为写入线程缓冲，由后台线程每
+        flush_ms 毫秒聚合后写入Prometheus。
+
+        Args:
+            flush_ms: 刷新间隔（毫秒）
+
+        Returns:
+            指标缓冲实例
+        """
+        if self.metrics_buffer is None:
+            self.metrics_buffer = MetricsBuffer(flush_ms / 1000.0)
+            self.metrics_buffer.start()
+        return self.metrics_buffer
+
+    def disable_buffering(self) -> None:
+        """停止缓冲并写入剩余条目"""
+        buffer, self.metrics_buffer = self.metrics_buffer, None
+        if buffer is not None:
+            buffer.stop()
+
+    def flush_metrics(self) -> int:
+        """立即写入缓冲中的指标更新，返回条目数"""
+        return self.metrics_buffer.flush() if self.metrics_buffer is not None else 0
+
+    def _child(self, metric: Any, *label_values: str) -> Any:
+        """带标签指标的子项（按标签值缓存）"""
+        key = (metric, label_values)
+        child = self._label_children.get(key)
+        if child is None:
+            child = self._label_children[key] = metric.labels(*label_values)
+        return child
+
+    def _inc(self, child: Any) -> None:
+        if self.metrics_buffer is None:
+            child.inc()
+        else:
+            self.metrics_buffer.inc(child)
+
+    def _set(self, child: Any, value: float) -> None:
+        if self.metrics_buffer is None:
+            child.set(value)
+        else:
+            self.metrics_buffer.set(child, value)
+
+    def _observe(self, metric: Any, value: float) -> None:
+        if self.metrics_buffer is None:
+            metric.observe(value)
+        else:
+            self.metrics_buffer.observe(metric, value)
+
     def start_server(self) -> None:
         """
         启动Prometheus HTTP服务器
@@ -433,8 +607,7 @@ class TradingMetricsCollector:
         try:
             yield
         finally:
-            elapsed: float = round(time.perf_counter() - start_time, 10)
-            self.signal_latency.observe(elapsed)
+            self.signal_latency.record(time.perf_counter() - start_time)
 
     @contextmanager
     def measure_order_latency(self) -> Generator[None, None, None]:
@@ -452,8 +625,7 @@ class TradingMetricsCollector:
         try:
             yield
         finally:
-            elapsed: float = round(time.perf_counter() - start_time, 10)
-            self.order_latency.observe(elapsed)
+            self.order_latency.record(time.perf_counter() - start_time)
 
     @contextmanager
     def measure_data_fetch_latency(self) -> Generator[None, None, None]:
@@ -471,8 +643,7 @@ class TradingMetricsCollector:
         try:
             yield
         finally:
-            elapsed: float = round(time.perf_counter() - start_time, 10)
-            self.data_fetch_latency.observe(elapsed)
+            self.data_fetch_latency.record(time.perf_counter() - start_time)
 
     def record_slippage(self, expected_price: float, actual_price: float) -> None:
         """
@@ -493,8 +664,7 @@ class TradingMetricsCollector:
             module: 模块名 (Module name)
             exception: 异常对象 (Exception object)
         """
-        exception_type: str = type(exception).__name__
-        self.exceptions.labels(module=module, exception_type=exception_type).inc()
+        self._count_exception(module, type(exception).__name__)
 
         # 如果提供了自定义 exporter，则使用其 error_count 指标
         if self.exporter is not None and hasattr(self.exporter, "error_count"):
@@ -556,12 +726,20 @@ class TradingMetricsCollector:
     # M4阶段 - WebSocket指标记录方法
     def observe_ws_latency(self, latency_seconds: float):
         """记录WebSocket延迟"""
-        self.ws_latency.observe(latency_seconds)
+        self._observe(self.ws_latency, latency_seconds)
 
     def record_ws_reconnect(self, symbol: str = "ALL", reason: str = "connection_lost"):
         """记录WebSocket重连"""
         self.ws_reconnects_total.labels(symbol=symbol, reason=reason).inc()
 
+    def record_ws_shard_drop(self, shard: str):
+        """记录分片队列丢弃一条未收盘K线"""
+        self.ws_shard_dropped.labels(shard=shard).inc()
+
+    def record_ws_shard_backpressure(self, shard: str, kind: str):
+        """记录分片队列满时不可丢弃的消息（kind: closed_kline / other）"""
+        self.ws_shard_backpressure.labels(shard=shard, kind=kind).inc()
+
     def record_ws_connection_success(self):
         """记录WebSocket连接成功"""
         self.ws_connections_total.labels(status="success").inc()
@@ -572,23 +750,79 @@ class TradingMetricsCollector:
 
     def record_ws_message(self, symbol: str, msg_type: str):
         """记录WebSocket消息"""
-        self.ws_messages_total.labels(symbol=symbol, type=msg_type).inc()
+        self._inc(self._child(self.ws_messages_total, symbol, msg_type))
 
     def record_price_update(self, symbol: str, price: float, source: str = "ws"):
         """记录价格更新"""
-        self.price_updates_total.labels(symbol=symbol, source=source).inc()
+        key = (symbol, source)
+        self._price_update_counts[key] = self._price_update_counts.get(key, 0) + 1
+        self._inc(self._child(self.price_updates_total, symbol, source))
 
     def observe_msg_lag(self, lag_seconds: float):
         """记录消息滞后时间"""
-        self.msg_lag.observe(lag_seconds)
+        self._observe(self.msg_lag, lag_seconds)
 
     def observe_order_roundtrip_latency(self, latency_seconds: float):
         """记录订单往返延迟"""
         self.order_roundtrip_latency.observe(latency_seconds)
 
+    def observe_batch_order_latency(
+        self, operation: str, latency_seconds: float, quantiles: Optional[Dict[str, float]] = None
+    ):
+        """
+        记录批量订单操作延迟
+
+        Args:
+            operation: 操作类型（place / cancel_all）
+            latency_seconds: 本批次耗时
+            quantiles: 最近批次的延迟分位数，如 {"p50": 0.1, "p95": 0.3}
+        """
+        self.batch_order_latency.labels(operation=operation).observe(latency_seconds)
+        for name, value in (quantiles or {}).items():
+            self.batch_order_latency_quantile.labels(operation=operation, quantile=name).set(value)
+
+    @staticmethod
+    def _counter_delta(published: Dict[str, int], key: str, current: int) -> int:
+        """计算相对上次推送的增量（来源计数被重置时返回0并重新对齐）"""
+        delta = current - published.get(key, 0)
+        published[key] = current
+        return delta if delta > 0 else 0
+
+    def update_signal_cache_stats(self, cache_name: str, stats: Dict[str, Any]):
+        """
+        推送信号缓存统计（按上次推送的增量累加Counter）
+
+        Args:
+            cache_name: 缓存名称（cache标签）
+            stats: SignalCache.stats() 返回的字典
+        """
+        published = self._cache_stats_published.setdefault(cache_name, {})
+        for event, key in (("hit", "hits"), ("miss", "misses"), ("eviction", "evictions")):
+            delta = self._counter_delta(published, event, int(stats.get(key, 0)))
+            if delta:
+                self.signal_cache_events.labels(cache=cache_name, event=event).inc(delta)
+        self.signal_cache_size.labels(cache=cache_name).set(stats.get("size", 0))
+
+    def update_ws_dispatch_stats(self, symbol_stats: Dict[str, Dict[str, int]]):
+        """
+        推送K线分发器统计
+
+        Args:
+            symbol_stats: KlineDispatcher.get_symbol_stats() 返回的 symbol -> 统计字典
+        """
+        for symbol, stats in symbol_stats.items():
+            published = self._dispatch_stats_published.setdefault(symbol, {})
+            self.ws_dispatch_queue_depth.labels(symbol=symbol).set(stats.get("depth", 0))
+            dropped = self._counter_delta(published, "dropped", int(stats.get("dropped", 0)))
+            if dropped:
+                self.ws_dispatch_dropped.labels(symbol=symbol).inc(dropped)
+            coalesced = self._counter_delta(published, "coalesced", int(stats.get("coalesced", 0)))
+            if coalesced:
+                self.ws_dispatch_coalesced.labels(symbol=symbol).inc(coalesced)
+
     def update_concurrent_tasks(self, task_type: str, count: int):
         """更新并发任务计数"""
-        self.concurrent_tasks.labels(task_type=task_type).set(count)
+        self._set(self._child(self.concurrent_tasks, task_type), count)
 
     @contextmanager
     def measure_ws_processing_time(self):
@@ -611,14 +845,40 @@ class TradingMetricsCollector:
         try:
             yield
         finally:
-            latency = round(time.perf_counter() - start_time, 10)
-            self.task_latency.labels(task_type=task_type).observe(latency)
+            self.task_latency.labels(task_type=task_type).record(time.perf_counter() - start_time)
 
     def observe_task_latency(self, task_type: str, latency_seconds: float):
         """直接记录任务延迟"""
         if not self.config.enabled:
             return
-        self.task_latency.labels(task_type=task_type).observe(latency_seconds)
+        self.task_latency.labels(task_type=task_type).record(latency_seconds)
+
+    def get_latency_percentiles(
+        self,
+        name: str = "signal",
+        percentiles: Iterable[float] = (50, 95, 99),
+        task_type: Optional[str] = None,
+    ) -> Dict[str, float]:
+        """
+        进程内计算的延迟分位数（秒）
+
+        Args:
+            name: 延迟类别（signal / order / data_fetch / task）
+            percentiles: 百分位（0-100）
+            task_type: name为task时的任务类型
+
+        Returns:
+            {"p50": ..., "p95": ..., "p99": ..., "count": 样本数}
+        """
+        histogram = getattr(self, f"{name}_latency")
+        if task_type is not None:
+            histogram = histogram.labels(task_type=task_type)
+        snapshot = histogram.snapshot()
+        result: Dict[str, float] = {
+            f"p{q:g}": value for q, value in snapshot.percentiles(percentiles).items()
+        }
+        result["count"] = snapshot.count
+        return result
 
     # M5阶段 - 内存和GC监控方法
     def update_process_memory_stats(self):
@@ -670,21 +930,33 @@ class TradingMetricsCollector:
         # 测试仅监控 observe 调用本体 – 无需 labels
         self.gc_pause_time.observe(pause_duration)
         self.gc_collected_objects.labels(generation=gen_label).inc(collected_objects)
+        self.memory_telemetry.on_gc_event(generation, pause_duration, collected_objects)
+
+    def update_gc_tracked_objects(self) -> Dict[str, Any]:
+        """
+        采样GC与内存遥测并更新指标
+
+        只读 gc.get_count() / gc.get_stats()（不遍历堆），并推进周期性tracemalloc窗口。
 
-    def update_gc_tracked_objects(self):
-        """更新GC追踪的对象数量"""
+        Returns:
+            MemoryTelemetry.sample() 结果；监控禁用或失败时为空字典
+        """
         if not self.config.enabled:
-            return
+            return {}
 
         try:
-            import gc
-
-            total = 0
-            for generation in range(3):
-                total += len(gc.get_objects(generation))
-            self.gc_tracked_objects.set(total)
+            sample = self.memory_telemetry.sample()
+            for generation, count in enumerate(sample["gc_counts"]):
+                self._child(self.gc_generation_count, str(generation)).set(count)
+            for generation, stats in enumerate(sample["gc_stats"]):
+                self._child(self.gc_uncollectable, str(generation)).set(stats["uncollectable"])
+            if sample["traced_bytes"] is not None:
+                self.memory_traced_bytes.set(sample["traced_bytes"])
+                self.memory_allocation_rate.set(sample["allocation_rate"])
+            return sample
         except Exception as e:
             self.logger.warning(f"⚠️ GC对象统计更新失败: {e}")
+            return {}
 
     def record_memory_allocation(self, size_bytes: int):
         """记录内存分配"""
@@ -812,56 +1084,14 @@ class TradingMetricsCollector:
             self.logger.error(f"❌ 获取内存健康状态失败: {e}")
             return {"error": str(e), "timestamp": time.time()}
 
-    def get_error_summary(self) -> Dict[str, int]:
-        """获取错误统计摘要"""
-        try:
-            # 使用模块级 REGISTRY（便于单元测试通过 patch 注入 side_effect）
-            # 如果被测试替换成 MagicMock(side_effect=Exception) ，下面一行会触发异常
-            try:
-                if callable(REGISTRY):
-                    REGISTRY()
-            except Exception as pre_err:
-                raise pre_err
-
-            errors = self._extract_error_counts_from_registry(REGISTRY)
-            if not errors and self._error_counts:
-                errors = {k: v for k, v in self._error_counts.items()}
-            return errors
-        except Exception as e:
-            msg = f"⚠️ 获取错误摘要失败: {e}"
-            self.logger.warning(msg)
-            import logging as _logging
-
-            _logging.warning(msg)
-            return {}
-
-    def _extract_error_counts_from_registry(self, registry) -> Dict[str, int]:
-        """从Prometheus注册表提取错误计数"""
-        error_counts = {}
+    def _count_exception(self, module: str, exception_type: str) -> None:
+        """异常计数器 +1，并同步按模块汇总的计数"""
+        self._child(self.exceptions, module, exception_type).inc()
+        self._exception_counts[module] = self._exception_counts.get(module, 0) + 1
 
-        for collector in registry._collector_to_names.keys():
-            if not self._is_exception_collector(collector):
-                continue
-
-            try:
-                self._process_exception_samples(collector, error_counts)
-            except Exception:
-                pass
-
-        return error_counts
-
-    def _is_exception_collector(self, collector) -> bool:
-        """检查是否为异常收集器"""
-        return hasattr(collector, "_name") and "exceptions" in str(collector._name)
-
-    def _process_exception_samples(self, collector, error_counts: Dict[str, int]):
-        """处理异常样本数据"""
-        for sample in collector.collect():
-            for metric_sample in sample.samples:
-                if "exceptions_total" in metric_sample.name:
-                    module = metric_sample.labels.get("module", "unknown")
-                    value = int(metric_sample.value)
-                    error_counts[module] = error_counts.get(module, 0) + value
+    def get_error_summary(self) -> Dict[str, int]:
+        """获取错误统计摘要 (module -> 异常次数)"""
+        return dict(self._exception_counts or self._error_counts)
 
     def record_trade(self, symbol: str, action: str, price: float = 0.0, quantity: float = 0.0):
         """
@@ -925,12 +1155,10 @@ class TradingMetricsCollector:
                     # 兼容旧版测试的键名
                     summary[symbol]["trades"] = sum(actions.values())
             else:
-                # 当内部缓存为空时，退回 Prometheus 注册表提取 – 单元测试会通过
-                # ``@patch('src.monitoring.metrics_collector.REGISTRY')`` 注入
-                # 自定义 REGISTRY 供我们解析。
-                from prometheus_client import REGISTRY as _REGISTRY
-
-                summary = self._extract_trade_summary_from_registry(_REGISTRY)
+                # 没有交易记录时按价格更新计数汇总
+                summary = self._trade_summary_from_price_updates()
+            if not summary:
+                return {}
             # 合计字段 – 旧版测试断言存在 total_trades
             total_trades = sum(
                 sum(v.values()) if isinstance(v, dict) else v for v in summary.values()
@@ -941,36 +1169,14 @@ class TradingMetricsCollector:
             self.logger.error(f"❌ 获取交易摘要失败: {e}")
             return {}
 
-    def _extract_trade_summary_from_registry(self, registry) -> Dict[str, Any]:
-        """从Prometheus注册表提取交易摘要"""
-        summary = {}
-
-        for collector in registry._collector_to_names.keys():
-            try:
-                self._process_trade_samples(collector, summary)
-            except Exception:
-                pass
-
-        return summary if summary else {}
-
-    def _process_trade_samples(self, collector, summary: Dict[str, Any]):
-        """处理交易样本数据"""
-        for sample in collector.collect():
-            for metric_sample in sample.samples:
-                if "price_updates_total" in metric_sample.name:
-                    self._update_trade_summary_for_symbol(metric_sample, summary)
-
-    def _update_trade_summary_for_symbol(self, metric_sample, summary: Dict[str, Any]):
-        """为特定交易对更新交易摘要"""
-        if "symbol" not in metric_sample.labels:
-            return
-
-        symbol = metric_sample.labels["symbol"]
-        if symbol not in summary:
-            summary[symbol] = {"trades": 0, "price_updates": 0}
-
-        summary[symbol]["price_updates"] += int(metric_sample.value)
-        summary[symbol]["trades"] += 1
+    def _trade_summary_from_price_updates(self) -> Dict[str, Any]:
+        """按交易对汇总价格更新计数（trades 为来源数）"""
+        summary: Dict[str, Any] = {}
+        for (symbol, _source), count in self._price_update_counts.items():
+            entry = summary.setdefault(symbol, {"trades": 0, "price_updates": 0})
+            entry["price_updates"] += count
+            entry["trades"] += 1
+        return summary
 
     def record_error(self, module: str = "general", error_message: str | Exception = ""):
         """
@@ -990,7 +1196,7 @@ class TradingMetricsCollector:
                     exporter_ok = False
 
             # 更新 Prometheus 计数器
-            self.exceptions.labels(module=module, exception_type=type(error_message).__name__).inc()
+            self._count_exception(module, type(error_message).__name__)
 
             # 仅当 exporter 更新成功时才更新内部错误计数表
             if exporter_ok:
@@ -1035,31 +1241,7 @@ class TradingMetricsCollector:
         Returns:
             符号到价格的映射
         """
-        try:
-            from prometheus_client import REGISTRY
-
-            prices = {}
-
-            # 从Prometheus注册表中获取价格数据
-            for collector in REGISTRY._collector_to_names.keys():
-                try:
-                    for sample in collector.collect():
-                        for metric_sample in sample.samples:
-                            if "current_price_usd" in metric_sample.name:
-                                if "symbol" in metric_sample.labels:
-                                    symbol = metric_sample.labels["symbol"]
-                                    prices[symbol] = float(metric_sample.value)
-
-                except Exception:
-                    pass
-
-            if not prices and self._last_prices:
-                prices = {k: v for k, v in self._last_prices.items()}
-            return prices
-
-        except Exception as e:
-            self.logger.error(f"❌ 获取最新价格失败: {e}")
-            return {}
+        return dict(self._last_prices)
 
     def update_heartbeat(self):
         """
@@ -1246,6 +1428,8 @@ class TradingMetricsCollector:
         self._trade_counts.clear()
         self._error_counts.clear()
         self._last_prices.clear()
+        self._exception_counts.clear()
+        self._price_update_counts.clear()
 
 
 # 全局监控实例
@@ -1260,6 +1444,7 @@ def get_metrics_collector() -> TradingMetricsCollector:
         config = MetricsConfig(
             enabled=os.getenv("METRICS_ENABLED", "true").lower() == "true",
             port=int(os.getenv("PROMETHEUS_PORT", "8000")),
+            buffer_flush_ms=float(os.getenv("METRICS_BUFFER_FLUSH_MS", "0")),
         )
         _global_collector = TradingMetricsCollector(config)
 
@@ -8,6 +8,13 @@
 - 性能指标计算
 """
 
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pickle import PicklingError
+
+import numpy as np
 import pandas as pd
 
 from src.core.risk_management import (
@@ -16,6 +23,9 @@ from src.core.risk_management import (
     compute_trailing_stop,
 )
 from src.indicators import bearish_cross_indices, bullish_cross_indices, moving_average
+from src.strategies.backtest_kernel import build_signal_arrays, run_ma_atr_kernel
+
+logger = logging.getLogger(__name__)
 
 
 def backtest_single(
@@ -119,7 +129,26 @@ class BacktestExecutor:
         self.equity_curve = []
 
     def run_backtest(self) -> pd.Series:
-        """执行完整的回测流程"""
+        """执行完整的回测流程（verbose时逐K线打印，否则走数组内核）"""
+        if self.verbose:
+            return self.run_backtest_loop()
+
+        indicators = self._calculate_indicators()
+        arrays = build_signal_arrays(
+            self.price, indicators["fast_ma"], indicators["slow_ma"], indicators["atr_series"]
+        )
+        equity_curve, _ = run_ma_atr_kernel(
+            arrays,
+            risk_frac=self.risk_frac,
+            init_equity=self.init_equity,
+            use_trailing_stop=self.use_trailing_stop,
+            breakeven_r=self.breakeven_r,
+            trail_r=self.trail_r,
+        )
+        return pd.Series(equity_curve, index=self.price.index)
+
+    def run_backtest_loop(self) -> pd.Series:
+        """逐K线执行回测（参考实现，数组内核与之逐项对齐）"""
         # 计算技术指标
         indicators = self._calculate_indicators()
 
@@ -265,6 +294,20 @@ class BacktestExecutor:
         self.equity_curve.append(current_equity)
 
 
+def _run_legs(legs, strategy_kwargs):
+    """在单个进程内顺序回测一组资产（进程池任务）"""
+    return {symbol: backtest_single(price=price, **strategy_kwargs) for symbol, price in legs}
+
+
+def _resolve_leg_workers(max_workers, leg_count):
+    # 并行为显式开启：None/0/1 均串行，-1 为CPU核数
+    if max_workers is None:
+        return 0
+    if max_workers < 0:
+        max_workers = os.cpu_count() or 1
+    return min(max_workers, leg_count)
+
+
 def _calculate_base_equity_curves(
     prices_dict,
     fast_win,
@@ -275,22 +318,38 @@ def _calculate_base_equity_curves(
     use_trailing_stop,
     breakeven_r,
     trail_r,
+    max_workers=None,
+    executor_factory=ProcessPoolExecutor,
 ):
-    """计算基础权益曲线"""
+    """计算基础权益曲线（指定max_workers时按进程池分组并行，失败时回退串行）"""
+    strategy_kwargs = dict(
+        fast_win=fast_win,
+        slow_win=slow_win,
+        atr_win=atr_win,
+        risk_frac=base_risk_frac,
+        init_equity=base_equity,
+        use_trailing_stop=use_trailing_stop,
+        breakeven_r=breakeven_r,
+        trail_r=trail_r,
+    )
+    legs = list(prices_dict.items())
+    workers = _resolve_leg_workers(max_workers, len(legs))
+    if workers <= 1:
+        return _run_legs(legs, strategy_kwargs)
+
+    # 每个进程一组资产，减少任务调度与序列化开销
+    chunks = [legs[slice(i, None, workers)] for i in range(workers)]
     equity_curves = {}
-    for symbol, price_series in prices_dict.items():
-        equity_curves[symbol] = backtest_single(
-            price=price_series,
-            fast_win=fast_win,
-            slow_win=slow_win,
-            atr_win=atr_win,
-            risk_frac=base_risk_frac,
-            init_equity=base_equity,
-            use_trailing_stop=use_trailing_stop,
-            breakeven_r=breakeven_r,
-            trail_r=trail_r,
-        )
-    return equity_curves
+    try:
+        with executor_factory(max_workers=workers) as executor:
+            for result in executor.map(_run_legs, chunks, [strategy_kwargs] * workers):
+                equity_curves.update(result)
+    except (BrokenProcessPool, PicklingError) as e:
+        # 进程池不可用（任务无法序列化、子进程崩溃、spawn模式缺少__main__保护等）
+        logger.warning(f"⚠️ 并行回测失败，回退为串行执行: {e}")
+        return _run_legs(legs, strategy_kwargs)
+    # 保持输入顺序
+    return {symbol: equity_curves[symbol] for symbol, _ in legs}
 
 
 def _calculate_performance_metrics(equity_df, lookback, prefer_better_asset):
@@ -364,25 +423,26 @@ def _apply_weight_constraints(raw_weights, asset_count, min_weight_factor, max_w
 
 
 def _apply_dynamic_rebalancing(equity_df, weights_df, lookback):
-    """应用动态再平衡"""
-    composite_equity = []
-
-    for i in range(len(equity_df)):
-        if i < lookback:
-            # 使用等权重
-            weight_vector = pd.Series(
-                [1.0 / len(equity_df.columns)] * len(equity_df.columns), index=equity_df.columns
-            )
-        else:
-            weight_vector = weights_df.iloc[i]
+    """应用动态再平衡（逐行加权求和合并为一次矩阵运算）"""
+    asset_count = len(equity_df.columns)
+    weights = weights_df.reindex(columns=equity_df.columns).to_numpy(dtype=float, copy=True)
+    # 回望期内使用等权重
+    weights[:lookback] = 1.0 / asset_count
 
-        # 计算加权权益
-        weighted_equity = (equity_df.iloc[i] * weight_vector).sum()
-        composite_equity.append(weighted_equity)
+    # 与pandas求和一致：NaN项不计入
+    equity = np.nan_to_num(equity_df.to_numpy(dtype=float), nan=0.0)
+    composite_equity = np.einsum("ij,ij->i", equity, np.nan_to_num(weights, nan=0.0))
 
     return pd.Series(composite_equity, index=equity_df.index)
 
 
+def _prices_to_legs(prices):
+    """对齐价格矩阵（列为资产）拆成各资产价格序列，去掉未上市/缺失部分"""
+    if isinstance(prices, pd.DataFrame):
+        return {symbol: prices[symbol].dropna() for symbol in prices.columns}
+    return prices
+
+
 def backtest_portfolio(
     prices_dict,
     fast_win=7,
@@ -399,12 +459,15 @@ def backtest_portfolio(
     lookback=20,
     prefer_better_asset=True,
     weight_power=2.0,
+    max_workers=None,
+    executor_factory=ProcessPoolExecutor,
 ):
     """
     投资组合回测函数。
 
     参数:
-        prices_dict: 价格数据字典，键为资产符号，值为价格序列
+        prices_dict: 价格数据字典，键为资产符号，值为价格序列；
+            也可以是对齐的价格矩阵DataFrame（索引为时间，列为资产）
         其他参数: 与backtest_single相同的策略参数
         use_dynamic_weights: 是否使用动态权重
         max_weight_factor: 最大权重系数
@@ -412,13 +475,17 @@ def backtest_portfolio(
         lookback: 回望窗口
         prefer_better_asset: 是否偏好表现更好的资产
         weight_power: 权重幂次
+        max_workers: 并行回测的进程数（默认None串行；大于1时启用进程池，-1为CPU核数；
+            进程池不可用时自动回退串行）
+        executor_factory: 并行时创建执行器的工厂，按 factory(max_workers=n) 调用，
+            默认ProcessPoolExecutor
 
     返回:
         Dict: 包含组合权益曲线和其他信息的字典
     """
     # 计算基础权益曲线
     equity_curves = _calculate_base_equity_curves(
-        prices_dict,
+        _prices_to_legs(prices_dict),
         fast_win,
         slow_win,
         atr_win,
@@ -427,32 +494,62 @@ def backtest_portfolio(
         use_trailing_stop,
         breakeven_r,
         trail_r,
+        max_workers=max_workers,
+        executor_factory=executor_factory,
     )
 
     # 创建权益DataFrame
     equity_df = pd.DataFrame(equity_curves)
     equity_df = equity_df.ffill().fillna(init_equity)
 
-    if use_dynamic_weights:
-        # 计算动态权重
-        weights_df = _calculate_dynamic_weights(
-            equity_df,
-            equity_df,
-            lookback,
-            len(prices_dict),
-            weight_power,
-            min_weight_factor,
-            max_weight_factor,
-        )
-
-        # 应用动态再平衡
-        composite_equity = _apply_dynamic_rebalancing(equity_df, weights_df, lookback)
-    else:
-        # 使用等权重
-        composite_equity = equity_df.mean(axis=1)
+    composite_equity, weights_df = combine_portfolio_equity(
+        equity_df,
+        use_dynamic_weights=use_dynamic_weights,
+        max_weight_factor=max_weight_factor,
+        min_weight_factor=min_weight_factor,
+        lookback=lookback,
+        weight_power=weight_power,
+    )
 
     return {
         "composite_equity": composite_equity,
         "individual_equity": equity_df,
-        "weights": weights_df if use_dynamic_weights else None,
+        "weights": weights_df,
     }
+
+
+def combine_portfolio_equity(
+    equity_df,
+    use_dynamic_weights=True,
+    max_weight_factor=1.5,
+    min_weight_factor=0.5,
+    lookback=20,
+    weight_power=2.0,
+):
+    """
+    将各资产权益曲线合成为组合权益曲线（backtest_portfolio 的合成步骤）
+
+    参数:
+        equity_df: 对齐后的各资产权益DataFrame（已前向填充）
+        其他参数: 与backtest_portfolio相同
+
+    返回:
+        (组合权益曲线, 权重DataFrame或None)
+    """
+    if not use_dynamic_weights:
+        # 使用等权重
+        return equity_df.mean(axis=1), None
+
+    # 计算动态权重
+    weights_df = _calculate_dynamic_weights(
+        equity_df,
+        equity_df,
+        lookback,
+        len(equity_df.columns),
+        weight_power,
+        min_weight_factor,
+        max_weight_factor,
+    )
+
+    # 应用动态再平衡
+    return _apply_dynamic_rebalancing(equity_df, weights_df, lookback), weights_df
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+回测数组内核
+Backtest Array Kernel
+
+将 BacktestExecutor 的 MA交叉 + ATR止损 + 保本/跟踪(R倍数) 状态机
+改写为作用于纯NumPy数组的单遍循环。
+
+用途：
+- 指标与交叉信号先整体向量化计算
+- 空仓区间直接跳到下一个可入场的K线，批量填充权益
+- 输出数组预先分配，不在循环中构造pandas对象
+- 安装了numba时自动JIT编译，否则以同一份代码在Python列表上运行
+"""
+
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.indicators import moving_average, vectorized_cross
+
+try:
+    from numba import njit
+
+    JIT_ENABLED = True
+except ImportError:  # numba为可选依赖，未安装时以纯Python运行同一份代码
+    JIT_ENABLED = False
+
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+
+@njit(cache=True)
+def _trailing_stop(price, atr, entry, initial_stop, breakeven_r, trail_r):
+    """compute_trailing_stop 的内联版本（atr<=0 时按初始风险50%跟踪）"""
+    initial_risk = entry - initial_stop
+    if initial_risk <= 0:
+        return initial_stop
+    current_r = (price - entry) / initial_risk
+    if current_r > 0:
+        if current_r >= breakeven_r and current_r <= trail_r:
+            return entry
+        if current_r > trail_r:
+            if atr > 0:
+                return price - atr
+            return price - initial_risk * 0.5
+    return initial_stop
+
+
+@njit(cache=True)
+def _ma_atr_kernel(
+    price,
+    atr,
+    sell,
+    next_entry,
+    risk_frac,
+    init_equity,
+    use_trailing_stop,
+    breakeven_r,
+    trail_r,
+    out,
+):
+    """
+    逐K线状态机（与 BacktestExecutor._process_price_point 逐项一致）
+
+    参数均为可按下标访问的序列；out为预分配的float64数组。
+
+    返回:
+        (最终权益, 交易次数)
+    """
+    n = len(price)
+    equity = init_equity
+    position = 0.0
+    entry = 0.0
+    stop = 0.0
+    initial_stop = 0.0
+    trades = 0
+
+    i = 0
+    while i < n:
+        if position == 0.0:
+            # 空仓：权益不变，直接跳到下一个买入信号且ATR>0的K线
+            j = next_entry[i]
+            if j > i:
+                out[i:j] = equity
+                i = j
+                if i >= n:
+                    break
+
+            p = price[i]
+            a = atr[i]
+            position = float(max(1, int((equity * risk_frac) / a)))
+            entry = p
+            stop = entry - 1.0 * a
+            initial_stop = stop
+            trades += 1
+            out[i] = equity + (p - entry) * position
+            i += 1
+            continue
+
+        p = price[i]
+        a = atr[i]
+
+        # 更新移动止损（只能向有利方向移动）
+        if use_trailing_stop and entry > 0 and initial_stop > 0:
+            new_stop = _trailing_stop(p, a, entry, initial_stop, breakeven_r, trail_r)
+            if new_stop > stop:
+                stop = new_stop
+
+        if sell[i] or (stop > 0 and p <= stop):
+            equity += (p - entry) * position
+            position = 0.0
+            entry = 0.0
+            stop = 0.0
+            initial_stop = 0.0
+            out[i] = equity
+        else:
+            out[i] = equity + (p - entry) * position
+        i += 1
+
+    return equity, trades
+
+
+def build_signal_arrays(
+    price: pd.Series, fast_ma: pd.Series, slow_ma: pd.Series, atr: pd.Series
+) -> Dict[str, np.ndarray]:
+    """
+    将价格、均线与ATR序列转换为内核输入数组
+
+    参数:
+        price: 价格序列
+        fast_ma: 快速均线
+        slow_ma: 慢速均线
+        atr: ATR序列（NaN视为0，与 BacktestExecutor._get_current_atr 一致）
+
+    返回:
+        dict: price / atr / buy / sell 数组
+    """
+    buy, sell = cross_signal_arrays(fast_ma, slow_ma)
+    return {
+        "price": price.to_numpy(dtype=np.float64),
+        "atr": atr_array(atr),
+        "buy": buy,
+        "sell": sell,
+    }
+
+
+def cross_signal_arrays(fast_ma: pd.Series, slow_ma: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """上穿/下穿布尔数组"""
+    buy = vectorized_cross(fast_ma, slow_ma, direction="above").to_numpy(dtype=bool)
+    sell = vectorized_cross(fast_ma, slow_ma, direction="below").to_numpy(dtype=bool)
+    return buy, sell
+
+
+def atr_array(atr: pd.Series) -> np.ndarray:
+    """ATR序列转float64数组（NaN视为0）"""
+    return np.nan_to_num(atr.to_numpy(dtype=np.float64), nan=0.0)
+
+
+def prepare_signal_arrays(
+    price: pd.Series, fast_win: int, slow_win: int, atr_win: int
+) -> Dict[str, np.ndarray]:
+    """按 BacktestExecutor 的指标口径（SMA + 简化ATR）计算内核输入数组"""
+    fast_ma = moving_average(price, fast_win, kind="sma")
+    slow_ma = moving_average(price, slow_win, kind="sma")
+    atr = price.diff().abs().rolling(window=atr_win).mean()
+    return build_signal_arrays(price, fast_ma, slow_ma, atr)
+
+
+def next_entry_index(buy: np.ndarray, atr: np.ndarray) -> np.ndarray:
+    """每根K线之后（含）第一个可入场位置（买入信号且ATR>0），没有则为n"""
+    n = len(buy)
+    candidates = np.flatnonzero(buy & (atr > 0))
+    return np.append(candidates, n)[np.searchsorted(candidates, np.arange(n))]
+
+
+def run_ma_atr_kernel(
+    arrays: Dict[str, np.ndarray],
+    risk_frac: float = 0.02,
+    init_equity: float = 100_000.0,
+    use_trailing_stop: bool = True,
+    breakeven_r: float = 1.0,
+    trail_r: float = 2.0,
+) -> Tuple[np.ndarray, int]:
+    """
+    在预先计算的数组上运行回测状态机
+
+    参数:
+        arrays: build_signal_arrays / prepare_signal_arrays 的返回值
+        其他参数: 与 backtest_single 相同
+
+    返回:
+        (权益曲线数组, 交易次数)
+    """
+    price = arrays["price"]
+    out = np.empty(len(price), dtype=np.float64)
+    next_entry = next_entry_index(arrays["buy"], arrays["atr"])
+
+    if JIT_ENABLED:
+        _, trades = _ma_atr_kernel(
+            price,
+            arrays["atr"],
+            arrays["sell"],
+            next_entry,
+            float(risk_frac),
+            float(init_equity),
+            bool(use_trailing_stop),
+            float(breakeven_r),
+            float(trail_r),
+            out,
+        )
+    else:
+        # 纯Python模式下按列表访问比逐个读取NumPy标量快得多
+        _, trades = _ma_atr_kernel(
+            price.tolist(),
+            arrays["atr"].tolist(),
+            arrays["sell"].tolist(),
+            next_entry.tolist(),
+            risk_frac,
+            init_equity,
+            use_trailing_stop,
+            breakeven_r,
+            trail_r,
+            out,
+        )
+    return out, trades
@@ -8,10 +8,18 @@ Provides abstract base classes and common functionality for all trading strategi
 
 import logging
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, Optional, Tuple, Union
 
 import pandas as pd
 
+from src.indicators import (
+    average_true_range,
+    exponential_moving_average,
+    get_indicator_cache,
+    simple_moving_average,
+    standard_deviation,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -99,7 +107,13 @@ class TechnicalIndicatorStrategy(BaseStrategy):
     """
     Base class for strategies using technical indicators (技术指标策略基类)
 
-    Provides common functionality for indicator-based strategies
+    Provides common functionality for indicator-based strategies.
+
+    The ``_calculate_*`` helpers go through the global indicator cache, so strategies
+    run on the same data share results. Cache keys cover the data's identity, index
+    and edge values only: after editing a frame in place (other than appending bars),
+    call ``get_indicator_cache().invalidate(data)`` before recomputing, or
+    ``invalidate()`` to drop everything, otherwise stale indicators are returned.
     """
 
     def __init__(self, name: str = None, parameters: Optional[Dict[str, Any]] = None):
@@ -139,12 +153,40 @@ class TechnicalIndicatorStrategy(BaseStrategy):
         return result.fillna(0)  # or however you want to handle NaN values
 
     def _calculate_sma(self, data: pd.Series, period: int) -> pd.Series:
-        """Calculate Simple Moving Average"""
-        return data.rolling(window=period).mean()
+        """Calculate Simple Moving Average (cached, see class docstring)"""
+        return simple_moving_average(data, period)
 
     def _calculate_ema(self, data: pd.Series, period: int) -> pd.Series:
-        """Calculate Exponential Moving Average"""
-        return data.ewm(span=period).mean()
+        """Calculate Exponential Moving Average (cached, see class docstring)"""
+        return exponential_moving_average(data, period, adjust=True)
+
+    def _calculate_atr(
+        self, high: pd.Series, low: pd.Series, close: pd.Series, period: int = 14
+    ) -> pd.Series:
+        """Calculate Average True Range (cached, see class docstring)"""
+        return average_true_range(high, low, close, period)
+
+    def _calculate_gain_loss(
+        self, data: pd.Series, period: int = 14
+    ) -> Tuple[pd.Series, pd.Series]:
+        """
+        Calculate rolling average gain and loss, the shared inputs of RSI variants
+
+        Args:
+            data: Price series
+            period: Rolling window
+
+        Returns:
+            (average gain, average loss), both non-negative
+        """
+
+        def compute() -> Tuple[pd.Series, pd.Series]:
+            delta = data.diff()
+            gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
+            loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+            return gain, loss
+
+        return get_indicator_cache().get_or_compute("gain_loss", [data], (period,), compute)
 
     def _calculate_rsi(self, data: pd.Series, period: int = 14) -> pd.Series:
         """
@@ -157,13 +199,15 @@ class TechnicalIndicatorStrategy(BaseStrategy):
         Returns:
             RSI values
         """
-        delta = data.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
 
-        rs = self._safe_divide(gain, loss)
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+        def compute() -> pd.Series:
+            gain, loss = self._calculate_gain_loss(data, period)
+            rs = self._safe_divide(gain, loss)
+            return 100 - (100 / (1 + rs))
+
+        # _safe_divide可被子类覆盖，作为键的一部分
+        params = (period, type(self)._safe_divide)
+        return get_indicator_cache().get_or_compute("strategy_rsi", [data], params, compute)
 
     def _calculate_bollinger_bands(
         self, data: pd.Series, period: int = 20, std_dev: float = 2.0
@@ -180,7 +224,7 @@ class TechnicalIndicatorStrategy(BaseStrategy):
             Dictionary with 'upper', 'middle', 'lower' bands
         """
         middle = self._calculate_sma(data, period)
-        std = data.rolling(window=period).std()
+        std = standard_deviation(data, period)
 
         return {
             "upper": middle + (std * std_dev),
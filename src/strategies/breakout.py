@@ -21,13 +21,9 @@ class BollingerBreakoutStrategy(TechnicalIndicatorStrategy):
 
     def calculate_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
         """计算布林带指标"""
-        close = data["close"]
-
-        # 计算布林带
-        middle_band = close.rolling(window=self.window).mean()
-        std_dev = close.rolling(window=self.window).std()
-        upper_band = middle_band + (std_dev * self.num_std)
-        lower_band = middle_band - (std_dev * self.num_std)
+        # 计算布林带（中轨/标准差经指标缓存与其他策略共享）
+        bands = self._calculate_bollinger_bands(data["close"], self.window, self.num_std)
+        upper_band, middle_band, lower_band = bands["upper"], bands["middle"], bands["lower"]
 
         result = data.copy()
         result["upper_band"] = upper_band
@@ -69,13 +65,9 @@ class BollingerMeanReversionStrategy(TechnicalIndicatorStrategy):
 
     def calculate_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
         """计算布林带指标"""
-        close = data["close"]
-
-        # 计算布林带
-        middle_band = close.rolling(window=self.window).mean()
-        std_dev = close.rolling(window=self.window).std()
-        upper_band = middle_band + (std_dev * self.num_std)
-        lower_band = middle_band - (std_dev * self.num_std)
+        # 计算布林带（中轨/标准差经指标缓存与其他策略共享）
+        bands = self._calculate_bollinger_bands(data["close"], self.window, self.num_std)
+        upper_band, middle_band, lower_band = bands["upper"], bands["middle"], bands["lower"]
 
         result = data.copy()
         result["upper_band"] = upper_band
@@ -219,15 +211,9 @@ class ATRBreakoutStrategy(TechnicalIndicatorStrategy):
         low = data["low"]
         close = data["close"]
 
-        # 计算ATR
-        tr1 = high - low
-        tr2 = abs(high - close.shift(1))
-        tr3 = abs(low - close.shift(1))
-        true_range = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        atr = true_range.rolling(window=self.atr_period).mean()
-
-        # 计算移动平均
-        ma = close.rolling(window=self.ma_period).mean()
+        # 计算ATR与移动平均（经指标缓存与其他策略共享）
+        atr = self._calculate_atr(high, low, close, self.atr_period)
+        ma = self._calculate_sma(close, self.ma_period)
 
         # 计算ATR带
         upper_atr = ma + (atr * self.multiplier)
@@ -25,10 +25,8 @@ class RSIStrategy(TechnicalIndicatorStrategy):
 
     def calculate_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
         """计算RSI指标"""
-        close = data[self.column]
-        delta = close.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=self.window).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=self.window).mean()
+        # 平均涨跌幅经指标缓存与其他策略共享
+        gain, loss = self._calculate_gain_loss(data[self.column], self.window)
 
         # 处理除零问题
         rs = gain / loss.replace(0, float("inf"))
@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+"""
+并行参数扫描
+Parallel Parameter Sweep
+
+用途：
+- 对 backtest_single / backtest_portfolio 的策略参数做网格搜索或随机搜索
+- 进程池并行执行，价格数据放在共享内存中，不随每个任务序列化
+- 每个worker按窗口缓存均线/ATR/交叉信号，参数组合按窗口排序分块以提高复用
+- 结果（最终权益、Sharpe、最大回撤）边完成边写入Parquet分片，内存占用有界
+"""
+
+import glob
+import itertools
+import logging
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import lru_cache
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from src.indicators import moving_average
+from src.metrics import max_drawdown, sharpe_ratio
+from src.strategies.backtest import combine_portfolio_equity
+from src.strategies.backtest_kernel import atr_array, cross_signal_arrays, run_ma_atr_kernel
+
+logger = logging.getLogger(__name__)
+
+# 可扫描的参数及默认值（与backtest_single一致）
+DEFAULT_PARAMS = {
+    "fast_win": 7,
+    "slow_win": 20,
+    "atr_win": 20,
+    "risk_frac": 0.02,
+    "breakeven_r": 1.0,
+    "trail_r": 2.0,
+}
+
+# 每个worker缓存的指标条数（100万根K线的float64序列约8MB）
+INDICATOR_CACHE_SIZE = 16
+
+
+def _validate_space(space: Dict[str, Sequence]) -> None:
+    unknown = set(space) - set(DEFAULT_PARAMS)
+    if unknown:
+        raise ValueError(f"未知参数: {sorted(unknown)}")
+
+
+def _is_valid(combo: Dict[str, Any]) -> bool:
+    # 保证快线 < 慢线
+    return combo["fast_win"] < combo["slow_win"]
+
+
+def grid_search_space(space: Dict[str, Sequence]) -> List[Dict[str, Any]]:
+    """
+    网格搜索参数组合（未指定的参数取默认值，自动跳过 fast_win >= slow_win）
+
+    参数:
+        space: 参数名 -> 候选值序列
+
+    返回:
+        参数组合列表
+    """
+    _validate_space(space)
+    names = list(space)
+    combos = []
+    for values in itertools.product(*(space[name] for name in names)):
+        combo = {**DEFAULT_PARAMS, **dict(zip(names, values))}
+        if _is_valid(combo):
+            combos.append(combo)
+    return combos
+
+
+def random_search_space(
+    space: Dict[str, Sequence], n_samples: int, seed: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    随机搜索参数组合（从候选值中均匀抽样，不重复）
+
+    参数:
+        space: 参数名 -> 候选值序列
+        n_samples: 组合数量（不超过有效组合总数）
+        seed: 随机种子
+
+    返回:
+        参数组合列表
+    """
+    _validate_space(space)
+    rng = random.Random(seed)
+    names = list(space)
+    seen = set()
+    combos = []
+    max_attempts = n_samples * 20
+    for _ in range(max_attempts):
+        if len(combos) >= n_samples:
+            break
+        values = tuple(rng.choice(list(space[name])) for name in names)
+        if values in seen:
+            continue
+        seen.add(values)
+        combo = {**DEFAULT_PARAMS, **dict(zip(names, values))}
+        if _is_valid(combo):
+            combos.append(combo)
+    return combos
+
+
+class SharedPriceBlock:
+    """共享内存中的价格数据：各资产价格首尾相接，附带在对齐索引中的行位置"""
+
+    def __init__(self, prices: Dict[str, pd.Series]):
+        aligned_index = pd.DataFrame(prices).index
+        values = [series.to_numpy(dtype=np.float64) for series in prices.values()]
+        positions = [aligned_index.get_indexer(series.index) for series in prices.values()]
+        lengths = [len(v) for v in values]
+        total = sum(lengths)
+
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, total * 16))
+        self.layout = {
+            "name": self.shm.name,
+            "symbols": list(prices),
+            "lengths": lengths,
+            "n_rows": len(aligned_index),
+        }
+        buffer_values, buffer_positions = self._views(self.shm, total)
+        if total:
+            buffer_values[:] = np.concatenate(values)
+            buffer_positions[:] = np.concatenate(positions)
+
+    @staticmethod
+    def _views(shm: shared_memory.SharedMemory, total: int) -> Tuple[np.ndarray, np.ndarray]:
+        values = np.ndarray((total,), dtype=np.float64, buffer=shm.buf)
+        positions = np.ndarray((total,), dtype=np.int64, buffer=shm.buf, offset=total * 8)
+        return values, positions
+
+    @classmethod
+    def attach(
+        cls, layout: Dict[str, Any]
+    ) -> Tuple[shared_memory.SharedMemory, List[np.ndarray], List[np.ndarray]]:
+        """
+        在worker中按布局挂载共享内存（零拷贝视图）
+
+        返回:
+            (共享内存句柄, 各资产价格数组, 各资产行位置数组)
+        """
+        shm = shared_memory.SharedMemory(name=layout["name"])
+        values, positions = cls._views(shm, sum(layout["lengths"]))
+        bounds = np.cumsum([0] + layout["lengths"])
+        legs = [slice(start, end) for start, end in zip(bounds[:-1], bounds[1:])]
+        return shm, [values[leg] for leg in legs], [positions[leg] for leg in legs]
+
+    def close(self) -> None:
+        """释放并删除共享内存"""
+        self.shm.close()
+        self.shm.unlink()
+
+
+class SweepResultWriter:
+    """
+    将结果按批写入 ``<output>/part-XXXXX.parquet`` 分片
+
+    目录已存在时只删除旧的 ``part-*.parquet`` 分片；目录中还有其他文件时
+    （多半是路径写错），除非 ``overwrite=True`` 否则拒绝写入，且其他文件从不删除。
+    """
+
+    def __init__(self, output_path: str, flush_rows: int = 1000, overwrite: bool = False):
+        self.output_path = output_path
+        self.flush_rows = flush_rows
+        self.parts = 0
+        self.rows_written = 0
+        self._buffer: List[Dict[str, Any]] = []
+
+        if os.path.isdir(output_path):
+            self._clear_parts(output_path, overwrite)
+        os.makedirs(output_path, exist_ok=True)
+
+    @staticmethod
+    def _clear_parts(output_path: str, overwrite: bool) -> None:
+        parts = set(glob.glob(os.path.join(output_path, "part-*.parquet")))
+        others = [
+            name for name in os.listdir(output_path) if os.path.join(output_path, name) not in parts
+        ]
+        if others and not overwrite:
+            raise FileExistsError(
+                f"结果目录 {output_path} 包含非扫描结果文件（{sorted(others)[:5]}），"
+                "请换一个目录或传入 overwrite=True"
+            )
+        for part in parts:
+            os.remove(part)
+
+    def add(self, rows: Iterable[Dict[str, Any]]) -> None:
+        self._buffer.extend(rows)
+        if len(self._buffer) >= self.flush_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        path = os.path.join(self.output_path, f"part-{self.parts:05d}.parquet")
+        pd.DataFrame(self._buffer).to_parquet(path, index=False)
+        self.parts += 1
+        self.rows_written += len(self._buffer)
+        self._buffer = []
+
+    def close(self) -> None:
+        self.flush()
+
+
+def load_sweep_results(output_path: str) -> pd.DataFrame:
+    """读取扫描结果（合并所有Parquet分片）"""
+    parts = sorted(glob.glob(os.path.join(output_path, "part-*.parquet")))
+    if not parts:
+        return pd.DataFrame()
+    return pd.concat([pd.read_parquet(part) for part in parts], ignore_index=True)
+
+
+# ---------------------------------------------------------------------------
+# worker 侧
+# ---------------------------------------------------------------------------
+
+_WORKER: Dict[str, Any] = {}
+
+
+def _init_worker(layout: Dict[str, Any], options: Dict[str, Any]) -> None:
+    """进程池initializer：挂载共享价格数据并清空指标缓存"""
+    shm, values, positions = SharedPriceBlock.attach(layout)
+    _WORKER.update(
+        shm=shm,
+        values=values,
+        prices=[pd.Series(v, copy=False) for v in values],
+        positions=positions,
+        symbols=layout["symbols"],
+        n_rows=layout["n_rows"],
+        options=options,
+    )
+    _clear_indicator_cache()
+
+
+def _release_worker() -> None:
+    _clear_indicator_cache()
+    shm = _WORKER.pop("shm", None)
+    _WORKER.clear()
+    if shm is not None:
+        shm.close()
+
+
+@lru_cache(maxsize=INDICATOR_CACHE_SIZE)
+def _sma(leg: int, window: int) -> pd.Series:
+    return moving_average(_WORKER["prices"][leg], window, kind="sma")
+
+
+@lru_cache(maxsize=INDICATOR_CACHE_SIZE)
+def _signals(leg: int, fast_win: int, slow_win: int) -> Tuple[np.ndarray, np.ndarray]:
+    return cross_signal_arrays(_sma(leg, fast_win), _sma(leg, slow_win))
+
+
+@lru_cache(maxsize=INDICATOR_CACHE_SIZE)
+def _atr(leg: int, window: int) -> np.ndarray:
+    price = _WORKER["prices"][leg]
+    return atr_array(price.diff().abs().rolling(window=window).mean())
+
+
+def _clear_indicator_cache() -> None:
+    _sma.cache_clear()
+    _signals.cache_clear()
+    _atr.cache_clear()
+
+
+def _evaluate(params: Dict[str, Any]) -> Dict[str, Any]:
+    """对一组参数运行回测并计算指标"""
+    options = _WORKER["options"]
+    init_equity = options["init_equity"]
+
+    curves = []
+    trades = 0
+    for leg, values in enumerate(_WORKER["values"]):
+        buy, sell = _signals(leg, params["fast_win"], params["slow_win"])
+        arrays = {"price": values, "atr": _atr(leg, params["atr_win"]), "buy": buy, "sell": sell}
+        curve, leg_trades = run_ma_atr_kernel(
+            arrays,
+            risk_frac=params["risk_frac"],
+            init_equity=init_equity,
+            use_trailing_stop=options["use_trailing_stop"],
+            breakeven_r=params["breakeven_r"],
+            trail_r=params["trail_r"],
+        )
+        curves.append(curve)
+        trades += leg_trades
+
+    if options["portfolio_kwargs"] is None:
+        equity = pd.Series(curves[0])
+    else:
+        # 与backtest_portfolio相同：按并集索引对齐、前向填充、再合成
+        matrix = np.full((_WORKER["n_rows"], len(curves)), np.nan)
+        for leg, curve in enumerate(curves):
+            matrix[_WORKER["positions"][leg], leg] = curve
+        equity_df = pd.DataFrame(matrix, columns=_WORKER["symbols"]).ffill().fillna(init_equity)
+        equity, _ = combine_portfolio_equity(equity_df, **options["portfolio_kwargs"])
+
+    return {
+        **params,
+        "final_equity": float(equity.iloc[-1]),
+        "sharpe": float(sharpe_ratio(equity)),
+        "max_drawdown": float(max_drawdown(equity)),
+        "trades": trades,
+    }
+
+
+def _run_chunk(chunk: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+    """运行一批参数组合，返回(结果行, 失败数)"""
+    rows = []
+    failed = 0
+    for params in chunk:
+        try:
+            rows.append(_evaluate(params))
+        except Exception as e:
+            failed += 1
+            logger.warning(f"⚠️ 参数组合回测失败 {params}: {e}")
+    return rows, failed
+
+
+# ---------------------------------------------------------------------------
+# 调度侧
+# ---------------------------------------------------------------------------
+
+
+class ParameterSweep:
+    """并行参数扫描器"""
+
+    def __init__(
+        self,
+        prices: Union[pd.Series, Dict[str, pd.Series]],
+        output_path: str,
+        max_workers: Optional[int] = None,
+        chunk_size: int = 16,
+        flush_rows: int = 1000,
+        init_equity: float = 100_000.0,
+        use_trailing_stop: bool = True,
+        portfolio_kwargs: Optional[Dict[str, Any]] = None,
+        overwrite: bool = False,
+    ):
+        """
+        初始化参数扫描器
+
+        参数:
+            prices: 单一价格序列（对应backtest_single）或 资产->价格序列 字典
+                    （对应backtest_portfolio）
+            output_path: 结果目录（Parquet分片，已存在时只替换旧分片）
+            max_workers: 进程数，None为CPU核数，0为在当前进程内串行执行
+            chunk_size: 每个任务包含的参数组合数
+            flush_rows: 累积多少行结果写一个分片
+            init_equity: 初始资金
+            use_trailing_stop: 是否使用移动止损
+            portfolio_kwargs: 组合合成参数（use_dynamic_weights/lookback/weight_power等），
+                              仅字典输入时生效
+            overwrite: 结果目录含有非分片文件时仍写入（其他文件保留不删）
+        """
+        if isinstance(prices, pd.Series):
+            self.prices = {prices.name or "price": prices}
+            self.portfolio_kwargs = None
+        else:
+            self.prices = dict(prices)
+            self.portfolio_kwargs = dict(portfolio_kwargs or {})
+        if not self.prices or any(series.empty for series in self.prices.values()):
+            raise ValueError("价格数据不能为空")
+
+        self.output_path = output_path
+        self.overwrite = overwrite
+        self.max_workers = os.cpu_count() if max_workers is None else max_workers
+        self.chunk_size = chunk_size
+        self.flush_rows = flush_rows
+        self.options = {
+            "init_equity": init_equity,
+            "use_trailing_stop": use_trailing_stop,
+            "portfolio_kwargs": self.portfolio_kwargs,
+        }
+
+    def grid(self, space: Dict[str, Sequence]) -> Dict[str, Any]:
+        """网格搜索"""
+        return self.run(grid_search_space(space))
+
+    def random(
+        self, space: Dict[str, Sequence], n_samples: int, seed: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """随机搜索"""
+        return self.run(random_search_space(space, n_samples, seed))
+
+    def _chunks(self, combinations: Iterable[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        # 共用窗口的组合排在一起，落到同一个worker上复用指标
+        combos = sorted(
+            ({**DEFAULT_PARAMS, **c} for c in combinations),
+            key=lambda c: (c["fast_win"], c["slow_win"], c["atr_win"]),
+        )
+        size = max(1, self.chunk_size)
+        return [combos[slice(i, i + size)] for i in range(0, len(combos), size)]
+
+    def run(self, combinations: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        执行扫描
+
+        参数:
+            combinations: 参数组合（缺省参数取默认值）
+
+        返回:
+            dict: 组合数、完成数、失败数、输出路径、耗时与最佳组合（按Sharpe）
+        """
+        chunks = self._chunks(combinations)
+        writer = SweepResultWriter(self.output_path, self.flush_rows, self.overwrite)
+        block = SharedPriceBlock(self.prices)
+        summary = {"completed": 0, "failed": 0, "best": None}
+        start = time.perf_counter()
+
+        def collect(result: Tuple[List[Dict[str, Any]], int]) -> None:
+            rows, failed = result
+            writer.add(rows)
+            summary["completed"] += len(rows)
+            summary["failed"] += failed
+            for row in rows:
+                best = summary["best"]
+                if not np.isnan(row["sharpe"]) and (best is None or row["sharpe"] > best["sharpe"]):
+                    summary["best"] = row
+
+        try:
+            if self.max_workers == 0:
+                _init_worker(block.layout, self.options)
+                try:
+                    for chunk in chunks:
+                        collect(_run_chunk(chunk))
+                finally:
+                    _release_worker()
+            else:
+                self._run_pool(chunks, block.layout, collect)
+        finally:
+            writer.close()
+            block.close()
+
+        elapsed = time.perf_counter() - start
+        total = sum(len(chunk) for chunk in chunks)
+        logger.info(f"✅ 参数扫描完成: {summary['completed']}/{total} 组合, 耗时 {elapsed:.1f}s")
+        return {
+            "combinations": total,
+            "completed": summary["completed"],
+            "failed": summary["failed"],
+            "output_path": self.output_path,
+            "parts": writer.parts,
+            "elapsed_seconds": elapsed,
+            "combinations_per_second": total / elapsed if elapsed > 0 else 0.0,
+            "best": summary["best"],
+        }
+
+    def _run_pool(self, chunks, layout, collect) -> None:
+        # 限制在途任务数，结果及时落盘，内存不随组合数增长
+        max_in_flight = self.max_workers * 2
+        pending_chunks = iter(chunks)
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_worker,
+            initargs=(layout, self.options),
+        ) as pool:
+            in_flight = set()
+            while True:
+                for chunk in itertools.islice(pending_chunks, max_in_flight - len(in_flight)):
+                    in_flight.add(pool.submit(_run_chunk, chunk))
+                if not in_flight:
+                    break
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    collect(future.result())
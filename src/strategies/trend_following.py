@@ -6,11 +6,122 @@
 实现基于趋势跟踪的交易策略，包括Supertrend、多时间框架等
 """
 
+import numpy as np
 import pandas as pd
 
 from .base import TechnicalIndicatorStrategy
 
 
+def supertrend_final_bands(basic_upper, basic_lower, close):
+    """
+    计算Supertrend最终上下轨（单遍循环，逐点规则与逐行实现一致）
+
+    参数:
+        basic_upper: 基础上轨数组
+        basic_lower: 基础下轨数组
+        close: 收盘价数组
+
+    返回:
+        (最终上轨, 最终下轨) float64数组
+    """
+    upper = np.asarray(basic_upper, dtype=np.float64).tolist()
+    lower = np.asarray(basic_lower, dtype=np.float64).tolist()
+    prev_close = np.asarray(close, dtype=np.float64).tolist()
+    n = len(upper)
+    final_upper = np.empty(n)
+    final_lower = np.empty(n)
+    if n == 0:
+        return final_upper, final_lower
+
+    fu, fl = upper[0], lower[0]
+    final_upper[0], final_lower[0] = fu, fl
+    for i in range(1, n):
+        c = prev_close[i - 1]
+        if upper[i] < fu or c > fu:
+            fu = upper[i]
+        if lower[i] > fl or c < fl:
+            fl = lower[i]
+        final_upper[i] = fu
+        final_lower[i] = fl
+    return final_upper, final_lower
+
+
+def supertrend_direction(final_upper, final_lower, close):
+    """
+    计算Supertrend值与趋势方向（单遍循环）
+
+    参数:
+        final_upper: 最终上轨数组
+        final_lower: 最终下轨数组
+        close: 收盘价数组
+
+    返回:
+        (Supertrend值, 趋势方向 1/-1) float64数组
+    """
+    upper = np.asarray(final_upper, dtype=np.float64).tolist()
+    lower = np.asarray(final_lower, dtype=np.float64).tolist()
+    prices = np.asarray(close, dtype=np.float64).tolist()
+    n = len(prices)
+    supertrend = np.empty(n)
+    trend = np.empty(n)
+    if n == 0:
+        return supertrend, trend
+
+    value, direction = upper[0], -1.0
+    supertrend[0], trend[0] = value, direction
+    for i in range(1, n):
+        if prices[i] <= lower[i]:
+            value, direction = lower[i], -1.0
+        elif prices[i] >= upper[i]:
+            value, direction = upper[i], 1.0
+        supertrend[i] = value
+        trend[i] = direction
+    return supertrend, trend
+
+
+def variable_window_mean(values, starts):
+    """
+    可变窗口均值：第i个输出为 values[starts[i]..i] 的均值（忽略NaN，与pandas.mean一致）
+
+    使用分块前缀和：每块长度不小于最大窗口，窗口最多跨两块，
+    块内累加的量级有界，避免全局前缀和在长序列上的精度损失。
+
+    参数:
+        values: 输入数组
+        starts: 每个位置的窗口起点（含）
+
+    返回:
+        float64数组
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    if n == 0:
+        return np.empty(0)
+    ends = np.arange(n)
+    starts = np.clip(np.asarray(starts, dtype=np.int64), 0, ends)
+
+    max_window = int((ends - starts).max()) + 1
+    block = max(64, 1 << (max_window - 1).bit_length())
+    n_blocks = -(-n // block)
+
+    valid = ~np.isnan(values)
+    padded = np.zeros(n_blocks * block)
+    padded[:n] = np.where(valid, values, 0.0)
+    local = np.cumsum(padded.reshape(n_blocks, block), axis=1).ravel()
+
+    start_offset = starts % block
+    before_start = np.where(start_offset > 0, local[starts - 1], 0.0)
+    start_block = starts // block
+    spans_blocks = start_block != ends // block
+    carry = np.where(spans_blocks, local[start_block * block + block - 1], 0.0)
+    sums = local[ends] - before_start + carry
+
+    counts = np.concatenate(([0], np.cumsum(valid)))
+    count = counts[ends + 1] - counts[starts]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(count > 0, sums / count, np.nan)
+
+
 class TrendFollowingStrategy(TechnicalIndicatorStrategy):
     """基础趋势跟踪策略 - 基于移动平均和ATR的趋势跟踪"""
 
@@ -26,15 +137,9 @@ class TrendFollowingStrategy(TechnicalIndicatorStrategy):
         low = data["low"]
         close = data["close"]
 
-        # 计算移动平均
-        ma = close.rolling(window=self.ma_window).mean()
-
-        # 计算ATR
-        tr1 = high - low
-        tr2 = abs(high - close.shift(1))
-        tr3 = abs(low - close.shift(1))
-        true_range = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        atr = true_range.rolling(window=self.atr_window).mean()
+        # 计算移动平均与ATR（经指标缓存与其他策略共享）
+        ma = self._calculate_sma(close, self.ma_window)
+        atr = self._calculate_atr(high, low, close, self.atr_window)
 
         # 计算趋势带
         upper_trend = ma + (atr * self.multiplier)
@@ -101,12 +206,8 @@ class SupertrendStrategy(TechnicalIndicatorStrategy):
 
     def _calculate_atr_and_basic_bands(self, high: pd.Series, low: pd.Series, close: pd.Series):
         """计算ATR和基础上下轨"""
-        # 计算ATR
-        tr1 = high - low
-        tr2 = abs(high - close.shift(1))
-        tr3 = abs(low - close.shift(1))
-        true_range = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        atr = true_range.rolling(window=self.atr_period).mean()
+        # 计算ATR（经指标缓存与其他策略共享）
+        atr = self._calculate_atr(high, low, close, self.atr_period)
 
         # 计算基础上下轨
         hl2 = (high + low) / 2
@@ -119,83 +220,22 @@ class SupertrendStrategy(TechnicalIndicatorStrategy):
         self, basic_upper: pd.Series, basic_lower: pd.Series, close: pd.Series
     ):
         """计算最终上下轨"""
-        final_upper = pd.Series(index=basic_upper.index, dtype=float)
-        final_lower = pd.Series(index=basic_lower.index, dtype=float)
-
-        for i in range(len(basic_upper)):
-            if i == 0:
-                final_upper.iloc[i] = basic_upper.iloc[i]
-                final_lower.iloc[i] = basic_lower.iloc[i]
-            else:
-                final_upper.iloc[i] = self._calculate_final_upper_band(
-                    basic_upper, final_upper, close, i
-                )
-                final_lower.iloc[i] = self._calculate_final_lower_band(
-                    basic_lower, final_lower, close, i
-                )
-
-        return final_upper, final_lower
-
-    def _calculate_final_upper_band(
-        self, basic_upper: pd.Series, final_upper: pd.Series, close: pd.Series, i: int
-    ) -> float:
-        """计算单个时点的最终上轨"""
-        if (
-            basic_upper.iloc[i] < final_upper.iloc[i - 1]
-            or close.iloc[i - 1] > final_upper.iloc[i - 1]
-        ):
-            return basic_upper.iloc[i]
-        else:
-            return final_upper.iloc[i - 1]
-
-    def _calculate_final_lower_band(
-        self, basic_lower: pd.Series, final_lower: pd.Series, close: pd.Series, i: int
-    ) -> float:
-        """计算单个时点的最终下轨"""
-        if (
-            basic_lower.iloc[i] > final_lower.iloc[i - 1]
-            or close.iloc[i - 1] < final_lower.iloc[i - 1]
-        ):
-            return basic_lower.iloc[i]
-        else:
-            return final_lower.iloc[i - 1]
+        final_upper, final_lower = supertrend_final_bands(
+            basic_upper.to_numpy(), basic_lower.to_numpy(), close.to_numpy()
+        )
+        return (
+            pd.Series(final_upper, index=basic_upper.index),
+            pd.Series(final_lower, index=basic_lower.index),
+        )
 
     def _calculate_supertrend(
         self, final_upper: pd.Series, final_lower: pd.Series, close: pd.Series
     ):
         """计算Supertrend指标和趋势"""
-        supertrend = pd.Series(index=close.index, dtype=float)
-        trend = pd.Series(index=close.index, dtype=int)
-
-        for i in range(len(close)):
-            if i == 0:
-                supertrend.iloc[i] = final_upper.iloc[i]
-                trend.iloc[i] = -1
-            else:
-                supertrend_value, trend_value = self._calculate_supertrend_point(
-                    final_upper, final_lower, close, supertrend, trend, i
-                )
-                supertrend.iloc[i] = supertrend_value
-                trend.iloc[i] = trend_value
-
-        return supertrend, trend
-
-    def _calculate_supertrend_point(
-        self,
-        final_upper: pd.Series,
-        final_lower: pd.Series,
-        close: pd.Series,
-        supertrend: pd.Series,
-        trend: pd.Series,
-        i: int,
-    ):
-        """计算单个时点的Supertrend值和趋势"""
-        if close.iloc[i] <= final_lower.iloc[i]:
-            return final_lower.iloc[i], -1
-        elif close.iloc[i] >= final_upper.iloc[i]:
-            return final_upper.iloc[i], 1
-        else:
-            return supertrend.iloc[i - 1], trend.iloc[i - 1]
+        supertrend, trend = supertrend_direction(
+            final_upper.to_numpy(), final_lower.to_numpy(), close.to_numpy()
+        )
+        return pd.Series(supertrend, index=close.index), pd.Series(trend, index=close.index)
 
     def _build_result_dataframe(
         self,
@@ -316,15 +356,11 @@ class AdaptiveMovingAverageStrategy(TechnicalIndicatorStrategy):
         adaptive_window = self.window * (1 - volatility_normalized * 0.5)
         adaptive_window = adaptive_window.fillna(self.window).clip(lower=5, upper=self.window * 2)
 
-        # 计算自适应移动平均
-        adaptive_ma = pd.Series(index=data.index, dtype=float)
-        for i in range(len(data)):
-            if i >= self.window:
-                window_size = int(adaptive_window.iloc[i])
-                start_idx = max(0, i - window_size + 1)
-                adaptive_ma.iloc[i] = close.iloc[start_idx : (i + 1)].mean()
-            else:
-                adaptive_ma.iloc[i] = close.iloc[: i + 1].mean()
+        # 计算自适应移动平均（前window行为扩展窗口均值）
+        positions = np.arange(len(data))
+        window_sizes = adaptive_window.to_numpy().astype(np.int64)
+        starts = np.where(positions >= self.window, positions - window_sizes + 1, 0)
+        adaptive_ma = pd.Series(variable_window_mean(close.to_numpy(), starts), index=data.index)
 
         result = data.copy()
         result["volatility"] = volatility
@@ -19,14 +19,29 @@ import pandas as pd
 import websockets
 
 from src.monitoring.metrics_collector import get_metrics_collector
+from src.ws import kline_decoder
+from src.ws.connection_pool import COMBINED_STREAM_URL, BinanceWSPool
+from src.ws.kline_dispatcher import KlineDispatcher
 
 
 class BinanceWSClient:
     """Binance WebSocket客户端"""
 
-    def __init__(self, symbols: List[str], on_kline_callback: Optional[Callable] = None):
+    def __init__(
+        self,
+        symbols: List[str],
+        on_kline_callback: Optional[Callable] = None,
+        fast_decode: bool = True,
+        streams_per_connection: Optional[int] = None,
+        dispatch_workers: int = 0,
+        dispatch_queue_size: int = 100,
+    ):
         self.symbols = [s.upper() for s in symbols]
         self.on_kline_callback = on_kline_callback
+
+        # 快速解码：orjson（可选）+ 整数时间戳 + KlineRecord；关闭时输出旧版字典
+        self.fast_decode = fast_decode
+        self._loads = kline_decoder.loads if fast_decode else json.loads
         self.ws = None
         self.running = False
         self.reconnect_count = 0
@@ -44,9 +59,24 @@ class BinanceWSClient:
         # 消息缓冲队列（防爆内存）
         self.message_queue = asyncio.Queue(maxsize=1000)
 
+        # dispatch_workers>0 时回调交给分发器的worker执行，读取循环不再等待回调
+        self.dispatcher: Optional[KlineDispatcher] = None
+        if dispatch_workers > 0 and on_kline_callback is not None:
+            self.dispatcher = KlineDispatcher(
+                on_kline_callback,
+                num_workers=dispatch_workers,
+                queue_size=dispatch_queue_size,
+                metrics=self.metrics,
+            )
+
         # WebSocket URL
         self.base_url = "wss://stream.binance.com:9443/ws"
 
+        # 设置streams_per_connection时改用分片的组合流连接池
+        self.streams_per_connection = streams_per_connection
+        self.stream_url = COMBINED_STREAM_URL
+        self.pool: Optional[BinanceWSPool] = None
+
         self.logger = logging.getLogger(__name__)
 
     async def connect(self):
@@ -99,19 +129,8 @@ class BinanceWSClient:
                 receive_time = time.perf_counter()
 
                 try:
-                    data = json.loads(message)
-
-                    # 更新统计信息
-                    self.message_count += 1
-                    self.last_message_time = time.time()
-
-                    # 处理K线数据
-                    if "k" in data:
-                        await self._handle_kline_data(data, receive_time)
-
-                    # 处理Ticker数据
-                    elif "c" in data:  # 24hr ticker
-                        await self._handle_ticker_data(data, receive_time)
+                    data = self._loads(message)
+                    await self._dispatch_message(data, receive_time)
 
                 except json.JSONDecodeError as e:
                     self.logger.warning(f"⚠️ JSON解析错误: {e}")
@@ -131,30 +150,33 @@ class BinanceWSClient:
             self.error_count += 1
             self.running = False
 
-    async def _handle_kline_data(self, data: Dict[str, Any], receive_time: float):
-        """处理K线数据"""
-        kline = data["k"]
+    async def _dispatch_message(self, data: Dict[str, Any], receive_time: float):
+        """按事件类型分发已解析的消息（单连接与连接池共用）"""
+        # 更新统计信息
+        self.message_count += 1
+        self.last_message_time = time.time()
 
-        # 计算消息延迟
-        event_time = data.get("E", 0) / 1000  # 事件时间（秒）
-        message_latency = receive_time - event_time
+        # 处理K线数据
+        if "k" in data:
+            await self._handle_kline_data(data, receive_time)
 
-        # 记录WebSocket延迟指标
-        self.metrics.observe_ws_latency(message_latency)
+        # 处理Ticker数据
+        elif "c" in data:  # 24hr ticker
+            await self._handle_ticker_data(data, receive_time)
 
-        # 构建标准化的K线数据
-        kline_data = {
-            "symbol": kline["s"],
-            "timestamp": pd.to_datetime(kline["t"], unit="ms"),
-            "open": float(kline["o"]),
-            "high": float(kline["h"]),
-            "low": float(kline["l"]),
-            "close": float(kline["c"]),
-            "volume": float(kline["v"]),
-            "is_closed": kline["x"],  # K线是否完成
-            "receive_time": receive_time,
-            "latency_ms": message_latency * 1000,
-        }
+    async def _handle_kline_data(self, data: Dict[str, Any], receive_time: float):
+        """处理K线数据"""
+        if self.fast_decode:
+            kline_data = kline_decoder.decode_kline(data, receive_time)
+            self.metrics.observe_ws_latency(kline_data.latency_ms / 1000)
+        else:
+            kline_data = self._build_kline_dict(data, receive_time)
+            self.metrics.observe_ws_latency(kline_data["latency_ms"] / 1000)
+
+        # 分发器模式：按交易对入队后立即返回，不阻塞socket读取
+        if self.dispatcher is not None:
+            self.dispatcher.submit(kline_data)
+            return
 
         # 调用回调函数
         if self.on_kline_callback:
@@ -175,6 +197,28 @@ class BinanceWSClient:
             except asyncio.QueueEmpty:
                 pass
 
+    @staticmethod
+    def _build_kline_dict(data: Dict[str, Any], receive_time: float) -> Dict[str, Any]:
+        """构建旧版标准化K线字典（fast_decode=False时使用）"""
+        kline = data["k"]
+
+        # 计算消息延迟
+        event_time = data.get("E", 0) / 1000  # 事件时间（秒）
+        message_latency = receive_time - event_time
+
+        return {
+            "symbol": kline["s"],
+            "timestamp": pd.to_datetime(kline["t"], unit="ms"),
+            "open": float(kline["o"]),
+            "high": float(kline["h"]),
+            "low": float(kline["l"]),
+            "close": float(kline["c"]),
+            "volume": float(kline["v"]),
+            "is_closed": kline["x"],  # K线是否完成
+            "receive_time": receive_time,
+            "latency_ms": message_latency * 1000,
+        }
+
     async def _handle_ticker_data(self, data: Dict[str, Any], receive_time: float):
         """处理Ticker数据"""
         ticker_data = {
@@ -216,12 +260,39 @@ class BinanceWSClient:
     async def close(self):
         """关闭WebSocket连接"""
         self.running = False
+        if self.dispatcher:
+            await self.dispatcher.stop()
+        if self.pool:
+            await self.pool.close()
         if self.ws:
             await self.ws.close()
             self.logger.info("🔌 WebSocket连接已关闭")
 
+    async def run_pool(self):
+        """以分片组合流连接池运行（每个分片独立读取、背压与重连）"""
+        self.pool = BinanceWSPool(
+            self.symbols,
+            self._dispatch_message,
+            streams_per_connection=self.streams_per_connection,
+            base_url=self.stream_url,
+            loads=self._loads,
+            metrics=self.metrics,
+        )
+        self.running = True
+        try:
+            await self.pool.run()
+        finally:
+            self.running = False
+
     async def run(self):
         """运行WebSocket客户端（带自动重连）"""
+        if self.dispatcher:
+            self.dispatcher.start()
+
+        if self.streams_per_connection:
+            await self.run_pool()
+            return
+
         while True:
             try:
                 if not self.running:
@@ -250,6 +321,8 @@ class BinanceWSClient:
             "last_message_ago": (
                 time.time() - self.last_message_time if self.message_count > 0 else None
             ),
+            "pool": self.pool.get_stats() if self.pool else None,
+            "dispatcher": self.dispatcher.get_stats() if self.dispatcher else None,
         }
 
 
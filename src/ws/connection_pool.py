@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Binance 组合流连接池
+Combined-stream WebSocket Connection Pool
+
+用途：
+- 将交易对按每连接流数上限分片到N条 ``/stream?streams=...`` 组合流连接
+- 每个分片独立的读取任务与有界队列（背压只影响本分片）
+- 队列满时只丢弃未收盘K线（后续更新会覆盖）；收盘K线等消息改为阻塞读取
+- 每个分片独立重连，一条连接断开不影响其他交易对
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+import websockets
+
+from src.monitoring.metrics_collector import get_metrics_collector
+from src.ws import kline_decoder
+
+COMBINED_STREAM_URL = "wss://stream.binance.com:9443/stream"
+DEFAULT_STREAM_TYPES = ("kline_1s", "ticker")
+
+# 分片消息回调：(解包后的事件, 接收时刻perf_counter)
+MessageHandler = Callable[[Dict[str, Any], float], Awaitable[None]]
+
+
+def shard_streams(
+    symbols: Sequence[str],
+    streams_per_connection: int,
+    stream_types: Sequence[str] = DEFAULT_STREAM_TYPES,
+) -> List[List[str]]:
+    """
+    按每连接流数上限切分订阅流（同一交易对的流总在同一分片）
+
+    Args:
+        symbols: 交易对列表
+        streams_per_connection: 每条连接最多订阅的流数
+        stream_types: 每个交易对订阅的流类型
+
+    Returns:
+        每个分片的流名称列表
+    """
+    per_symbol = len(stream_types)
+    if streams_per_connection < per_symbol:
+        raise ValueError(
+            f"streams_per_connection({streams_per_connection})不能小于每个交易对的流数({per_symbol})"
+        )
+
+    symbols_per_shard = streams_per_connection // per_symbol
+    shards = []
+    for start in range(0, len(symbols), symbols_per_shard):
+        chunk = symbols[slice(start, start + symbols_per_shard)]
+        shards.append([f"{s.lower()}@{stream}" for s in chunk for stream in stream_types])
+    return shards
+
+
+class _ShardQueue(asyncio.Queue):
+    """分片消息队列：元素为 (消息, 接收时刻, 是否未收盘K线)，满时可移除最旧的未收盘K线"""
+
+    def _init(self, maxsize: int) -> None:
+        super()._init(maxsize)
+        self.unclosed = 0
+
+    def _put(self, item: tuple) -> None:
+        super()._put(item)
+        self.unclosed += item[2]
+
+    def _get(self) -> tuple:
+        item = super()._get()
+        self.unclosed -= item[2]
+        return item
+
+    def drop_oldest_unclosed(self) -> bool:
+        """移除队列中最旧的一条未收盘K线；没有时返回False"""
+        if not self.unclosed:
+            return False
+        for index, item in enumerate(self._queue):
+            if item[2]:
+                # 读取任务是唯一的生产者，移除后直接put即可，无需唤醒等待者
+                del self._queue[index]
+                self.unclosed -= 1
+                return True
+        return False
+
+
+class WSShard:
+    """单条组合流连接：读取任务 + 有界队列 + 消费任务 + 独立重连"""
+
+    def __init__(
+        self,
+        shard_id: int,
+        streams: List[str],
+        on_message: MessageHandler,
+        base_url: str = COMBINED_STREAM_URL,
+        queue_size: int = 1000,
+        drop_when_full: bool = True,
+        max_reconnects: int = 100,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 60.0,
+        loads: Callable[[Any], Any] = kline_decoder.loads,
+        metrics: Any = None,
+    ):
+        self.shard_id = shard_id
+        self.name = f"shard-{shard_id}"
+        self.streams = streams
+        self.symbols = sorted({stream.split("@")[0].upper() for stream in streams})
+        self.url = f"{base_url}?streams={'/'.join(streams)}"
+        self.on_message = on_message
+
+        # 背压：满队列时丢弃最旧的未收盘K线；收盘K线等不可丢弃的消息阻塞本分片的读取。
+        # drop_when_full=False 时一律阻塞
+        self.queue = _ShardQueue(maxsize=queue_size)
+        self.drop_when_full = drop_when_full
+
+        self.max_reconnects = max_reconnects
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self._loads = loads
+
+        self.metrics = metrics or get_metrics_collector()
+        self.logger = logging.getLogger(f"{__name__}.{self.name}")
+
+        self.ws = None
+        self.running = False
+        self.connected = False
+        self.connect_count = 0
+        self.reconnect_count = 0
+        self.message_count = 0
+        self.dropped_count = 0
+        self.closed_backpressure_count = 0
+        self.error_count = 0
+        self.last_message_time: Optional[float] = None
+
+    async def _connect(self) -> None:
+        try:
+            self.ws = await websockets.connect(
+                self.url, ping_interval=20, ping_timeout=10, close_timeout=10
+            )
+        except Exception:
+            self.metrics.record_ws_connection_error()
+            raise
+
+        self.connected = True
+        self.connect_count += 1
+        self.reconnect_count = 0
+        self.metrics.record_ws_connection_success()
+        self.logger.info(f"✅ {self.name} 已连接 ({len(self.streams)} 个流)")
+
+    async def _read(self) -> None:
+        """读取消息写入本分片队列；连接断开时返回"""
+        try:
+            async for message in self.ws:
+                self.message_count += 1
+                self.last_message_time = time.time()
+                await self._enqueue(message, time.perf_counter())
+        except websockets.exceptions.ConnectionClosed:
+            self.logger.warning(f"🔌 {self.name} 连接断开")
+        finally:
+            self.connected = False
+
+    async def _enqueue(self, message: Any, receive_time: float) -> None:
+        if not self.drop_when_full:
+            await self.queue.put((message, receive_time, False))
+            return
+
+        closed = kline_decoder.peek_kline_closed(message)
+        unclosed = closed is False
+        if self.queue.full():
+            if self.queue.drop_oldest_unclosed():
+                self._record_drop()
+            elif unclosed:
+                # 队列中没有更早的未收盘K线：丢弃新到的这一条
+                self._record_drop()
+                return
+            else:
+                # 收盘K线等不可丢弃的消息：等待消费者腾出位置（阻塞本分片读取）
+                kind = "closed_kline" if closed else "other"
+                if closed:
+                    self.closed_backpressure_count += 1
+                self.metrics.record_ws_shard_backpressure(self.name, kind)
+        await self.queue.put((message, receive_time, unclosed))
+
+    def _record_drop(self) -> None:
+        self.dropped_count += 1
+        self.metrics.record_ws_shard_drop(self.name)
+
+    async def _consume(self) -> None:
+        """解包组合流消息并交给回调"""
+        while True:
+            message, receive_time, _ = await self.queue.get()
+            try:
+                data = self._loads(message)
+                await self.on_message(data.get("data", data), receive_time)
+            except Exception as e:
+                self.error_count += 1
+                self.logger.error(f"❌ {self.name} 消息处理错误: {e}")
+
+    async def _wait_before_reconnect(self) -> bool:
+        """指数退避；超过最大重连次数返回False"""
+        if self.reconnect_count >= self.max_reconnects:
+            self.logger.error(f"❌ {self.name} 达到最大重连次数 ({self.max_reconnects})")
+            return False
+
+        self.reconnect_count += 1
+        delay = min(
+            self.reconnect_delay * (2 ** (self.reconnect_count - 1)), self.max_reconnect_delay
+        )
+        self.metrics.record_ws_reconnect(symbol=self.name, reason="connection_lost")
+        self.logger.info(f"🔄 {self.name} {delay}秒后重连 (尝试 {self.reconnect_count})")
+        await asyncio.sleep(delay)
+        return True
+
+    async def run(self) -> None:
+        """运行分片（断线自动重连，直到close或超过重连上限）"""
+        self.running = True
+        consumer = asyncio.create_task(self._consume())
+        try:
+            while self.running:
+                try:
+                    await self._connect()
+                    await self._read()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.error_count += 1
+                    self.logger.error(f"❌ {self.name} 运行错误: {e}")
+
+                if not self.running or not await self._wait_before_reconnect():
+                    break
+        finally:
+            self.running = False
+            consumer.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await consumer
+            await self._close_socket()
+
+    async def _close_socket(self) -> None:
+        if self.ws is not None:
+            with contextlib.suppress(Exception):
+                await self.ws.close()
+        self.connected = False
+
+    async def close(self) -> None:
+        """停止分片并关闭连接"""
+        self.running = False
+        await self._close_socket()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "streams": len(self.streams),
+            "connected": self.connected,
+            "connect_count": self.connect_count,
+            "reconnect_count": self.reconnect_count,
+            "message_count": self.message_count,
+            "dropped_count": self.dropped_count,
+            "closed_backpressure_count": self.closed_backpressure_count,
+            "error_count": self.error_count,
+            "queue_size": self.queue.qsize(),
+        }
+
+
+class BinanceWSPool:
+    """按交易对分片的组合流连接池"""
+
+    def __init__(
+        self,
+        symbols: List[str],
+        on_message: MessageHandler,
+        streams_per_connection: int = 200,
+        stream_types: Sequence[str] = DEFAULT_STREAM_TYPES,
+        base_url: str = COMBINED_STREAM_URL,
+        **shard_kwargs: Any,
+    ):
+        """
+        初始化连接池
+
+        Args:
+            symbols: 交易对列表
+            on_message: 异步回调 ``(event, receive_time)``，event为解包后的data字段
+            streams_per_connection: 每条连接的流数上限
+            stream_types: 每个交易对订阅的流类型
+            base_url: 组合流地址
+            **shard_kwargs: 透传给WSShard（queue_size/drop_when_full/重连参数/loads/metrics）
+        """
+        self.symbols = [s.upper() for s in symbols]
+        self.shards = [
+            WSShard(i, streams, on_message, base_url=base_url, **shard_kwargs)
+            for i, streams in enumerate(
+                shard_streams(self.symbols, streams_per_connection, stream_types)
+            )
+        ]
+        self._shard_by_symbol = {symbol: shard for shard in self.shards for symbol in shard.symbols}
+        self._tasks: List[asyncio.Task] = []
+
+    def shard_for(self, symbol: str) -> Optional[WSShard]:
+        """查询交易对所在分片"""
+        return self._shard_by_symbol.get(symbol.upper())
+
+    def start(self) -> List[asyncio.Task]:
+        """为每个分片创建运行任务"""
+        self._tasks = [
+            asyncio.create_task(shard.run(), name=f"ws-{shard.name}") for shard in self.shards
+        ]
+        return self._tasks
+
+    async def run(self) -> None:
+        """运行所有分片，直到全部停止"""
+        if not self._tasks:
+            self.start()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def close(self) -> None:
+        """关闭所有分片"""
+        for shard in self.shards:
+            await shard.close()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    @property
+    def running(self) -> bool:
+        return any(shard.running for shard in self.shards)
+
+    def get_stats(self) -> Dict[str, Any]:
+        shards = [shard.get_stats() for shard in self.shards]
+        return {
+            "shard_count": len(shards),
+            "connected_shards": sum(1 for s in shards if s["connected"]),
+            "message_count": sum(s["message_count"] for s in shards),
+            "dropped_count": sum(s["dropped_count"] for s in shards),
+            "closed_backpressure_count": sum(s["closed_backpressure_count"] for s in shards),
+            "queue_size": sum(s["queue_size"] for s in shards),
+            "shards": shards,
+        }
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+WebSocket K线快速解码
+Fast WebSocket Kline Decoder
+
+用途：
+- 可选使用orjson解析消息（未安装时回退到标准库json）
+- 时间戳只做整数运算，热路径不调用pandas
+- 输出带__slots__的紧凑K线记录，可直接写入OHLCVRingBuffer
+- 不解析JSON即可识别未收盘K线（供连接池满队列时挑选可丢弃的消息）
+"""
+
+import json
+import re
+import time
+from typing import Any, Dict, Iterator, Optional, Union
+
+import pandas as pd
+
+try:
+    import orjson
+
+    _fast_loads = orjson.loads
+    JSON_BACKEND = "orjson"
+except ImportError:  # pragma: no cover - 取决于运行环境
+    orjson = None
+    _fast_loads = json.loads
+    JSON_BACKEND = "json"
+
+
+# kline事件的 "x" 为布尔收盘标志（ticker的 "x" 为字符串价格，不会匹配）
+_CLOSED_FLAG = re.compile(r'"x"\s*:\s*(true|false)')
+_CLOSED_FLAG_BYTES = re.compile(rb'"x"\s*:\s*(true|false)')
+
+
+def loads(message: Union[str, bytes]) -> Any:
+    """
+    解析WebSocket消息
+
+    Args:
+        message: 原始文本或字节
+
+    Returns:
+        解析后的对象；格式错误时抛出json.JSONDecodeError（orjson的异常是其子类）
+    """
+    return _fast_loads(message)
+
+
+def peek_kline_closed(message: Union[str, bytes]) -> Optional[bool]:
+    """
+    读取原始消息中K线的收盘标志（不解析JSON）
+
+    Args:
+        message: 原始文本或字节
+
+    Returns:
+        kline事件返回收盘标志，其他消息返回None
+    """
+    if isinstance(message, str):
+        match = "kline" in message and _CLOSED_FLAG.search(message)
+        return match[1] == "true" if match else None
+    match = b"kline" in message and _CLOSED_FLAG_BYTES.search(message)
+    return match[1] == b"true" if match else None
+
+
+class KlineRecord:
+    """
+    紧凑K线记录
+
+    兼容旧版K线字典的读取方式（``record["close"]`` / ``record.get(...)`` / ``in``），
+    ``timestamp`` 仅在被访问时才构造pd.Timestamp。
+    """
+
+    __slots__ = (
+        "symbol",
+        "open_time",
+        "open",
+        "high",
+        "low",
+        "close",
+        "volume",
+        "is_closed",
+        "event_time",
+        "receive_time",
+        "latency_ms",
+    )
+
+    _KEYS = (
+        "symbol",
+        "timestamp",
+        "open",
+        "high",
+        "low",
+        "close",
+        "volume",
+        "is_closed",
+        "receive_time",
+        "latency_ms",
+    )
+
+    def __init__(
+        self,
+        symbol: str,
+        open_time: int,
+        open_: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float,
+        is_closed: bool,
+        event_time: int = 0,
+        receive_time: float = 0.0,
+        latency_ms: float = 0.0,
+    ):
+        self.symbol = symbol
+        self.open_time = open_time
+        self.open = open_
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.is_closed = is_closed
+        self.event_time = event_time
+        self.receive_time = receive_time
+        self.latency_ms = latency_ms
+
+    @property
+    def timestamp(self):
+        """K线开盘时间（pd.Timestamp，按需构造）"""
+        return pd.Timestamp(self.open_time, unit="ms")
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._KEYS and key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._KEYS or key in self.__slots__
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self) -> Iterator[str]:
+        return iter(self._KEYS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为旧版K线字典"""
+        return {key: getattr(self, key) for key in self._KEYS}
+
+    def as_row(self) -> tuple:
+        """(open_time_ms, open, high, low, close, volume)，用于OHLCVRingBuffer.append"""
+        return (self.open_time, self.open, self.high, self.low, self.close, self.volume)
+
+    def __repr__(self) -> str:
+        return (
+            f"KlineRecord({self.symbol} t={self.open_time} o={self.open} h={self.high} "
+            f"l={self.low} c={self.close} v={self.volume} closed={self.is_closed})"
+        )
+
+
+def decode_kline(
+    data: Dict[str, Any], receive_time: float, receive_ms: Optional[int] = None
+) -> KlineRecord:
+    """
+    将已解析的kline事件转换为KlineRecord
+
+    Args:
+        data: ``{"E": 事件时间, "k": {...}}`` 格式的事件
+        receive_time: 接收时刻（perf_counter，保留给下游计时）
+        receive_ms: 接收时刻的毫秒级墙钟时间，默认取 ``time.time_ns()``
+
+    Returns:
+        KlineRecord
+    """
+    kline = data["k"]
+    event_time = data.get("E", 0)
+    if receive_ms is None:
+        receive_ms = time.time_ns() // 1_000_000
+
+    return KlineRecord(
+        kline["s"],
+        int(kline["t"]),
+        float(kline["o"]),
+        float(kline["h"]),
+        float(kline["l"]),
+        float(kline["c"]),
+        float(kline["v"]),
+        kline["x"],
+        event_time,
+        receive_time,
+        float(receive_ms - event_time) if event_time else 0.0,
+    )
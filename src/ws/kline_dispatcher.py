@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+K线分发器（WS读取与策略回调解耦）
+Per-symbol Kline Dispatcher
+
+用途：
+- 每个交易对一个有界队列，满时丢弃最旧K线
+- 未收盘K线只保留最新一条（合并），收盘K线按顺序投递
+- 固定数量的worker轮转消费，同一交易对同一时刻只由一个worker处理（保证顺序）
+- 导出队列深度、丢弃数、合并数指标
+"""
+
+import asyncio
+import contextlib
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+KlineHandler = Callable[[Any], Awaitable[None]]
+
+
+class _SymbolQueue:
+    """单个交易对的待处理K线：收盘K线队列 + 最新未收盘K线槽位"""
+
+    __slots__ = ("closed", "unclosed", "scheduled", "dropped", "coalesced", "delivered")
+
+    def __init__(self, maxlen: int):
+        self.closed: deque = deque(maxlen=maxlen)
+        self.unclosed: Any = None
+        self.scheduled = False
+        self.dropped = 0
+        self.coalesced = 0
+        self.delivered = 0
+
+    def __len__(self) -> int:
+        return len(self.closed) + (self.unclosed is not None)
+
+    def pop(self) -> Any:
+        # 收盘K线总是早于（或等于）槽位中的未收盘K线，先投递
+        if self.closed:
+            return self.closed.popleft()
+        kline, self.unclosed = self.unclosed, None
+        return kline
+
+
+class KlineDispatcher:
+    """按交易对分队列的K线分发器"""
+
+    def __init__(
+        self,
+        handler: KlineHandler,
+        num_workers: int = 4,
+        queue_size: int = 100,
+        coalesce_unclosed: bool = True,
+        metrics: Any = None,
+        metrics_interval: float = 5.0,
+    ):
+        """
+        初始化分发器
+
+        Args:
+            handler: 异步K线回调（与BinanceWSClient.on_kline_callback相同）
+            num_workers: worker数量
+            queue_size: 每个交易对最多缓存的收盘K线数
+            coalesce_unclosed: 是否只保留最新的未收盘K线
+            metrics: TradingMetricsCollector（为None时不导出指标）
+            metrics_interval: 指标推送间隔（秒）
+        """
+        if num_workers <= 0:
+            raise ValueError("num_workers必须为正数")
+
+        self.handler = handler
+        self.num_workers = num_workers
+        self.queue_size = queue_size
+        self.coalesce_unclosed = coalesce_unclosed
+        self.metrics = metrics
+        self.metrics_interval = metrics_interval
+
+        self._queues: Dict[str, _SymbolQueue] = {}
+        self._ready: asyncio.Queue = asyncio.Queue()
+        self._workers: List[asyncio.Task] = []
+        self._metrics_task: Optional[asyncio.Task] = None
+        self.error_count = 0
+
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    def submit(self, kline: Any) -> None:
+        """
+        提交一条K线（非阻塞，供WS读取路径调用）
+
+        Args:
+            kline: 标准化K线（字典或KlineRecord，需包含symbol/is_closed/timestamp）
+        """
+        symbol = kline["symbol"]
+        queue = self._queues.get(symbol)
+        if queue is None:
+            queue = self._queues[symbol] = _SymbolQueue(self.queue_size)
+
+        if self.coalesce_unclosed:
+            if queue.unclosed is not None:
+                # 新的未收盘K线，或同一根K线已收盘：旧槽位作废
+                queue.unclosed = None
+                queue.coalesced += 1
+            if not kline["is_closed"]:
+                queue.unclosed = kline
+                self._schedule(symbol, queue)
+                return
+
+        if len(queue.closed) == queue.closed.maxlen:
+            queue.dropped += 1  # deque(maxlen)自动丢弃最旧的一条
+        queue.closed.append(kline)
+        self._schedule(symbol, queue)
+
+    def _schedule(self, symbol: str, queue: _SymbolQueue) -> None:
+        if not queue.scheduled:
+            queue.scheduled = True
+            self._ready.put_nowait(symbol)
+
+    async def _worker(self) -> None:
+        while True:
+            symbol = await self._ready.get()
+            queue = self._queues[symbol]
+            kline = queue.pop()
+            try:
+                if kline is not None:
+                    await self.handler(kline)
+                    queue.delivered += 1
+            except Exception as e:
+                self.error_count += 1
+                self.logger.error(f"❌ K线回调错误 {symbol}: {e}")
+            finally:
+                # 处理完一条后重新排队，保证交易对之间轮转公平
+                if len(queue):
+                    self._ready.put_nowait(symbol)
+                else:
+                    queue.scheduled = False
+                self._ready.task_done()
+
+    async def _metrics_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.metrics_interval)
+            self.publish_metrics()
+
+    def start(self) -> None:
+        """启动worker（需在事件循环内调用，重复调用无副作用）"""
+        if self._workers:
+            return
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"kline-dispatch-{i}")
+            for i in range(self.num_workers)
+        ]
+        if self.metrics is not None and self.metrics_interval > 0:
+            self._metrics_task = asyncio.create_task(self._metrics_loop())
+
+    async def join(self) -> None:
+        """等待当前所有待处理K线被消费"""
+        await self._ready.join()
+
+    async def stop(self, drain: bool = False) -> None:
+        """
+        停止worker
+
+        Args:
+            drain: 是否先处理完队列中剩余的K线
+        """
+        if drain and self._workers:
+            await self.join()
+
+        tasks = self._workers + ([self._metrics_task] if self._metrics_task else [])
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._workers = []
+        self._metrics_task = None
+        self.publish_metrics()
+
+    def publish_metrics(self) -> None:
+        """推送队列深度/丢弃/合并统计"""
+        if self.metrics is None:
+            return
+        try:
+            self.metrics.update_ws_dispatch_stats(self.get_symbol_stats())
+        except Exception as e:
+            self.logger.warning(f"⚠️ 分发器指标推送失败: {e}")
+
+    def get_symbol_stats(self) -> Dict[str, Dict[str, int]]:
+        """按交易对的 depth/dropped/coalesced/delivered"""
+        return {
+            symbol: {
+                "depth": len(queue),
+                "dropped": queue.dropped,
+                "coalesced": queue.coalesced,
+                "delivered": queue.delivered,
+            }
+            for symbol, queue in self._queues.items()
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """汇总统计"""
+        per_symbol = self.get_symbol_stats().values()
+        return {
+            "workers": len(self._workers),
+            "symbols": len(self._queues),
+            "queue_depth": sum(s["depth"] for s in per_symbol),
+            "dropped": sum(s["dropped"] for s in per_symbol),
+            "coalesced": sum(s["coalesced"] for s in per_symbol),
+            "delivered": sum(s["delivered"] for s in per_symbol),
+            "errors": self.error_count,
+        }
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Binance 用户数据流
+Binance User Data Stream
+
+用途：
+- 创建listenKey并定时keepalive（PUT /api/v3/userDataStream）
+- 连接 ``<ws地址>/<listenKey>`` 接收 executionReport 等账户事件
+- 断线或listenKey过期时以新listenKey重连（指数退避）
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import websockets
+
+from src.monitoring.metrics_collector import get_metrics_collector
+from src.ws import kline_decoder
+
+USER_STREAM_URL = "wss://stream.binance.com:9443/ws"
+TESTNET_USER_STREAM_URL = "wss://stream.testnet.binance.vision/ws"
+LISTEN_KEY_ENDPOINT = "/api/v3/userDataStream"
+
+# REST请求函数：(method, endpoint, params) -> 响应
+RequestFunc = Callable[..., Awaitable[Dict[str, Any]]]
+# 事件回调：(事件, 接收时刻毫秒)
+EventHandler = Callable[[Dict[str, Any], int], Any]
+
+
+class UserDataStream:
+    """用户数据流：listenKey管理 + WebSocket读取 + 自动重连"""
+
+    def __init__(
+        self,
+        request: RequestFunc,
+        on_event: EventHandler,
+        base_url: str = USER_STREAM_URL,
+        keepalive_interval: float = 30 * 60,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 60.0,
+        metrics: Any = None,
+    ):
+        """
+        初始化用户数据流
+
+        Args:
+            request: REST请求协程函数（如 LiveBrokerAsync._request），签名为
+                ``request(method, endpoint, params)``
+            on_event: 事件回调 ``(event, receive_ms)``，可为同步函数或协程函数
+            base_url: WebSocket地址（不含listenKey）
+            keepalive_interval: listenKey续期间隔（秒，listenKey 60分钟过期）
+            reconnect_delay: 重连退避基数（秒）
+            max_reconnect_delay: 最大重连间隔（秒）
+            metrics: 指标收集器
+        """
+        self._request = request
+        self.on_event = on_event
+        self.base_url = base_url.rstrip("/")
+        self.keepalive_interval = keepalive_interval
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.metrics = metrics or get_metrics_collector()
+        self.logger = logging.getLogger(__name__)
+
+        self.listen_key: Optional[str] = None
+        self.ws = None
+        self.running = False
+        self.connected = False
+        self.connect_count = 0
+        self.reconnect_count = 0
+        self.event_count = 0
+        self.error_count = 0
+        self._task: Optional[asyncio.Task] = None
+
+    # ------------------------------------------------------------------
+    # listenKey
+    # ------------------------------------------------------------------
+
+    async def _create_listen_key(self) -> str:
+        response = await self._request("POST", LISTEN_KEY_ENDPOINT, {})
+        self.listen_key = response["listenKey"]
+        return self.listen_key
+
+    async def _keepalive(self) -> None:
+        """定时续期当前listenKey（失败只记录，过期由重连处理）"""
+        while True:
+            await asyncio.sleep(self.keepalive_interval)
+            try:
+                await self._request("PUT", LISTEN_KEY_ENDPOINT, {"listenKey": self.listen_key})
+            except Exception as e:
+                self.error_count += 1
+                self.logger.warning(f"⚠️ listenKey续期失败: {e}")
+
+    # ------------------------------------------------------------------
+    # 连接与读取
+    # ------------------------------------------------------------------
+
+    async def _connect(self) -> None:
+        listen_key = await self._create_listen_key()
+        try:
+            self.ws = await websockets.connect(
+                f"{self.base_url}/{listen_key}",
+                ping_interval=20,
+                ping_timeout=10,
+                close_timeout=10,
+            )
+        except Exception:
+            self.metrics.record_ws_connection_error()
+            raise
+
+        self.connected = True
+        self.connect_count += 1
+        self.reconnect_count = 0
+        self.metrics.record_ws_connection_success()
+        self.logger.info("✅ 用户数据流已连接")
+
+    async def _read(self) -> None:
+        """读取账户事件；连接断开或listenKey过期时返回"""
+        try:
+            async for message in self.ws:
+                receive_ms = int(time.time() * 1000)
+                event = kline_decoder.loads(message)
+                if event.get("e") == "listenKeyExpired":
+                    self.logger.warning("⚠️ listenKey已过期，重新连接")
+                    return
+                self.event_count += 1
+                try:
+                    result = self.on_event(event, receive_ms)
+                    if asyncio.iscoroutine(result):
+                        await result
+                except Exception as e:
+                    self.error_count += 1
+                    self.logger.error(f"❌ 用户数据事件处理错误: {e}")
+        except websockets.exceptions.ConnectionClosed:
+            self.logger.warning("🔌 用户数据流连接断开")
+        finally:
+            self.connected = False
+
+    async def _wait_before_reconnect(self) -> None:
+        self.reconnect_count += 1
+        delay = min(
+            self.reconnect_delay * (2 ** (self.reconnect_count - 1)), self.max_reconnect_delay
+        )
+        self.metrics.record_ws_reconnect(symbol="user_data", reason="connection_lost")
+        self.logger.info(f"🔄 用户数据流 {delay}秒后重连 (尝试 {self.reconnect_count})")
+        await asyncio.sleep(delay)
+
+    async def run(self) -> None:
+        """运行用户数据流（断线自动重连，直到close）"""
+        self.running = True
+        keepalive = asyncio.create_task(self._keepalive())
+        try:
+            while self.running:
+                try:
+                    await self._connect()
+                    await self._read()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.error_count += 1
+                    self.logger.error(f"❌ 用户数据流错误: {e}")
+                finally:
+                    await self._close_socket()
+
+                if self.running:
+                    await self._wait_before_reconnect()
+        finally:
+            self.running = False
+            keepalive.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await keepalive
+
+    def start(self) -> asyncio.Task:
+        """创建运行任务"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run(), name="user-data-stream")
+        return self._task
+
+    async def _close_socket(self) -> None:
+        if self.ws is not None:
+            with contextlib.suppress(Exception):
+                await self.ws.close()
+            self.ws = None
+        self.connected = False
+
+    async def close(self) -> None:
+        """停止数据流并删除listenKey"""
+        self.running = False
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self._close_socket()
+
+        if self.listen_key is not None:
+            with contextlib.suppress(Exception):
+                await self._request("DELETE", LISTEN_KEY_ENDPOINT, {"listenKey": self.listen_key})
+            self.listen_key = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "connected": self.connected,
+            "connect_count": self.connect_count,
+            "reconnect_count": self.reconnect_count,
+            "event_count": self.event_count,
+            "error_count": self.error_count,
+        }
@@ -33,6 +33,7 @@ TEST_ENV_VARS = {
     "LOG_LEVEL": "INFO",
     "LOG_DIR": "test_logs",
     "TRADES_DIR": "test_trades",
+    "MARKET_STORE_DIR": "",
     "USE_BINANCE_TESTNET": "true",
     "MONITORING_PORT": "9091",
 }
@@ -108,6 +109,72 @@ def mock_broker(monkeypatch):
         yield broker
 
 
+# 本地Binance服务器替身 / 异步代理 ----------------------------------------------
+
+
+class FakeBinanceServer:
+    """
+    本地Binance REST/WS服务器替身（aiohttp TestServer）
+
+    各测试文件只提供路由处理函数：routes 为 (method, path, handler) 序列。
+    """
+
+    def __init__(self, routes):
+        from aiohttp import web
+
+        self.app = web.Application()
+        for method, path, handler in routes:
+            self.app.router.add_route(method, path, handler)
+        self.url = None
+
+    @property
+    def ws_url(self):
+        return self.url.replace("http://", "ws://") + "/ws"
+
+    async def __aenter__(self):
+        from aiohttp.test_utils import TestServer
+
+        self._server = TestServer(self.app)
+        await self._server.start_server()
+        self.url = str(self._server.make_url("")).rstrip("/")
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._server.close()
+
+
+@pytest.fixture
+def fake_binance_server():
+    """按路由创建服务器替身：``async with fake_binance_server(routes) as server``"""
+    return FakeBinanceServer
+
+
+@pytest.fixture
+def async_broker():
+    """
+    指向服务器替身的 LiveBrokerAsync 工厂
+
+    默认不启动用户数据流；metrics 非空时替换代理与订单管理器的指标收集器。
+    """
+    from src.brokers.live_broker_async import LiveBrokerAsync
+
+    def factory(server, user_stream=False, metrics=None, **kwargs):
+        broker = LiveBrokerAsync(
+            "key",
+            "secret",
+            base_url=server.url,
+            ws_url=server.ws_url,
+            user_stream=user_stream,
+            **kwargs,
+        )
+        if metrics is not None:
+            broker.metrics = metrics
+            broker.order_manager.metrics = metrics
+        return broker
+
+    return factory
+
+
 @pytest.fixture(autouse=True, scope="session")
 def setup_test_environment():
     """设置测试环境变量"""
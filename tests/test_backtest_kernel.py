@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+回测数组内核测试
+Backtest Array Kernel Tests
+
+测试目标:
+- src/strategies/backtest_kernel.py
+- BacktestExecutor.run_backtest 与逐K线参考实现 run_backtest_loop 对齐
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.strategies.backtest import BacktestExecutor, backtest_single
+from src.strategies.backtest_kernel import (
+    next_entry_index,
+    prepare_signal_arrays,
+    run_ma_atr_kernel,
+)
+
+
+def _random_walk(seed: int, n: int = 2000) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    prices = 100 + np.cumsum(rng.normal(0, 1, n))
+    return pd.Series(prices, index=pd.date_range("2022-01-01", periods=n, freq="h"))
+
+
+def _executor(price: pd.Series, **overrides) -> BacktestExecutor:
+    params = dict(
+        price=price,
+        fast_win=7,
+        slow_win=20,
+        atr_win=20,
+        risk_frac=0.02,
+        init_equity=100_000.0,
+        use_trailing_stop=True,
+        breakeven_r=1.0,
+        trail_r=2.0,
+        verbose=False,
+    )
+    params.update(overrides)
+    return BacktestExecutor(**params)
+
+
+class TestKernelParity:
+    """测试内核与逐K线实现逐项一致"""
+
+    @pytest.mark.parametrize("seed", range(5))
+    @pytest.mark.parametrize("use_trailing_stop", [True, False])
+    def test_matches_loop_to_the_cent(self, seed, use_trailing_stop):
+        price = _random_walk(seed)
+        kernel = _executor(price, use_trailing_stop=use_trailing_stop).run_backtest()
+        loop = _executor(price, use_trailing_stop=use_trailing_stop).run_backtest_loop()
+
+        assert kernel.index.equals(loop.index)
+        np.testing.assert_allclose(kernel.values, loop.values, rtol=0, atol=0.005)
+
+    def test_atr_fallback_and_tight_trailing(self):
+        # atr_win很大时ATR长期为NaN（视为0），跟踪止损走初始风险50%分支
+        price = _random_walk(7, n=600)
+        params = dict(fast_win=3, slow_win=8, atr_win=5, breakeven_r=0.2, trail_r=0.5)
+        kernel = _executor(price, **params).run_backtest()
+        loop = _executor(price, **params).run_backtest_loop()
+
+        np.testing.assert_allclose(kernel.values, loop.values, rtol=0, atol=0.005)
+
+    def test_backtest_single_uses_kernel(self):
+        price = _random_walk(11)
+        result = backtest_single(price)
+        expected = _executor(price).run_backtest_loop()
+
+        np.testing.assert_allclose(result.values, expected.values, rtol=0, atol=0.005)
+
+
+class TestKernelArrays:
+    """测试内核辅助函数"""
+
+    def test_next_entry_index(self):
+        buy = np.array([False, True, False, True, False])
+        atr = np.array([1.0, 1.0, 1.0, 0.0, 1.0])
+
+        # 索引3的ATR为0不可入场
+        assert next_entry_index(buy, atr).tolist() == [1, 1, 5, 5, 5]
+
+    def test_flat_curve_without_signals(self):
+        price = pd.Series(np.linspace(100, 90, 50))
+        arrays = prepare_signal_arrays(price, 3, 10, 5)
+        equity, trades = run_ma_atr_kernel(arrays, init_equity=5_000.0)
+
+        assert trades == 0
+        assert equity.dtype == np.float64
+        assert (equity == 5_000.0).all()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+批量订单接口测试（本地aiohttp服务器替身）
+Batch Order API Tests
+
+测试目标:
+- LiveBrokerAsync.place_orders_batch / cancel_all_orders_batch / cancel_replace_order_async
+- 批量延迟 p50/p95 指标
+- AsyncTradingEngine.process_concurrent_orders 使用批量接口
+"""
+
+from unittest.mock import Mock, patch
+
+import pytest
+from aiohttp import web
+
+
+class FakeOrderREST:
+    """REST服务器替身：REJECTUSDT 下单失败，其余订单立即成交"""
+
+    def __init__(self):
+        self.next_id = 100
+        self.cancel_all_symbols = []
+        self.cancel_replace_params = None
+
+    async def new_order(self, request):
+        form = await request.post()
+        if form["symbol"] == "REJECTUSDT":
+            return web.json_response({"code": -1121, "msg": "Invalid symbol."}, status=400)
+        self.next_id += 1
+        return web.json_response(
+            {"orderId": self.next_id, "clientOrderId": f"c{self.next_id}", "status": "FILLED"}
+        )
+
+    async def cancel_all(self, request):
+        symbol = request.query["symbol"]
+        self.cancel_all_symbols.append(symbol)
+        if symbol == "NOORDERSUSDT":
+            return web.json_response({"code": -2011, "msg": "Unknown order sent."}, status=400)
+        return web.json_response([{"symbol": symbol, "orderId": 1, "status": "CANCELED"}])
+
+    async def cancel_replace(self, request):
+        self.cancel_replace_params = dict(await request.post())
+        return web.json_response(
+            {
+                "cancelResult": "SUCCESS",
+                "newOrderResult": "SUCCESS",
+                "cancelResponse": {"orderId": 1, "status": "CANCELED"},
+                "newOrderResponse": {"orderId": 2, "clientOrderId": "c2", "status": "NEW"},
+            }
+        )
+
+    def routes(self):
+        return [
+            ("POST", "/api/v3/order", self.new_order),
+            ("DELETE", "/api/v3/openOrders", self.cancel_all),
+            ("POST", "/api/v3/order/cancelReplace", self.cancel_replace),
+        ]
+
+
+class TestBatchOrders:
+    """测试批量接口的逐项结果与延迟指标"""
+
+    @pytest.mark.asyncio
+    async def test_batch_place_with_partial_failure(self, fake_binance_server, async_broker):
+        orders = [
+            {"symbol": "BTCUSDT", "side": "BUY", "quantity": 0.001},
+            {"symbol": "REJECTUSDT", "side": "BUY", "quantity": 1},
+            {
+                "symbol": "ETHUSDT",
+                "side": "SELL",
+                "quantity": 0.01,
+                "order_type": "LIMIT",
+                "price": 2000.0,
+            },
+        ]
+        rest = FakeOrderREST()
+        async with (
+            fake_binance_server(rest.routes()) as server,
+            async_broker(server, metrics=Mock()) as broker,
+        ):
+            results = await broker.place_orders_batch(orders)
+            stats = broker.get_batch_latency_stats()
+
+        assert [item["success"] for item in results] == [True, False, True]
+        assert [item["symbol"] for item in results] == ["BTCUSDT", "REJECTUSDT", "ETHUSDT"]
+        assert "-1121" in results[1]["error"]
+        assert results[2]["order"]["price"] == 2000.0
+        assert stats["place"]["count"] == 1
+
+        operation, latency = broker.metrics.observe_batch_order_latency.call_args.args
+        quantiles = broker.metrics.observe_batch_order_latency.call_args.kwargs["quantiles"]
+        assert operation == "place"
+        assert quantiles == {"p50": latency, "p95": latency}
+
+    @pytest.mark.asyncio
+    async def test_cancel_all_per_symbol(self, fake_binance_server, async_broker):
+        rest = FakeOrderREST()
+        async with (
+            fake_binance_server(rest.routes()) as server,
+            async_broker(server, metrics=Mock()) as broker,
+        ):
+            results = await broker.cancel_all_orders_batch(["BTCUSDT", "NOORDERSUSDT"])
+            for _ in range(3):
+                await broker.cancel_all_orders_batch(["BTCUSDT"])
+            stats = broker.get_batch_latency_stats()["cancel_all"]
+
+        assert sorted(rest.cancel_all_symbols[:2]) == ["BTCUSDT", "NOORDERSUSDT"]
+        assert results[0] == {
+            "success": True,
+            "order": [{"symbol": "BTCUSDT", "orderId": 1, "status": "CANCELED"}],
+            "symbol": "BTCUSDT",
+        }
+        assert results[1]["success"] is False
+        assert stats["count"] == 4
+        assert stats["p50_ms"] <= stats["p95_ms"]
+
+    @pytest.mark.asyncio
+    async def test_cancel_replace_tracks_new_order(self, fake_binance_server, async_broker):
+        rest = FakeOrderREST()
+        async with (
+            fake_binance_server(rest.routes()) as server,
+            async_broker(server, metrics=Mock()) as broker,
+        ):
+            response = await broker.cancel_replace_order_async(
+                "BTCUSDT", 1, "BUY", "LIMIT", 0.001, price=30000.0
+            )
+            await broker.order_manager.close()
+
+        params = rest.cancel_replace_params
+        assert params["cancelOrderId"] == "1"
+        assert params["cancelReplaceMode"] == "STOP_ON_FAILURE"
+        assert params["timeInForce"] == "GTC"
+        assert "signature" in params
+        assert response["order"]["order_id"] == 2
+        assert broker.pending_orders[2]["status"] == "NEW"
+
+    @pytest.mark.asyncio
+    async def test_engine_uses_batch_orders(self, fake_binance_server, async_broker):
+        from src.core.async_trading_engine import AsyncTradingEngine
+
+        with patch("src.monitoring.metrics_collector.get_metrics_collector"):
+            engine = AsyncTradingEngine(api_key="k", api_secret="s")
+
+        rest = FakeOrderREST()
+        async with (
+            fake_binance_server(rest.routes()) as server,
+            async_broker(server, metrics=Mock()) as broker,
+        ):
+            engine.broker = broker
+            results = await engine.process_concurrent_orders(
+                [
+                    {"symbol": "BTCUSDT", "side": "BUY", "quantity": 0.001},
+                    {"symbol": "REJECTUSDT", "side": "SELL", "quantity": 1},
+                ]
+            )
+
+        assert results[0]["orderId"] == results[0]["order_id"]
+        assert results[1]["symbol"] == "REJECTUSDT"
+        assert "error" in results[1]
+        assert broker.get_batch_latency_stats()["place"]["count"] == 1
@@ -311,6 +311,44 @@ class TestCSVDataLoader:
         assert isinstance(dataframes, list)
         assert len(dataframes) >= 0
 
+    @pytest.fixture
+    def daily_files(self, tmp_path):
+        """多个按日拆分的OHLCV文件"""
+        for day in range(5):
+            close = np.arange(100, dtype=float) + day * 100
+            pd.DataFrame(
+                {"open": close, "high": close + 1, "low": close - 1, "close": close, "volume": 1}
+            ).to_csv(tmp_path / f"day_{day}.csv", index=False)
+        return tmp_path
+
+    def test_streaming_combine_matches_eager(self, daily_files):
+        """测试流式合并与逐文件加载一致，且source_file为分类类型"""
+        loader = CSVDataLoader(daily_files)
+        eager = loader.load_multiple_files(["day_*.csv"], combine=True)
+        streamed = loader.load_multiple_files(
+            ["day_*.csv"], combine=True, streaming=True, max_workers=3
+        )
+
+        assert isinstance(streamed["source_file"].dtype, pd.CategoricalDtype)
+        assert streamed["source_file"].astype(str).tolist() == eager["source_file"].tolist()
+        np.testing.assert_array_equal(streamed["close"], eager["close"])
+        assert loader.last_load_stats["rows"] == 500
+        assert loader.last_load_stats["bytes_per_second"] > 0
+
+    def test_streaming_chunks_with_float32_prices(self, daily_files):
+        """测试分块产出与float32价格列"""
+        loader = CSVDataLoader(daily_files)
+        chunks = list(
+            loader.load_multiple_files(
+                ["day_0.csv", "day_1.csv"], streaming=True, chunksize=40, float32_prices=True
+            )
+        )
+
+        assert [len(chunk) for chunk in chunks] == [40, 40, 20, 40, 40, 20]
+        assert chunks[0]["close"].dtype == np.float32
+        assert chunks[0]["volume"].dtype == np.float64
+        assert chunks[-1]["source_file"].iloc[0] == "day_1.csv"
+
     def test_get_file_info(self, sample_csv_file):
         """测试文件信息获取"""
         loader = CSVDataLoader()
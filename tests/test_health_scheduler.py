@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+异步健康检查调度器测试
+Async Health Scheduler Tests
+
+测试目标:
+- src/monitoring/health_scheduler.py
+- 同步检查放到线程池、协程检查超时、TTL缓存与单次刷新、告警冷却、/health 端点
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.monitoring.alerting import AlertManager
+from src.monitoring.health_checker import HealthChecker
+from src.monitoring.health_scheduler import AsyncHealthScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _make_checker() -> HealthChecker:
+    checker = HealthChecker(None)
+    checker._health_checks.clear()
+    return checker
+
+
+class TestHealthChecks:
+    """测试并发检查与超时"""
+
+    @pytest.mark.asyncio
+    async def test_sync_checks_run_concurrently_off_loop(self):
+        checker = _make_checker()
+        for i in range(3):
+            checker.register_check(f"slow_{i}", lambda: time.sleep(0.2) or True, critical=True)
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker_task = asyncio.create_task(ticker())
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            scheduler = AsyncHealthScheduler(checker, executor=executor)
+            start = time.perf_counter()
+            results = await scheduler.run_checks()
+            elapsed = time.perf_counter() - start
+        ticker_task.cancel()
+
+        assert results["overall_status"] == "healthy"
+        assert set(results["checks"]) == {"slow_0", "slow_1", "slow_2"}
+        assert elapsed < 0.5
+        # 事件循环在检查期间持续运行
+        assert ticks >= 5
+        assert checker.get_health_status() == results
+
+    @pytest.mark.asyncio
+    async def test_coroutine_check_timeout(self):
+        checker = _make_checker()
+
+        async def hung():
+            await asyncio.sleep(10)
+            return True
+
+        async def ok():
+            return True
+
+        checker.register_check("exchange", hung, critical=True, timeout=0.05)
+        checker.register_check("cache", ok)
+        scheduler = AsyncHealthScheduler(checker)
+
+        results = await scheduler.run_checks()
+
+        assert results["checks"]["exchange"]["status"] == "timeout"
+        assert results["checks"]["cache"]["status"] == "healthy"
+        assert results["overall_status"] == "unhealthy"
+        assert scheduler.timeout_count == 1
+
+    @pytest.mark.asyncio
+    async def test_unknown_check_name(self):
+        scheduler = AsyncHealthScheduler(_make_checker())
+        results = await scheduler.run_checks("missing")
+        assert results["overall_status"] == "error"
+
+
+class TestCaching:
+    """测试TTL缓存与单次刷新"""
+
+    @pytest.mark.asyncio
+    async def test_ttl_cache_and_single_flight(self):
+        checker = _make_checker()
+        calls = 0
+
+        async def probe():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return True
+
+        checker.register_check("probe", probe)
+        clock = FakeClock()
+        scheduler = AsyncHealthScheduler(checker, cache_ttl=5, clock=clock)
+
+        # 并发请求共享同一次刷新
+        await asyncio.gather(*(scheduler.get_health_status() for _ in range(10)))
+        assert calls == 1
+
+        clock.now = 4
+        await scheduler.get_health_status()
+        assert calls == 1
+
+        clock.now = 6
+        await scheduler.get_health_status()
+        assert calls == 2
+        assert scheduler.get_stats()["run_count"] == 2
+
+
+class TestAlerts:
+    """测试告警评估"""
+
+    @pytest.mark.asyncio
+    async def test_alert_cooldown_and_handler(self):
+        alert_manager = AlertManager(None)
+        alert_manager._alert_rules.clear()
+        handled = []
+        alert_manager.add_alert_handler(handled.append)
+
+        async def high_latency():
+            return True
+
+        alert_manager.add_alert_rule("high_latency", high_latency, severity="critical")
+        alert_manager.add_alert_rule("never", lambda: False)
+        scheduler = AsyncHealthScheduler(_make_checker(), alert_manager)
+
+        fired = await scheduler.check_alerts()
+        assert [alert["name"] for alert in fired] == ["high_latency"]
+        assert handled == fired
+
+        # 冷却期内不重复触发
+        assert await scheduler.check_alerts() == []
+        assert len(handled) == 1
+
+
+class TestHealthEndpoint:
+    """测试 aiohttp /health 端点"""
+
+    @pytest.mark.asyncio
+    async def test_health_endpoint_status_codes(self):
+        from aiohttp import ClientSession, web
+        from aiohttp.test_utils import TestServer
+
+        checker = _make_checker()
+        state = {"healthy": True}
+        checker.register_check("exchange", lambda: state["healthy"], critical=True)
+        scheduler = AsyncHealthScheduler(checker, cache_ttl=0)
+
+        app = web.Application()
+        scheduler.add_routes(app)
+        async with TestServer(app) as server, ClientSession() as session:
+            async with session.get(server.make_url("/health")) as response:
+                assert response.status == 200
+                body = await response.json()
+                assert body["checks"]["exchange"]["status"] == "healthy"
+
+            state["healthy"] = False
+            async with session.get(server.make_url("/health")) as response:
+                assert response.status == 503
+                assert (await response.json())["overall_status"] == "unhealthy"
+
+    @pytest.mark.asyncio
+    async def test_background_loop_start_stop(self):
+        checker = _make_checker()
+        checker.register_check("ok", lambda: True)
+        scheduler = AsyncHealthScheduler(checker, interval=0.01)
+
+        scheduler.start()
+        await asyncio.sleep(0.1)
+        await scheduler.stop()
+
+        assert scheduler.run_count >= 2
+        assert scheduler.get_stats()["running"] is False
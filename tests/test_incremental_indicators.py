@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+增量指标状态引擎测试（与批量路径对拍）
+Incremental Indicator State Parity Tests
+
+测试目标:
+- src/core/incremental_indicators.py
+- OptimizedSignalProcessor 增量路径与批量路径一致
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.incremental_indicators import IncrementalIndicatorState
+from src.core.market_data_buffer import OHLCVRingBuffer
+from src.core.signal_processor_vectorized import OptimizedSignalProcessor, fast_atr, fast_ema
+
+
+@pytest.fixture
+def ohlc():
+    """带多次均线交叉的随机游走K线"""
+    rng = np.random.default_rng(7)
+    n = 600
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    spread = rng.uniform(0.1, 2.0, n)
+    timestamps = 1_700_000_000_000 + np.arange(n, dtype=np.int64) * 1000
+    return timestamps, close + spread, close - spread, close
+
+
+class TestIncrementalParity:
+    """逐根K线更新结果与批量函数一致"""
+
+    def test_ema_sma_atr_match_batch(self, ohlc):
+        timestamps, high, low, close = ohlc
+        state = IncrementalIndicatorState("BTCUSDT", fast_win=7, slow_win=25, atr_window=14)
+
+        batch_fast = fast_ema(close, 7)
+        batch_slow = fast_ema(close, 25)
+        batch_atr = fast_atr(high, low, close, 14)
+        batch_fast_sma = pd.Series(close).rolling(7, min_periods=1).mean().values
+        batch_slow_sma = pd.Series(close).rolling(25, min_periods=1).mean().values
+
+        for i in range(len(close)):
+            state.update(int(timestamps[i]), high[i], low[i], close[i])
+            assert state.fast_ema == pytest.approx(batch_fast[i], rel=1e-9)
+            assert state.slow_ema == pytest.approx(batch_slow[i], rel=1e-9)
+            assert state.atr == pytest.approx(batch_atr[i], rel=1e-9)
+            assert state.fast_sma == pytest.approx(batch_fast_sma[i], rel=1e-9)
+            assert state.slow_sma == pytest.approx(batch_slow_sma[i], rel=1e-9)
+
+    def test_crossovers_match_batch(self, ohlc):
+        timestamps, high, low, close = ohlc
+        processor = OptimizedSignalProcessor()
+        state = IncrementalIndicatorState("BTCUSDT", fast_win=7, slow_win=25)
+
+        crossings = 0
+        for i in range(len(close)):
+            state.update(int(timestamps[i]), high[i], low[i], close[i])
+            expected = processor._detect_crossover_fast(
+                fast_ema(close[: i + 1], 7), fast_ema(close[: i + 1], 25)
+            )
+            assert state.crossover() == expected
+            crossings += any(expected)
+
+        assert crossings > 0
+
+    def test_revising_last_bar_matches_single_update(self, ohlc):
+        timestamps, high, low, close = ohlc
+        revised = IncrementalIndicatorState("BTCUSDT")
+        direct = IncrementalIndicatorState("BTCUSDT")
+
+        for i in range(50):
+            ts = int(timestamps[i])
+            # 未收盘K线先以错误值写入，随后用最终值修订
+            revised.update(ts, high[i] + 5, low[i] - 5, close[i] + 3)
+            revised.update(ts, high[i], low[i], close[i])
+            direct.update(ts, high[i], low[i], close[i])
+
+        assert revised.bar_count == direct.bar_count == 50
+        assert revised.signals() == direct.signals()
+        assert revised.fast_sma == pytest.approx(direct.fast_sma)
+
+    def test_atr_only_state(self, ohlc):
+        timestamps, high, low, close = ohlc
+        state = IncrementalIndicatorState("BTCUSDT", fast_win=None, slow_win=None, atr_window=14)
+        state.sync(timestamps, high, low, close)
+
+        assert state.atr == pytest.approx(fast_atr(high, low, close, 14)[-1])
+        assert state.crossover() == (False, False)
+
+    def test_mismatched_windows_rejected(self):
+        with pytest.raises(ValueError):
+            IncrementalIndicatorState("BTCUSDT", fast_win=7, slow_win=None)
+
+
+class TestProcessorIncrementalPath:
+    """信号处理器在流式缓冲区上默认使用增量状态"""
+
+    def test_streaming_buffer_matches_batch(self, ohlc):
+        timestamps, high, low, close = ohlc
+        processor = OptimizedSignalProcessor()
+        batch = OptimizedSignalProcessor(use_incremental=False)
+        # 容量小于序列长度，600根K线回绕3次
+        capacity = 200
+        buf = OHLCVRingBuffer(capacity=capacity, symbol="BTCUSDT")
+
+        # 回绕后批量EMA/ATR在窗口首根重新起算，增量状态从第一根起从不重置；
+        # 起算误差按 (1-α)^(窗口长度) 衰减：慢线 (24/26)^199 ≈ 1e-7，故取 rel=1e-6
+        tolerance = 1e-6
+        for i in range(len(close)):
+            buf.append(int(timestamps[i]), close[i], high[i], low[i], close[i], 1.0)
+            if i < 25:
+                continue
+            signals = processor.get_trading_signals_optimized(buf, 7, 25)
+            expected = batch.get_trading_signals_optimized(buf, 7, 25)
+            assert signals["last_timestamp"] == expected["last_timestamp"]
+            for key in ("current_price", "fast_ma", "slow_ma"):
+                assert signals[key] == pytest.approx(expected[key], rel=tolerance)
+            # 快慢线差值远大于误差时，交叉信号必须一致
+            if abs(expected["fast_ma"] - expected["slow_ma"]) > tolerance * expected["slow_ma"]:
+                for key in ("buy_signal", "sell_signal"):
+                    assert signals[key] == expected[key]
+
+            assert processor.compute_atr_optimized(buf) == pytest.approx(
+                batch.compute_atr_optimized(buf), rel=tolerance
+            )
+
+        assert len(buf) == capacity
+        assert buf.timestamps[0] == timestamps[-capacity]
+        # 信号与ATR共用同一组状态
+        assert len(processor._indicator_states) == 1
+
+    def test_dataframe_with_symbol_uses_state(self, ohlc):
+        timestamps, high, low, close = ohlc
+        df = pd.DataFrame(
+            {"open": close, "high": high, "low": low, "close": close},
+            index=pd.to_datetime(timestamps, unit="ms"),
+        )
+        processor = OptimizedSignalProcessor()
+
+        signals = processor.get_trading_signals_optimized(df, 7, 25, symbol="ETHUSDT")
+
+        assert ("ETHUSDT", 7, 25, 14) in processor._indicator_states
+        assert signals["fast_ma"] == pytest.approx(fast_ema(close, 7)[-1])
+
+        processor.reset_indicator_states("ETHUSDT")
+        assert not processor._indicator_states
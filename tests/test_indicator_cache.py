@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+指标缓存测试
+Indicator Cache Tests
+
+测试目标:
+- src/indicators/indicator_cache.py
+- src/indicators 函数与 TechnicalIndicatorStrategy 辅助方法共享缓存
+- 改用缓存辅助方法的策略输出与原逐策略计算一致
+"""
+
+import gc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.indicators import (
+    average_true_range,
+    configure_indicator_cache,
+    reset_indicator_cache,
+    simple_moving_average,
+)
+from src.indicators.indicator_cache import IndicatorCache, data_key
+from src.strategies.base import TechnicalIndicatorStrategy
+from src.strategies.breakout import (
+    ATRBreakoutStrategy,
+    BollingerBreakoutStrategy,
+    BollingerMeanReversionStrategy,
+)
+from src.strategies.oscillator import RSIStrategy
+from src.strategies.trend_following import SupertrendStrategy, TrendFollowingStrategy
+
+
+@pytest.fixture
+def cache():
+    fresh = configure_indicator_cache()
+    yield fresh
+    reset_indicator_cache()
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    close = 100 + np.cumsum(rng.normal(0, 1, 500))
+    return pd.DataFrame(
+        {"high": close + 1, "low": close - 1, "close": close},
+        index=pd.date_range("2024-01-01", periods=500, freq="h"),
+    )
+
+
+class _Strategy(TechnicalIndicatorStrategy):
+    def generate_signals(self, data):
+        return data
+
+
+class TestIndicatorCache:
+    """测试缓存键、命中与淘汰"""
+
+    def test_column_access_shares_entry(self, cache, frame):
+        first = simple_moving_average(frame["close"], 20)
+        second = simple_moving_average(frame["close"], 20)
+        simple_moving_average(frame["close"], 50)
+
+        assert second is first
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 2
+
+    def test_copies_and_leading_nan_keys(self, frame):
+        close = frame["close"].copy()
+        close.iloc[0] = np.nan
+
+        assert data_key(close)[0] == data_key(close)[0]
+        assert data_key(close)[0] != data_key(frame["close"])[0]
+        assert data_key(pd.Series(["a", "b"])) is None
+
+    def test_multi_input_indicator(self, cache, frame):
+        atr = average_true_range(frame["high"], frame["low"], frame["close"], 14)
+
+        assert average_true_range(frame["high"], frame["low"], frame["close"], 14) is atr
+        assert average_true_range(frame["high"], frame["low"], frame["close"], 10) is not atr
+
+    def test_byte_bound_evicts_lru(self, frame):
+        close = frame["close"]
+        entry_bytes = close.nbytes
+        small = IndicatorCache(max_bytes=entry_bytes * 2)
+
+        for window in (5, 10, 20):
+            small.get_or_compute("sma", [close], (window,), lambda: close.rolling(5).mean())
+
+        assert small.size() == 2
+        assert small.evictions == 1
+        assert small.current_bytes <= small.max_bytes
+
+    def test_entries_expire_with_data(self, cache):
+        series = pd.Series(np.arange(100, dtype=float))
+        simple_moving_average(series, 5)
+        assert cache.size() == 1
+
+        del series
+        gc.collect()
+        other = pd.Series(np.arange(100, dtype=float))
+        simple_moving_average(other, 5)
+        assert cache.stats()["hits"] == 0
+
+
+class TestInvalidation:
+    """测试显式失效"""
+
+    def test_invalidate_after_in_place_update(self, cache, frame):
+        close = frame["close"]
+        simple_moving_average(close, 20)
+        simple_moving_average(frame["high"], 20)
+
+        frame.loc[frame.index[100], "close"] = 1_000.0
+        assert cache.invalidate(frame["close"]) == 1
+
+        refreshed = simple_moving_average(frame["close"], 20)
+        assert refreshed.iloc[100] == pytest.approx(frame["close"].iloc[81:101].mean())
+        assert cache.size() == 2
+
+    def test_invalidate_by_name_and_clear(self, cache, frame):
+        simple_moving_average(frame["close"], 20)
+        average_true_range(frame["high"], frame["low"], frame["close"])
+
+        assert cache.invalidate(name="atr") == 1
+        assert cache.size() == 1
+        cache.clear()
+        assert cache.size() == 0 and cache.current_bytes == 0
+
+
+class TestStrategyHelpers:
+    """测试策略辅助方法共享缓存"""
+
+    def test_strategies_share_indicators(self, cache, frame):
+        first, second = _Strategy(), _Strategy()
+
+        sma = first._calculate_sma(frame["close"], 20)
+        bands = second._calculate_bollinger_bands(frame["close"], 20)
+        rsi = first._calculate_rsi(frame["close"], 14)
+
+        assert bands["middle"] is sma
+        assert second._calculate_rsi(frame["close"], 14) is rsi
+        pd.testing.assert_series_equal(
+            first._calculate_ema(frame["close"], 12), frame["close"].ewm(span=12).mean()
+        )
+
+
+def _reference_atr(frame, window):
+    high, low, close = frame["high"], frame["low"], frame["close"]
+    true_range = pd.concat(
+        [high - low, abs(high - close.shift(1)), abs(low - close.shift(1))], axis=1
+    ).max(axis=1)
+    return true_range.rolling(window=window).mean()
+
+
+def _reference_bands(close, window, num_std):
+    middle = close.rolling(window=window).mean()
+    std = close.rolling(window=window).std()
+    return middle + std * num_std, middle, middle - std * num_std
+
+
+class TestStrategyParity:
+    """测试改用缓存辅助方法后策略输出不变（对照原先各策略内联的计算）"""
+
+    @pytest.fixture
+    def ohlc(self, frame):
+        # 含平盘段，覆盖RSI中loss为0的分支
+        frame = frame.copy()
+        frame.iloc[100:130, :] = frame.iloc[100].to_numpy()
+        frame["open"] = frame["close"].shift(1).fillna(frame["close"].iloc[0])
+        frame["volume"] = 1.0
+        return frame
+
+    @pytest.mark.parametrize(
+        "strategy_cls", [BollingerBreakoutStrategy, BollingerMeanReversionStrategy]
+    )
+    def test_bollinger_strategies(self, cache, ohlc, strategy_cls):
+        result = strategy_cls(window=20, num_std=2.5).generate_signals(ohlc)
+        upper, middle, lower = _reference_bands(ohlc["close"], 20, 2.5)
+
+        pd.testing.assert_series_equal(result["upper_band"], upper, check_names=False)
+        pd.testing.assert_series_equal(result["middle_band"], middle, check_names=False)
+        pd.testing.assert_series_equal(result["lower_band"], lower, check_names=False)
+        if "bb_width" in result:
+            pd.testing.assert_series_equal(
+                result["bb_width"], (upper - lower) / middle, check_names=False
+            )
+
+    def test_atr_breakout(self, cache, ohlc):
+        result = ATRBreakoutStrategy(atr_period=14, ma_period=20).generate_signals(ohlc)
+        atr = _reference_atr(ohlc, 14)
+        ma = ohlc["close"].rolling(window=20).mean()
+
+        pd.testing.assert_series_equal(result["atr"], atr, check_names=False)
+        pd.testing.assert_series_equal(result["upper_atr"], ma + atr * 2.0, check_names=False)
+        pd.testing.assert_series_equal(result["lower_atr"], ma - atr * 2.0, check_names=False)
+
+    def test_trend_following(self, cache, ohlc):
+        result = TrendFollowingStrategy(ma_window=20, atr_window=14).generate_signals(ohlc)
+        atr = _reference_atr(ohlc, 14)
+        ma = ohlc["close"].rolling(window=20).mean()
+
+        pd.testing.assert_series_equal(result["ma"], ma, check_names=False)
+        pd.testing.assert_series_equal(result["atr"], atr, check_names=False)
+        pd.testing.assert_series_equal(result["upper_trend"], ma + atr * 2.0, check_names=False)
+
+    def test_supertrend_atr(self, cache, ohlc):
+        result = SupertrendStrategy(atr_period=10, multiplier=3.0).calculate_indicators(ohlc)
+        atr = _reference_atr(ohlc, 10)
+        hl2 = (ohlc["high"] + ohlc["low"]) / 2
+
+        pd.testing.assert_series_equal(result["atr"], atr, check_names=False)
+        pd.testing.assert_series_equal(result["basic_upper"], hl2 + 3.0 * atr, check_names=False)
+
+    def test_rsi_strategy(self, cache, ohlc):
+        result = RSIStrategy(window=14).generate_signals(ohlc)
+        delta = ohlc["close"].diff()
+        gain = delta.where(delta > 0, 0).rolling(window=14).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+        rsi = (100 - 100 / (1 + gain / loss.replace(0, float("inf")))).fillna(50).clip(0, 100)
+
+        pd.testing.assert_series_equal(result["rsi"], rsi, check_names=False)
+
+    def test_strategies_share_sma_and_atr(self, cache, ohlc):
+        BollingerBreakoutStrategy(window=20).generate_signals(ohlc)
+        misses = cache.stats()["misses"]
+        ATRBreakoutStrategy(atr_period=14, ma_period=20).generate_signals(ohlc)
+        TrendFollowingStrategy(ma_window=20, atr_window=14).generate_signals(ohlc)
+
+        # SMA(20)三次只算一次，ATR(14)两次只算一次
+        assert cache.stats()["misses"] == misses + 1
+        assert cache.stats()["hits"] == 3
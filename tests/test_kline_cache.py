@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+增量K线缓存测试
+Incremental Kline Cache Tests
+
+测试目标:
+- src/core/kline_cache.py
+- fetch_price_data 通过缓存只拉取新K线
+"""
+
+import time
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+from src.core.kline_cache import KlineCache, get_kline_cache, interval_to_ms, reset_kline_cache
+from src.core.price_fetcher import fetch_price_data
+from src.data.storage import ParquetMarketStore
+
+HOUR = 3_600_000
+START = 1_700_000_000_000 - 1_700_000_000_000 % HOUR
+
+
+def make_rows(first, count, close=100.0):
+    return [
+        [START + (first + k) * HOUR, close, close + 1, close - 1, close + k, 10.0, 0, 0, 0, 0, 0, 0]
+        for k in range(count)
+    ]
+
+
+class FakeClient:
+    """按 start_time / limit 返回K线的假客户端"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def get_klines(self, symbol, interval="1h", limit=100, start_time=None):
+        self.calls.append({"limit": limit, "start_time": start_time})
+        rows = [r for r in self.rows if start_time is None or r[0] >= start_time]
+        return rows[:limit] if start_time is not None else rows[-limit:]
+
+
+class TestKlineCache:
+    """测试全量/增量拉取、只读视图与持久化"""
+
+    def test_interval_to_ms(self):
+        assert interval_to_ms("1h") == HOUR
+        assert interval_to_ms("15m") == 15 * 60_000
+        assert interval_to_ms("1M") is None
+
+    def test_delta_fetch_updates_forming_bar(self):
+        client = FakeClient(make_rows(0, 120))
+        cache = KlineCache(limit=50)
+
+        first = cache.get(client, "BTCUSDT", now_ms=START + 119 * HOUR + 10)
+        assert len(first) == 50
+        assert client.calls[-1] == {"limit": 50, "start_time": None}
+
+        # 未收盘K线被更新，并新增两根
+        client.rows[-1][4] = -1.0
+        client.rows += make_rows(120, 2)
+        second = cache.get(client, "BTCUSDT", now_ms=START + 121 * HOUR + 10)
+
+        assert client.calls[-1] == {"limit": 3, "start_time": START + 119 * HOUR}
+        assert len(second) == 50
+        assert second["close"].iloc[-3] == -1.0
+        assert second.index[-1].value // 1_000_000 == START + 121 * HOUR
+        assert second.index.is_monotonic_increasing
+        assert cache.stats()["delta_fetches"] == 1
+
+        with pytest.raises(ValueError):
+            second.iloc[0, 0] = 0.0
+
+    def test_large_gap_falls_back_to_full_fetch(self):
+        client = FakeClient(make_rows(0, 10))
+        cache = KlineCache(limit=5)
+        cache.get(client, "BTCUSDT", now_ms=START + 9 * HOUR)
+
+        client.rows += make_rows(10, 20)
+        result = cache.get(client, "BTCUSDT", now_ms=START + 29 * HOUR)
+
+        assert client.calls[-1]["start_time"] is None
+        assert cache.stats()["full_fetches"] == 2
+        assert len(result) == 5
+
+    def test_closed_klines_persist_and_restore(self, tmp_path):
+        store = ParquetMarketStore(tmp_path, partition="day")
+        client = FakeClient(make_rows(0, 30))
+        now_ms = START + 29 * HOUR + 10
+
+        KlineCache(limit=20, store=store).get(client, "BTCUSDT", now_ms=now_ms)
+        stored = store.read("BTCUSDT", "1h")
+        # 未收盘的最后一根K线不写入存储
+        assert len(stored) == 19
+
+        restarted = KlineCache(limit=20, store=store)
+        result = restarted.get(client, "BTCUSDT", now_ms=now_ms)
+
+        assert client.calls[-1] == {"limit": 2, "start_time": START + 28 * HOUR}
+        assert restarted.stats()["full_fetches"] == 0
+        np.testing.assert_array_equal(result["close"].to_numpy(), [r[4] for r in client.rows[-20:]])
+
+    def test_default_store_survives_restart(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("MARKET_STORE_DIR", str(tmp_path / "store"))
+        now_hour = int(time.time() * 1000) // HOUR * HOUR
+        rows = [
+            [now_hour + (k - 99) * HOUR, 100.0, 101.0, 99.0, 100.0 + k, 10.0] for k in range(100)
+        ]
+        reset_kline_cache()
+        try:
+            first = FakeClient(rows)
+            fetch_price_data("BTCUSDT", exchange_client=first)
+            assert get_kline_cache(first).store is not None
+
+            # 模拟重启：全新的缓存与客户端，使用同一默认存储
+            reset_kline_cache()
+            second = FakeClient(rows)
+            data = fetch_price_data("BTCUSDT", exchange_client=second)
+
+            assert get_kline_cache(second).stats()["full_fetches"] == 0
+            assert second.calls == [{"limit": 2, "start_time": rows[-2][0]}]
+            np.testing.assert_array_equal(data["close"].to_numpy(), [r[4] for r in rows])
+        finally:
+            reset_kline_cache()
+
+    def test_fetch_price_data_uses_cache(self):
+        client = Mock()
+        client.get_klines.return_value = make_rows(0, 100)
+        cache = KlineCache()
+
+        data = fetch_price_data("BTCUSDT", exchange_client=client, cache=cache)
+        assert len(data) == 100
+        assert list(data.columns[:5]) == ["open", "high", "low", "close", "volume"]
+        assert cache.stats()["full_fetches"] == 1
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+进程内延迟直方图测试
+Latency Histogram Tests
+
+测试目标:
+- src/monitoring/latency_histogram.py
+- TradingMetricsCollector 延迟分位数与Prometheus导出
+"""
+
+import threading
+import timeit
+
+import numpy as np
+import pytest
+from prometheus_client import CollectorRegistry, generate_latest
+
+from src.monitoring.latency_histogram import (
+    LatencyHistogram,
+    LatencyHistogramCollector,
+    LatencyHistogramFamily,
+)
+
+
+def _samples(n=50_000, seed=0):
+    return np.random.default_rng(seed).lognormal(mean=-6, sigma=1.0, size=n)
+
+
+class TestLatencyHistogram:
+    """测试分桶精度、快照合并与多线程写入"""
+
+    def test_percentiles_within_bucket_precision(self):
+        values = _samples()
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.record(value)
+
+        snapshot = histogram.snapshot()
+        assert snapshot.count == len(values)
+        assert snapshot.sum == pytest.approx(values.sum())
+        for q, value in snapshot.percentiles([50, 95, 99]).items():
+            # 对数-线性分桶（128子桶）相对误差 < 1%
+            assert value == pytest.approx(np.percentile(values, q), rel=0.01)
+        assert snapshot.max() == pytest.approx(values.max(), rel=0.01)
+
+    def test_out_of_range_and_empty(self):
+        histogram = LatencyHistogram()
+        assert histogram.snapshot().percentile(99) == 0.0
+
+        for value in (0.0, -1.0, 1e-9, 1e6):
+            histogram.record(value)
+        snapshot = histogram.snapshot()
+        assert snapshot.count == 4
+        assert snapshot.percentile(50) <= 1e-6
+        assert snapshot.percentile(100) >= 3600.0
+
+    def test_snapshots_merge_and_subtract(self):
+        first, second = LatencyHistogram(), LatencyHistogram()
+        values = _samples(10_000)
+        for value in values[:4000]:
+            first.record(value)
+        for value in values[4000:]:
+            second.record(value)
+
+        merged = first.snapshot() + second.snapshot()
+        assert merged.count == len(values)
+        assert merged.percentile(95) == pytest.approx(np.percentile(values, 95), rel=0.01)
+
+        before = second.snapshot()
+        second.record(2.0)
+        interval = second.snapshot() - before
+        assert interval.count == 1
+        assert interval.percentile(50) == pytest.approx(2.0, rel=0.01)
+
+        with pytest.raises(ValueError):
+            merged + LatencyHistogram(precision_bits=4).snapshot()
+
+    def test_per_thread_shards(self):
+        histogram = LatencyHistogram()
+
+        def worker(value):
+            for _ in range(10_000):
+                histogram.record(value)
+
+        threads = [threading.Thread(target=worker, args=(0.001 * (i + 1),)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        snapshot = histogram.snapshot()
+        assert snapshot.count == 40_000
+        # 线程均已退出，分片并入退役分片
+        assert histogram.shard_count == 1
+        assert snapshot.percentile(100) == pytest.approx(0.004, rel=0.01)
+
+        histogram.reset()
+        assert histogram.snapshot().count == 0
+
+    def test_short_lived_thread_shards_are_retired(self):
+        histogram = LatencyHistogram()
+        histogram.record(0.5)
+        max_shards = 0
+
+        def worker(value):
+            for _ in range(100):
+                histogram.record(value)
+
+        for i in range(100):
+            thread = threading.Thread(target=worker, args=(0.001 * (i % 10 + 1),))
+            thread.start()
+            thread.join()
+            max_shards = max(max_shards, histogram.shard_count)
+
+        snapshot = histogram.snapshot()
+        # 主线程 + 至多一个刚退出的工作线程 + 退役分片
+        assert max_shards <= 3
+        assert histogram.shard_count == 2
+        assert snapshot.count == 100 * 100 + 1
+        expected_sum = 0.5 + sum(100 * 0.001 * (i % 10 + 1) for i in range(100))
+        assert snapshot.sum == pytest.approx(expected_sum)
+        assert snapshot.percentile(100) == pytest.approx(0.5, rel=0.01)
+
+    def test_record_cost(self):
+        histogram = LatencyHistogram()
+        record = histogram.record
+        per_call = min(timeit.repeat(lambda: record(0.0025), number=20_000, repeat=3)) / 20_000
+        # 目标 <1µs；CI机器留出余量
+        assert per_call < 5e-6
+
+
+class TestPrometheusBridge:
+    """测试抓取时导出"""
+
+    def test_exposition_keeps_buckets_and_adds_quantiles(self):
+        family = LatencyHistogramFamily(["task_type"])
+        for value in (0.002, 0.004, 0.2):
+            family.labels(task_type="trading_cycle").record(value)
+
+        registry = CollectorRegistry()
+        registry.register(
+            LatencyHistogramCollector(
+                "task_latency_seconds", "Task latency", family, buckets=[0.001, 0.01, 0.1, 1.0]
+            )
+        )
+        text = generate_latest(registry).decode()
+
+        assert 'task_latency_seconds_bucket{le="0.01",task_type="trading_cycle"} 2.0' in text
+        assert 'task_latency_seconds_bucket{le="+Inf",task_type="trading_cycle"} 3.0' in text
+        assert 'task_latency_seconds_count{task_type="trading_cycle"} 3.0' in text
+        p50 = registry.get_sample_value(
+            "task_latency_quantile_seconds", {"task_type": "trading_cycle", "quantile": "0.5"}
+        )
+        assert p50 == pytest.approx(0.004, rel=0.01)
+
+    def test_metrics_collector_latency_percentiles(self):
+        from src.monitoring.metrics_collector import TradingMetricsCollector
+
+        collector = TradingMetricsCollector()
+        for _ in range(100):
+            with collector.measure_signal_latency():
+                pass
+        collector.observe_task_latency("trading_cycle", 0.003)
+
+        signal = collector.get_latency_percentiles("signal")
+        assert signal["count"] == 100
+        assert 0 < signal["p50"] <= signal["p95"] <= signal["p99"] < 0.01
+
+        task = collector.get_latency_percentiles("task", [95], task_type="trading_cycle")
+        assert task == {"p95": pytest.approx(0.003, rel=0.01), "count": 1}
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+行情环形缓冲区测试
+OHLCV Ring Buffer Tests
+
+测试目标:
+- src/core/market_data_buffer.py
+- OptimizedSignalProcessor 直接读取缓冲区的一致性
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.market_data_buffer import MarketDataStore, OHLCVRingBuffer, to_epoch_ms
+from src.core.signal_processor_vectorized import OptimizedSignalProcessor
+
+
+def _make_ohlcv(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    index = pd.date_range("2024-01-01", periods=n, freq="1s", name="timestamp")
+    return pd.DataFrame(
+        {
+            "open": close + rng.normal(0, 0.1, n),
+            "high": close + 1.0,
+            "low": close - 1.0,
+            "close": close,
+            "volume": rng.uniform(1, 10, n),
+        },
+        index=index,
+    )
+
+
+class TestOHLCVRingBuffer:
+    """测试环形缓冲区"""
+
+    def test_append_and_wraparound(self):
+        """测试超过容量后保留最新数据且视图连续"""
+        buf = OHLCVRingBuffer(capacity=3)
+        for i in range(5):
+            buf.append(1000 + i, i, i + 1, i - 1, float(i), 10.0)
+
+        assert len(buf) == 3
+        np.testing.assert_array_equal(buf.close, [2.0, 3.0, 4.0])
+        np.testing.assert_array_equal(buf.timestamps, [1002, 1003, 1004])
+        assert buf.close.flags["C_CONTIGUOUS"]
+        assert buf.last_timestamp == 1004
+
+    def test_same_timestamp_overwrites_last_bar(self):
+        """测试相同时间戳覆盖最后一根K线"""
+        buf = OHLCVRingBuffer(capacity=4)
+        buf.append(1, 1, 1, 1, 1, 1)
+        buf.append(2, 2, 2, 2, 2, 2)
+        buf.append(2, 2, 3, 2, 2.5, 3)
+
+        assert len(buf) == 2
+        assert buf.last_row() == (2, 2.0, 3.0, 2.0, 2.5, 3.0)
+
+    def test_views_are_read_only(self):
+        """测试导出视图不可写"""
+        buf = OHLCVRingBuffer(capacity=2)
+        buf.append(1, 1, 1, 1, 1, 1)
+        with pytest.raises(ValueError):
+            buf.close[0] = 5.0
+
+    def test_frame_roundtrip(self):
+        """测试DataFrame往返转换"""
+        df = _make_ohlcv(10)
+        buf = OHLCVRingBuffer.from_frame(df, capacity=8)
+
+        restored = buf.to_frame()
+        pd.testing.assert_frame_equal(restored, df.tail(8), check_freq=False)
+
+    def test_to_epoch_ms(self):
+        """测试时间戳转换"""
+        ts = pd.Timestamp("2024-01-01 00:00:01")
+        assert to_epoch_ms(ts) == 1704067201000
+        assert to_epoch_ms(ts.to_pydatetime()) == 1704067201000
+        assert to_epoch_ms(1704067201000) == 1704067201000
+
+    def test_invalid_capacity(self):
+        with pytest.raises(ValueError):
+            OHLCVRingBuffer(capacity=0)
+
+
+class TestMarketDataStore:
+    """测试按交易对的存储字典"""
+
+    def test_dataframe_access_is_on_demand(self):
+        store = MarketDataStore(capacity=5)
+        store.ensure("BTCUSDT").append(1, 1, 2, 0.5, 1.5, 10)
+
+        assert isinstance(store.buffer("BTCUSDT"), OHLCVRingBuffer)
+        frame = store["BTCUSDT"]
+        assert isinstance(frame, pd.DataFrame)
+        assert frame.iloc[0]["close"] == 1.5
+        assert store.get("ETHUSDT") is None
+
+    def test_assign_dataframe_loads_buffer(self):
+        store = MarketDataStore(capacity=2)
+        store["BTCUSDT"] = _make_ohlcv(5)
+
+        assert len(store.buffer("BTCUSDT")) == 2
+
+
+class TestSignalProcessorOnBuffer:
+    """测试信号处理器直接读取缓冲区与DataFrame路径一致"""
+
+    def test_signals_and_atr_match_dataframe_path(self):
+        df = _make_ohlcv(200, seed=42)
+        buf = OHLCVRingBuffer.from_frame(df, capacity=200)
+
+        from_frame = OptimizedSignalProcessor().get_trading_signals_optimized(df, 7, 25)
+        from_buffer = OptimizedSignalProcessor().get_trading_signals_optimized(buf, 7, 25)
+
+        for key in ("buy_signal", "sell_signal", "current_price", "fast_ma", "slow_ma"):
+            assert from_frame[key] == pytest.approx(from_buffer[key])
+        assert from_frame["last_timestamp"] == from_buffer["last_timestamp"]
+
+        processor = OptimizedSignalProcessor()
+        assert processor.compute_atr_optimized(buf) == pytest.approx(
+            processor.compute_atr_optimized(df)
+        )
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+列式行情存储测试
+Market Data Store Tests
+
+测试目标:
+- src/data/storage/market_store.py
+- CSVDataLoader.load_market_data / DataFetcher.save_data / ExchangeClient.sync_market_data
+  写入与读取行情存储
+"""
+
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.brokers.exchange.client import ExchangeClient
+from src.data import CSVDataLoader, ParquetMarketStore
+
+
+@pytest.fixture
+def klines():
+    index = pd.date_range("2024-01-30", periods=5 * 24 * 60, freq="min", name="timestamp")
+    close = 100 + np.arange(len(index), dtype=float)
+    return pd.DataFrame(
+        {"open": close - 0.5, "high": close + 1, "low": close - 1, "close": close, "volume": 1.0},
+        index=index,
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ParquetMarketStore(tmp_path / "store", partition="day")
+
+
+class TestParquetMarketStore:
+    """测试分区写入、裁剪读取与追加"""
+
+    def test_round_trip_by_partition(self, store, klines):
+        assert store.append("BTC/USDT", "1m", klines) == len(klines)
+
+        parts = store._list_parts("BTC/USDT", "1m")
+        assert [part[0] for part in parts] == [
+            "2024-01-30",
+            "2024-01-31",
+            "2024-02-01",
+            "2024-02-02",
+            "2024-02-03",
+        ]
+        pd.testing.assert_frame_equal(store.read("BTC/USDT", "1m"), klines, check_freq=False)
+        assert store.symbols() == ["BTC-USDT"]
+
+    def test_range_read_prunes_partitions_and_columns(self, store, klines):
+        store.append("BTC", "1m", klines)
+
+        start, end = "2024-02-01 12:00", "2024-02-02 03:00"
+        paths = store._select_parts(
+            "BTC", "1m", *(pd.Timestamp(t).value // 10**6 for t in (start, end))
+        )
+        result = store.read("BTC", "1m", start=start, end=end, columns=["close"])
+
+        assert [path.parent.name for path in paths] == ["date=2024-02-01", "date=2024-02-02"]
+        assert list(result.columns) == ["close"]
+        pd.testing.assert_series_equal(
+            result["close"], klines.loc[start:end, "close"], check_freq=False
+        )
+
+    def test_append_writes_new_parts_and_later_wins(self, store, klines):
+        store.append("BTC", "1m", klines.iloc[:3000])
+        first_parts = {
+            part[4]: part[4].stat().st_mtime_ns for part in store._list_parts("BTC", "1m")
+        }
+
+        overlap = klines.iloc[2990:].copy()
+        overlap.loc[overlap.index[0], "close"] = -1.0
+        store.append("BTC", "1m", overlap)
+
+        # 已有分片不被重写
+        for path, mtime in first_parts.items():
+            assert path.stat().st_mtime_ns == mtime
+
+        result = store.read("BTC", "1m")
+        assert len(result) == len(klines)
+        assert result["close"].iloc[2990] == -1.0
+        assert result.index.is_monotonic_increasing
+
+        assert store.compact("BTC", "1m") > 0
+        pd.testing.assert_frame_equal(store.read("BTC", "1m"), result)
+
+    def test_missing_series_and_bad_partition(self, store, tmp_path):
+        assert store.read("ETH", "1h").empty
+        assert store.time_range("ETH", "1h") is None
+        with pytest.raises(ValueError):
+            ParquetMarketStore(tmp_path, partition="week")
+
+
+class TestStoreTargets:
+    """测试加载器、数据获取工具与交易所客户端写入存储"""
+
+    def test_csv_loader_imports_once(self, store, klines, tmp_path):
+        csv_path = tmp_path / "btc.csv"
+        klines.rename_axis("date").to_csv(csv_path)
+        loader = CSVDataLoader(tmp_path, store=store)
+
+        first = loader.load_market_data("BTC", "1m", csv_path=csv_path)
+        with patch("pandas.read_csv", side_effect=AssertionError("CSV重复解析")):
+            second = loader.load_market_data(
+                "BTC", "1m", start="2024-02-01", csv_path=csv_path, columns=["close"]
+            )
+
+        assert len(first) == len(klines)
+        pd.testing.assert_series_equal(second["close"], first.loc["2024-02-01":, "close"])
+
+    def test_data_fetcher_saves_to_store(self, klines, tmp_path):
+        from scripts.tools.data_fetcher import DataFetcher
+
+        root = tmp_path / "fetched"
+        DataFetcher().save_data(klines, str(root), format="store", symbol="BTC", interval="1m")
+
+        assert len(ParquetMarketStore(root).read("BTC", "1m")) == len(klines)
+        with pytest.raises(ValueError):
+            DataFetcher().save_data(klines, str(root), format="store")
+
+    def test_sync_market_data_fetches_only_new_klines(self, store):
+        client = ExchangeClient("key", "secret", demo_mode=True)
+        now_ms = 1_700_000_000_000
+        day = 24 * 60 * 60 * 1000
+        history = [[now_ms - k * day, 1, 2, 0.5, 1.5, 10] for k in range(5, 0, -1)]
+        store.append("BTC/USDT", "1d", client._klines_to_frame(history[:3]))
+
+        with (
+            patch("src.brokers.exchange.client.time.time", return_value=now_ms / 1000),
+            patch.object(client, "get_historical_klines", return_value=history[3:]) as fetch,
+        ):
+            result = client.sync_market_data("BTC/USDT", "1d", days=30, store=store)
+
+        assert fetch.call_args.kwargs["start_time"] == history[2][0]
+        assert len(result) == 5
+        assert result.index.name == "timestamp"
+
+    def test_sync_market_data_backfills_older_window(self, store):
+        client = ExchangeClient("key", "secret", demo_mode=True)
+        now_ms = 1_700_000_000_000
+        day = 24 * 60 * 60 * 1000
+        start_ms = now_ms - 30 * day
+        history = [[now_ms - k * day, 1, 2, 0.5, 1.5, 10] for k in range(30, 0, -1)]
+        # 存储只覆盖最近10天中的前5天
+        store.append("BTC/USDT", "1d", client._klines_to_frame(history[20:25]))
+        first_stored = history[20][0]
+
+        def fake_fetch(symbol, interval, start_time, end_time):
+            return [k for k in history if start_time <= k[0] <= end_time]
+
+        with (
+            patch("src.brokers.exchange.client.time.time", return_value=now_ms / 1000),
+            patch.object(client, "get_historical_klines", side_effect=fake_fetch) as fetch,
+        ):
+            result = client.sync_market_data("BTC/USDT", "1d", days=30, store=store)
+
+        ranges = [(c.kwargs["start_time"], c.kwargs["end_time"]) for c in fetch.call_args_list]
+        assert ranges == [(start_ms, first_stored - 1), (history[24][0], now_ms)]
+        assert len(result) == 30
+        assert store.time_range("BTC/USDT", "1d")[0] == pd.Timestamp(start_ms, unit="ms")
+
+    def test_sync_market_data_refreshes_forming_bar(self, store):
+        client = ExchangeClient("key", "secret", demo_mode=True)
+        day = 24 * 60 * 60 * 1000
+        open_ms = 1_700_000_000_000 - 1_700_000_000_000 % day
+        closed = [open_ms - day, 1, 2, 0.5, 1.5, 10]
+        forming = [open_ms, 1.5, 1.6, 1.4, 1.55, 3]
+        final = [open_ms, 1.5, 2.5, 1.2, 2.2, 40]
+
+        def sync(now_ms, klines):
+            def fake_fetch(symbol, interval, start_time, end_time):
+                return [k for k in klines if start_time <= k[0] <= end_time]
+
+            with (
+                patch("src.brokers.exchange.client.time.time", return_value=now_ms / 1000),
+                patch.object(client, "get_historical_klines", side_effect=fake_fetch),
+            ):
+                return client.sync_market_data("BTC/USDT", "1d", days=5, store=store)
+
+        # 第一次同步时当日K线尚未收盘，第二次同步时已收盘
+        sync(open_ms + day // 2, [closed, forming])
+        result = sync(open_ms + day + 1000, [closed, final])
+
+        assert len(result) == 2
+        assert result.iloc[-1][["open", "high", "low", "close", "volume"]].tolist() == final[1:]
+        stored = store.read("BTC/USDT", "1d")
+        assert stored.loc[pd.Timestamp(open_ms, unit="ms"), "volume"] == 40
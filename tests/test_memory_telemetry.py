@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+采样式内存遥测测试
+Sampling Memory Telemetry Tests
+
+测试目标:
+- src/monitoring/memory_telemetry.py
+- TradingMetricsCollector.update_gc_tracked_objects 不再遍历堆
+"""
+
+import tracemalloc
+from unittest.mock import patch
+
+from prometheus_client import REGISTRY
+
+from src.monitoring.memory_telemetry import MemoryTelemetry
+from src.monitoring.metrics_collector import TradingMetricsCollector
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestMemoryTelemetry:
+    """测试GC采样、GC事件累计与tracemalloc窗口"""
+
+    def test_sample_reads_gc_counters_only(self):
+        telemetry = MemoryTelemetry()
+        with patch("gc.get_objects", side_effect=AssertionError("不应遍历堆")):
+            sample = telemetry.sample()
+
+        assert len(sample["gc_counts"]) == 3
+        assert "pending_objects" not in sample
+        assert {"collections", "collected", "uncollectable"} <= set(sample["gc_stats"][2])
+        assert sample["traced_bytes"] is None
+        assert telemetry.get_report()["last_sample_us"] > 0
+
+    def test_tracemalloc_window_records_hotspots(self):
+        clock = FakeClock()
+        telemetry = MemoryTelemetry(tracemalloc_interval=10, tracemalloc_window=1, clock=clock)
+        assert not tracemalloc.is_tracing()
+
+        clock.now = 5
+        assert telemetry.sample()["tracing"] is False
+        clock.now = 10
+        assert telemetry.sample()["tracing"] is True
+
+        retained = [bytearray(1024) for _ in range(2000)]
+        clock.now = 12
+        sample = telemetry.sample()
+
+        assert not tracemalloc.is_tracing()
+        assert sample["tracing"] is False
+        assert sample["traced_bytes"] >= 2000 * 1024
+        assert sample["allocation_rate"] >= 1000 * 1024
+        assert __file__ in telemetry.top_allocations[0]["location"]
+        assert telemetry.snapshot_count == 1
+        del retained
+
+    def test_gc_optimizer_callbacks_feed_telemetry(self):
+        from src.core.gc_optimizer import GCOptimizer
+
+        optimizer = GCOptimizer()
+        optimizer.metrics = TradingMetricsCollector()
+        optimizer._gc_callback("start", {"generation": 1})
+        optimizer._gc_callback("stop", {"generation": 1, "collected": 42})
+
+        events = optimizer.metrics.memory_telemetry.gc_events[1]
+        assert events["collections"] == 1
+        assert events["collected"] == 42
+
+
+class TestCollectorGCSampling:
+    """测试 update_gc_tracked_objects 指标输出"""
+
+    def test_update_gc_tracked_objects_sets_gauges(self):
+        collector = TradingMetricsCollector()
+        with patch("gc.get_objects", side_effect=AssertionError("不应遍历堆")):
+            sample = collector.update_gc_tracked_objects()
+
+        # 不同单位的各代计数不再相加发布
+        assert not hasattr(collector, "gc_tracked_objects")
+        assert REGISTRY.get_sample_value("gc_tracked_objects") is None
+        assert (
+            REGISTRY.get_sample_value("gc_generation_count", {"generation": "0"})
+            == sample["gc_counts"][0]
+        )
+        assert REGISTRY.get_sample_value("gc_uncollectable_objects", {"generation": "2"}) == 0
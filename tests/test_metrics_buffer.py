@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+热路径指标缓冲测试
+Hot-path Metrics Buffer Tests
+
+测试目标:
+- src/monitoring/metrics_buffer.py
+- TradingMetricsCollector 缓冲模式与标签子项缓存
+"""
+
+import threading
+import time
+from unittest.mock import Mock
+
+from prometheus_client import REGISTRY
+
+from src.monitoring.metrics_buffer import MetricsBuffer
+from src.monitoring.metrics_collector import MetricsConfig, TradingMetricsCollector
+
+
+class TestMetricsBuffer:
+    """测试聚合与并发写入"""
+
+    def test_flush_aggregates_updates(self):
+        buffer = MetricsBuffer()
+        counter, gauge, histogram = Mock(), Mock(), Mock()
+
+        for _ in range(3):
+            buffer.inc(counter)
+        buffer.set(gauge, 1)
+        buffer.set(gauge, 5)
+        buffer.observe(histogram, 0.1)
+        buffer.observe(histogram, 0.2)
+
+        counter.inc.assert_not_called()
+        assert buffer.flush() == 7
+        counter.inc.assert_called_once_with(3)
+        gauge.set.assert_called_once_with(5)
+        assert [c.args for c in histogram.observe.call_args_list] == [(0.1,), (0.2,)]
+        assert buffer.get_stats() == {"pending": 0, "flush_count": 1, "flushed_entries": 7}
+
+    def test_background_flush_with_writer_threads(self):
+        buffer = MetricsBuffer(flush_interval=0.01)
+        counter = Mock()
+        buffer.start()
+
+        def writer():
+            for _ in range(5000):
+                buffer.inc(counter)
+
+        threads = [threading.Thread(target=writer) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        deadline = time.monotonic() + 5
+        while buffer.pending() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        flushed_in_background = buffer.flush_count
+        buffer.stop()
+
+        assert flushed_in_background >= 1
+        assert sum(c.args[0] for c in counter.inc.call_args_list) == 20_000
+        assert len(buffer._buffers) == 4
+
+
+class TestCollectorBuffering:
+    """测试 TradingMetricsCollector 缓冲模式"""
+
+    def test_hot_path_updates_applied_on_flush(self):
+        collector = TradingMetricsCollector(MetricsConfig(buffer_flush_ms=60_000))
+        try:
+            for _ in range(10):
+                collector.record_ws_message("BTCUSDT", "kline")
+                collector.record_price_update("BTCUSDT", 100.0)
+                collector.observe_ws_latency(0.002)
+            collector.update_concurrent_tasks("market_data", 1)
+            collector.update_concurrent_tasks("market_data", 3)
+
+            labels = {"symbol": "BTCUSDT", "type": "kline"}
+            assert not REGISTRY.get_sample_value("ws_messages_total", labels)
+            assert collector.flush_metrics() == 32
+        finally:
+            collector.disable_buffering()
+
+        assert REGISTRY.get_sample_value("ws_messages_total", labels) == 10
+        assert (
+            REGISTRY.get_sample_value("price_updates_total", {"symbol": "BTCUSDT", "source": "ws"})
+            == 10
+        )
+        assert REGISTRY.get_sample_value("binance_ws_latency_seconds_count") == 10
+        assert (
+            REGISTRY.get_sample_value("concurrent_tasks_count", {"task_type": "market_data"}) == 3
+        )
+
+    def test_unbuffered_mode_caches_label_children(self):
+        collector = TradingMetricsCollector()
+        assert collector.metrics_buffer is None
+
+        collector.record_ws_message("ETHUSDT", "kline")
+        child = collector._label_children[(collector.ws_messages_total, ("ETHUSDT", "kline"))]
+        collector.record_ws_message("ETHUSDT", "kline")
+
+        assert child._value.get() == 2
+        assert len(collector._label_children) == 1
+
+    def test_disable_buffering_flushes_remaining(self):
+        collector = TradingMetricsCollector(MetricsConfig(buffer_flush_ms=60_000))
+        collector.record_price_update("XRPUSDT", 0.5, source="api")
+        time.sleep(0.01)
+        collector.disable_buffering()
+
+        labels = {"symbol": "XRPUSDT", "source": "api"}
+        assert REGISTRY.get_sample_value("price_updates_total", labels) == 1
+        assert collector.metrics_buffer is None
@@ -118,6 +118,22 @@ class TestTradingMetricsCollector:
         except Exception as e:
             pytest.fail(f"API调用记录失败: {e}")
 
+    def test_update_signal_cache_stats_publishes_deltas(self, collector):
+        """测试信号缓存统计按增量累加"""
+        collector.update_signal_cache_stats("vectorized", {"hits": 3, "misses": 2, "size": 2})
+        collector.update_signal_cache_stats(
+            "vectorized", {"hits": 5, "misses": 2, "evictions": 1, "size": 2}
+        )
+
+        def value(event):
+            return collector.signal_cache_events.labels(
+                cache="vectorized", event=event
+            )._value.get()
+
+        assert value("hit") == 5
+        assert value("miss") == 2
+        assert value("eviction") == 1
+
 
 class TestContextManagers:
     """上下文管理器测试类"""
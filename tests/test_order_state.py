@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+事件驱动订单跟踪测试（本地aiohttp服务器替身）
+Event-driven Order Tracking Tests
+
+测试目标:
+- src/brokers/order_state.py
+- src/ws/user_data_stream.py
+- LiveBrokerAsync 通过用户数据流跟踪订单，无事件时回退轮询
+"""
+
+import asyncio
+import json
+from unittest.mock import Mock
+
+import pytest
+from aiohttp import WSMsgType, web
+
+from src.brokers.order_state import OrderStateManager
+
+TRANSACT_MS = 1_700_000_000_000
+
+
+def _report(order_id, status, transact_ms, client_id="c1"):
+    return {"e": "executionReport", "i": order_id, "c": client_id, "X": status, "T": transact_ms}
+
+
+class FakeBinanceAccount:
+    """REST + 用户数据流服务器替身：下单回报NEW，随后（可选）推送成交事件"""
+
+    def __init__(self, push_events=True, fill_after_ms=15):
+        self.push_events = push_events
+        self.fill_after_ms = fill_after_ms
+        self.sockets = []
+        self.listen_keys = []
+        self.order_queries = 0
+        self.next_id = 0
+
+    async def create_listen_key(self, request):
+        self.listen_keys.append(f"lk{len(self.listen_keys) + 1}")
+        return web.json_response({"listenKey": self.listen_keys[-1]})
+
+    async def listen_key_ok(self, request):
+        return web.json_response({})
+
+    async def user_stream(self, request):
+        assert request.match_info["key"] == self.listen_keys[-1]
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.sockets.append(ws)
+        async for msg in ws:
+            if msg.type == WSMsgType.CLOSE:
+                break
+        return ws
+
+    async def new_order(self, request):
+        self.next_id += 1
+        order_id = self.next_id
+        if self.push_events:
+            asyncio.get_running_loop().call_later(0.02, self._push_fill, order_id)
+        return web.json_response(
+            {
+                "orderId": order_id,
+                "clientOrderId": f"c{order_id}",
+                "status": "NEW",
+                "transactTime": TRANSACT_MS,
+            }
+        )
+
+    def _push_fill(self, order_id):
+        event = _report(order_id, "FILLED", TRANSACT_MS + self.fill_after_ms, f"c{order_id}")
+        for ws in self.sockets:
+            asyncio.ensure_future(ws.send_str(json.dumps(event)))
+
+    async def query_order(self, request):
+        self.order_queries += 1
+        return web.json_response({"status": "FILLED", "updateTime": TRANSACT_MS + 500})
+
+    def routes(self):
+        return [
+            ("POST", "/api/v3/userDataStream", self.create_listen_key),
+            ("PUT", "/api/v3/userDataStream", self.listen_key_ok),
+            ("DELETE", "/api/v3/userDataStream", self.listen_key_ok),
+            ("GET", "/ws/{key}", self.user_stream),
+            ("POST", "/api/v3/order", self.new_order),
+            ("GET", "/api/v3/order", self.query_order),
+        ]
+
+
+async def _wait_for(predicate, timeout=5.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not predicate():
+        if loop.time() > deadline:
+            raise AssertionError("等待条件超时")
+        await asyncio.sleep(0.01)
+
+
+class TestOrderStateManager:
+    """测试事件应用与延迟计算"""
+
+    def _order(self, order_id=1, status="NEW"):
+        return {
+            "order_id": order_id,
+            "client_order_id": "c1",
+            "symbol": "BTCUSDT",
+            "status": status,
+            "submit_time": 0.0,
+            "ack_latency": 0.01,
+            "response": {"transactTime": TRANSACT_MS},
+        }
+
+    @pytest.mark.asyncio
+    async def test_latency_from_exchange_timestamps(self):
+        metrics = Mock()
+        manager = OrderStateManager(Mock(), metrics, clock=lambda: 100.0)
+
+        manager.track(self._order())
+        manager.on_event(_report(1, "PARTIALLY_FILLED", TRANSACT_MS + 5) | {"z": "0.5"})
+        assert manager.pending[1]["filled_quantity"] == 0.5
+
+        manager.on_event(_report(1, "FILLED", TRANSACT_MS + 40))
+        await manager.close()
+
+        assert not manager.pending
+        assert manager.history[0]["roundtrip_latency"] == pytest.approx(0.05)
+        metrics.observe_order_roundtrip_latency.assert_called_once_with(pytest.approx(0.05))
+
+    @pytest.mark.asyncio
+    async def test_event_before_ack_is_applied_on_track(self):
+        manager = OrderStateManager(Mock(), Mock())
+
+        # 用户数据流事件先于下单回报到达
+        manager.on_event(_report(7, "FILLED", TRANSACT_MS + 3))
+        manager.track(self._order(order_id=7))
+
+        assert manager.history[0]["status"] == "FILLED"
+        assert manager.get_stats() == {"pending": 0, "completed": 1, "events": 1, "polls": 0}
+
+
+class TestLiveBrokerOrderTracking:
+    """测试异步代理的订单跟踪（本地服务器）"""
+
+    @pytest.mark.asyncio
+    async def test_fills_arrive_via_user_stream(self, fake_binance_server, async_broker):
+        account = FakeBinanceAccount()
+        async with (
+            fake_binance_server(account.routes()) as server,
+            async_broker(server, user_stream=True) as broker,
+        ):
+            await _wait_for(lambda: broker.user_stream.connected)
+            orders = await asyncio.gather(
+                *(broker.place_order_async("BTCUSDT", "BUY", "MARKET", 0.001) for _ in range(20))
+            )
+            await _wait_for(lambda: not broker.pending_orders)
+            stats = broker.get_performance_stats()
+
+        assert account.order_queries == 0
+        assert stats["completed_orders"] == 20
+        for order in orders:
+            assert order["status"] == "FILLED"
+            assert order["roundtrip_latency"] == pytest.approx(order["ack_latency"] + 0.015)
+        assert account.listen_keys == ["lk1"]
+
+    @pytest.mark.asyncio
+    async def test_polling_fallback_without_events(self, fake_binance_server, async_broker):
+        account = FakeBinanceAccount(push_events=False)
+        async with (
+            fake_binance_server(account.routes()) as server,
+            async_broker(server, user_stream=True, order_event_timeout=0.1) as broker,
+        ):
+            broker.order_manager.poll_interval = 0.05
+            order = await broker.place_order_async("BTCUSDT", "BUY", "MARKET", 0.001)
+            await _wait_for(lambda: not broker.pending_orders)
+
+        assert account.order_queries == 1
+        assert order["status"] == "FILLED"
+        assert order["roundtrip_latency"] == pytest.approx(order["ack_latency"] + 0.5)
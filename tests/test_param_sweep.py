@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+并行参数扫描测试
+Parallel Parameter Sweep Tests
+
+测试目标:
+- src/strategies/param_sweep.py
+- 扫描结果与 backtest_single / backtest_portfolio 一致
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.metrics import max_drawdown, sharpe_ratio
+from src.strategies.backtest import backtest_portfolio, backtest_single
+from src.strategies.param_sweep import (
+    ParameterSweep,
+    SharedPriceBlock,
+    SweepResultWriter,
+    grid_search_space,
+    load_sweep_results,
+    random_search_space,
+)
+
+
+def _random_walk(seed: int, n: int = 800, start: str = "2022-01-01") -> pd.Series:
+    rng = np.random.default_rng(seed)
+    prices = 100 + np.cumsum(rng.normal(0, 1, n))
+    return pd.Series(prices, index=pd.date_range(start, periods=n, freq="D"))
+
+
+SPACE = {"fast_win": [3, 5, 30], "slow_win": [10, 20], "atr_win": [10, 14], "trail_r": [1.5, 2.0]}
+
+
+class TestSearchSpace:
+    """测试参数组合生成"""
+
+    def test_grid_skips_invalid_windows_and_fills_defaults(self):
+        combos = grid_search_space(SPACE)
+
+        assert len(combos) == 2 * 2 * 2 * 2
+        assert all(c["fast_win"] < c["slow_win"] for c in combos)
+        assert all(c["risk_frac"] == 0.02 and c["breakeven_r"] == 1.0 for c in combos)
+
+    def test_random_is_unique_and_reproducible(self):
+        first = random_search_space(SPACE, n_samples=10, seed=1)
+
+        assert len(first) == 10
+        assert len({tuple(sorted(c.items())) for c in first}) == 10
+        assert first == random_search_space(SPACE, n_samples=10, seed=1)
+
+    def test_unknown_parameter(self):
+        with pytest.raises(ValueError):
+            grid_search_space({"fast": [3]})
+
+
+class TestParameterSweep:
+    """测试扫描结果"""
+
+    def test_single_matches_backtest_single(self, tmp_path):
+        price = _random_walk(0)
+        sweep = ParameterSweep(
+            price, str(tmp_path / "results"), max_workers=0, chunk_size=3, flush_rows=3
+        )
+        summary = sweep.grid(SPACE)
+
+        results = load_sweep_results(summary["output_path"])
+        assert summary["completed"] == len(results) == 16
+        assert summary["parts"] == 6
+
+        for row in results.sample(4, random_state=0).to_dict("records"):
+            equity = backtest_single(
+                price,
+                fast_win=row["fast_win"],
+                slow_win=row["slow_win"],
+                atr_win=row["atr_win"],
+                trail_r=row["trail_r"],
+            )
+            assert row["final_equity"] == pytest.approx(equity.iloc[-1], abs=0.005)
+            assert row["sharpe"] == pytest.approx(sharpe_ratio(equity))
+            assert row["max_drawdown"] == pytest.approx(max_drawdown(equity))
+
+        assert summary["best"]["sharpe"] == pytest.approx(results["sharpe"].max())
+
+    def test_process_pool_matches_serial(self, tmp_path):
+        price = _random_walk(1)
+        combos = random_search_space(SPACE, n_samples=8, seed=3)
+
+        serial = ParameterSweep(price, str(tmp_path / "serial"), max_workers=0).run(combos)
+        pooled = ParameterSweep(price, str(tmp_path / "pool"), max_workers=2, chunk_size=3).run(
+            combos
+        )
+
+        keys = list(SPACE)
+        expected = load_sweep_results(serial["output_path"]).sort_values(keys)
+        actual = load_sweep_results(pooled["output_path"]).sort_values(keys)
+        pd.testing.assert_frame_equal(
+            expected.reset_index(drop=True), actual.reset_index(drop=True)
+        )
+
+    def test_portfolio_matches_backtest_portfolio(self, tmp_path):
+        # 两个资产的索引部分重叠，需按并集对齐
+        prices = {"btc": _random_walk(2), "eth": _random_walk(3, n=700, start="2022-02-01")}
+        params = {"fast_win": 5, "slow_win": 20, "atr_win": 14}
+
+        sweep = ParameterSweep(
+            prices, str(tmp_path / "portfolio"), max_workers=0, portfolio_kwargs={"lookback": 10}
+        )
+        row = load_sweep_results(sweep.run([params])["output_path"]).iloc[0]
+
+        composite = backtest_portfolio(prices, lookback=10, **params)["composite_equity"]
+        assert row["final_equity"] == pytest.approx(composite.iloc[-1], abs=0.005)
+        assert row["max_drawdown"] == pytest.approx(max_drawdown(composite))
+
+
+class TestSweepResultWriter:
+    """测试结果目录处理"""
+
+    def test_reuse_replaces_only_old_parts(self, tmp_path):
+        out = tmp_path / "results"
+        writer = SweepResultWriter(str(out), flush_rows=1)
+        writer.add([{"sharpe": 1.0}, {"sharpe": 2.0}])
+        writer.close()
+        assert len(load_sweep_results(str(out))) == 2
+
+        writer = SweepResultWriter(str(out))
+        writer.add([{"sharpe": 3.0}])
+        writer.close()
+        assert load_sweep_results(str(out))["sharpe"].tolist() == [3.0]
+
+    def test_refuses_directory_with_other_files(self, tmp_path):
+        (tmp_path / "prices.csv").write_text("keep")
+        (tmp_path / "part-00000.parquet").write_text("stale")
+
+        with pytest.raises(FileExistsError):
+            SweepResultWriter(str(tmp_path))
+        assert (tmp_path / "part-00000.parquet").exists()
+
+        SweepResultWriter(str(tmp_path), overwrite=True)
+        assert (tmp_path / "prices.csv").read_text() == "keep"
+        assert not (tmp_path / "part-00000.parquet").exists()
+
+
+class TestSharedPriceBlock:
+    """测试共享内存布局"""
+
+    def test_attach_round_trip(self):
+        prices = {"a": _random_walk(4, n=10), "b": _random_walk(5, n=5, start="2022-01-04")}
+        block = SharedPriceBlock(prices)
+        try:
+            shm, values, positions = SharedPriceBlock.attach(block.layout)
+            np.testing.assert_array_equal(values[1], prices["b"].to_numpy())
+            assert positions[1].tolist() == [3, 4, 5, 6, 7]
+            assert block.layout["n_rows"] == 10
+            del values, positions
+            shm.close()
+        finally:
+            block.close()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+投资组合回测测试
+Portfolio Backtest Tests
+
+测试目标:
+- src/strategies/backtest.py 的 backtest_portfolio
+- 并行回测各资产与串行结果一致，默认串行，进程池失败时回退串行
+- 对齐价格矩阵输入与字典输入一致
+- 矩阵化再平衡与逐行加权求和一致
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.strategies.backtest import _apply_dynamic_rebalancing, backtest_portfolio
+
+
+def _price_matrix(symbols: int = 6, n: int = 800, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2023-01-01", periods=n, freq="h")
+    prices = 100 + np.cumsum(rng.normal(0, 1, (n, symbols)), axis=0)
+    matrix = pd.DataFrame(prices, index=index, columns=[f"A{i}" for i in range(symbols)])
+    # 后上市的资产前段为NaN
+    matrix.iloc[:150, 1] = np.nan
+    return matrix
+
+
+def _rebalance_loop(equity_df, weights_df, lookback):
+    composite = []
+    for i in range(len(equity_df)):
+        if i < lookback:
+            weights = pd.Series(1.0 / len(equity_df.columns), index=equity_df.columns)
+        else:
+            weights = weights_df.iloc[i]
+        composite.append((equity_df.iloc[i] * weights).sum())
+    return pd.Series(composite, index=equity_df.index)
+
+
+class TestPortfolioBacktest:
+    """测试投资组合回测"""
+
+    def test_matrix_input_matches_dict(self):
+        matrix = _price_matrix()
+        legs = {symbol: matrix[symbol].dropna() for symbol in matrix.columns}
+
+        from_matrix = backtest_portfolio(matrix, lookback=10, max_workers=0)
+        from_dict = backtest_portfolio(legs, lookback=10, max_workers=0)
+
+        pd.testing.assert_series_equal(
+            from_matrix["composite_equity"], from_dict["composite_equity"]
+        )
+        pd.testing.assert_frame_equal(
+            from_matrix["individual_equity"], from_dict["individual_equity"]
+        )
+
+    @pytest.mark.timeout(300)
+    def test_parallel_legs_match_serial(self):
+        matrix = _price_matrix(symbols=5)
+
+        serial = backtest_portfolio(matrix, max_workers=0)
+        parallel = backtest_portfolio(matrix, max_workers=2)
+
+        assert list(parallel["individual_equity"].columns) == list(matrix.columns)
+        pd.testing.assert_frame_equal(parallel["individual_equity"], serial["individual_equity"])
+        pd.testing.assert_series_equal(parallel["composite_equity"], serial["composite_equity"])
+
+    def test_default_is_serial(self):
+        matrix = _price_matrix(symbols=10, n=200)
+
+        def no_pool(*args, **kwargs):
+            pytest.fail("默认不应启动进程池")
+
+        result = backtest_portfolio(matrix, executor_factory=no_pool)
+
+        assert list(result["individual_equity"].columns) == list(matrix.columns)
+
+    def test_broken_pool_falls_back_to_serial(self):
+        matrix = _price_matrix(symbols=4, n=200)
+        serial = backtest_portfolio(matrix)
+
+        def broken_pool(*args, **kwargs):
+            raise BrokenProcessPool("worker died")
+
+        fallback = backtest_portfolio(matrix, max_workers=2, executor_factory=broken_pool)
+
+        pd.testing.assert_frame_equal(fallback["individual_equity"], serial["individual_equity"])
+        pd.testing.assert_series_equal(fallback["composite_equity"], serial["composite_equity"])
+
+    def test_custom_executor_factory(self):
+        matrix = _price_matrix(symbols=4, n=200)
+        serial = backtest_portfolio(matrix)
+
+        parallel = backtest_portfolio(matrix, max_workers=2, executor_factory=ThreadPoolExecutor)
+
+        pd.testing.assert_frame_equal(parallel["individual_equity"], serial["individual_equity"])
+
+
+class TestRebalancing:
+    """测试矩阵化再平衡"""
+
+    def test_matches_row_loop(self):
+        rng = np.random.default_rng(1)
+        index = pd.date_range("2024-01-01", periods=200, freq="D")
+        equity = pd.DataFrame(rng.uniform(90, 110, (200, 4)), index=index, columns=list("abcd"))
+        weights = pd.DataFrame(rng.dirichlet(np.ones(4), 200), index=index, columns=list("abcd"))
+
+        result = _apply_dynamic_rebalancing(equity, weights, lookback=20)
+
+        np.testing.assert_allclose(
+            result.values, _rebalance_loop(equity, weights, 20).values, rtol=1e-12
+        )
+        assert result.iloc[0] == pytest.approx(equity.iloc[0].mean())
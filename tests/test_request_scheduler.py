@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+异步请求调度测试（本地aiohttp服务器替身）
+Async Request Scheduler Tests
+
+测试目标:
+- src/brokers/request_scheduler.py
+- LiveBrokerAsync 经调度器发送请求：GET合并、签名请求并发上限、限额响应头
+"""
+
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from src.brokers.request_scheduler import (
+    RequestScheduler,
+    parse_limit_headers,
+    request_weight,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeBinanceREST:
+    """REST服务器替身：记录请求次数与签名请求最大并发数"""
+
+    def __init__(self, used_weight=10, delay=0.05):
+        self.used_weight = used_weight
+        self.delay = delay
+        self.hits = {}
+        self.inflight = 0
+        self.max_inflight = 0
+        self.rate_limit_next = False
+
+    def _headers(self):
+        return {"X-MBX-USED-WEIGHT-1M": str(self.used_weight), "X-MBX-ORDER-COUNT-10S": "1"}
+
+    async def _track(self, request):
+        path = request.path
+        self.hits[path] = self.hits.get(path, 0) + 1
+        seq = self.hits[path]
+        self.inflight += 1
+        self.max_inflight = max(self.max_inflight, self.inflight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.inflight -= 1
+        return seq
+
+    async def account(self, request):
+        await self._track(request)
+        if self.rate_limit_next:
+            self.rate_limit_next = False
+            return web.Response(status=429, text="Too many requests", headers={"Retry-After": "7"})
+        assert "signature" in request.query
+        return web.json_response({"balances": []}, headers=self._headers())
+
+    async def new_order(self, request):
+        seq = await self._track(request)
+        form = await request.post()
+        return web.json_response(
+            {
+                "orderId": f"o{seq}",
+                "status": "FILLED",
+                "symbol": form["symbol"],
+            },
+            headers=self._headers(),
+        )
+
+    async def query_order(self, request):
+        return web.json_response({"status": "FILLED"}, headers=self._headers())
+
+    def routes(self):
+        return [
+            ("GET", "/api/v3/account", self.account),
+            ("POST", "/api/v3/order", self.new_order),
+            ("GET", "/api/v3/order", self.query_order),
+        ]
+
+
+class TestRequestScheduler:
+    """测试限额计算与令牌桶"""
+
+    def test_request_weight(self):
+        assert request_weight("GET", "/api/v3/account", {}) == (20, 0)
+        assert request_weight("GET", "/api/v3/openOrders", {}) == (80, 0)
+        assert request_weight("GET", "/api/v3/openOrders", {"symbol": "BTCUSDT"}) == (6, 0)
+        assert request_weight("POST", "/api/v3/order", {}) == (1, 1)
+
+    def test_parse_limit_headers(self):
+        headers = {
+            "X-MBX-USED-WEIGHT-1M": "120",
+            "x-mbx-order-count-10s": "3",
+            "X-MBX-USED-WEIGHT": "5",
+            "Content-Type": "application/json",
+        }
+        assert dict(parse_limit_headers(headers)) == {("weight", 60): 5, ("orders", 10): 3}
+
+    def test_headers_tighten_budget(self):
+        clock = FakeClock()
+        scheduler = RequestScheduler({("weight", 60): 1200}, clock=clock)
+
+        assert scheduler.delay(20) == 0
+        scheduler.update_from_headers({"X-MBX-USED-WEIGHT-1M": "1190"})
+        # 剩余10，需等待10个令牌（每秒恢复20）
+        assert scheduler.delay(20) == pytest.approx(0.5)
+
+        clock.now = 0.5
+        assert scheduler.delay(20) == 0
+
+    def test_retry_after_pauses_all_requests(self):
+        clock = FakeClock()
+        scheduler = RequestScheduler(clock=clock)
+
+        scheduler.update_from_headers({"Retry-After": "30"}, status=429)
+
+        assert scheduler.delay(1) == pytest.approx(30)
+        assert scheduler.get_stats()["rate_limited"] == 1
+
+    @pytest.mark.asyncio
+    async def test_acquire_waits_for_order_budget(self):
+        scheduler = RequestScheduler({("orders", 1): 50})
+
+        for _ in range(50):
+            await scheduler.acquire(weight=1, orders=1)
+        await scheduler.acquire(weight=1, orders=1)
+
+        stats = scheduler.get_stats()
+        assert stats["throttled"] == 1
+        assert stats["throttle_seconds"] == pytest.approx(0.02, abs=0.005)
+
+
+class TestLiveBrokerScheduling:
+    """测试异步代理经调度器发送请求（本地服务器）"""
+
+    @pytest.mark.asyncio
+    async def test_identical_gets_are_coalesced(self, fake_binance_server, async_broker):
+        rest = FakeBinanceREST()
+        async with fake_binance_server(rest.routes()) as server, async_broker(server) as broker:
+            results = await asyncio.gather(*(broker.get_account_info_async() for _ in range(5)))
+            stats = broker.scheduler.get_stats()
+
+        assert rest.hits["/api/v3/account"] == 1
+        assert all(result == {"balances": []} for result in results)
+        assert stats["coalesced"] == 4
+        assert stats["inflight_gets"] == 0
+        assert stats["weight_60s_available"] < 6000 - 10
+
+    @pytest.mark.asyncio
+    async def test_signed_requests_are_bounded(self, fake_binance_server, async_broker):
+        rest = FakeBinanceREST()
+        async with (
+            fake_binance_server(rest.routes()) as server,
+            async_broker(server, max_signed_inflight=2) as broker,
+        ):
+            orders = await asyncio.gather(
+                *(broker.place_order_async("BTCUSDT", "BUY", "MARKET", 0.001) for _ in range(6))
+            )
+            await asyncio.sleep(0.05)
+
+        assert rest.hits["/api/v3/order"] == 6
+        assert rest.max_inflight == 2
+        assert len({order["order_id"] for order in orders}) == 6
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_response_pauses_scheduler(self, fake_binance_server, async_broker):
+        rest = FakeBinanceREST()
+        async with fake_binance_server(rest.routes()) as server, async_broker(server) as broker:
+            rest.rate_limit_next = True
+            with pytest.raises(Exception, match="429"):
+                await broker.get_account_info_async()
+            delay = broker.scheduler.delay(1)
+
+        assert delay == pytest.approx(7, abs=0.5)
@@ -385,6 +385,39 @@ class TestSignalCache:
         not_found = self.cache.get(data, 7, 10)
         assert not_found is None
 
+    def test_lru_eviction_and_stats(self):
+        """测试满容量时淘汰最久未使用的条目"""
+        frames = [
+            pd.DataFrame(
+                {"close": [100.0 + i, 101.0 + i], "high": [102.0, 103.0], "low": [99.0, 98.0]}
+            )
+            for i in range(4)
+        ]
+        for i, frame in enumerate(frames[:3]):
+            self.cache.set(frame, 5, 10, {"id": i})
+
+        # 访问第一个条目，使第二个成为最久未使用
+        assert self.cache.get(frames[0], 5, 10) == {"id": 0}
+        self.cache.set(frames[3], 5, 10, {"id": 3})
+
+        assert self.cache.get(frames[1], 5, 10) is None
+        assert self.cache.get(frames[0], 5, 10) == {"id": 0}
+        assert len(self.cache.cache) == 3
+        assert self.cache.evictions == 1
+        assert self.cache.hits == 2
+        assert self.cache.misses == 1
+
+    def test_key_uses_tail_bytes(self):
+        """测试尾部数据变化会产生不同的键"""
+        data = pd.DataFrame(
+            {"close": [100.0, 101.0, 102.0], "high": [103.0] * 3, "low": [99.0] * 3}
+        )
+        revised = data.copy()
+        revised.iloc[-1, 0] = 102.5
+
+        assert self.cache._generate_key(data, 5, 10) == self.cache._generate_key(data.copy(), 5, 10)
+        assert self.cache._generate_key(data, 5, 10) != self.cache._generate_key(revised, 5, 10)
+
 
 class TestSignalProcessorIntegration:
     """信号处理器集成测试类"""
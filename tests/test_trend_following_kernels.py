@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+趋势跟踪数组内核测试
+Trend Following Array Kernel Tests
+
+测试目标:
+- src/strategies/trend_following.py 中的 supertrend_final_bands / supertrend_direction /
+  variable_window_mean
+- SupertrendStrategy / AdaptiveMovingAverageStrategy 输出与逐行实现一致
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.strategies.trend_following import (
+    AdaptiveMovingAverageStrategy,
+    SupertrendStrategy,
+    supertrend_direction,
+    supertrend_final_bands,
+    variable_window_mean,
+)
+
+
+def _ohlcv(seed: int, n: int = 400) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    return pd.DataFrame(
+        {
+            "open": close,
+            "high": close + rng.random(n),
+            "low": close - rng.random(n),
+            "close": close,
+            "volume": 1.0,
+        },
+        index=pd.date_range("2024-01-01", periods=n, freq="min"),
+    )
+
+
+def _reference_bands(basic_upper, basic_lower, close):
+    """逐行参考实现"""
+    fu, fl = [basic_upper[0]], [basic_lower[0]]
+    for i in range(1, len(close)):
+        keep_upper = not (basic_upper[i] < fu[-1] or close[i - 1] > fu[-1])
+        keep_lower = not (basic_lower[i] > fl[-1] or close[i - 1] < fl[-1])
+        fu.append(fu[-1] if keep_upper else basic_upper[i])
+        fl.append(fl[-1] if keep_lower else basic_lower[i])
+    return np.array(fu), np.array(fl)
+
+
+class TestSupertrendKernels:
+    """测试Supertrend单遍循环"""
+
+    def test_bands_and_direction_match_reference(self):
+        rng = np.random.default_rng(5)
+        close = 100 + np.cumsum(rng.normal(0, 1, 1000))
+        basic_upper = close + rng.random(1000) * 3
+        basic_lower = close - rng.random(1000) * 3
+
+        final_upper, final_lower = supertrend_final_bands(basic_upper, basic_lower, close)
+        expected_upper, expected_lower = _reference_bands(basic_upper, basic_lower, close)
+        np.testing.assert_array_equal(final_upper, expected_upper)
+        np.testing.assert_array_equal(final_lower, expected_lower)
+
+        supertrend, trend = supertrend_direction(final_upper, final_lower, close)
+        assert set(np.unique(trend)) == {-1.0, 1.0}
+        up = trend == 1
+        np.testing.assert_array_equal(
+            supertrend[up & (close >= final_upper)], final_upper[up & (close >= final_upper)]
+        )
+
+    def test_strategy_output_columns(self):
+        result = SupertrendStrategy(atr_period=5).generate_signals(_ohlcv(0))
+
+        assert result["trend"].dtype == np.float64
+        assert result["signal"].isin([-1, 0, 1]).all()
+        assert len(result) == 400
+
+
+class TestVariableWindowMean:
+    """测试可变窗口均值"""
+
+    @pytest.mark.parametrize("n", [1, 63, 64, 65, 1000])
+    def test_matches_slice_means(self, n):
+        rng = np.random.default_rng(n)
+        values = 30000 + np.cumsum(rng.normal(0, 10, n))
+        values[rng.random(n) < 0.05] = np.nan
+        starts = np.maximum(0, np.arange(n) - rng.integers(0, 40, n))
+
+        expected = [pd.Series(values[slice(s, i + 1)]).mean() for i, s in enumerate(starts)]
+        np.testing.assert_allclose(variable_window_mean(values, starts), expected, rtol=1e-12)
+
+    def test_adaptive_strategy_matches_row_loop(self):
+        data = _ohlcv(1, n=300)
+        strategy = AdaptiveMovingAverageStrategy(window=10, volatility_window=5)
+        result = strategy.calculate_indicators(data)
+
+        close = data["close"]
+        for i in (0, 5, 9, 10, 150, 299):
+            if i >= strategy.window:
+                start = max(0, i - int(result["adaptive_window"].iloc[i]) + 1)
+            else:
+                start = 0
+            expected = close.iloc[slice(start, i + 1)].mean()
+            assert result["adaptive_ma"].iloc[i] == pytest.approx(expected, rel=1e-12)
@@ -343,6 +343,30 @@ class TestMovingAverageIndicators(unittest.TestCase):
         with self.assertRaises(ValueError):
             weighted_moving_average(self.test_data, -1)
 
+    def test_weighted_moving_average_matches_np_average(self):
+        """测试WMA内核与逐窗口np.average一致（含预热期、NaN与跨块窗口）"""
+        from src.data.indicators.technical_analysis import TechnicalIndicators
+        from src.indicators.moving_averages import weighted_moving_average as cached_wma
+
+        rng = np.random.default_rng(0)
+        data = pd.Series(30000 + np.cumsum(rng.normal(0, 10, 700)), name="close")
+        data.iloc[[5, 400]] = np.nan
+
+        for window in (1, 3, 20, 65):
+            weights = np.arange(1, window + 1)
+            expected = data.rolling(window, min_periods=1).apply(
+                lambda x: np.average(x, weights=weights[: len(x)]), raw=True
+            )
+            result = weighted_moving_average(data, window)
+            pd.testing.assert_series_equal(result, expected, rtol=1e-12)
+
+            # 共享内核的其他入口：预热期为NaN
+            full = expected.where(np.arange(len(data)) >= window - 1)
+            pd.testing.assert_series_equal(cached_wma(data, window), full, rtol=1e-12)
+            pd.testing.assert_series_equal(
+                TechnicalIndicators.moving_average(data, window, "weighted"), full, rtol=1e-12
+            )
+
     def test_moving_average_alias(self):
         """测试兼容性别名函数"""
         window = 3
@@ -8,6 +8,7 @@ Vectorized Signal Processor and Cache Tests - Coverage Boost
 - src/core/signal_cache.py (当前0%覆盖率)
 """
 
+from unittest.mock import MagicMock
 
 import numpy as np
 import pandas as pd
@@ -375,6 +376,83 @@ class TestSignalCache:
         # 缓存大小应该仍然是1
         assert self.cache.size() == 1
 
+    def test_lru_eviction_and_stats(self):
+        """测试超出容量时淘汰最久未使用的条目并统计"""
+        cache = SignalCache(max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1  # a 变为最近使用
+
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        stats = cache.stats()
+        assert stats["size"] == 2
+        assert stats["hits"] == 3
+        assert stats["misses"] == 1
+        assert stats["evictions"] == 1
+        assert stats["hit_rate"] == pytest.approx(0.75)
+
+    def test_invalid_max_size(self):
+        """测试非法容量"""
+        with pytest.raises(ValueError):
+            SignalCache(max_size=0)
+
+
+class TestProcessorSignalCache:
+    """测试处理器批量路径的LRU缓存"""
+
+    def create_data(self, periods=50, seed=0):
+        rng = np.random.default_rng(seed)
+        dates = pd.date_range("2024-01-01", periods=periods, freq="h")
+        return pd.DataFrame({"close": 100 + np.cumsum(rng.normal(0, 1, periods))}, index=dates)
+
+    def test_hit_miss_and_bounded_size(self):
+        """测试命中统计与容量上限"""
+        processor = OptimizedSignalProcessor(cache_size=2)
+        data = self.create_data()
+
+        processor.get_trading_signals_optimized(data)
+        processor.get_trading_signals_optimized(data)
+        for fast_win in (3, 4, 5):
+            processor.get_trading_signals_optimized(data, fast_win=fast_win)
+
+        stats = processor.get_cache_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 4
+        assert stats["size"] == 2
+        assert stats["evictions"] == 2
+
+    def test_revised_last_bar_is_not_served_from_cache(self):
+        """测试同一时间戳的最后K线被修订后重新计算"""
+        processor = OptimizedSignalProcessor()
+        data = self.create_data()
+        first = processor.get_trading_signals_optimized(data)
+
+        revised = data.copy()
+        revised.iloc[-1, 0] += 5.0
+        second = processor.get_trading_signals_optimized(revised)
+
+        assert second["current_price"] == pytest.approx(first["current_price"] + 5.0)
+        assert processor.get_cache_stats()["hits"] == 0
+
+    def test_publish_cache_metrics(self):
+        """测试缓存统计推送到收集器"""
+        processor = OptimizedSignalProcessor()
+        data = self.create_data()
+        processor.get_trading_signals_optimized(data)
+        processor.get_trading_signals_optimized(data)
+
+        metrics = MagicMock()
+        processor.publish_cache_metrics(metrics)
+
+        metrics.update_signal_cache_stats.assert_called_once()
+        name, stats = metrics.update_signal_cache_stats.call_args[0]
+        assert name == "vectorized"
+        assert stats["hits"] == 1 and stats["misses"] == 1
+
 
 class TestModuleFunctions:
     """测试模块级函数"""
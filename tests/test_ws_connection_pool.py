@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+组合流连接池测试（本地websockets服务器替身）
+Combined-stream Connection Pool Tests
+
+测试目标:
+- src/ws/connection_pool.py
+- BinanceWSClient 连接池模式
+"""
+
+import asyncio
+import json
+from unittest.mock import Mock, patch
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from websockets.asyncio.server import serve
+
+from src.ws.binance_ws_client import BinanceWSClient
+from src.ws.connection_pool import BinanceWSPool, WSShard, shard_streams
+
+
+def _kline(symbol, open_time=1_700_000_000_000, closed=True):
+    return {
+        "e": "kline",
+        "E": open_time + 999,
+        "s": symbol,
+        "k": {
+            "t": open_time,
+            "s": symbol,
+            "o": "1.0",
+            "h": "2.0",
+            "l": "0.5",
+            "c": "1.5",
+            "v": "10.0",
+            "x": closed,
+        },
+    }
+
+
+class FakeBinanceServer:
+    """组合流服务器替身：连接后为每个订阅的kline流推送一条消息"""
+
+    def __init__(self, drop_first_connection_of=None):
+        self.connections = []
+        self.drop_first_connection_of = drop_first_connection_of
+        self._dropped = False
+        self.url = None
+
+    async def handler(self, ws):
+        streams = parse_qs(urlparse(ws.request.path).query)["streams"][0].split("/")
+        self.connections.append(streams)
+
+        if not self._dropped and self.drop_first_connection_of in streams:
+            self._dropped = True
+            await ws.close()
+            return
+
+        for stream in streams:
+            if stream.endswith("@kline_1s"):
+                symbol = stream.split("@")[0].upper()
+                await ws.send(json.dumps({"stream": stream, "data": _kline(symbol)}))
+        await ws.wait_closed()
+
+    async def __aenter__(self):
+        self._server = await serve(self.handler, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        self.url = f"ws://127.0.0.1:{port}/stream"
+        return self
+
+    async def __aexit__(self, *exc):
+        self._server.close()
+        await self._server.wait_closed()
+
+
+async def _wait_for(predicate, timeout=5.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not predicate():
+        if loop.time() > deadline:
+            raise AssertionError("等待条件超时")
+        await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+def metrics():
+    return Mock()
+
+
+class TestShardStreams:
+    """测试分片规划"""
+
+    def test_symbols_never_split_across_shards(self):
+        shards = shard_streams(["BTCUSDT", "ETHUSDT", "BNBUSDT"], streams_per_connection=5)
+
+        assert shards == [
+            ["btcusdt@kline_1s", "btcusdt@ticker", "ethusdt@kline_1s", "ethusdt@ticker"],
+            ["bnbusdt@kline_1s", "bnbusdt@ticker"],
+        ]
+
+    def test_limit_smaller_than_symbol_streams(self):
+        with pytest.raises(ValueError):
+            shard_streams(["BTCUSDT"], streams_per_connection=1)
+
+
+class TestBinanceWSPool:
+    """测试连接池（本地服务器）"""
+
+    @pytest.mark.asyncio
+    async def test_messages_from_all_shards(self, metrics):
+        symbols = ["BTCUSDT", "ETHUSDT", "BNBUSDT", "XRPUSDT"]
+        received = []
+
+        async def on_message(data, receive_time):
+            received.append(data["s"])
+
+        async with FakeBinanceServer() as server:
+            pool = BinanceWSPool(
+                symbols, on_message, streams_per_connection=4, base_url=server.url, metrics=metrics
+            )
+            pool.start()
+            await _wait_for(lambda: len(received) == len(symbols))
+            stats = pool.get_stats()
+            await pool.close()
+
+        assert sorted(received) == sorted(symbols)
+        assert stats["shard_count"] == 2
+        assert stats["connected_shards"] == 2
+        assert len(server.connections) == 2
+        assert pool.shard_for("ethusdt") is pool.shards[0]
+
+    @pytest.mark.asyncio
+    async def test_dropped_shard_reconnects_alone(self, metrics):
+        received = []
+
+        async def on_message(data, receive_time):
+            received.append(data["s"])
+
+        async with FakeBinanceServer(drop_first_connection_of="btcusdt@kline_1s") as server:
+            pool = BinanceWSPool(
+                ["BTCUSDT", "ETHUSDT"],
+                on_message,
+                streams_per_connection=2,
+                base_url=server.url,
+                reconnect_delay=0.01,
+                metrics=metrics,
+            )
+            pool.start()
+            await _wait_for(lambda: sorted(received) == ["BTCUSDT", "ETHUSDT"])
+            btc, eth = pool.shard_for("BTCUSDT"), pool.shard_for("ETHUSDT")
+            await pool.close()
+
+        assert btc.connect_count == 2
+        assert eth.connect_count == 1
+        metrics.record_ws_reconnect.assert_called_once_with(
+            symbol=btc.name, reason="connection_lost"
+        )
+
+
+class TestShardBackpressure:
+    """测试分片有界队列"""
+
+    @staticmethod
+    def _message(open_time, closed):
+        kline = _kline("BTCUSDT", open_time, closed=closed)
+        return json.dumps({"stream": "btcusdt@kline_1s", "data": kline})
+
+    @staticmethod
+    def _shard(metrics, queue_size=2):
+        async def on_message(data, receive_time):
+            pass
+
+        return WSShard(0, ["btcusdt@kline_1s"], on_message, queue_size=queue_size, metrics=metrics)
+
+    def _queued(self, shard):
+        return [
+            (json.loads(message)["data"]["k"]["t"], unclosed)
+            for message, _, unclosed in (
+                shard.queue.get_nowait() for _ in range(shard.queue.qsize())
+            )
+        ]
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_oldest_unclosed_kline(self, metrics):
+        shard = self._shard(metrics, queue_size=3)
+        await shard._enqueue(self._message(1, closed=True), 0.0)
+        await shard._enqueue(self._message(2, closed=False), 0.0)
+        await shard._enqueue(self._message(3, closed=True), 0.0)
+        await shard._enqueue(self._message(4, closed=False), 0.0)
+
+        # 收盘K线保留，丢弃更早的未收盘K线
+        assert shard.dropped_count == 1
+        assert self._queued(shard) == [(1, False), (3, False), (4, True)]
+        metrics.record_ws_shard_drop.assert_called_once_with(shard.name)
+
+    @pytest.mark.asyncio
+    async def test_unclosed_kline_dropped_when_queue_holds_only_closed(self, metrics):
+        shard = self._shard(metrics)
+        await shard._enqueue(self._message(1, closed=True), 0.0)
+        await shard._enqueue(self._message(2, closed=True), 0.0)
+        await shard._enqueue(self._message(3, closed=False), 0.0)
+
+        assert shard.dropped_count == 1
+        assert self._queued(shard) == [(1, False), (2, False)]
+
+    @pytest.mark.asyncio
+    async def test_closed_kline_waits_instead_of_dropping(self, metrics):
+        shard = self._shard(metrics)
+        await shard._enqueue(self._message(1, closed=True), 0.0)
+        await shard._enqueue(self._message(2, closed=True), 0.0)
+
+        pending = asyncio.create_task(shard._enqueue(self._message(3, closed=True), 0.0))
+        await asyncio.sleep(0.01)
+        assert not pending.done()
+
+        shard.queue.get_nowait()
+        await asyncio.wait_for(pending, timeout=1.0)
+
+        assert shard.dropped_count == 0
+        assert shard.closed_backpressure_count == 1
+        assert [t for t, _ in self._queued(shard)] == [2, 3]
+        metrics.record_ws_shard_backpressure.assert_called_once_with(shard.name, "closed_kline")
+        metrics.record_ws_shard_drop.assert_not_called()
+
+
+class TestClientPoolMode:
+    """测试BinanceWSClient连接池模式"""
+
+    @pytest.mark.asyncio
+    async def test_client_dispatches_pool_messages(self):
+        received = []
+
+        async def on_kline(kline):
+            received.append(kline["symbol"])
+
+        with patch("src.ws.binance_ws_client.get_metrics_collector", return_value=Mock()):
+            client = BinanceWSClient(["BTCUSDT", "ETHUSDT"], on_kline, streams_per_connection=2)
+
+        async with FakeBinanceServer() as server:
+            client.stream_url = server.url
+            client_task = asyncio.create_task(client.run())
+            await _wait_for(lambda: len(received) == 2)
+            assert client.get_stats()["pool"]["shard_count"] == 2
+            await client.close()
+            await client_task
+
+        assert sorted(received) == ["BTCUSDT", "ETHUSDT"]
+        assert client.message_count == 2
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+WebSocket K线快速解码测试
+Fast WebSocket Kline Decoder Tests
+
+测试目标:
+- src/ws/kline_decoder.py
+- BinanceWSClient 快速/旧版解码路径一致
+"""
+
+import json
+import time
+from unittest.mock import AsyncMock, Mock, patch
+
+import pandas as pd
+import pytest
+
+from src.core.market_data_buffer import OHLCVRingBuffer
+from src.ws import kline_decoder
+from src.ws.binance_ws_client import BinanceWSClient
+from src.ws.kline_decoder import KlineRecord, decode_kline
+
+
+def _kline_event(open_time=1_700_000_000_000, closed=True):
+    return {
+        "e": "kline",
+        "E": open_time + 999,
+        "s": "BTCUSDT",
+        "k": {
+            "t": open_time,
+            "s": "BTCUSDT",
+            "o": "50000.00",
+            "h": "51000.00",
+            "l": "49000.00",
+            "c": "50500.00",
+            "v": "100.0",
+            "x": closed,
+        },
+    }
+
+
+class TestKlineDecoder:
+    """测试解码函数与KlineRecord"""
+
+    def test_decode_matches_legacy_dict(self):
+        event = _kline_event()
+        record = decode_kline(event, receive_time=1.0, receive_ms=event["E"] + 5)
+        legacy = BinanceWSClient._build_kline_dict(event, 1.0)
+
+        for key in ("symbol", "timestamp", "open", "high", "low", "close", "volume", "is_closed"):
+            assert record[key] == legacy[key]
+        assert record.latency_ms == 5.0
+        assert record.timestamp == pd.Timestamp("2023-11-14 22:13:20")
+
+    def test_record_is_slotted_and_dict_like(self):
+        record = decode_kline(_kline_event(closed=False), receive_time=0.0)
+
+        assert not hasattr(record, "__dict__")
+        assert "timestamp" in record and "missing" not in record
+        assert record.get("is_closed") is False
+        assert record.get("missing", 1) == 1
+        with pytest.raises(KeyError):
+            record["missing"]
+        assert set(record.to_dict()) == set(record.keys())
+
+    def test_loads_accepts_bytes_and_raises_json_error(self):
+        assert kline_decoder.loads(b'{"a": 1}') == {"a": 1}
+        with pytest.raises(json.JSONDecodeError):
+            kline_decoder.loads("{bad")
+
+    def test_ring_buffer_appends_record_without_timestamp(self):
+        record = decode_kline(_kline_event(), receive_time=0.0)
+        buf = OHLCVRingBuffer(capacity=2)
+
+        with patch.object(KlineRecord, "timestamp", new=property(lambda self: 1 / 0)):
+            buf.append_kline(record)
+
+        assert buf.last_row() == (1_700_000_000_000, 50000.0, 51000.0, 49000.0, 50500.0, 100.0)
+
+
+class TestClientDecodePaths:
+    """测试客户端的快速与旧版解码路径"""
+
+    @pytest.fixture
+    def mock_metrics(self):
+        with patch("src.ws.binance_ws_client.get_metrics_collector") as mock:
+            mock.return_value = Mock()
+            yield mock.return_value
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("fast_decode", [True, False])
+    async def test_callback_receives_equivalent_kline(self, mock_metrics, fast_decode):
+        callback = AsyncMock()
+        client = BinanceWSClient(["BTCUSDT"], callback, fast_decode=fast_decode)
+        client.metrics = mock_metrics
+
+        await client._handle_kline_data(_kline_event(), time.perf_counter())
+
+        kline = callback.call_args[0][0]
+        assert isinstance(kline, KlineRecord) is fast_decode
+        assert kline["symbol"] == "BTCUSDT"
+        assert kline["close"] == 50500.0
+        assert kline["timestamp"] == pd.Timestamp(1_700_000_000_000, unit="ms")
+        mock_metrics.observe_ws_latency.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_listen_uses_fast_loads(self, mock_metrics):
+        client = BinanceWSClient(["BTCUSDT"])
+        client.ws = _FakeSocket([json.dumps(_kline_event()).encode(), b"not json"])
+        client._handle_kline_data = AsyncMock()
+
+        await client.listen()
+
+        client._handle_kline_data.assert_awaited_once()
+        assert client.message_count == 1
+        assert client.error_count == 1
+
+
+class _FakeSocket:
+    """按顺序产出消息的异步迭代器"""
+
+    def __init__(self, messages):
+        self._messages = list(messages)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self._messages:
+            raise StopAsyncIteration
+        return self._messages.pop(0)
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+K线分发器测试
+Per-symbol Kline Dispatcher Tests
+
+测试目标:
+- src/ws/kline_dispatcher.py
+- BinanceWSClient 分发器模式
+- TradingMetricsCollector.update_ws_dispatch_stats
+"""
+
+import asyncio
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.monitoring.metrics_collector import TradingMetricsCollector
+from src.ws.binance_ws_client import BinanceWSClient
+from src.ws.kline_dispatcher import KlineDispatcher
+
+
+def _kline(symbol, t, closed=True, close=1.0):
+    return {"symbol": symbol, "timestamp": t, "is_closed": closed, "close": close}
+
+
+class TestKlineDispatcherQueues:
+    """测试队列、合并与丢弃策略（不启动worker）"""
+
+    def test_unclosed_klines_are_coalesced(self):
+        dispatcher = KlineDispatcher(Mock(), queue_size=10)
+        for i in range(5):
+            dispatcher.submit(_kline("BTCUSDT", 1, closed=False, close=float(i)))
+
+        stats = dispatcher.get_symbol_stats()["BTCUSDT"]
+        assert stats["depth"] == 1
+        assert stats["coalesced"] == 4
+
+        # 同一根K线收盘后，未收盘槽位作废
+        dispatcher.submit(_kline("BTCUSDT", 1, closed=True))
+        stats = dispatcher.get_symbol_stats()["BTCUSDT"]
+        assert stats["depth"] == 1
+        assert stats["coalesced"] == 5
+
+    def test_full_queue_drops_oldest_closed_kline(self):
+        dispatcher = KlineDispatcher(Mock(), queue_size=2)
+        for t in range(4):
+            dispatcher.submit(_kline("BTCUSDT", t))
+
+        queue = dispatcher._queues["BTCUSDT"]
+        assert [k["timestamp"] for k in queue.closed] == [2, 3]
+        assert queue.dropped == 2
+
+    def test_invalid_worker_count(self):
+        with pytest.raises(ValueError):
+            KlineDispatcher(Mock(), num_workers=0)
+
+
+class TestKlineDispatcherWorkers:
+    """测试worker消费"""
+
+    @pytest.mark.asyncio
+    async def test_per_symbol_order_is_preserved(self):
+        delivered = []
+
+        async def handler(kline):
+            await asyncio.sleep(0)
+            delivered.append((kline["symbol"], kline["timestamp"]))
+
+        dispatcher = KlineDispatcher(handler, num_workers=3)
+        dispatcher.start()
+        for t in range(20):
+            for symbol in ("BTCUSDT", "ETHUSDT"):
+                dispatcher.submit(_kline(symbol, t))
+        await dispatcher.join()
+        await dispatcher.stop()
+
+        for symbol in ("BTCUSDT", "ETHUSDT"):
+            assert [t for s, t in delivered if s == symbol] == list(range(20))
+        assert dispatcher.get_stats()["delivered"] == 40
+
+    @pytest.mark.asyncio
+    async def test_slow_symbol_does_not_block_others(self):
+        fast_done = asyncio.Event()
+        release = asyncio.Event()
+
+        async def handler(kline):
+            if kline["symbol"] == "SLOWUSDT":
+                await release.wait()
+            else:
+                fast_done.set()
+
+        dispatcher = KlineDispatcher(handler, num_workers=2)
+        dispatcher.start()
+        dispatcher.submit(_kline("SLOWUSDT", 1))
+        dispatcher.submit(_kline("FASTUSDT", 1))
+
+        await asyncio.wait_for(fast_done.wait(), timeout=1)
+        release.set()
+        await dispatcher.stop(drain=True)
+
+    @pytest.mark.asyncio
+    async def test_handler_errors_are_counted(self):
+        async def handler(kline):
+            raise RuntimeError("boom")
+
+        dispatcher = KlineDispatcher(handler, num_workers=1)
+        dispatcher.start()
+        dispatcher.submit(_kline("BTCUSDT", 1))
+        await dispatcher.join()
+        await dispatcher.stop()
+
+        assert dispatcher.error_count == 1
+
+    @pytest.mark.asyncio
+    async def test_stop_publishes_metrics(self):
+        metrics = Mock()
+        dispatcher = KlineDispatcher(Mock(), metrics=metrics)
+        dispatcher.submit(_kline("BTCUSDT", 1, closed=False))
+
+        await dispatcher.stop()
+
+        metrics.update_ws_dispatch_stats.assert_called_once_with(
+            {"BTCUSDT": {"depth": 1, "dropped": 0, "coalesced": 0, "delivered": 0}}
+        )
+
+
+class TestClientDispatcherMode:
+    """测试客户端不再在读取路径上等待回调"""
+
+    @pytest.mark.asyncio
+    async def test_handle_kline_returns_before_callback(self):
+        release = asyncio.Event()
+        received = []
+
+        async def on_kline(kline):
+            await release.wait()
+            received.append(kline["symbol"])
+
+        with patch("src.ws.binance_ws_client.get_metrics_collector", return_value=Mock()):
+            client = BinanceWSClient(["BTCUSDT"], on_kline, dispatch_workers=2)
+        client.dispatcher.start()
+
+        event = {
+            "E": int(time.time() * 1000),
+            "k": {
+                "s": "BTCUSDT",
+                "t": 1_700_000_000_000,
+                "o": "1",
+                "h": "1",
+                "l": "1",
+                "c": "1",
+                "v": "1",
+                "x": True,
+            },
+        }
+        await asyncio.wait_for(client._handle_kline_data(event, time.perf_counter()), 0.5)
+        assert received == []
+
+        release.set()
+        await client.dispatcher.join()
+        assert received == ["BTCUSDT"]
+        assert client.get_stats()["dispatcher"]["delivered"] == 1
+        await client.close()
+
+
+class TestDispatchMetrics:
+    """测试分发指标导出"""
+
+    def test_counters_accumulate_deltas(self):
+        collector = TradingMetricsCollector()
+        collector.update_ws_dispatch_stats({"BTCUSDT": {"depth": 3, "dropped": 2, "coalesced": 5}})
+        collector.update_ws_dispatch_stats({"BTCUSDT": {"depth": 1, "dropped": 4, "coalesced": 5}})
+
+        assert collector.ws_dispatch_queue_depth.labels(symbol="BTCUSDT")._value.get() == 1
+        assert collector.ws_dispatch_dropped.labels(symbol="BTCUSDT")._value.get() == 4
+        assert collector.ws_dispatch_coalesced.labels(symbol="BTCUSDT")._value.get() == 5
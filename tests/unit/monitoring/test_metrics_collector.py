@@ -44,3 +44,26 @@ def test_reset_counters(fresh_collector):
     fresh_collector.reset_counters()
     assert fresh_collector.get_trade_summary() == {}
     assert fresh_collector.get_error_summary() == {}
+
+
+def test_getters_read_shadow_state_without_registry(fresh_collector, monkeypatch):
+    from prometheus_client import REGISTRY
+
+    fresh_collector.update_price("ETHUSDT", 3_000)
+    fresh_collector.record_exception("ws", ValueError("bad frame"))
+    fresh_collector.record_error("ws", "reconnect")
+
+    # 摘要不再遍历注册表
+    monkeypatch.setattr(REGISTRY, "_collector_to_names", None)
+    assert fresh_collector.get_latest_prices() == {"ETHUSDT": 3_000}
+    assert fresh_collector.get_error_summary() == {"ws": 2}
+
+
+def test_trade_summary_from_price_updates(fresh_collector):
+    fresh_collector.record_price_update("BTCUSDT", 50_000, source="ws")
+    fresh_collector.record_price_update("BTCUSDT", 50_001, source="ws")
+    fresh_collector.record_price_update("BTCUSDT", 50_002, source="api")
+
+    summary = fresh_collector.get_trade_summary()
+    assert summary["BTCUSDT"] == {"trades": 2, "price_updates": 3}
+    assert summary["total_trades"] == 5